@@ -34,7 +34,9 @@ PROFILES = {
                         "max_posts": 25,
                         "max_age_days": 30,
                         "min_age_days": 7,
-                        "max_posts_per_profile": 5
+                        "max_posts_per_profile": 5,
+                        "scoring": "engagement",
+                        "history_days": 0 # days of older scrapes to merge in (0 = latest scrape only)
                     },
                     "count_linkedin": 17,
                     "count_x_profile": 50,
@@ -69,6 +71,7 @@ PROFILES = {
                         "ignore_video_tweets": False
                     },
                     "scraper": {
+                        "tabs": 1,
                         "max_tweets": 20,
                         "communities": [],
                         "specific_url": "",
@@ -80,7 +83,8 @@ PROFILES = {
                     "subreddits": [],
                     'time_filter': ['day', 'yesterday'],
                     "min_comments": 0,
-                    "include_comments": False
+                    "include_comments": False,
+                    "workers": 4
                 },
                 "linkedin": {
                     "reply": {
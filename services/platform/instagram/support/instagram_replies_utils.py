@@ -3,7 +3,6 @@ import os
 import json
 import time
 import requests
-import google.generativeai as genai
 
 from bs4 import BeautifulSoup
 from selenium import webdriver
@@ -13,6 +12,7 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from typing import Optional, List, Dict, Tuple, Any
 from services.support.logger_util import _log as log
+from services.support.gemini_client import get_gemini_model
 from selenium.webdriver.support.ui import WebDriverWait
 from services.support.path_config import get_instagram_reels_dir
 from selenium.webdriver.support import expected_conditions as EC
@@ -27,8 +27,7 @@ def _init_gemini_model(api_key=None):
         api_key = os.getenv("GEMINI_API")
     if not api_key:
         raise ValueError("No Gemini API key found. Set GEMINI_API environment variable or pass via argument.")
-    genai.configure(api_key=api_key)
-    return genai.GenerativeModel("gemini-2.5-flash")
+    return get_gemini_model(api_key, "gemini-2.5-flash")
 
 def parse_instagram_comments_robust(html_content):
     soup = BeautifulSoup(html_content, 'html.parser')
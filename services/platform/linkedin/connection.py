@@ -1,7 +1,6 @@
 # socials linkedin <profile> connection "user1,user2,user3"
 
 import sys
-import time
 import argparse
 
 from profiles import PROFILES
@@ -12,6 +11,7 @@ from rich.console import Console
 
 from services.support.logger_util import _log as log
 from services.support.web_driver_handler import setup_driver
+from services.support.wait_util import log_interaction_summary, pace
 from services.support.path_config import get_browser_data_dir, initialize_directories
 
 from services.platform.linkedin.support.connection_utils import send_connection_request
@@ -68,13 +68,14 @@ def main():
 
             if username != usernames[-1]:
                 log(f"Waiting for 25 seconds before proceeding to the next profile...", verbose, log_caller_file="connection.py")
-                time.sleep(25)
+                pace(25, 25, action="between_connection_requests")
 
     except Exception as e:
         log(f"An error occurred: {e}", verbose=True, is_error=True, log_caller_file="connection.py")
     finally:
         if driver:
             driver.quit()
+        log_interaction_summary(verbose)
 
 if __name__ == "__main__":
     main()
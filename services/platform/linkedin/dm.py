@@ -3,7 +3,6 @@
 import os
 import sys
 import json
-import time
 import argparse
 
 from profiles import PROFILES
@@ -16,6 +15,7 @@ from rich.console import Console
 
 from services.support.logger_util import _log as log
 from services.support.web_driver_handler import setup_driver
+from services.support.wait_util import log_interaction_summary, pace
 from services.support.path_config import get_browser_data_dir, get_linkedin_profile_dir, initialize_directories
 
 from services.platform.linkedin.support.connection_utils import send_linkedin_dm
@@ -89,7 +89,7 @@ def main():
 
             if i < len(messages_data) - 1:
                 log(f"Waiting for 10 seconds before next message...", verbose, log_caller_file="dm.py")
-                time.sleep(10)
+                pace(10, 10, action="between_messages")
 
         with open(messages_file, 'w', encoding='utf-8') as f:
             json.dump(messages_data, f, indent=2, ensure_ascii=False)
@@ -101,6 +101,7 @@ def main():
     finally:
         if driver:
             driver.quit()
+        log_interaction_summary(verbose)
 
 if __name__ == "__main__":
     main()
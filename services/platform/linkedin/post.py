@@ -3,7 +3,6 @@
 import os
 import sys
 import json
-import time
 import argparse
 
 from profiles import PROFILES
@@ -16,6 +15,7 @@ from rich.status import Status
 
 from services.support.logger_util import _log as log
 from services.support.web_driver_handler import setup_driver
+from services.support.wait_util import log_interaction_summary, navigate, pace
 from services.support.path_config import get_browser_data_dir, get_linkedin_profile_dir, initialize_directories
 
 from services.platform.linkedin.support.post_utils import create_linkedin_post
@@ -67,8 +67,7 @@ def main():
                 log(msg, verbose, status, log_caller_file="post.py")
             status.update("[white]WebDriver setup complete.[/white]")
 
-        driver.get("https://www.linkedin.com/feed/")
-        time.sleep(5)
+        navigate(driver, "https://www.linkedin.com/feed/", action="open_feed")
 
         for i, post_obj in enumerate(posts_data):
             text = post_obj.get('text', '').strip()
@@ -92,7 +91,7 @@ def main():
 
             if i < len(posts_data) - 1:
                 log(f"Waiting for 30 seconds before next post...", verbose, log_caller_file="post.py")
-                time.sleep(30)
+                pace(30, 30, action="between_posts")
 
         with open(posts_file, 'w', encoding='utf-8') as f:
             json.dump(posts_data, f, indent=2, ensure_ascii=False)
@@ -104,6 +103,7 @@ def main():
     finally:
         if driver:
             driver.quit()
+        log_interaction_summary(verbose)
 
 if __name__ == "__main__":
     main()
@@ -1,36 +1,31 @@
-import time
-import random
-
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 
 from services.support.logger_util import _log as log
+from services.support.wait_util import click, find_first, human_pause, navigate, timed, wait_until
+
+SEND_WITHOUT_NOTE_SELECTOR = "button[aria-label='Send without a note']"
+MESSAGE_BUTTON_XPATH = "(//button[starts-with(@aria-label, 'Message ')])[2]"
+MESSAGE_INPUT_SELECTOR = ".msg-form__contenteditable[contenteditable='true'][role='textbox']"
+MESSAGE_SEND_SELECTOR = ".msg-form__send-button.artdeco-button.artdeco-button--1"
 
 def send_connection_request(driver, profile_url: str, verbose: bool = False, status=None) -> bool:
     try:
         username = profile_url.split("linkedin.com/in/")[-1].strip('/')
         direct_invite_url = f"https://www.linkedin.com/preload/custom-invite/?vanityName={username}"
-        
+
         log(f"Navigating to direct LinkedIn invite URL: {direct_invite_url}", verbose, status, log_caller_file="connection_utils.py")
-        driver.get(direct_invite_url)
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "body"))
-        )
-        time.sleep(5)
+        navigate(driver, direct_invite_url, ready_selectors=[SEND_WITHOUT_NOTE_SELECTOR], timeout=20, action="open_invite")
 
-        log("Attempting to click 'Send without a note' button directly via JavaScript...", verbose, status, log_caller_file="connection_utils.py")
-        
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "button[aria-label='Send without a note']"))
-        )
-        send_without_note_button = WebDriverWait(driver, 15).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, "button[aria-label='Send without a note']"))
-        )
-        send_without_note_button.click()
+        log("Attempting to click 'Send without a note' button...", verbose, status, log_caller_file="connection_utils.py")
+        found = find_first(driver, [SEND_WITHOUT_NOTE_SELECTOR], timeout=15, clickable=True, action="find_send_without_note")
+        if not found:
+            raise Exception("'Send without a note' button did not become clickable")
+        click(driver, found[0], action="click_send_without_note", verbose=verbose, status=status)
         log("'Send without a note' button clicked using Selenium.", verbose, status, log_caller_file="connection_utils.py")
-        time.sleep(5)
-        
+
+        wait_until(driver, lambda d: not d.find_elements(By.CSS_SELECTOR, SEND_WITHOUT_NOTE_SELECTOR), timeout=10, action="invite_dialog_closed", raise_on_timeout=False)
+        human_pause(1, 2, action="after_connection_request")
+
         log(f"Successfully sent connection request to {profile_url}", verbose=verbose, status=status, log_caller_file="connection_utils.py")
         return True
     except Exception as e:
@@ -40,38 +35,33 @@ def send_connection_request(driver, profile_url: str, verbose: bool = False, sta
 def send_linkedin_dm(driver, profile_url: str, message: str, verbose: bool = False, status=None) -> bool:
     try:
         log(f"Navigating to LinkedIn profile: {profile_url}", verbose, status, log_caller_file="connection_utils.py")
-        driver.get(profile_url)
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "body"))
-        )
-        time.sleep(5)
+        navigate(driver, profile_url, timeout=20, action="open_profile")
 
         log(f"Attempting to click Message button on {profile_url}'s profile...", verbose, status, log_caller_file="connection_utils.py")
-        message_button = WebDriverWait(driver, 20).until(
-            EC.element_to_be_clickable((By.XPATH, "(//button[starts-with(@aria-label, 'Message ')])[2]"))
-        )
-        try:
-            message_button.click()
-        except Exception:
-            driver.execute_script("arguments[0].click();", message_button)
+        found = find_first(driver, [MESSAGE_BUTTON_XPATH], by=By.XPATH, timeout=20, clickable=True, action="find_message_button")
+        if not found:
+            raise Exception("Message button did not become clickable")
+        click(driver, found[0], action="click_message_button", verbose=verbose, status=status)
         log(f"Message button clicked for {profile_url}. Waiting for message composer...", verbose, status, log_caller_file="connection_utils.py")
-        time.sleep(15)
 
-        message_input = WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, ".msg-form__contenteditable[contenteditable='true'][role='textbox']"))
-        )
+        found = find_first(driver, [MESSAGE_INPUT_SELECTOR], timeout=20, visible=True, action="find_message_input")
+        if not found:
+            raise Exception("Message composer did not open")
+        message_input = found[0]
         for char in message:
-            message_input.send_keys(char)
-            time.sleep(random.uniform(0.05, 0.15))
+            with timed("type_message", "act"):
+                message_input.send_keys(char)
+            human_pause(0.05, 0.15, action="typing_cadence")
         log(f"Typed message into composer for {profile_url}.", verbose, status, log_caller_file="connection_utils.py")
-        time.sleep(2)
+        human_pause(1, 2, action="before_send")
 
-        send_button = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, ".msg-form__send-button.artdeco-button.artdeco-button--1"))
-        )
-        send_button.click()
+        found = find_first(driver, [MESSAGE_SEND_SELECTOR], timeout=10, clickable=True, action="find_send_button")
+        if not found:
+            raise Exception("Send button did not become clickable")
+        click(driver, found[0], action="click_send_button", verbose=verbose, status=status)
         log(f"Send button clicked for {profile_url}. DM sent.", verbose, status, log_caller_file="connection_utils.py")
-        time.sleep(5)
+
+        wait_until(driver, lambda d: not (message_input.text or "").strip(), timeout=10, action="message_sent", raise_on_timeout=False)
         return True
 
     except Exception as e:
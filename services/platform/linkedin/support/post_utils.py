@@ -1,41 +1,43 @@
 import os
-import time
 
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 
 from services.support.logger_util import _log as log
+from services.support.wait_util import click, find_all, find_first, human_pause, navigate, timed, wait_until, wait_for_dom_settled
+
+START_POST_XPATH = "//button[contains(., 'Start a post')]"
+START_POST_SELECTORS = [
+    "button[aria-label*='Start a post'], button[aria-label*='Create a post']",
+    "button[data-test-id*='share'], button[data-test-id*='post']",
+    ".share-box button, .feed-shared-control button"
+]
+TEXT_EDITOR_SELECTOR = ".ql-editor[data-test-ql-editor-contenteditable='true'], [contenteditable='true'][aria-label*='Text editor']"
+
+def _find_start_post_button(driver, timeout: float):
+    found = find_first(driver, [START_POST_XPATH], by=By.XPATH, timeout=timeout, visible=True, action="find_start_post")
+    if found:
+        return found[0]
+    found = find_first(driver, START_POST_SELECTORS, timeout=0.5, visible=True, action="find_start_post_fallback")
+    return found[0] if found else None
 
 def create_linkedin_post(driver, text, media_urls=None, verbose=False, status=None):
     try:
         log("Looking for 'Start a post' button...", verbose, status, log_caller_file="post_utils.py")
 
-        post_buttons = driver.find_elements(By.XPATH, "//button[contains(., 'Start a post')]")
-        if not post_buttons:
-            post_buttons = driver.find_elements(By.CSS_SELECTOR, "button[aria-label*='Start a post'], button[aria-label*='Create a post']")
-        if not post_buttons:
-            post_buttons = driver.find_elements(By.CSS_SELECTOR, "button[data-test-id*='share'], button[data-test-id*='post']")
-        if not post_buttons:
-            post_buttons = driver.find_elements(By.CSS_SELECTOR, ".share-box button, .feed-shared-control button")
-
-        if post_buttons:
-            log(f"Found {len(post_buttons)} post button(s), clicking first one", verbose, status, log_caller_file="post_utils.py")
-            post_buttons[0].click()
-            time.sleep(3)
+        post_button = _find_start_post_button(driver, timeout=5)
+
+        if post_button:
+            log("Found post button, clicking it", verbose, status, log_caller_file="post_utils.py")
+            click(driver, post_button, action="click_start_post", verbose=verbose, status=status)
         else:
             log("Could not find post button on current page, refreshing and trying again", verbose, status, log_caller_file="post_utils.py")
-            driver.get("https://www.linkedin.com/feed/")
-            time.sleep(5)
+            navigate(driver, "https://www.linkedin.com/feed/", action="reload_feed")
 
-            post_buttons = driver.find_elements(By.XPATH, "//button[contains(., 'Start a post')]")
-            if not post_buttons:
-                post_buttons = driver.find_elements(By.CSS_SELECTOR, "button[aria-label*='Start a post']")
+            post_button = _find_start_post_button(driver, timeout=10)
 
-            if post_buttons:
-                log(f"Found {len(post_buttons)} post button(s) after refresh, clicking first one", verbose, status, log_caller_file="post_utils.py")
-                post_buttons[0].click()
-                time.sleep(3)
+            if post_button:
+                log("Found post button after refresh, clicking it", verbose, status, log_caller_file="post_utils.py")
+                click(driver, post_button, action="click_start_post", verbose=verbose, status=status)
             else:
                 log("Available buttons on page:", verbose, status, log_caller_file="post_utils.py")
                 all_buttons = driver.find_elements(By.TAG_NAME, "button")
@@ -49,24 +51,26 @@ def create_linkedin_post(driver, text, media_urls=None, verbose=False, status=No
                 raise Exception("Could not find post creation button")
 
         log("Looking for text editor...", verbose, status, log_caller_file="post_utils.py")
-        text_editor = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, ".ql-editor[data-test-ql-editor-contenteditable='true'], [contenteditable='true'][aria-label*='Text editor']"))
-        )
+        found = find_first(driver, [TEXT_EDITOR_SELECTOR], timeout=10, clickable=True, action="find_text_editor")
+        if not found:
+            raise Exception("Post text editor did not open")
+        text_editor = found[0]
 
         log("Clicking on text editor...", verbose, status, log_caller_file="post_utils.py")
-        text_editor.click()
-        time.sleep(2)
+        click(driver, text_editor, action="focus_text_editor", verbose=verbose, status=status)
+        human_pause(0.5, 1.5, action="before_typing")
 
         log(f"Setting text content using JavaScript: {text[:50]}...", verbose, status, log_caller_file="post_utils.py")
 
         try:
             safe_text = text.replace('"', '\\"').replace("'", "\\'").replace('\n', '</p><p>')
-            driver.execute_script(f"""
-                arguments[0].innerHTML = '<p>{safe_text}</p>';
-                arguments[0].focus();
-            """, text_editor)
+            with timed("enter_post_text", "act"):
+                driver.execute_script(f"""
+                    arguments[0].innerHTML = '<p>{safe_text}</p>';
+                    arguments[0].focus();
+                """, text_editor)
 
-            time.sleep(1)
+            wait_until(driver, lambda d: (d.execute_script("return arguments[0].textContent;", text_editor) or "").strip(), timeout=3, action="post_text_rendered", raise_on_timeout=False)
 
             entered_text = driver.execute_script("return arguments[0].textContent;", text_editor)
             log(f"Text editor content after input: {entered_text[:50] if entered_text else 'empty'}", verbose, status, log_caller_file="post_utils.py")
@@ -83,59 +87,50 @@ def create_linkedin_post(driver, text, media_urls=None, verbose=False, status=No
                 raise Exception(f"Could not input text: {e}")
 
         log("Post text entered successfully", verbose, status, log_caller_file="post_utils.py")
-        time.sleep(2)
-        time.sleep(2)
+        human_pause(1, 2, action="after_typing")
 
         if media_urls:
             log("Adding media to post...", verbose, status, log_caller_file="post_utils.py")
-            media_buttons = driver.find_elements(By.CSS_SELECTOR, "button[aria-label*='Add media'], button[aria-label*='Add a photo']")
+            found = find_first(driver, ["button[aria-label*='Add media'], button[aria-label*='Add a photo']"], timeout=3, action="find_add_media")
 
-            if media_buttons:
-                media_buttons[0].click()
-                time.sleep(2)
+            if found:
+                click(driver, found[0], action="click_add_media", verbose=verbose, status=status)
 
-                file_inputs = driver.find_elements(By.CSS_SELECTOR, "input[type='file']")
+                file_inputs = find_all(driver, ["input[type='file']"], timeout=5, action="find_file_input")
                 if file_inputs:
                     for media_url in media_urls:
                         if media_url.startswith('http'):
                             continue
 
                         if os.path.exists(media_url):
-                            file_inputs[0].send_keys(media_url)
-                            time.sleep(3)
+                            with timed("attach_media", "act"):
+                                file_inputs[0].send_keys(media_url)
+                            wait_for_dom_settled(driver, quiet_ms=750, timeout=10, action="media_upload_settled")
                             log(f"Added media: {media_url}", verbose, status, log_caller_file="post_utils.py")
                         else:
                             log(f"Media file not found: {media_url}", verbose, is_error=True, log_caller_file="post_utils.py")
 
-                    time.sleep(5)
-
-                    try:
-                        next_button = WebDriverWait(driver, 5).until(
-                            EC.element_to_be_clickable((By.CSS_SELECTOR, "button[aria-label='Next'], .share-box-footer__primary-btn"))
-                        )
-                        next_button.click()
+                    found = find_first(driver, ["button[aria-label='Next'], .share-box-footer__primary-btn"], timeout=10, clickable=True, action="find_media_next")
+                    if found:
+                        click(driver, found[0], action="click_media_next", verbose=verbose, status=status)
                         log("Clicked Next button after media upload", verbose, status, log_caller_file="post_utils.py")
-                        time.sleep(2)
-                    except Exception as e:
-                        log(f"Next button not found or not needed: {e}", verbose, status, log_caller_file="post_utils.py")
+                        wait_for_dom_settled(driver, timeout=5, action="media_next_settled")
+                    else:
+                        log("Next button not found or not needed", verbose, status, log_caller_file="post_utils.py")
                 else:
                     log("Could not find file input for media", verbose, is_error=True, log_caller_file="post_utils.py")
 
         log("Clicking post button...", verbose, status, log_caller_file="post_utils.py")
-        post_submit_buttons = driver.find_elements(By.CSS_SELECTOR, "button[aria-label*='Post'], button.share-actions__primary-action")
+        post_submit_buttons = find_all(driver, ["button[aria-label*='Post'], button.share-actions__primary-action"], timeout=5, action="find_submit_buttons")
 
         if post_submit_buttons:
-            post_button = None
-            for btn in post_submit_buttons:
-                if btn.is_enabled() and btn.is_displayed():
-                    post_button = btn
-                    break
+            found = find_first(driver, ["button[aria-label*='Post'], button.share-actions__primary-action"], timeout=5, clickable=True, action="wait_submit_enabled")
+            post_button = found[0] if found else None
 
             if post_button:
-                post_button.click()
-                time.sleep(5)
+                click(driver, post_button, action="click_submit_post", verbose=verbose, status=status)
 
-                success_indicators = driver.find_elements(By.CSS_SELECTOR, ".share-toast, [data-test-id*='success']")
+                success_indicators = find_all(driver, [".share-toast, [data-test-id*='success']"], timeout=10, action="post_confirmation")
                 if success_indicators:
                     log("Post published successfully", verbose, status, log_caller_file="post_utils.py")
                     return True
@@ -1,49 +1,59 @@
 import re
 import os
 import json
-import time
-import google.generativeai as genai
+import threading
 
 from bs4 import BeautifulSoup
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from profiles import PROFILES
 
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 
 from services.support.logger_util import _log as log
 from services.support.api_key_pool import APIKeyPool
 from services.support.web_driver_handler import setup_driver
+from services.support.wait_util import click, find_all, find_first, human_pause, log_interaction_summary, scroll_into_view, timed, wait_for_dom_settled, wait_for_scroll_growth
 from services.support.api_call_tracker import APICallTracker
+from services.support.example_index import select_examples
+from services.support.gemini_client import get_gemini_model
 from services.support.storage.storage_factory import get_storage
 from services.support.path_config import get_browser_data_dir, get_gemini_log_file_path, get_linkedin_profile_dir
 
 from services.platform.linkedin.support.scraper_utils import scrape_linkedin_feed_posts
 
+api_call_tracker = APICallTracker(log_file=get_gemini_log_file_path())
+
+def _build_reply_data(post: dict, index: int, generated_reply) -> dict:
+    return {
+        "post_id": post.get("data", {}).get("post_id", f"linkedin_{index}"),
+        "post_urn": post.get("data", {}).get("post_urn"),
+        "post_text": post.get("data", {}).get("text", ""),
+        "profile_url": post.get("data", {}).get("profile_url", ""),
+        "author_name": post.get("data", {}).get("author_name", ""),
+        "post_date": post.get("data", {}).get("post_date", ""),
+        "media_urls": post.get("data", {}).get("media_urls", []),
+        "engagement": post.get("engagement", {}),
+        "generated_reply": generated_reply,
+        "approved": False,
+        "posted": False,
+        "created_at": datetime.now().isoformat() + "Z"
+    }
+
+def _write_replies_file(replies_file: str, replies_data: list):
+    tmp_file = f"{replies_file}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(replies_data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_file, replies_file)
+
 def run_linkedin_reply_mode(profile_name: str, browser_profile_name: str, max_posts: int = 10, verbose: bool = False, headless: bool = True, status=None, browser_data_dir: str = None):
     user_data_dir = browser_data_dir or get_browser_data_dir(browser_profile_name)
     log(f"LinkedIn Mode: user_data_dir is {user_data_dir}", verbose, status, log_caller_file="reply_utils.py")
 
     try:
-        driver, setup_messages = setup_driver(user_data_dir, profile=browser_profile_name, verbose=verbose, status=status, headless=headless)
-        for msg in setup_messages:
-            log(msg, verbose, status, log_caller_file="reply_utils.py")
-
-        log("Scraping LinkedIn home feed posts...", verbose, status, log_caller_file="reply_utils.py")
-        feed_posts = scrape_linkedin_feed_posts(browser_profile_name, max_posts=max_posts, verbose=verbose, status=status, headless=headless, existing_driver=driver)
-
-        if not feed_posts:
-            log("No posts found in LinkedIn feed", verbose, is_error=True, log_caller_file="reply_utils.py")
-            driver.quit()
-            return None, []
-
-        log(f"Found {len(feed_posts)} posts, generating replies...", verbose, status, log_caller_file="reply_utils.py")
-
         api_key_pool = APIKeyPool(verbose=verbose)
         if api_key_pool.size() == 0:
             log("No API keys available for reply generation", verbose, is_error=True, log_caller_file="reply_utils.py")
-            driver.quit()
             return None, []
 
         storage = get_storage('linkedin', profile_name, 'action', verbose)
@@ -54,32 +64,48 @@ def run_linkedin_reply_mode(profile_name: str, browser_profile_name: str, max_po
         else:
             log("Warning: Could not initialize storage for approved replies context", verbose, status, log_caller_file="reply_utils.py")
 
-        replies_data = []
-        for i, post in enumerate(feed_posts):
-            generated_reply = generate_linkedin_reply(post, api_key_pool, profile_name, all_replies, verbose=verbose, status=status)
-
-            reply_data = {
-                "post_id": post.get("data", {}).get("post_id", f"linkedin_{i}"),
-                "post_urn": post.get("data", {}).get("post_urn"),
-                "post_text": post.get("data", {}).get("text", ""),
-                "profile_url": post.get("data", {}).get("profile_url", ""),
-                "author_name": post.get("data", {}).get("author_name", ""),
-                "post_date": post.get("data", {}).get("post_date", ""),
-                "media_urls": post.get("data", {}).get("media_urls", []),
-                "engagement": post.get("engagement", {}),
-                "generated_reply": generated_reply,
-                "approved": False,
-                "posted": False,
-                "created_at": datetime.now().isoformat() + "Z"
-            }
-            replies_data.append(reply_data)
+        driver, setup_messages = setup_driver(user_data_dir, profile=browser_profile_name, verbose=verbose, status=status, headless=headless)
+        for msg in setup_messages:
+            log(msg, verbose, status, log_caller_file="reply_utils.py")
 
         replies_file = os.path.join(get_linkedin_profile_dir(profile_name), "replies.json")
         os.makedirs(os.path.dirname(replies_file), exist_ok=True)
 
-        with open(replies_file, 'w', encoding='utf-8') as f:
-            json.dump(replies_data, f, indent=2, ensure_ascii=False)
+        replies_slots = []
+        replies_lock = threading.Lock()
+        futures = []
+
+        def generate(index: int, post: dict):
+            generated_reply = generate_linkedin_reply(post, api_key_pool, profile_name, all_replies, verbose=verbose, status=status)
+            with replies_lock:
+                replies_slots[index] = _build_reply_data(post, index, generated_reply)
+                _write_replies_file(replies_file, [reply for reply in replies_slots if reply])
+
+        workers = int(os.getenv("LINKEDIN_REPLY_WORKERS", "0")) or api_key_pool.size()
+        log("Scraping LinkedIn home feed posts and generating replies as they arrive...", verbose, status, log_caller_file="reply_utils.py")
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="linkedin-reply") as executor:
+            def on_post(post: dict):
+                with replies_lock:
+                    index = len(replies_slots)
+                    replies_slots.append(None)
+                futures.append(executor.submit(generate, index, post))
+
+            feed_posts = scrape_linkedin_feed_posts(browser_profile_name, max_posts=max_posts, verbose=verbose, status=status, headless=headless, existing_driver=driver, on_post=on_post)
+            if feed_posts:
+                log(f"Found {len(feed_posts)} posts, waiting for {len(futures)} replies across {max(1, workers)} workers...", verbose, status, log_caller_file="reply_utils.py")
+            for future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    log(f"Error generating LinkedIn reply: {e}", verbose, is_error=True, log_caller_file="reply_utils.py")
+
+        if not feed_posts:
+            log("No posts found in LinkedIn feed", verbose, is_error=True, log_caller_file="reply_utils.py")
+            driver.quit()
+            return None, []
 
+        replies_data = [reply for reply in replies_slots if reply]
+        _write_replies_file(replies_file, replies_data)
         return driver, replies_data
 
     except Exception as e:
@@ -135,34 +161,20 @@ def post_approved_linkedin_replies(driver, profile_name: str, verbose: bool = Fa
 
             log("Loading posts by scrolling down to expand feed...", verbose, status, log_caller_file="reply_utils.py")
 
-            scroll_element = None
-            try:
-                scroll_element = WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.ID, "workspace"))
-                )
-            except:
-                try:
-                    scroll_element = WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "main.scaffold-layout__main"))
-                    )
-                except:
-                    scroll_element = driver.find_element(By.TAG_NAME, "body")
+            found = find_first(driver, ["#workspace", "main.scaffold-layout__main", "body"], timeout=10, action="find_feed_container")
+            scroll_element = found[0] if found else None
 
             if scroll_element:
                 driver.execute_script("arguments[0].scrollTo(0, 0);", scroll_element)
-                time.sleep(2)
             else:
                 driver.execute_script("window.scrollTo(0, 0);")
-                time.sleep(2)
-
-            if scroll_element:
-                pass
+            wait_for_dom_settled(driver, timeout=5, action="feed_scrolled_top")
 
             for scroll_attempt in range(max_scrolls):
                 if found_post:
                     break
 
-                posts = driver.find_elements(By.CSS_SELECTOR, "[data-view-name=\"feed-full-update\"]")
+                posts = find_all(driver, ["[data-view-name=\"feed-full-update\"]"], timeout=5, action="find_feed_posts")
                 log(f"Checking {len(posts)} posts in current view for URN {post_urn}", verbose, status, log_caller_file="reply_utils.py")
 
                 for post in posts:
@@ -194,12 +206,12 @@ def post_approved_linkedin_replies(driver, profile_name: str, verbose: bool = Fa
                         if current_urn == post_urn:
                             log(f"Found matching post by URN, attempting to comment", verbose, status, log_caller_file="reply_utils.py")
 
-                            driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", post)
-                            time.sleep(2)
+                            scroll_into_view(driver, post)
+                            human_pause(0.5, 1.5, action="before_comment_click")
 
                             comment_button = post.find_element(By.CSS_SELECTOR, "button[data-view-name='feed-comment-button']")
-                            comment_button.click()
-                            time.sleep(6)  # Increased wait time for comment box to appear
+                            click(driver, comment_button, action="click_comment_button", verbose=verbose, status=status)
+                            find_first(driver, ["[data-view-name=\"comment-box\"] [contenteditable=\"true\"]", ".comments-comment-box [contenteditable=\"true\"]", ".comment-box [contenteditable=\"true\"]"], timeout=10, visible=True, action="comment_box_open")
 
                             log(f"Clicked comment button, looking for comment input", verbose, status, log_caller_file="reply_utils.py")
 
@@ -247,36 +259,37 @@ def post_approved_linkedin_replies(driver, profile_name: str, verbose: bool = Fa
                                     raise Exception("No comment inputs found in comment containers")
 
                             except Exception as e:
-                                try:
-                                    comment_input = WebDriverWait(driver, 15).until(
-                                        lambda d: d.find_element(By.CSS_SELECTOR, "[data-view-name=\"comment-box\"] [contenteditable=\"true\"]")
-                                    )
-                                except Exception as e2:
-                                    log(f"Failed to find comment input with direct fallback: {e2}", verbose, is_error=True, log_caller_file="reply_utils.py")
+                                found = find_first(driver, ["[data-view-name=\"comment-box\"] [contenteditable=\"true\"]"], timeout=15, action="find_comment_input_fallback")
+                                if not found:
+                                    log(f"Failed to find comment input with direct fallback: {e}", verbose, is_error=True, log_caller_file="reply_utils.py")
                                     continue
+                                comment_input = found[0]
 
                             safe_text = reply_text.replace('"', '\\"').replace("'", "\\'").replace('\n', '</p><p>')
-                            driver.execute_script(f"""
-                                arguments[0].innerHTML = '<p>{safe_text}</p>';
-                                arguments[0].focus();
-                            """, comment_input)
-
-                            time.sleep(4)
+                            with timed("enter_comment_text", "act"):
+                                driver.execute_script(f"""
+                                    arguments[0].innerHTML = '<p>{safe_text}</p>';
+                                    arguments[0].focus();
+                                """, comment_input)
+                            human_pause(1, 2, action="after_typing")
 
 
                             try:
                                 comment_container = comment_input.find_element(By.XPATH, "ancestor::*[contains(@data-view-name, 'comment') or contains(@class, 'comments-comment-box') or contains(@class, 'comment-box')][1]")
 
-                                submit_button = WebDriverWait(comment_container, 15).until(
-                                    lambda c: c.find_element(By.CSS_SELECTOR, "button[data-view-name=\"comment-post\"]") or
-                                              c.find_element(By.CSS_SELECTOR, "button[data-test-id=\"comment-submit\"]") or
-                                              c.find_element(By.CSS_SELECTOR, ".comments-comment-box__submit-button") or
-                                              c.find_element(By.CSS_SELECTOR, "button[type=\"submit\"]") or
-                                              c.find_element(By.CSS_SELECTOR, "button[data-view-name=\"comment-submit\"]") or
-                                              c.find_element(By.CSS_SELECTOR, "button[aria-label=\"Post comment\"]") or
-                                              c.find_element(By.CSS_SELECTOR, "button[aria-label=\"Post\"]") or
-                                              c.find_element(By.CSS_SELECTOR, "button:last-child")
-                                )
+                                found = find_first(comment_container, [
+                                    "button[data-view-name=\"comment-post\"]",
+                                    "button[data-test-id=\"comment-submit\"]",
+                                    ".comments-comment-box__submit-button",
+                                    "button[type=\"submit\"]",
+                                    "button[data-view-name=\"comment-submit\"]",
+                                    "button[aria-label=\"Post comment\"]",
+                                    "button[aria-label=\"Post\"]",
+                                    "button:last-child"
+                                ], timeout=15, clickable=True, action="find_comment_submit")
+                                if not found:
+                                    raise Exception("Comment submit button did not become clickable")
+                                submit_button = found[0]
                             except Exception as e:
                                 try:
                                     all_submit_buttons = driver.find_elements(By.CSS_SELECTOR, "button[data-view-name=\"comment-post\"], button[data-test-id=\"comment-submit\"], .comments-comment-box__submit-button, button[type=\"submit\"], button[aria-label=\"Post comment\"], button[aria-label=\"Post\"]")
@@ -306,8 +319,8 @@ def post_approved_linkedin_replies(driver, profile_name: str, verbose: bool = Fa
                                 except Exception as e2:
                                     log(f"Failed to find submit button with any method: {e2}", verbose, is_error=True, log_caller_file="reply_utils.py")
                                     continue
-                            submit_button.click()
-                            time.sleep(6)
+                            click(driver, submit_button, action="click_comment_submit", verbose=verbose, status=status)
+                            wait_for_dom_settled(driver, quiet_ms=750, timeout=10, action="comment_posted")
 
                             reply_data["posted"] = True
                             reply_data["posted_at"] = datetime.now().isoformat() + "Z"
@@ -321,8 +334,10 @@ def post_approved_linkedin_replies(driver, profile_name: str, verbose: bool = Fa
 
                 if not found_post and scroll_attempt < max_scrolls - 1:
                     log(f"Post not found, scrolling down very slowly (attempt {scroll_attempt + 1}/{max_scrolls})", verbose, status, log_caller_file="reply_utils.py")
+                    previous_height = driver.execute_script("return document.body.scrollHeight")
                     driver.execute_script("window.scrollBy(0, 300);")
-                    time.sleep(8)
+                    wait_for_scroll_growth(driver, previous_height, timeout=8, action="feed_scroll_load")
+                    human_pause(0.5, 1.5, action="feed_scroll")
 
             if not found_post:
                 log(f"Could not find matching post for reply {reply_data['post_id']}", verbose, is_error=True, log_caller_file="reply_utils.py")
@@ -341,12 +356,11 @@ def post_approved_linkedin_replies(driver, profile_name: str, verbose: bool = Fa
     with open(replies_file, 'w', encoding='utf-8') as f:
         json.dump(replies_data, f, indent=2, ensure_ascii=False, default=serialize_datetime)
 
+    log_interaction_summary(verbose, status)
     return {"processed": processed, "posted": posted, "failed": failed}
 
 
 def generate_linkedin_reply(post_data, api_key_pool, profile_name, all_replies=None, verbose=False, status=None):
-    api_call_tracker = APICallTracker(log_file=get_gemini_log_file_path())
-
     try:
         post_text = post_data.get("data", {}).get("text", "")
         if not post_text:
@@ -372,12 +386,12 @@ def generate_linkedin_reply(post_data, api_key_pool, profile_name, all_replies=N
             log(f"Rate limit: {reason}", verbose, is_error=True, log_caller_file="reply_utils.py")
             return None
 
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel(model_name)
+        model = get_gemini_model(api_key, model_name)
 
         context_section = ""
         if all_replies:
-            context_replies = "\n".join([f"- {reply.get('generated_reply', '')}" for reply in all_replies if reply.get('generated_reply')])
+            examples = [(reply.get('post_text') or reply['generated_reply'], reply['generated_reply']) for reply in all_replies if reply.get('generated_reply')]
+            context_replies = "\n".join(f"- {generated_reply}" for _, generated_reply in select_examples(profile_name, "linkedin", post_text, examples, verbose, status))
             if context_replies:
                 context_section = f"""
                 Previously approved/posted replies for context (avoid generating similar responses):
@@ -402,4 +416,6 @@ def generate_linkedin_reply(post_data, api_key_pool, profile_name, all_replies=N
     except Exception as e:
         log(f"Error generating reply: {e}", verbose, is_error=True, log_caller_file="reply_utils.py")
         api_call_tracker.record_call("gemini", "generate_content", model=model_name, api_key_suffix=api_key[-4:] if 'api_key' in locals() else "unknown", success=False)
+        if 'api_key' in locals() and api_key:
+            api_key_pool.report_failure(api_key, e)
         return None
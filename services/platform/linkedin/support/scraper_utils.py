@@ -3,7 +3,7 @@ import re
 import time
 
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List, Optional
 
 from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
@@ -82,8 +82,7 @@ def scrape_linkedin_profiles(linkedin_target_profiles: List[str], profile_name:
 
     return all_posts
 
-def scrape_linkedin_feed_posts(profile_name: str, max_posts: int = 10, headless: bool = True, status=None, verbose: bool = False, existing_driver=None) -> List[Dict[str, Any]]:
-    all_posts = []
+def scrape_linkedin_feed_posts(profile_name: str, max_posts: int = 10, headless: bool = True, status=None, verbose: bool = False, existing_driver=None, on_post: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
     processed_posts = []
     driver = existing_driver
 
@@ -161,7 +160,6 @@ def scrape_linkedin_feed_posts(profile_name: str, max_posts: int = 10, headless:
                         with open(html_file, 'w', encoding='utf-8') as f:
                             f.write(html_content)
 
-                        all_posts.append({"html_file": html_file, "post_id": post_id})
                         posts_scraped += 1
                         new_posts_found = True
                         log(f"Saved HTML for post {posts_scraped}/{max_posts}: {html_file}", verbose, status=status, log_caller_file="scraper_utils.py")
@@ -169,6 +167,17 @@ def scrape_linkedin_feed_posts(profile_name: str, max_posts: int = 10, headless:
                         log(f"Error saving post HTML: {e}", verbose, is_error=True, log_caller_file="scraper_utils.py")
                         continue
 
+                    # Posts are parsed as they are saved so on_post consumers can start before scrolling finishes
+                    try:
+                        post_data = extract_post_data_from_html(html_content)
+                    except Exception as e:
+                        log(f"Error processing HTML file {html_file}: {e}", verbose, is_error=True, log_caller_file="scraper_utils.py")
+                        continue
+                    if post_data:
+                        processed_posts.append(post_data)
+                        if on_post:
+                            on_post(post_data)
+
                 if posts_scraped >= max_posts:
                     break
 
@@ -181,25 +190,7 @@ def scrape_linkedin_feed_posts(profile_name: str, max_posts: int = 10, headless:
                 log(f"Error during scrolling: {e}", verbose, is_error=True, log_caller_file="scraper_utils.py")
                 break
 
-        log(f"Scraped {len(all_posts)} LinkedIn feed posts", verbose, status=status, log_caller_file="scraper_utils.py")
-
-        log("Processing saved HTML files...", verbose, status=status, log_caller_file="scraper_utils.py")
-        processed_posts = []
-        for post_info in all_posts:
-            try:
-                html_file = post_info["html_file"]
-                with open(html_file, 'r', encoding='utf-8') as f:
-                    html_content = f.read()
-
-                post_data = extract_post_data_from_html(html_content)
-                if post_data:
-                    processed_posts.append(post_data)
-                    log(f"Processed post from {os.path.basename(html_file)}", verbose, status=status, log_caller_file="scraper_utils.py")
-
-            except Exception as e:
-                log(f"Error processing HTML file {post_info.get('html_file', 'unknown')}: {e}", verbose, is_error=True, log_caller_file="scraper_utils.py")
-                continue
-
+        log(f"Scraped {posts_scraped} LinkedIn feed posts", verbose, status=status, log_caller_file="scraper_utils.py")
         log(f"Successfully processed {len(processed_posts)} posts from HTML", verbose, status=status, log_caller_file="scraper_utils.py")
 
 
@@ -14,6 +14,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from services.support.logger_util import _log as log
 from services.support.storage.storage_factory import get_storage
+from services.support.dataset_store import read_dataset, resolve_dataset_path
 from services.support.path_config import initialize_directories, get_product_hunt_output_file_path
 
 from services.platform.producthunt.support.scraper_utils import scrape_product_hunt_products
@@ -54,13 +55,11 @@ def main():
 
     scraped_products = []
 
-    target_file_path = get_product_hunt_output_file_path(profile_name, target_date_for_scrape.strftime("%Y%m%d"))
-    if os.path.exists(target_file_path):
+    target_file_path = resolve_dataset_path(get_product_hunt_output_file_path(profile_name, target_date_for_scrape.strftime("%Y%m%d")))
+    if target_file_path:
         log(f"Found existing Product Hunt data for {target_date_for_scrape.strftime('%Y-%m-%d')} at {target_file_path}", verbose, log_caller_file="scraper.py")
         try:
-            import json
-            with open(target_file_path, 'r', encoding='utf-8') as f:
-                scraped_products = json.load(f)
+            scraped_products = list(read_dataset(target_file_path))
             log(f"Loaded {len(scraped_products)} existing products from file.", verbose, log_caller_file="scraper.py")
         except Exception as e:
             log(f"Error loading existing data for {target_date_for_scrape.strftime('%Y-%m-%d')}: {e}. Will scrape fresh data.", verbose, is_error=True, log_caller_file="scraper.py")
@@ -1,5 +1,3 @@
-import os
-import json
 import time
 import uuid
 import undetected_chromedriver as uc
@@ -18,7 +16,9 @@ from selenium.webdriver.support import expected_conditions as EC
 
 from services.support.logger_util import _log as log
 from services.support.web_driver_handler import cleanup_chrome_locks, kill_chrome_processes_by_user_data_dir
-from services.support.path_config import get_product_hunt_output_file_path, get_browser_data_dir, ensure_dir_exists
+from services.support.dataset_store import write_dataset
+from services.support.seen_index import get_seen_index, log_seen_index_stats
+from services.support.path_config import get_product_hunt_output_file_path, get_browser_data_dir, ensure_dir_exists, register_artifact
 
 console = Console()
 
@@ -208,6 +208,11 @@ def scrape_product_hunt_products(profile_name: str, verbose: bool = False, statu
             return []
 
         products_to_scrape = leaderboard_products[:limit] if limit is not None else leaderboard_products
+        seen_index = get_seen_index(profile_name, verbose)
+        already_seen = seen_index.contains_many("producthunt", "scraped", [product['product_link'] for product in products_to_scrape if product['product_link'] != "N/A"])
+        if already_seen:
+            log(f"Skipping {len(already_seen)} products already scraped in earlier runs", verbose, status=status, log_caller_file="scraper_utils.py")
+            products_to_scrape = [product for product in products_to_scrape if product['product_link'] not in already_seen]
 
         for product_item in products_to_scrape:
             time.sleep(20)
@@ -215,14 +220,16 @@ def scrape_product_hunt_products(profile_name: str, verbose: bool = False, statu
             if detailed_product_data:
                 formatted_data = _format_product_data(detailed_product_data)
                 all_formatted_products.append(formatted_data)
+                if "founders_data" in detailed_product_data:
+                    seen_index.mark_many("producthunt", "scraped", [product_item['product_link']])
                 log(f"Successfully scraped and formatted product information for {formatted_data['core']['name']}.", verbose, status=status, log_caller_file="scraper_utils.py")
 
         output_file_path = get_product_hunt_output_file_path(profile_name, yesterday.strftime("%Y%m%d"))
-        ensure_dir_exists(os.path.dirname(output_file_path))
-        with open(output_file_path, 'w', encoding='utf-8') as f:
-            json.dump(all_formatted_products, f, indent=2, ensure_ascii=False)
+        write_dataset(output_file_path, all_formatted_products, metadata={"profile_name": profile_name, "date": yesterday.strftime("%Y-%m-%d")}, numeric_fields=("data.upvotes_count",), verbose=verbose)
+        register_artifact(output_file_path, profile_name, "producthunt", "raw", len(all_formatted_products))
 
         log(f"Scraped and saved {len(all_formatted_products)} products to {output_file_path}", verbose, status=status, log_caller_file="scraper_utils.py")
+        log_seen_index_stats(verbose, status)
 
         return all_formatted_products
 
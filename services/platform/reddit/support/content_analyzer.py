@@ -1,5 +1,4 @@
 import os
-import json
 
 from profiles import PROFILES
 
@@ -12,9 +11,8 @@ from services.support.api_key_pool import APIKeyPool
 from services.support.rate_limiter import RateLimiter
 from services.support.gemini_util import generate_gemini
 from services.support.api_call_tracker import APICallTracker
-from services.support.path_config import get_reddit_analysis_dir, ensure_dir_exists
-
-from services.platform.reddit.support.file_manager import get_latest_dated_json_file
+from services.support.dataset_store import read_dataset, get_field
+from services.support.path_config import get_reddit_analysis_dir, ensure_dir_exists, get_latest_artifact
 
 console = Console()
 
@@ -36,30 +34,28 @@ def analyze_reddit_content_with_gemini(profile_name: str, api_key: Optional[str]
     reddit_config = platform_props.get("reddit", {})
     prompts = profile_config.get("prompts", {})
     reddit_user_prompt = prompts.get("reddit_user_prompt", "Analyze these Reddit trends and suggest 5-10 content ideas for my [Your Channel Niche] channel focusing on engaging topics and unanswered questions from the discussions.")
-    latest_scraped_data_path = get_latest_dated_json_file(profile_name, "reddit_scraped_data", verbose=verbose)
+    latest_scraped_data_path = get_latest_artifact(profile_name, "reddit", "raw")
 
     if not latest_scraped_data_path:
         log(f"No latest scraped Reddit data found for profile '{profile_name}'. Please run Reddit scraper first.", verbose, is_error=True, status=status, log_caller_file="content_analyzer.py")
         return None
 
+    reddit_data_for_prompt = []
     try:
-        with open(latest_scraped_data_path, 'r', encoding='utf-8') as f:
-            scraped_reddit_data = json.load(f)
+        for post in read_dataset(latest_scraped_data_path, fields=['data.title', 'data.subreddit', 'data.content', 'data.comments', 'engagement.score', 'engagement.num_comments']):
+            post_info = f"Title: {get_field(post, 'data.title') or 'N/A'}\nSubreddit: {get_field(post, 'data.subreddit') or 'N/A'}\nScore: {get_field(post, 'engagement.score') or 0}\nComments: {get_field(post, 'engagement.num_comments') or 0}\nContent: {get_field(post, 'data.content') or 'N/A'}"
+            comments = get_field(post, 'data.comments')
+            if comments:
+                comments_str = "\n".join([f"  - {c.get('body', '')[:100]}..." for c in comments[:3]])
+                post_info += f"\nTop Comments:\n{comments_str}"
+            reddit_data_for_prompt.append(post_info)
     except Exception as e:
         log(f"Error loading scraped Reddit data from {latest_scraped_data_path}: {e}", verbose, is_error=True, status=status, log_caller_file="content_analyzer.py")
         return None
 
-    if not scraped_reddit_data:
+    if not reddit_data_for_prompt:
         log("No Reddit data found in the latest scraped file. Cannot generate content suggestions.", verbose, status=status, log_caller_file="content_analyzer.py")
         return None
-
-    reddit_data_for_prompt = []
-    for post in scraped_reddit_data:
-        post_info = f"Title: {post.get('title', 'N/A')}\nSubreddit: {post.get('subreddit', 'N/A')}\nScore: {post.get('score', 0)}\nComments: {post.get('num_comments', 0)}\nContent: {post.get('content', 'N/A')}"
-        if post.get("comments"):
-            comments_str = "\n".join([f"  - {c.get('body', '')[:100]}..." for c in post["comments"][:3]])
-            post_info += f"\nTop Comments:\n{comments_str}"
-        reddit_data_for_prompt.append(post_info)
     
     full_prompt = f"{reddit_user_prompt}\n\nScraped Reddit Data:\n\n{'--'*50}\n{'''\n'''.join(reddit_data_for_prompt)}\n{'--'*50}"
 
@@ -0,0 +1,100 @@
+import threading
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from services.support.logger_util import _log as log
+
+from services.platform.reddit.support.data_formatter import format_reddit_post
+from services.platform.reddit.support.reddit_cache import log_reddit_cache_stats
+from services.platform.reddit.support.reddit_api_utils import REDDIT_LISTINGS, initialize_praw, fetch_listing, select_time_filter_posts, get_post_comments
+
+ListingKey = Tuple[str, str, Optional[str]]
+
+class RedditIngestion:
+    def __init__(self, profile_name: str, workers: int = 4, verbose: bool = False, status=None):
+        self.profile_name = profile_name
+        self.verbose = verbose
+        self.status = status
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="reddit-ingest")
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.listings: Dict[ListingKey, Future] = {}
+        self.comments: Dict[str, Future] = {}
+        self.stats = {"listings": 0, "listings_reused": 0, "comments": 0, "comments_reused": 0}
+
+    # PRAW instances are not thread-safe, so every worker thread gets its own
+    def _reddit(self):
+        reddit = getattr(self.local, "reddit", None)
+        if reddit is None:
+            reddit = self.local.reddit = initialize_praw(self.profile_name, verbose=self.verbose)
+        return reddit
+
+    def _fetch_listing(self, subreddit_name: str, listing: str, listing_time_filter: Optional[str], method_name: str, limit: int) -> List[Dict[str, Any]]:
+        return fetch_listing(self.profile_name, self._reddit(), subreddit_name, listing, listing_time_filter, method_name, limit, verbose=self.verbose)
+
+    def _fetch_comments(self, post_id: str, num_comments: Optional[int]) -> List[Dict[str, Any]]:
+        return get_post_comments(self.profile_name, self._reddit(), post_id, verbose=self.verbose, num_comments=num_comments)
+
+    def listing(self, subreddit_name: str, time_filter: str, limit: int) -> Future:
+        listing, listing_time_filter, method_name = REDDIT_LISTINGS[time_filter]
+        key = (subreddit_name.lower(), listing, listing_time_filter)
+        with self.lock:
+            future = self.listings.get(key)
+            if future is None:
+                future = self.listings[key] = self.executor.submit(self._fetch_listing, subreddit_name, listing, listing_time_filter, method_name, limit)
+                self.stats["listings"] += 1
+            else:
+                self.stats["listings_reused"] += 1
+            return future
+
+    def post_comments(self, post: Dict[str, Any], count_reuse: bool = True) -> Future:
+        post_id = post["id"]
+        with self.lock:
+            future = self.comments.get(post_id)
+            if future is None:
+                future = self.comments[post_id] = self.executor.submit(self._fetch_comments, post_id, post.get("num_comments"))
+                self.stats["comments"] += 1
+            elif count_reuse:
+                self.stats["comments_reused"] += 1
+            return future
+
+    def _select(self, posts: List[Dict[str, Any]], time_filter: str, min_comments: int) -> List[Dict[str, Any]]:
+        return [post for post in select_time_filter_posts(posts, time_filter) if post.get("num_comments", 0) >= min_comments]
+
+    def ingest(self, subreddits: List[str], time_filters: List[str], limit: int, min_comments: int = 0, include_comments: bool = False) -> Iterator[Dict[str, Any]]:
+        jobs = []
+        for subreddit_name in subreddits:
+            for time_filter in time_filters:
+                if time_filter not in REDDIT_LISTINGS:
+                    log(f"Unsupported time filter: {time_filter}", self.verbose, is_error=True, status=self.status, log_caller_file="ingestion_engine.py")
+                    continue
+                future = self.listing(subreddit_name, time_filter, limit)
+                if include_comments:
+                    # Comment trees are queued as soon as their listing lands instead of after earlier listings are consumed
+                    future.add_done_callback(lambda done, time_filter=time_filter: [self.post_comments(post) for post in self._select(done.result(), time_filter, min_comments)])
+                jobs.append((subreddit_name, time_filter, future))
+
+        for subreddit_name, time_filter, future in jobs:
+            if self.status:
+                self.status.update(f"[white]Scraping r/{subreddit_name} ({time_filter} posts)...[/white]")
+            posts = self._select(future.result(), time_filter, min_comments)
+            log(f"Found {len(posts)} posts from r/{subreddit_name} ({time_filter}) with >= {min_comments} comments.", self.verbose, status=self.status, log_caller_file="ingestion_engine.py")
+            for post in posts:
+                if include_comments:
+                    yield format_reddit_post(post, time_filter, include_comments, self.post_comments(post, count_reuse=False).result())
+                else:
+                    yield format_reddit_post(post, time_filter, include_comments)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        with self.lock:
+            stats = dict(self.stats)
+        log(f"Reddit ingestion: {stats['listings']} listings fetched ({stats['listings_reused']} shared between time filters), {stats['comments']} comment trees fetched ({stats['comments_reused']} reused)", self.verbose, status=self.status, log_caller_file="ingestion_engine.py")
+        log_reddit_cache_stats(self.verbose, self.status)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,10 +1,11 @@
 import os
 import time
 import praw
+import threading
 
 from dotenv import load_dotenv
 from rich.console import Console
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 
 from services.support.logger_util import _log as log
@@ -12,17 +13,32 @@ from services.support.rate_limiter import RateLimiter
 from services.support.api_call_tracker import APICallTracker
 from services.support.path_config import get_reddit_log_file_path
 
+from services.platform.reddit.support.reddit_cache import get_reddit_cache
+
 console = Console()
 
+# time filter -> (listing, listing time filter, tracked method); day and yesterday share one top/day listing
+REDDIT_LISTINGS: Dict[str, Tuple[str, Optional[str], str]] = {
+    "hot": ("hot", None, "subreddit_hot"),
+    "new": ("new", None, "subreddit_new"),
+    "top": ("top", "all", "subreddit_top"),
+    "rising": ("rising", None, "subreddit_rising"),
+    "week": ("top", "week", "subreddit_week"),
+    "day": ("top", "day", "subreddit_day"),
+    "yesterday": ("top", "day", "subreddit_top_day")
+}
+
 _api_call_tracker_instances: Dict[str, APICallTracker] = {}
 _rate_limiter_instances: Dict[str, RateLimiter] = {}
+_trackers_lock = threading.Lock()
 
 def _get_api_trackers(profile_name: str):
-    if profile_name not in _api_call_tracker_instances:
-        _api_call_tracker_instances[profile_name] = APICallTracker(log_file=get_reddit_log_file_path(profile_name))
-    if profile_name not in _rate_limiter_instances:
-        _rate_limiter_instances[profile_name] = RateLimiter(rpm_limit=60)
-    return _api_call_tracker_instances[profile_name], _rate_limiter_instances[profile_name]
+    with _trackers_lock:
+        if profile_name not in _api_call_tracker_instances:
+            _api_call_tracker_instances[profile_name] = APICallTracker(log_file=get_reddit_log_file_path(profile_name))
+        if profile_name not in _rate_limiter_instances:
+            _rate_limiter_instances[profile_name] = RateLimiter(rpm_limit=int(os.getenv("REDDIT_RPM_LIMIT", "60")))
+        return _api_call_tracker_instances[profile_name], _rate_limiter_instances[profile_name]
 
 def initialize_praw(profile_name: str, verbose: bool = False):
     load_dotenv()
@@ -70,86 +86,93 @@ def _handle_rate_limit(profile_name: str, method_name: str, status=None, verbose
         sleep_time = rate_limiter.wait_if_needed(api_key_suffix)
         if sleep_time > 0:
             time.sleep(sleep_time)
-
-def get_subreddit_posts(profile_name: str, reddit_instance: praw.Reddit, subreddit_name: str, time_filter: str = "all", limit: int = 100, status=None, verbose: bool = False) -> List[Dict[str, Any]]:
+    rate_limiter.wait_if_needed(api_key_suffix)
+
+def _post_to_dict(post) -> Dict[str, Any]:
+    return {
+        "id": post.id,
+        "title": post.title,
+        "url": post.url,
+        "author": str(post.author) if post.author else "[deleted]",
+        "score": post.score,
+        "upvote_ratio": post.upvote_ratio,
+        "num_comments": post.num_comments,
+        "created_utc": post.created_utc,
+        "selftext": post.selftext,
+        "is_video": post.is_video,
+        "link_flair_text": post.link_flair_text if post.link_flair_text else "",
+        "total_awards_received": post.total_awards_received,
+        "subreddit": post.subreddit.display_name
+    }
+
+def fetch_listing(profile_name: str, reddit_instance: praw.Reddit, subreddit_name: str, listing: str, listing_time_filter: Optional[str], method_name: str, limit: int = 100, status=None, verbose: bool = False) -> List[Dict[str, Any]]:
     api_key_suffix = os.getenv("REDDIT_CLIENT_ID")[-4:] if os.getenv("REDDIT_CLIENT_ID") else "N/A"
     if not reddit_instance:
         log("Reddit API not initialized.", verbose, is_error=True, status=status, log_caller_file="reddit_api_utils.py")
         return []
-    
+
+    label = f"{listing}/{listing_time_filter}" if listing_time_filter else listing
+    cache = get_reddit_cache(verbose=verbose)
+    cached = cache.get_listing(subreddit_name, listing, listing_time_filter, limit)
+    if cached is not None:
+        log(f"Using cached {label} posts from r/{subreddit_name} ({len(cached)} posts).", verbose, status=status, log_caller_file="reddit_api_utils.py")
+        return cached
+
     posts_data = []
     api_call_tracker, rate_limiter = _get_api_trackers(profile_name)
     try:
         subreddit = reddit_instance.subreddit(subreddit_name)
-        method_name = f"subreddit_{time_filter}"
-        
-        log(f"Fetching {time_filter} posts from r/{subreddit_name}...", verbose, status=status, log_caller_file="reddit_api_utils.py")
+
+        log(f"Fetching {label} posts from r/{subreddit_name}...", verbose, status=status, log_caller_file="reddit_api_utils.py")
         _handle_rate_limit(profile_name, method_name, status, verbose)
 
-        posts = []
-        if time_filter == "hot":
-            posts = subreddit.hot(limit=limit)
-        elif time_filter == "new":
-            posts = subreddit.new(limit=limit)
-        elif time_filter == "top":
-            posts = subreddit.top(time_filter="all", limit=limit)
-        elif time_filter == "rising":
-            posts = subreddit.rising(limit=limit)
-        elif time_filter == "week":
-            posts = subreddit.top(time_filter="week", limit=limit)
-        elif time_filter == "day":
-            posts = subreddit.top(time_filter="day", limit=limit)
-        elif time_filter == "yesterday":
-            method_name = "subreddit_top_day"
-            _handle_rate_limit(profile_name, method_name, status, verbose)
-
-            today = datetime.now()
-            yesterday = today - timedelta(days=1)
-            yesterday_start = datetime(yesterday.year, yesterday.month, yesterday.day, 0, 0, 0)
-            yesterday_end = datetime(yesterday.year, yesterday.month, yesterday.day, 23, 59, 59)
-
-            log(f"Fetching 'day' posts for custom 'yesterday' filter from r/{subreddit_name}...", verbose, status=status, log_caller_file="reddit_api_utils.py")
-            all_day_posts = subreddit.top(time_filter="day", limit=limit)
-            filtered_posts = []
-            for post in all_day_posts:
-                post_utc_dt = datetime.fromtimestamp(post.created_utc)
-                if yesterday_start <= post_utc_dt <= yesterday_end:
-                    filtered_posts.append(post)
-            posts = filtered_posts
-            log(f"Filtered {len(posts)} posts for 'yesterday' from r/{subreddit_name}.", verbose, status=status, log_caller_file="reddit_api_utils.py")
+        if listing_time_filter:
+            posts = getattr(subreddit, listing)(time_filter=listing_time_filter, limit=limit)
         else:
-            log(f"Unsupported time filter: {time_filter}", verbose, is_error=True, status=status, log_caller_file="reddit_api_utils.py")
-            return []
+            posts = getattr(subreddit, listing)(limit=limit)
 
         for post in posts:
-            posts_data.append({
-                "id": post.id,
-                "title": post.title,
-                "url": post.url,
-                "author": str(post.author) if post.author else "[deleted]",
-                "score": post.score,
-                "upvote_ratio": post.upvote_ratio,
-                "num_comments": post.num_comments,
-                "created_utc": post.created_utc,
-                "selftext": post.selftext,
-                "is_video": post.is_video,
-                "link_flair_text": post.link_flair_text if post.link_flair_text else "",
-                "total_awards_received": post.total_awards_received,
-                "subreddit": post.subreddit.display_name
-            })
+            posts_data.append(_post_to_dict(post))
         api_call_tracker.record_call("reddit", method_name, api_key_suffix=api_key_suffix, success=True)
-        log(f"Fetched {len(posts_data)} {time_filter} posts from r/{subreddit_name}.", verbose, status=status, log_caller_file="reddit_api_utils.py")
+        cache.put_listing(subreddit_name, listing, listing_time_filter, limit, posts_data)
+        log(f"Fetched {len(posts_data)} {label} posts from r/{subreddit_name}.", verbose, status=status, log_caller_file="reddit_api_utils.py")
     except Exception as e:
         api_call_tracker.record_call("reddit", method_name, api_key_suffix=api_key_suffix, success=False, response=str(e))
-        log(f"Error fetching posts from r/{subreddit_name} with filter {time_filter}: {e}", verbose, is_error=True, status=status, log_caller_file="reddit_api_utils.py")
+        log(f"Error fetching {listing} posts from r/{subreddit_name}: {e}", verbose, is_error=True, status=status, log_caller_file="reddit_api_utils.py")
     return posts_data
 
-def get_post_comments(profile_name: str, reddit_instance: praw.Reddit, post_id: str, limit: int = 25, status=None, verbose: bool = False) -> List[Dict[str, Any]]:
+def select_time_filter_posts(posts: List[Dict[str, Any]], time_filter: str) -> List[Dict[str, Any]]:
+    if time_filter != "yesterday":
+        return posts
+
+    yesterday = datetime.now() - timedelta(days=1)
+    yesterday_start = datetime(yesterday.year, yesterday.month, yesterday.day, 0, 0, 0)
+    yesterday_end = datetime(yesterday.year, yesterday.month, yesterday.day, 23, 59, 59)
+    return [post for post in posts if yesterday_start <= datetime.fromtimestamp(post["created_utc"]) <= yesterday_end]
+
+def get_subreddit_posts(profile_name: str, reddit_instance: praw.Reddit, subreddit_name: str, time_filter: str = "all", limit: int = 100, status=None, verbose: bool = False) -> List[Dict[str, Any]]:
+    if time_filter not in REDDIT_LISTINGS:
+        log(f"Unsupported time filter: {time_filter}", verbose, is_error=True, status=status, log_caller_file="reddit_api_utils.py")
+        return []
+
+    listing, listing_time_filter, method_name = REDDIT_LISTINGS[time_filter]
+    posts = select_time_filter_posts(fetch_listing(profile_name, reddit_instance, subreddit_name, listing, listing_time_filter, method_name, limit, status, verbose), time_filter)
+    if time_filter == "yesterday":
+        log(f"Filtered {len(posts)} posts for 'yesterday' from r/{subreddit_name}.", verbose, status=status, log_caller_file="reddit_api_utils.py")
+    return posts
+
+def get_post_comments(profile_name: str, reddit_instance: praw.Reddit, post_id: str, limit: int = 25, status=None, verbose: bool = False, num_comments: Optional[int] = None) -> List[Dict[str, Any]]:
     api_key_suffix = os.getenv("REDDIT_CLIENT_ID")[-4:] if os.getenv("REDDIT_CLIENT_ID") else "N/A"
     if not reddit_instance:
         log("Reddit API not initialized.", verbose, is_error=True, status=status, log_caller_file="reddit_api_utils.py")
         return []
-    
+
+    cache = get_reddit_cache(verbose=verbose)
+    cached = cache.get_comments(post_id, num_comments, limit)
+    if cached is not None:
+        log(f"Using cached comments for post {post_id} ({num_comments} comments unchanged).", verbose, status=status, log_caller_file="reddit_api_utils.py")
+        return cached
+
     comments_data = []
     api_call_tracker, rate_limiter = _get_api_trackers(profile_name)
     try:
@@ -172,6 +195,7 @@ def get_post_comments(profile_name: str, reddit_instance: praw.Reddit, post_id:
                 "is_stickied": comment.stickied
             })
         api_call_tracker.record_call("reddit", method_name, api_key_suffix=api_key_suffix, success=True)
+        cache.put_comments(post_id, num_comments, limit, comments_data)
         log(f"Fetched {len(comments_data)} comments for post {post_id}.", verbose, status=status, log_caller_file="reddit_api_utils.py")
     except Exception as e:
         api_call_tracker.record_call("reddit", method_name, api_key_suffix=api_key_suffix, success=False, response=str(e))
@@ -0,0 +1,148 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+from typing import Any, Dict, List, Optional
+
+from services.support.logger_util import _log as log
+from services.support.path_config import get_reddit_cache_path, ensure_dir_exists
+
+REDDIT_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    subreddit TEXT NOT NULL,
+    listing TEXT NOT NULL,
+    period TEXT NOT NULL,
+    row_limit INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (subreddit, listing, period)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS comments (
+    post_id TEXT PRIMARY KEY,
+    num_comments INTEGER NOT NULL,
+    row_limit INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    payload TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+# Fast-moving listings go stale quickly, long top windows barely move within a day
+LISTING_TTL_SECONDS: Dict[str, float] = {
+    "new": 5 * 60,
+    "rising": 5 * 60,
+    "hot": 15 * 60,
+    "top/day": 60 * 60,
+    "top/week": 6 * 3600,
+    "top/all": 24 * 3600
+}
+DEFAULT_LISTING_TTL_SECONDS = 15 * 60
+# Comment trees are refreshed as soon as num_comments moves; this only bounds how stale their scores can get
+COMMENT_TTL_SECONDS = 24 * 3600
+
+def _listing_label(listing: str, period: Optional[str]) -> str:
+    return f"{listing}/{period}" if period else listing
+
+class RedditCache:
+    def __init__(self, path: str, ttl_scale: float = 1.0, verbose: bool = False):
+        self.path = path
+        self.ttl_scale = ttl_scale
+        self.verbose = verbose
+        self.lock = threading.Lock()
+        self.stats = {"listing_hits": 0, "listing_misses": 0, "comment_hits": 0, "comment_misses": 0, "comment_refreshes": 0}
+
+        ensure_dir_exists(os.path.dirname(path))
+        self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(REDDIT_CACHE_SCHEMA)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_scale > 0
+
+    def listing_ttl(self, listing: str, period: Optional[str]) -> float:
+        return LISTING_TTL_SECONDS.get(_listing_label(listing, period), DEFAULT_LISTING_TTL_SECONDS) * self.ttl_scale
+
+    def get_listing(self, subreddit: str, listing: str, period: Optional[str], limit: int) -> Optional[List[Dict[str, Any]]]:
+        if not self.enabled:
+            return None
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT row_limit, fetched_at, payload FROM listings WHERE subreddit = ? AND listing = ? AND period = ?",
+                (subreddit.lower(), listing, period or "")
+            ).fetchone()
+            # A listing fetched with a larger limit also answers smaller requests
+            fresh = row is not None and row[0] >= limit and time.time() - row[1] <= self.listing_ttl(listing, period)
+            self.stats["listing_hits" if fresh else "listing_misses"] += 1
+        return json.loads(row[2])[:limit] if fresh else None
+
+    def put_listing(self, subreddit: str, listing: str, period: Optional[str], limit: int, posts: List[Dict[str, Any]]):
+        if not self.enabled:
+            return
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO listings (subreddit, listing, period, row_limit, fetched_at, payload) VALUES (?, ?, ?, ?, ?, ?)",
+                (subreddit.lower(), listing, period or "", limit, time.time(), json.dumps(posts, ensure_ascii=False))
+            )
+
+    def get_comments(self, post_id: str, num_comments: Optional[int], limit: int) -> Optional[List[Dict[str, Any]]]:
+        if not self.enabled or num_comments is None:
+            return None
+        with self.lock:
+            row = self.connection.execute("SELECT num_comments, row_limit, fetched_at, payload FROM comments WHERE post_id = ?", (post_id,)).fetchone()
+            if row is None:
+                self.stats["comment_misses"] += 1
+                return None
+            fresh = row[0] == num_comments and row[1] >= limit and time.time() - row[2] <= COMMENT_TTL_SECONDS * self.ttl_scale
+            self.stats["comment_hits" if fresh else "comment_refreshes"] += 1
+        return json.loads(row[3])[:limit] if fresh else None
+
+    def put_comments(self, post_id: str, num_comments: Optional[int], limit: int, comments: List[Dict[str, Any]]):
+        if not self.enabled or num_comments is None:
+            return
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO comments (post_id, num_comments, row_limit, fetched_at, payload) VALUES (?, ?, ?, ?, ?)",
+                (post_id, num_comments, limit, time.time(), json.dumps(comments, ensure_ascii=False))
+            )
+
+    def prune(self) -> int:
+        now = time.time()
+        with self.lock, self.connection:
+            removed = self.connection.execute("DELETE FROM listings WHERE fetched_at < ?", (now - max(LISTING_TTL_SECONDS.values()) * max(self.ttl_scale, 1),)).rowcount
+            removed += self.connection.execute("DELETE FROM comments WHERE fetched_at < ?", (now - COMMENT_TTL_SECONDS * max(self.ttl_scale, 1),)).rowcount
+        return removed
+
+    def get_stats(self) -> Dict[str, int]:
+        with self.lock:
+            return dict(self.stats)
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+_reddit_cache: Optional[RedditCache] = None
+_reddit_cache_lock = threading.Lock()
+
+def get_reddit_cache(verbose: bool = False) -> RedditCache:
+    global _reddit_cache
+    with _reddit_cache_lock:
+        if _reddit_cache is None:
+            _reddit_cache = RedditCache(get_reddit_cache_path(), ttl_scale=float(os.getenv("REDDIT_CACHE_TTL_SCALE", "1")), verbose=verbose)
+            pruned = _reddit_cache.prune()
+            if pruned:
+                log(f"Pruned {pruned} expired entries from the Reddit cache", verbose, log_caller_file="reddit_cache.py")
+        return _reddit_cache
+
+def log_reddit_cache_stats(verbose: bool = False, status=None):
+    if _reddit_cache is None:
+        return
+    stats = _reddit_cache.get_stats()
+    if not any(stats.values()):
+        return
+    log(
+        f"Reddit cache: {stats['listing_hits']}/{stats['listing_hits'] + stats['listing_misses']} listings served from cache, "
+        f"{stats['comment_hits']} comment trees reused, {stats['comment_refreshes']} refreshed, {stats['comment_misses']} fetched for the first time",
+        verbose, status, log_caller_file="reddit_cache.py"
+    )
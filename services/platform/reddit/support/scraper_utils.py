@@ -1,5 +1,4 @@
 import os
-import json
 
 from datetime import datetime
 from dotenv import load_dotenv
@@ -11,10 +10,11 @@ from rich.console import Console
 from profiles import PROFILES
 
 from services.support.logger_util import _log as log
-from services.support.path_config import ensure_dir_exists, get_reddit_scraper_dir
+from services.support.dataset_store import write_dataset
+from services.support.path_config import get_reddit_scraper_output_file_path, register_artifact
 
-from services.platform.reddit.support.data_formatter import format_reddit_post
-from services.platform.reddit.support.reddit_api_utils import initialize_praw, get_subreddit_posts, get_post_comments
+from services.platform.reddit.support.ingestion_engine import RedditIngestion
+from services.platform.reddit.support.reddit_api_utils import initialize_praw
 
 console = Console()
 
@@ -44,40 +44,29 @@ def run_reddit_scraper(profile_name: str, status: Optional[Status] = None, verbo
     reddit_instance = initialize_praw(profile_name, verbose=verbose)
     if not reddit_instance:
         return []
-        
+
+    workers = int(reddit_config.get("workers", os.getenv("REDDIT_WORKERS", "4")))
+    log(f"Scraping {len(subreddits)} subreddits ({', '.join(time_filters)}) with {workers} workers...", verbose, status=status, log_caller_file="scraper_utils.py")
+
     all_formatted_posts = []
 
-    for subreddit_name in subreddits:
-        for time_filter in time_filters:
-            if status:
-                status.update(f"[white]Scraping r/{subreddit_name} ({time_filter} posts)...[/white]")
-            log(f"Scraping r/{subreddit_name} ({time_filter} posts)...", verbose, status=status, log_caller_file="scraper_utils.py")
-            raw_posts = get_subreddit_posts(profile_name, reddit_instance, subreddit_name, time_filter, limit=max_posts, status=status, verbose=verbose)
-            
-            filtered_posts = [post for post in raw_posts if post.get("num_comments", 0) >= min_comments]
-            log(f"Found {len(filtered_posts)} posts from r/{subreddit_name} ({time_filter}) with >= {min_comments} comments.", verbose, status=status, log_caller_file="scraper_utils.py")
-
-            posts_with_comments = []
-            if include_comments:
-                for post in filtered_posts:
-                    post_comments = get_post_comments(profile_name, reddit_instance, post["id"], status=status, verbose=verbose)
-                    posts_with_comments.append(format_reddit_post(post, time_filter, include_comments, post_comments))
-            else:
-                for post in filtered_posts:
-                    posts_with_comments.append(format_reddit_post(post, time_filter, include_comments))
-            
-            all_formatted_posts.extend(posts_with_comments)
-
-    reddit_output_dir = get_reddit_scraper_dir(profile_name)
-    ensure_dir_exists(reddit_output_dir)
+    def collect(records):
+        for record in records:
+            all_formatted_posts.append(record)
+            yield record
+
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_file = os.path.join(reddit_output_dir, f"reddit_scraped_data_{timestamp}.json")
-
-    try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(all_formatted_posts, f, indent=2, ensure_ascii=False)
-        log(f"Reddit scraped data saved to {output_file}", verbose, status=status, log_caller_file="scraper_utils.py")
-    except Exception as e:
-        log(f"Error saving Reddit scraped data to {output_file}: {e}", verbose, is_error=True, status=status, log_caller_file="scraper_utils.py")
+    output_file = get_reddit_scraper_output_file_path(profile_name, timestamp)
+
+    with RedditIngestion(profile_name, workers=workers, verbose=verbose, status=status) as ingestion:
+        records = collect(ingestion.ingest(subreddits, time_filters, max_posts, min_comments, include_comments))
+        try:
+            write_dataset(output_file, records, metadata={"profile_name": profile_name, "subreddits": subreddits, "time_filters": time_filters}, numeric_fields=("engagement.score", "engagement.num_comments", "data.created_utc"), verbose=verbose)
+            register_artifact(output_file, profile_name, "reddit", "raw", len(all_formatted_posts))
+            log(f"Reddit scraped data saved to {output_file}", verbose, status=status, log_caller_file="scraper_utils.py")
+        except Exception as e:
+            log(f"Error saving Reddit scraped data to {output_file}: {e}", verbose, is_error=True, status=status, log_caller_file="scraper_utils.py")
+            for _ in records:
+                pass
 
     return all_formatted_posts
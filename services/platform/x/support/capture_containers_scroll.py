@@ -1,28 +1,97 @@
+import os
 import time
 
 from rich.console import Console
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import WebDriverException
 from services.support.logger_util import _log as log
 
 console = Console()
 
-def capture_containers_and_scroll(driver, raw_containers, processed_tweet_ids, no_new_content_count, scroll_count, verbose: bool = False, status=None):
-    # Debug: Check current page state
-    current_url = driver.current_url
-    page_title = driver.title
-    log(f"DEBUG: Current URL: {current_url}, Title: {page_title}", verbose, status=status, log_caller_file="capture_containers_scroll.py")
-
-    # Try multiple selectors for tweets
-    tweet_selectors = [
-        'article[data-testid="tweet"]',
-        'article[role="article"]',
-        '[data-testid="Tweet-User-Text"]',
-        '.tweet',
-        '.css-1dbjc4n'
-    ]
+TWEET_SELECTORS = [
+    'article[data-testid="tweet"]',
+    'article[role="article"]',
+    '[data-testid="Tweet-User-Text"]',
+    '.tweet',
+    '.css-1dbjc4n'
+]
 
+_EXTRACT_TWEETS_SCRIPT = """
+const seen = new Set(arguments[0]);
+const includeHtml = arguments[1];
+const scrollFraction = arguments[2];
+let articles = document.querySelectorAll('article[data-testid="tweet"]');
+if (!articles.length) {
+    articles = document.querySelectorAll('article[role="article"]');
+}
+const records = [];
+for (const article of articles) {
+    let url = null;
+    for (const link of article.querySelectorAll('a[href*="/status/"]')) {
+        const href = link.href;
+        if (href && href.includes('/status/') && !href.includes('/analytics')) {
+            url = href;
+            break;
+        }
+    }
+    if (!url) {
+        continue;
+    }
+    const id = url.split('/status/')[1].split('?')[0];
+    if (seen.has(id)) {
+        continue;
+    }
+    seen.add(id);
+    const textEl = article.querySelector('[data-testid="tweetText"]');
+    const avatar = article.querySelector('a[href^="/"] img');
+    const timeEl = article.querySelector('time');
+    const hasVideo = !!article.querySelector('[data-testid="videoComponent"]');
+    records.push({
+        id: id,
+        url: url,
+        text: article.innerText,
+        tweet_text: textEl ? textEl.textContent : '',
+        avatar: avatar ? avatar.src : '',
+        datetime: timeEl ? timeEl.getAttribute('datetime') : null,
+        media: hasVideo ? ['video'] : Array.from(article.querySelectorAll('img[src*="media"]'), img => img.getAttribute('src')),
+        metrics: Array.from(article.querySelectorAll('[role="group"]'), group => group.getAttribute('aria-label') || '').filter(label => label),
+        is_reply: Array.from(article.querySelectorAll('div[dir="ltr"]')).some(div => div.textContent.trim().startsWith('Replying to')),
+        html: includeHtml ? article.outerHTML : null
+    });
+}
+window.scrollTo(0, window.pageYOffset + window.innerHeight * scrollFraction);
+return records;
+"""
+
+def get_extraction_mode() -> str:
+    return os.getenv("X_EXTRACTION_MODE", "js").strip().lower()
+
+def _capture_html_enabled() -> bool:
+    return os.getenv("X_CAPTURE_HTML", "0").strip().lower() in ("1", "true", "yes")
+
+def _capture_with_script(driver, raw_containers, processed_tweet_ids, include_html: bool, verbose: bool = False, status=None) -> int:
+    records = driver.execute_script(_EXTRACT_TWEETS_SCRIPT, list(processed_tweet_ids), include_html, 0.8) or []
+
+    for record in records:
+        tweet_id = record['id']
+        processed_tweet_ids.add(tweet_id)
+        container = {
+            'text': record.get('text') or '',
+            'url': record['url'],
+            'tweet_id': tweet_id,
+            'profile_image_url': record.get('avatar') or '',
+            'extracted': record
+        }
+        if record.get('html'):
+            container['html'] = record['html']
+        raw_containers.append(container)
+
+    log(f"DEBUG: Extracted {len(records)} new tweets in one script call. Total processed: {len(processed_tweet_ids)}", verbose, status=status, log_caller_file="capture_containers_scroll.py")
+    return len(records)
+
+def _capture_with_webdriver(driver, raw_containers, processed_tweet_ids, verbose: bool = False, status=None) -> int:
     tweet_elements = []
-    for selector in tweet_selectors:
+    for selector in TWEET_SELECTORS:
         try:
             elements = driver.find_elements(By.CSS_SELECTOR, selector)
             log(f"DEBUG: Found {len(elements)} elements with selector '{selector}'", verbose, status=status, log_caller_file="capture_containers_scroll.py")
@@ -41,18 +110,18 @@ def capture_containers_and_scroll(driver, raw_containers, processed_tweet_ids, n
     for tweet_element in tweet_elements:
         try:
             links = tweet_element.find_elements(By.CSS_SELECTOR, 'a[href*="/status/"]')
-            
+
             if not links:
                 log(f"DEBUG: Tweet article has no /status/ link. Text: {tweet_element.text[:50]}...", verbose, is_error=False, status=status, log_caller_file="capture_containers_scroll.py")
                 continue
-            
+
             url = None
             for link in links:
                 href = link.get_attribute("href")
                 if href and '/status/' in href and '/analytics' not in href:
                     url = href
                     break
-            
+
             if not url:
                 log(f"DEBUG: No valid tweet URL found in article. Text: {tweet_element.text[:50]}...", verbose, is_error=False, status=status, log_caller_file="capture_containers_scroll.py")
                 continue
@@ -92,11 +161,26 @@ def capture_containers_and_scroll(driver, raw_containers, processed_tweet_ids, n
     scroll_amount = viewport_height * 0.8
 
     driver.execute_script(f"window.scrollTo(0, {current_position + scroll_amount})")
+    return new_containers_found_in_this_pass
+
+def capture_containers_and_scroll(driver, raw_containers, processed_tweet_ids, no_new_content_count, scroll_count, verbose: bool = False, status=None, mode: str = None):
+    mode = mode or get_extraction_mode()
+
+    new_containers_found_in_this_pass = None
+    if mode == "js":
+        try:
+            new_containers_found_in_this_pass = _capture_with_script(driver, raw_containers, processed_tweet_ids, _capture_html_enabled(), verbose, status)
+        except WebDriverException as e:
+            log(f"Script extraction failed, falling back to per-element capture: {e}", verbose, is_error=True, status=status, log_caller_file="capture_containers_scroll.py")
+
+    if new_containers_found_in_this_pass is None:
+        new_containers_found_in_this_pass = _capture_with_webdriver(driver, raw_containers, processed_tweet_ids, verbose, status)
+
     time.sleep(0.5)
 
     if new_containers_found_in_this_pass == 0:
         no_new_content_count += 1
     else:
         no_new_content_count = 0
-    
-    return no_new_content_count, scroll_count, new_containers_found_in_this_pass
\ No newline at end of file
+
+    return no_new_content_count, scroll_count, new_containers_found_in_this_pass
@@ -1,13 +1,13 @@
 import os
-import base64
-import mimetypes
-import google.generativeai as genai
 
 from profiles import PROFILES
 
 from rich.console import Console
 from services.support.logger_util import _log as log
 from services.support.api_call_tracker import APICallTracker
+from services.support.example_index import select_examples
+from services.support.gemini_client import get_gemini_model
+from services.support.media_parts import get_media_part_builder
 from services.support.path_config import get_gemini_log_file_path
 
 console = Console()
@@ -29,15 +29,11 @@ def generate_reply_with_key(args, status=None, verbose: bool = False):
             log(f"[RATE LIMIT] Cannot call Gemini API: {reason}", verbose, status, is_error=True, api_info=api_call_tracker.get_quot_info("gemini", "generate_content", model=model_name, api_key_suffix=api_key_suffix), log_caller_file="generate_reply_with_key.py")
             return f"Error generating reply: {reason}"
 
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel(model_name)        
-        replies = all_replies
+        model = get_gemini_model(api_key, model_name)
         sample_section = ''
-        if replies:
-            approved_examples = []
-            for r in replies:
-                if r.get('approved') and r.get('reply') and r.get('tweet_text'):
-                    approved_examples.append(f"Original Tweet: {r['tweet_text']}\nApproved Reply: {r['reply']}")
+        if all_replies:
+            examples = [(r['tweet_text'], r['reply']) for r in all_replies if r.get('approved') and r.get('reply') and r.get('tweet_text')]
+            approved_examples = [f"Original Tweet: {source}\nApproved Reply: {reply}" for source, reply in select_examples(profile_name, "x", tweet_text, examples, verbose, status)]
 
             if approved_examples:
                 sample_section = 'Sample approved tweet-reply pairs:\n' + '\n---\n'.join(approved_examples) + '\n\n'
@@ -54,25 +50,15 @@ def generate_reply_with_key(args, status=None, verbose: bool = False):
 
         if media_urls:
             status.update("Preparing media for tweet...")
+            media_builder = get_media_part_builder()
             for medi_item in media_urls:
-                local_file_path = medi_item
-                try:
-                    mime_type = mimetypes.guess_type(local_file_path)[0] or "application/octet-stream"
-                    if not mime_type.startswith(('image/', 'video/')):
-                        log(f"Skipping unsupported media type {mime_type} for {local_file_path}", verbose, status, is_error=False, log_caller_file="generate_reply_with_key.py")
-                        continue
-                    with open(local_file_path, 'rb') as f:
-                        data_b64 = base64.b64encode(f.read()).decode('utf-8')
-                    prompt_parts.append({
-                        "inline_data": {
-                            "mime_type": mime_type,
-                            "data": data_b64
-                        }
-                    })
-                    prompt_parts.append("\n")
-                    log(f"Inlined media {os.path.basename(local_file_path)} (MIME: {mime_type}) for tweet {tweet_id} using API key ending in {api_key[-4:]}", verbose, status, is_error=False, log_caller_file="generate_reply_with_key.py")
-                except Exception as e:
-                    log(f"Could not process media item {medi_item}: {e}", verbose, status, is_error=False, log_caller_file="generate_reply_with_key.py")
+                media_part = media_builder.build_part(medi_item, allow_video=True, verbose=verbose, status=status)
+                if media_part is None:
+                    continue
+                prompt_parts.append(media_part)
+                prompt_parts.append("\n")
+                log(f"Inlined media {os.path.basename(medi_item)} for tweet {tweet_id} using API key ending in {api_key[-4:]}", verbose, status, is_error=False, log_caller_file="generate_reply_with_key.py")
+            prompt_parts = media_builder.resolve_uploads(prompt_parts, api_key, verbose, status)
 
         prompt_parts.append("Important: Generate exactly ONE reply. Do not provide multiple options or explanations take inspiration from sample_section to my writing style.\n")
         prompt_parts.append("Just write a single direct reply that matches the prompt requirements.\n")
@@ -1,7 +1,6 @@
 import os
 import time
 import json
-import random
 
 from datetime import datetime
 from rich.console import Console
@@ -9,21 +8,20 @@ from typing import List, Dict, Any, Optional
 from concurrent.futures import ThreadPoolExecutor
 
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
 
 from services.support.api_key_pool import APIKeyPool
 from services.support.logger_util import _log as log
 from services.support.rate_limiter import RateLimiter
 from services.support.web_driver_handler import setup_driver
+from services.support.wait_util import click, find_first, human_pause, log_interaction_summary, scroll_into_view, timed, wait_for_dom_settled, wait_for_scroll_growth, wait_until
 from services.support.storage.storage_factory import get_storage
 from services.support.path_config import get_browser_data_dir, get_x_replies_dir, ensure_dir_exists
 
 from services.platform.x.support.process_container import process_container
 from services.platform.x.support.post_approved_tweets import post_tweet_reply
 from services.platform.x.support.capture_containers_scroll import capture_containers_and_scroll
-from services.platform.x.support.home_support import _generate_with_pool, _ensure_home_mode_folder, _cleanup_temp_media_dir, _prepare_media_for_gemini_home_mode, _navigate_to_community
+from services.platform.x.support.home_support import _generate_with_pool, _ensure_home_mode_folder, _cleanup_temp_media_dir, _prepare_media_for_gemini_home_mode, _prefetch_home_mode_videos, _is_video_tweet, _navigate_to_community
 
 console = Console()
 
@@ -54,7 +52,8 @@ def run_home_mode(profile_name: str, custom_prompt: str, max_tweets: int = 10, s
         driver.get("https://x.com/home")
         log("Navigated to x.com/home...", verbose, status, log_caller_file="home.py")
 
-    time.sleep(8)
+    find_first(driver, ['article[data-testid="tweet"]', '[data-testid="primaryColumn"]'], timeout=20, action="timeline_ready")
+    wait_for_dom_settled(driver, timeout=5, action="timeline_settled")
 
     if community_name:
         _navigate_to_community(driver, community_name, verbose)
@@ -79,14 +78,16 @@ def run_home_mode(profile_name: str, custom_prompt: str, max_tweets: int = 10, s
                 last_new_content_time = time.time()
 
             if time.time() - last_new_content_time > 10:
+                previous_height = driver.execute_script("return document.body.scrollHeight")
                 driver.execute_script("window.scrollBy(0, window.innerHeight * 0.8);")
-                time.sleep(random.uniform(2, 4))
+                wait_for_scroll_growth(driver, previous_height, timeout=4, action="timeline_scroll_load")
+                human_pause(0.5, 1.5, action="timeline_scroll")
                 last_new_content_time = time.time()
                 no_new_content_count = 0
 
             if status:
                 status.update(f"Collecting tweets: {len(processed_tweet_ids)} collected...")
-            time.sleep(1)
+            wait_for_dom_settled(driver, quiet_ms=300, timeout=2, action="timeline_pass_settled")
     except KeyboardInterrupt:
         log("Collection stopped manually.", verbose, status, log_caller_file="home.py")
 
@@ -122,14 +123,18 @@ def run_home_mode(profile_name: str, custom_prompt: str, max_tweets: int = 10, s
     else:
         log("Warning: Could not initialize storage for approved tweets context", verbose, status, log_caller_file="home.py")
 
-    enriched_items: List[Dict[str, Any]] = []
+    candidate_tweets: List[Dict[str, Any]] = []
     for td in processed_tweets:
-        media_urls = td.get('media_urls', [])
-        if any('video' in str(url).lower() for url in media_urls):
+        if ignore_video_tweets and _is_video_tweet(td):
             log(f"Skipping tweet {td.get('tweet_id')} - contains video content", verbose, status, log_caller_file="home.py")
             continue
+        candidate_tweets.append(td)
+
+    prefetched_videos = _prefetch_home_mode_videos(candidate_tweets, ignore_video_tweets=ignore_video_tweets, verbose=verbose)
 
-        media_abs_paths = _prepare_media_for_gemini_home_mode(td, profile_name, temp_processing_dir, is_home_mode=True, ignore_video_tweets=ignore_video_tweets, verbose=verbose)
+    enriched_items: List[Dict[str, Any]] = []
+    for td in candidate_tweets:
+        media_abs_paths = _prepare_media_for_gemini_home_mode(td, profile_name, temp_processing_dir, is_home_mode=True, ignore_video_tweets=ignore_video_tweets, prefetched_videos=prefetched_videos, verbose=verbose)
         args = (td['tweet_text'], media_abs_paths, profile_name, api_pool.get_key(), rate_limiter, custom_prompt, td['tweet_id'], all_replies)
         enriched_items.append({
             'tweet_data': td,
@@ -201,6 +206,7 @@ def run_home_mode(profile_name: str, custom_prompt: str, max_tweets: int = 10, s
         log(f"Saved {len(results)} results to {schedule_file}", verbose, status=status, log_caller_file="home.py")
 
     _cleanup_temp_media_dir(temp_processing_dir, verbose)
+    log_interaction_summary(verbose, status)
 
     return driver, results
 
@@ -254,7 +260,7 @@ def post_approved_home_mode_replies(driver, profile_name: str, post_via_api: boo
 
         return {"processed": len(generated_replies), "posted": posted, "failed": failed}
 
-    time.sleep(5)
+    wait_for_dom_settled(driver, timeout=5, action="feed_settled")
 
     log("Starting to locate all approved tweets on the feed...", verbose, log_caller_file="home.py")
 
@@ -262,7 +268,7 @@ def post_approved_home_mode_replies(driver, profile_name: str, post_via_api: boo
     tweets_not_found = []
 
     driver.execute_script("window.scrollTo(0, 0);")
-    time.sleep(2)
+    wait_for_dom_settled(driver, timeout=3, action="feed_scrolled_top")
 
     for tweet_data in generated_replies:
         tweet_id = tweet_data.get('tweet_id')
@@ -281,19 +287,21 @@ def post_approved_home_mode_replies(driver, profile_name: str, post_via_api: boo
             try:
                 log(f"Searching for tweet ID: {tweet_id} (attempt {scroll_attempts + 1}/{max_scroll_attempts})...", verbose, log_caller_file="home.py")
 
-                tweet_link_element = WebDriverWait(driver, 3).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, f'article[role="article"][data-testid="tweet"] a[href*="/status/{tweet_id}"]'))
-                )
-                found_tweet_element = tweet_link_element.find_element(By.XPATH, './ancestor::article[@role="article"]')
+                found = find_first(driver, [f'article[role="article"][data-testid="tweet"] a[href*="/status/{tweet_id}"]'], timeout=3, action="find_tweet")
+                if not found:
+                    raise NoSuchElementException(f"Tweet {tweet_id} not in view")
+                found_tweet_element = found[0].find_element(By.XPATH, './ancestor::article[@role="article"]')
 
                 # Store a more stable identifier instead of the element reference
                 tweet_elements_map[tweet_id] = tweet_id  # Just store the ID, we'll find the element fresh each time
                 log(f"Found tweet {tweet_id} on attempt {scroll_attempts + 1}", verbose, log_caller_file="home.py")
                 break
 
-            except (TimeoutException, NoSuchElementException, StaleElementReferenceException):
+            except (NoSuchElementException, StaleElementReferenceException):
+                previous_height = driver.execute_script("return document.body.scrollHeight")
                 driver.execute_script("window.scrollBy(0, window.innerHeight * 0.7);")
-                time.sleep(random.uniform(1, 2))
+                wait_for_scroll_growth(driver, previous_height, timeout=3, action="feed_scroll_load")
+                human_pause(0.3, 0.8, action="feed_scroll")
                 scroll_attempts += 1
 
         if found_tweet_element is None:
@@ -319,11 +327,11 @@ def post_approved_home_mode_replies(driver, profile_name: str, post_via_api: boo
 
         # Find the tweet element fresh each time to avoid stale element issues
         try:
-            tweet_link_element = WebDriverWait(driver, 5).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, f'article[role="article"][data-testid="tweet"] a[href*="/status/{tweet_id}"]'))
-            )
-            tweet_element = tweet_link_element.find_element(By.XPATH, './ancestor::article[@role="article"]')
-        except (TimeoutException, NoSuchElementException, StaleElementReferenceException) as e:
+            found = find_first(driver, [f'article[role="article"][data-testid="tweet"] a[href*="/status/{tweet_id}"]'], timeout=5, action="find_tweet")
+            if not found:
+                raise NoSuchElementException(f"Tweet {tweet_id} is no longer on the page")
+            tweet_element = found[0].find_element(By.XPATH, './ancestor::article[@role="article"]')
+        except (NoSuchElementException, StaleElementReferenceException) as e:
             log(f"Could not find tweet element for {tweet_id}: {e}", verbose, is_error=True, log_caller_file="home.py")
             failed += 1
             continue
@@ -338,12 +346,12 @@ def post_approved_home_mode_replies(driver, profile_name: str, post_via_api: boo
 
                 # Re-find tweet element each attempt to avoid staleness
                 try:
-                    tweet_link_element = WebDriverWait(driver, 5).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, f'article[role="article"][data-testid="tweet"] a[href*="/status/{tweet_id}"]'))
-                    )
-                    tweet_element = tweet_link_element.find_element(By.XPATH, './ancestor::article[@role="article"]')
-                    driver.execute_script("arguments[0].scrollIntoView({ behavior: 'smooth', block: 'center' });", tweet_element)
-                    time.sleep(random.uniform(1, 2))
+                    found = find_first(driver, [f'article[role="article"][data-testid="tweet"] a[href*="/status/{tweet_id}"]'], timeout=5, action="find_tweet")
+                    if not found:
+                        raise NoSuchElementException(f"Tweet {tweet_id} is no longer on the page")
+                    tweet_element = found[0].find_element(By.XPATH, './ancestor::article[@role="article"]')
+                    scroll_into_view(driver, tweet_element)
+                    human_pause(0.5, 1.5, action="before_reply_click")
                 except Exception as refind_e:
                     log(f"Could not re-find tweet element: {refind_e}", verbose, is_error=True, log_caller_file="home.py")
                     break
@@ -360,15 +368,10 @@ def post_approved_home_mode_replies(driver, profile_name: str, post_via_api: boo
                     'span[data-testid="app-text-transition-container"] + div[data-testid="reply"]'
                 ]
 
-                for selector in reply_selectors:
-                    try:
-                        reply_button = WebDriverWait(tweet_element, 3).until(
-                            EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                        )
-                        log(f"Found reply button with selector: {selector}", verbose, log_caller_file="home.py")
-                        break
-                    except:
-                        continue
+                found = find_first(tweet_element, reply_selectors, timeout=3, clickable=True, action="find_reply_button")
+                if found:
+                    reply_button = found[0]
+                    log(f"Found reply button with selector: {found[1]}", verbose, log_caller_file="home.py")
 
                 if not reply_button:
                     # Try to find reply button by looking for elements with reply-related text
@@ -390,14 +393,8 @@ def post_approved_home_mode_replies(driver, profile_name: str, post_via_api: boo
                 if not reply_button:
                     raise Exception("Could not find reply button with any method")
 
-                try:
-                    reply_button.click()
-                    log("Clicked reply button with Selenium", verbose, log_caller_file="home.py")
-                except Exception as click_e:
-                    log(f"Selenium click failed, trying JavaScript click: {click_e}", verbose, log_caller_file="home.py")
-                    driver.execute_script("arguments[0].click();", reply_button)
-
-                time.sleep(random.uniform(2, 3))
+                click(driver, reply_button, action="click_reply_button", verbose=verbose)
+                log("Clicked reply button", verbose, log_caller_file="home.py")
 
                 # Try multiple selectors for the textarea
                 textarea_selectors = [
@@ -408,28 +405,18 @@ def post_approved_home_mode_replies(driver, profile_name: str, post_via_api: boo
                     '.public-DraftEditor-content[contenteditable="true"]'
                 ]
 
-                reply_textarea = None
-                for textarea_selector in textarea_selectors:
-                    try:
-                        reply_textarea = WebDriverWait(driver, 3).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, textarea_selector))
-                        )
-                        log(f"Found textarea with selector: {textarea_selector}", verbose, log_caller_file="home.py")
-                        break
-                    except:
-                        continue
-
-                if not reply_textarea:
+                found = find_first(driver, textarea_selectors, timeout=8, action="find_reply_textarea")
+                if not found:
                     raise Exception("Could not find reply textarea")
-
-                reply_textarea.clear()
-                time.sleep(0.5)
+                reply_textarea = found[0]
+                log(f"Found textarea with selector: {found[1]}", verbose, log_caller_file="home.py")
 
                 # Type the reply more reliably
-                driver.execute_script("arguments[0].focus();", reply_textarea)
-                time.sleep(0.5)
-                reply_textarea.send_keys(generated_reply)
-                time.sleep(random.uniform(1, 2))
+                with timed("type_reply", "act"):
+                    reply_textarea.clear()
+                    driver.execute_script("arguments[0].focus();", reply_textarea)
+                    reply_textarea.send_keys(generated_reply)
+                human_pause(1, 2, action="after_typing")
 
                 # Find post button with multiple selectors
                 post_button_selectors = [
@@ -439,37 +426,19 @@ def post_approved_home_mode_replies(driver, profile_name: str, post_via_api: boo
                     'div[role="button"][data-testid="tweetButton"]'
                 ]
 
-                post_button = None
-                for post_selector in post_button_selectors:
-                    try:
-                        post_button = WebDriverWait(driver, 5).until(
-                            EC.element_to_be_clickable((By.CSS_SELECTOR, post_selector))
-                        )
-                        log(f"Found post button with selector: {post_selector}", verbose, log_caller_file="home.py")
-                        break
-                    except:
-                        continue
-
-                if not post_button:
+                found = find_first(driver, post_button_selectors, timeout=5, clickable=True, action="find_post_button")
+                if not found:
                     raise Exception("Could not find post button")
+                post_button = found[0]
+                log(f"Found post button with selector: {found[1]}", verbose, log_caller_file="home.py")
 
-                driver.execute_script("arguments[0].scrollIntoView({ behavior: 'smooth', block: 'center' });", post_button)
-                time.sleep(0.5)
-
-                try:
-                    post_button.click()
-                    log("Clicked post button with Selenium", verbose, log_caller_file="home.py")
-                except Exception as post_click_e:
-                    log(f"Selenium post button click failed, trying JavaScript: {post_click_e}", verbose, log_caller_file="home.py")
-                    driver.execute_script("arguments[0].click();", post_button)
-
-                time.sleep(random.uniform(3, 5))  # Wait longer for posting
+                scroll_into_view(driver, post_button)
+                click(driver, post_button, action="click_post_button", verbose=verbose)
+                log("Clicked post button", verbose, log_caller_file="home.py")
 
                 # Check if dialog is closed (success indicator)
                 try:
-                    WebDriverWait(driver, 10).until(
-                        EC.invisibility_of_element_located((By.CSS_SELECTOR, '[data-testid="tweetTextarea_0"]'))
-                    )
+                    wait_until(driver, lambda d: not any(el.is_displayed() for el in d.find_elements(By.CSS_SELECTOR, '[data-testid="tweetTextarea_0"]')), timeout=15, action="reply_dialog_closed")
                     log("Reply dialog closed successfully - reply posted", verbose, log_caller_file="home.py")
                     post_success = True
                 except Exception as verify_e:
@@ -480,17 +449,17 @@ def post_approved_home_mode_replies(driver, profile_name: str, post_via_api: boo
                 if post_success:
                     try:
                         # Re-find tweet element for liking
-                        tweet_link_element = WebDriverWait(driver, 3).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, f'article[role="article"][data-testid="tweet"] a[href*="/status/{tweet_id}"]'))
-                        )
-                        tweet_element = tweet_link_element.find_element(By.XPATH, './ancestor::article[@role="article"]')
-
-                        like_button = WebDriverWait(tweet_element, 5).until(
-                            EC.element_to_be_clickable((By.CSS_SELECTOR, '[data-testid="like"], [data-testid="unlike"]'))
-                        )
-                        like_button.click()
+                        found = find_first(driver, [f'article[role="article"][data-testid="tweet"] a[href*="/status/{tweet_id}"]'], timeout=3, action="find_tweet")
+                        if not found:
+                            raise NoSuchElementException(f"Tweet {tweet_id} is no longer on the page")
+                        tweet_element = found[0].find_element(By.XPATH, './ancestor::article[@role="article"]')
+
+                        found = find_first(tweet_element, ['[data-testid="like"], [data-testid="unlike"]'], timeout=5, clickable=True, action="find_like_button")
+                        if not found:
+                            raise NoSuchElementException("Like button not clickable")
+                        click(driver, found[0], action="click_like", verbose=verbose)
                         log(f"Successfully liked tweet {tweet_id}.", verbose, is_error=False, log_caller_file="home.py")
-                        time.sleep(random.uniform(1, 2))
+                        human_pause(1, 2, action="after_like")
                     except Exception as like_e:
                         log(f"Could not like tweet {tweet_id}: {like_e}", verbose, is_error=False, log_caller_file="home.py")
 
@@ -502,7 +471,7 @@ def post_approved_home_mode_replies(driver, profile_name: str, post_via_api: boo
             except Exception as e:
                 log(f"Post attempt {post_attempt + 1} failed: {e}", verbose, is_error=True, log_caller_file="home.py")
                 if post_attempt < max_post_retries - 1:
-                    time.sleep(random.uniform(2, 4))  # Wait before retry
+                    human_pause(2, 4, action="post_retry_backoff")
                 else:
                     log(f"All post attempts failed for {tweet_url}", verbose, is_error=True, log_caller_file="home.py")
                     failed += 1
@@ -512,6 +481,7 @@ def post_approved_home_mode_replies(driver, profile_name: str, post_via_api: boo
             json.dump(items, f, indent=2)
 
         driver.execute_script("window.scrollBy(0, window.innerHeight * 0.2);")
-        time.sleep(random.uniform(1, 2))
+        human_pause(1, 2, action="between_replies")
 
+    log_interaction_summary(verbose)
     return {"processed": len(generated_replies), "posted": posted, "failed": failed}
\ No newline at end of file
@@ -4,7 +4,7 @@ import time
 import shutil
 
 from rich.console import Console
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -13,7 +13,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from services.support.api_key_pool import APIKeyPool
 from services.support.logger_util import _log as log
 from services.support.image_download import download_images
-from services.support.video_download import download_twitter_videos
+from services.support.video_download import acquire_twitter_videos
 from services.support.path_config import get_x_replies_dir, ensure_dir_exists
 
 from services.platform.x.support.generate_reply_with_key import generate_reply_with_key
@@ -26,13 +26,11 @@ def _generate_with_pool(api_pool: APIKeyPool, args: tuple, status=None, verbose:
     tried_keys = set()
     
     while attempts < max_attempts:
-        api_key = api_pool.get_key()
+        exclude = tried_keys if len(tried_keys) < api_pool.size() else None
+        api_key = api_pool.acquire(exclude=exclude)
         if not api_key:
             return "Error generating reply: No API key available"
-        
-        if api_key in tried_keys and api_pool.size() > 1:
-            continue
-        
+
         tried_keys.add(api_key)
         new_args = (args[0], args[1], args[2], api_key, args[4], args[5], args[6], args[7])
         result = generate_reply_with_key(new_args, status=status, verbose=verbose)
@@ -90,20 +88,45 @@ def _copy_medi_into_home_mode(media_paths: List[str], temp_processing_dir: str,
                 log(f"Error copying media {path} into temp processing dir: {e}", verbose, is_error=True, log_caller_file="home_support.py")
     return saved_abs_paths
 
-def _prepare_media_for_gemini_home_mode(tweet_data: Dict[str, Any], profile_name: str, temp_processing_dir: str, is_home_mode: bool = False, ignore_video_tweets: bool = False, verbose: bool = False) -> List[str]:
+def _is_video_tweet(tweet_data: Dict[str, Any]) -> bool:
+    raw_media_urls = tweet_data.get('media_urls')
+    if isinstance(raw_media_urls, list):
+        return any(isinstance(url, str) and url.strip() == 'video' for url in raw_media_urls)
+    return isinstance(raw_media_urls, str) and raw_media_urls.strip() == 'video'
+
+# One browser session for every video in the batch; _prepare_media_for_gemini_home_mode then only looks paths up here
+def _prefetch_home_mode_videos(tweets: List[Dict[str, Any]], ignore_video_tweets: bool = False, verbose: bool = False) -> Dict[str, str]:
+    if ignore_video_tweets:
+        return {}
+    tweet_urls = [td['tweet_url'] for td in tweets if td.get('tweet_url') and _is_video_tweet(td)]
+    if not tweet_urls:
+        return {}
+    try:
+        return acquire_twitter_videos(tweet_urls, profile_name="Download", headless=True, verbose=verbose)
+    except Exception as e:
+        log(f"Error downloading {len(tweet_urls)} videos for the batch: {str(e)}", verbose, is_error=True, log_caller_file="home_support.py")
+        return {}
+
+def _video_paths_for(tweet_data: Dict[str, Any], prefetched_videos: Optional[Dict[str, str]], verbose: bool = False) -> List[str]:
+    if prefetched_videos is not None:
+        path = prefetched_videos.get(tweet_data['tweet_url'])
+        return [path] if path else []
+    return list(acquire_twitter_videos([tweet_data['tweet_url']], profile_name="Download", headless=True, verbose=verbose).values())
+
+def _prepare_media_for_gemini_home_mode(tweet_data: Dict[str, Any], profile_name: str, temp_processing_dir: str, is_home_mode: bool = False, ignore_video_tweets: bool = False, prefetched_videos: Optional[Dict[str, str]] = None, verbose: bool = False) -> List[str]:
     media_abs_paths_for_gemini: List[str] = []
     raw_media_urls = tweet_data.get('media_urls')
 
     if is_home_mode:
         temp_media_dir = _get_temp_media_dir(temp_processing_dir)
         if raw_media_urls:
-            if ignore_video_tweets and (raw_media_urls == 'video' or (isinstance(raw_media_urls, str) and raw_media_urls.strip() == 'video')):
+            if ignore_video_tweets and _is_video_tweet(tweet_data):
                 log(f"Ignoring video tweet {tweet_data['tweet_id']} due to --ignore-video-tweets flag.", verbose, is_error=False, log_caller_file="home_support.py")
-            elif raw_media_urls == 'video' or (isinstance(raw_media_urls, str) and raw_media_urls.strip() == 'video'):
+            elif _is_video_tweet(tweet_data):
                 try:
-                    video_path = download_twitter_videos([tweet_data['tweet_url']], profile_name="Download", headless=True)
-                    if video_path:
-                        copied = _copy_medi_into_home_mode([video_path], temp_media_dir, verbose)
+                    video_paths = _video_paths_for(tweet_data, prefetched_videos, verbose)
+                    if video_paths:
+                        copied = _copy_medi_into_home_mode(video_paths, temp_media_dir, verbose)
                         media_abs_paths_for_gemini.extend(copied)
                     else:
                         log(f"Video download failed or returned no path for {tweet_data['tweet_id']}", verbose, is_error=False, log_caller_file="home_support.py")
@@ -118,13 +141,13 @@ def _prepare_media_for_gemini_home_mode(tweet_data: Dict[str, Any], profile_name
                 
         return media_abs_paths_for_gemini
 
-    if ignore_video_tweets and (raw_media_urls == 'video' or (isinstance(raw_media_urls, str) and raw_media_urls.strip() == 'video')):
+    if ignore_video_tweets and _is_video_tweet(tweet_data):
         log(f"Ignoring video tweet {tweet_data['tweet_id']} due to --ignore-video-tweets flag.", verbose, is_error=False, log_caller_file="home_support.py")
-    elif raw_media_urls == 'video' or (isinstance(raw_media_urls, str) and raw_media_urls.strip() == 'video'):
+    elif _is_video_tweet(tweet_data):
         try:
-            video_path = download_twitter_videos([tweet_data['tweet_url']], profile_name="Download", headless=True)
-            if video_path:
-                copied = _copy_medi_into_home_mode([video_path], temp_processing_dir, verbose)
+            video_paths = _video_paths_for(tweet_data, prefetched_videos, verbose)
+            if video_paths:
+                copied = _copy_medi_into_home_mode(video_paths, temp_processing_dir, verbose)
                 media_abs_paths_for_gemini.extend(copied)
             else:
                 log(f"Video download failed or returned no path for {tweet_data['tweet_id']}", verbose, is_error=False, log_caller_file="home_support.py")
@@ -1,12 +1,91 @@
 from bs4 import BeautifulSoup
 from datetime import datetime
+from typing import Any, Dict, List, Optional
 from rich.console import Console
 from services.support.logger_util import _log as log
 
 console = Console()
 
+def parse_metric_labels(labels: List[str], verbose: bool = False) -> Dict[str, int]:
+    metrics = {'likes': 0, 'retweets': 0, 'replies': 0, 'views': 0, 'bookmarks': 0}
+    for label in labels:
+        try:
+            aria_label = (label or '').lower()
+            if not aria_label:
+                continue
+                
+            parts = aria_label.split(',')
+            for part in parts:
+                part = part.strip()
+                if not part:
+                    continue
+                    
+                numeric_part = ''.join(filter(str.isdigit, part))
+                if not numeric_part:
+                    continue
+                    
+                value = float(numeric_part)
+                
+                if 'k' in part:
+                    value *= 1000
+                elif 'm' in part:
+                    value *= 1000000
+                elif 'b' in part:
+                    value *= 1000000000
+                    
+                if 'repl' in part:
+                    metrics['replies'] = int(value)
+                elif 'repost' in part or 'retweet' in part:
+                    metrics['retweets'] = int(value)
+                elif 'like' in part:
+                    metrics['likes'] = int(value)
+                elif 'view' in part:
+                    metrics['views'] = int(value)
+                elif 'bookmark' in part:
+                    metrics['bookmarks'] = int(value)
+        except Exception as e:
+            log(f"Error processing metrics: {str(e)}", verbose, is_error=True, log_caller_file="process_container.py")
+            continue
+    return metrics
+
+def _format_tweet_date(iso_datetime: Optional[str]) -> str:
+    if iso_datetime:
+        return datetime.fromisoformat(iso_datetime.replace('Z', '+00:00')).strftime('%Y-%m-%d %H:%M:%S')
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+def _build_tweet_data(container, tweet_text: str, tweet_date: str, media_urls: List[str], metrics: Dict[str, int]) -> Dict[str, Any]:
+    return {
+        'text': tweet_text,
+        'tweet_text': tweet_text,
+        'date': tweet_date,
+        'likes': metrics['likes'] / 1000,
+        'retweets': metrics['retweets'],
+        'replies': metrics['replies'],
+        'views': metrics['views'],
+        'bookmarks': metrics['bookmarks'],
+        'media_urls': media_urls,
+        'scraped_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'tweet_date': tweet_date,
+        'tweet_url': container['url'],
+        'tweet_id': container['tweet_id'],
+        'profile_image_url': container.get('profile_image_url', '')
+    }
+
+def _process_extracted(container, verbose: bool = False):
+    record = container['extracted']
+    if record.get('is_reply'):
+        log("Skipping reply tweet (contains 'Replying to')", verbose, is_error=False, log_caller_file="process_container.py")
+        return None
+
+    tweet_date = _format_tweet_date(record.get('datetime'))
+    metrics = parse_metric_labels(record.get('metrics') or [], verbose)
+    return _build_tweet_data(container, record.get('tweet_text') or "", tweet_date, list(record.get('media') or []), metrics)
+
 def process_container(container, verbose: bool = False):
     try:
+        if container.get('extracted'):
+            return _process_extracted(container, verbose)
+
         soup = BeautifulSoup(container['html'], 'html.parser')
     
         replying_to_divs = soup.find_all('div', {'dir': 'ltr'})
@@ -19,9 +98,7 @@ def process_container(container, verbose: bool = False):
         tweet_text = tweet_text_elem.text if tweet_text_elem else ""
         
         time_el = soup.find('time')
-        tweet_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        if time_el and time_el.get('datetime'):
-            tweet_date = datetime.fromisoformat(time_el['datetime'].replace('Z', '+00:00')).strftime('%Y-%m-%d %H:%M:%S')
+        tweet_date = _format_tweet_date(time_el.get('datetime') if time_el else None)
         
         media_urls = []
         if 'data-testid="videoComponent"' in container['html']:
@@ -31,65 +108,9 @@ def process_container(container, verbose: bool = False):
             if images:
                 media_urls = [img['src'] for img in images]
         
-        metrics = {'likes': 0, 'retweets': 0, 'replies': 0, 'views': 0, 'bookmarks': 0}
-        groups = soup.find_all(attrs={'role': 'group'})
-        for group in groups:
-            try:
-                aria_label = group.get('aria-label', '').lower()
-                if not aria_label:
-                    continue
-                    
-                parts = aria_label.split(',')
-                for part in parts:
-                    part = part.strip()
-                    if not part:
-                        continue
-                        
-                    numeric_part = ''.join(filter(str.isdigit, part))
-                    if not numeric_part:
-                        continue
-                        
-                    value = float(numeric_part)
-                    
-                    if 'k' in part:
-                        value *= 1000
-                    elif 'm' in part:
-                        value *= 1000000
-                    elif 'b' in part:
-                        value *= 1000000000
-                        
-                    if 'repl' in part:
-                        metrics['replies'] = int(value)
-                    elif 'repost' in part or 'retweet' in part:
-                        metrics['retweets'] = int(value)
-                    elif 'like' in part:
-                        metrics['likes'] = int(value)
-                    elif 'view' in part:
-                        metrics['views'] = int(value)
-                    elif 'bookmark' in part:
-                        metrics['bookmarks'] = int(value)
-            except Exception as e:
-                log(f"Error processing metrics: {str(e)}", verbose, is_error=True, log_caller_file="process_container.py")
-                continue
-        
-        tweet_data = {
-            'text': tweet_text,
-            'tweet_text': tweet_text,
-            'date': tweet_date,
-            'likes': metrics['likes'] / 1000,
-            'retweets': metrics['retweets'],
-            'replies': metrics['replies'],
-            'views': metrics['views'],
-            'bookmarks': metrics['bookmarks'],
-            'media_urls': media_urls,
-            'scraped_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'tweet_date': tweet_date,
-            'tweet_url': container['url'],
-            'tweet_id': container['tweet_id'],
-            'profile_image_url': container.get('profile_image_url', '')
-        }
-        
-        return tweet_data
+        metrics = parse_metric_labels([group.get('aria-label', '') for group in soup.find_all(attrs={'role': 'group'})], verbose)
+
+        return _build_tweet_data(container, tweet_text, tweet_date, media_urls, metrics)
         
     except Exception as e:
         log(f"Error processing container: {str(e)}", verbose, is_error=True, log_caller_file="process_container.py")
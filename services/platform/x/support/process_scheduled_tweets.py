@@ -1,18 +1,14 @@
 import os
 import json
-import time
 
 from rich.text import Text
 from rich.status import Status
 from rich.console import Console
 from datetime import datetime, timedelta
 
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-
 from services.support.logger_util import _log as log
 from services.support.web_driver_handler import setup_driver
+from services.support.wait_util import find_first, log_interaction_summary, navigate, pace
 from services.support.path_config import get_browser_data_dir, get_schedule_file_path
 
 from services.platform.x.support.schedule_tweet import schedule_tweet
@@ -29,24 +25,19 @@ def process_scheduled_tweets(profile_name="Default", verbose: bool = False, head
             driver, setup_messages = setup_driver(user_data_dir, profile=profile_name, headless=headless, verbose=verbose)
             for msg in setup_messages:
                 status.update(Text(f"[white]{msg}[/white]"))
-                time.sleep(0.1)
             status.update(Text("[white]WebDriver initialized.[/white]"))
-            time.sleep(0.5)
 
             status.update(Text("Navigating to x.com/home...", style="white"))
-            driver.get("https://x.com/home")
+            navigate(driver, "https://x.com/home", ready_selectors=['[data-testid="primaryColumn"]', 'input[name="text"]'], action="open_home")
             status.update(Text("Checking for login redirect...", style="white"))
 
-            try:
-                WebDriverWait(driver, 5).until(
-                    EC.presence_of_element_located((By.NAME, "text"))
-                )
-                status.update(Text("Redirected to login page. Waiting 30 seconds for manual login...", style="white"))
-                time.sleep(30)
+            found = find_first(driver, ['input[name="text"]', '[data-testid="primaryColumn"]'], timeout=5, action="login_check")
+            if found and found[1] == 'input[name="text"]':
+                status.update(Text("Redirected to login page. Waiting up to 30 seconds for manual login...", style="white"))
+                find_first(driver, ['[data-testid="primaryColumn"]'], timeout=30, action="manual_login")
                 status.update(Text("Resuming automated process after manual login window.", style="white"))
-            except Exception:
+            else:
                 status.update(Text("Not redirected to login page or already logged in.", style="white"))
-            time.sleep(1) 
 
         scheduled_tweets = load_tweet_schedules(profile_name, verbose=verbose)
 
@@ -72,8 +63,9 @@ def process_scheduled_tweets(profile_name="Default", verbose: bool = False, head
                     log(f"Failed to schedule tweet: {scheduled_time}", verbose, is_error=True, log_caller_file="process_scheduled_tweets.py")
 
                 save_tweet_schedules(scheduled_tweets, profile_name, verbose=verbose)
-                time.sleep(5)
+                pace(3, 5, action="between_scheduled_tweets")
         log("All scheduled tweets processed!", verbose, log_caller_file="process_scheduled_tweets.py")
+        log_interaction_summary(verbose)
 
     except Exception as e:
         log(f"An error occurred during tweet processing: {e}", verbose, is_error=True, log_caller_file="process_scheduled_tweets.py")
@@ -16,6 +16,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from services.support.logger_util import _log as log
 from services.support.storage.storage_factory import get_storage
 from services.platform.ycombinator.support.scraper_utils import scrape_yc_companies
+from services.support.dataset_store import read_dataset, resolve_dataset_path
 from services.support.path_config import initialize_directories, get_ycombinator_output_file_path
 
 console = Console()
@@ -50,15 +51,13 @@ def main():
     push_to_db = global_props.get('push_to_db', False)
 
     today = datetime.now()
-    existing_file_path = get_ycombinator_output_file_path(profile_name, today.strftime("%Y%m%d"))
+    existing_file_path = resolve_dataset_path(get_ycombinator_output_file_path(profile_name, today.strftime("%Y%m%d")))
 
     scraped_companies = []
-    if os.path.exists(existing_file_path):
+    if existing_file_path:
         log(f"Found existing Y Combinator data for {today.strftime('%Y-%m-%d')} at {existing_file_path}", verbose, log_caller_file="scraper.py")
         try:
-            import json
-            with open(existing_file_path, 'r', encoding='utf-8') as f:
-                scraped_companies = json.load(f)
+            scraped_companies = list(read_dataset(existing_file_path))
             log(f"Loaded {len(scraped_companies)} existing companies from file.", verbose, log_caller_file="scraper.py")
         except Exception as e:
             log(f"Error loading existing data: {e}. Will scrape fresh data.", verbose, is_error=True, log_caller_file="scraper.py")
@@ -1,5 +1,3 @@
-import os
-import json
 import time
 import uuid
 import undetected_chromedriver as uc
@@ -18,7 +16,9 @@ from selenium.webdriver.support import expected_conditions as EC
 
 from services.support.logger_util import _log as log
 from services.support.web_driver_handler import cleanup_chrome_locks, kill_chrome_processes_by_user_data_dir
-from services.support.path_config import get_yc_scrape_output_file_path, get_browser_data_dir, ensure_dir_exists
+from services.support.dataset_store import write_dataset
+from services.support.seen_index import get_seen_index, log_seen_index_stats
+from services.support.path_config import get_ycombinator_output_file_path, get_browser_data_dir, ensure_dir_exists, register_artifact
 
 console = Console()
 
@@ -124,10 +124,16 @@ def scrape_yc_companies(profile_name: str, verbose: bool = False, status: Option
         log(f"Found {len(company_links)} company links on the page after scrolling.", verbose, status=status, log_caller_file="scraper_utils.py")
 
         companies_to_process = company_links[:limit] if limit is not None else company_links
+        seen_index = get_seen_index(profile_name, verbose)
+        already_seen = seen_index.contains_many("ycombinator", "scraped", [link.get('href', '').replace('/companies/', '') for link in companies_to_process])
+        if already_seen:
+            log(f"Skipping {len(already_seen)} companies already scraped in earlier runs", verbose, status=status, log_caller_file="scraper_utils.py")
 
         for i, company_link in enumerate(companies_to_process):
             company_url = f"https://www.ycombinator.com{company_link['href']}"
             company_name = company_link.get('href', '').replace('/companies/', '')
+            if company_name in already_seen:
+                continue
 
             log(f"Processing company {i+1}/{len(companies_to_process)}: {company_name}", verbose, status=status, log_caller_file="scraper_utils.py")
 
@@ -150,6 +156,7 @@ def scrape_yc_companies(profile_name: str, verbose: bool = False, status: Option
 
                     formatted_data = _format_yc_data(basic_data)
                     all_formatted_companies.append(formatted_data)
+                    seen_index.mark_many("ycombinator", "scraped", [company_name])
 
                     log(f"Successfully scraped {company_name} with {len(formatted_data['founders'])} founders", verbose, status=status, log_caller_file="scraper_utils.py")
 
@@ -161,12 +168,12 @@ def scrape_yc_companies(profile_name: str, verbose: bool = False, status: Option
                 continue
 
         today = datetime.now()
-        output_file_path = get_yc_scrape_output_file_path(profile_name, today.strftime("%Y%m%d"))
-        ensure_dir_exists(os.path.dirname(output_file_path))
-        with open(output_file_path, 'w', encoding='utf-8') as f:
-            json.dump(all_formatted_companies, f, indent=2, ensure_ascii=False)
+        output_file_path = get_ycombinator_output_file_path(profile_name, today.strftime("%Y%m%d"))
+        write_dataset(output_file_path, all_formatted_companies, metadata={"profile_name": profile_name, "date": today.strftime("%Y-%m-%d")}, verbose=verbose)
+        register_artifact(output_file_path, profile_name, "ycombinator", "raw", len(all_formatted_companies))
 
         log(f"Scraped and saved {len(all_formatted_companies)} companies to {output_file_path}", verbose, status=status, log_caller_file="scraper_utils.py")
+        log_seen_index_stats(verbose, status)
         return all_formatted_companies
 
     except Exception as e:
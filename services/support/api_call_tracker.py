@@ -1,161 +1,283 @@
 import os
 import json
+import time
+import threading
 
 from collections import deque
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, Tuple
 from services.support.path_config import get_api_log_file_path, ensure_dir_exists
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+RETENTION_DAYS = 2
+COMPACT_THRESHOLD_BYTES = 512 * 1024
+
+SERVICE_QUOTAS = {
+    "gemini": {
+        "gemini-2.5-pro": {"rpm": 5, "tpm": 125000, "rpd": 100},
+        "gemini-2.5-flash": {"rpm": 10, "tpm": 250000, "rpd": 250},
+        "gemini-2.5-flash-preview": {"rpm": 10, "tpm": 250000, "rpd": 250},
+        "gemini-2.5-flash-lite": {"rpm": 15, "tpm": 250000, "rpd": 1000},
+        "gemini-2.5-flash-lite-preview": {"rpm": 15, "tpm": 250000, "rpd": 1000},
+        "gemini-2.0-flash": {"rpm": 15, "tpm": 1000000, "rpd": 200},
+        "gemini-2.0-flash-lite": {"rpm": 30, "tpm": 1000000, "rpd": 200},
+        "gemini-flash-latest": {"rpm": 15, "tpm": 1000000, "rpd": 200},
+        "gemini-flash-latest-lite": {"rpm": 30, "tpm": 1000000, "rpd": 200}
+    },
+    "reddit": {
+        "subreddit_hot": {"rpm": 60, "tpm": -1, "rpd": 1000},
+        "subreddit_new": {"rpm": 60, "tpm": -1, "rpd": 1000},
+        "subreddit_top": {"rpm": 60, "tpm": -1, "rpd": 1000},
+        "subreddit_rising": {"rpm": 60, "tpm": -1, "rpd": 1000},
+        "subreddit_week": {"rpm": 60, "tpm": -1, "rpd": 1000},
+        "subreddit_day": {"rpm": 60, "tpm": -1, "rpd": 1000},
+        "subreddit_yesterday": {"rpm": 60, "tpm": -1, "rpd": 1000},
+        "subreddit_top_day": {"rpm": 60, "tpm": -1, "rpd": 1000},
+        "post_comments": {"rpm": 60, "tpm": -1, "rpd": 1000},
+    },
+    "google_search": {
+        "search_query": {"rpm": 100, "tpm": -1, "rpd": 10000}
+    }
+}
+
+class _RollingCounter:
+    def __init__(self):
+        self.minute: deque[Tuple[float, int]] = deque()
+        self.minute_tokens = 0
+        self.day = None
+        self.day_count = 0
+
+    def add(self, ts: float, tokens: int):
+        day = datetime.fromtimestamp(ts).date()
+        if self.day is None or day > self.day:
+            self.day = day
+            self.day_count = 0
+        if day == self.day:
+            self.day_count += 1
+        if ts > time.time() - 60:
+            self.minute.append((ts, tokens))
+            self.minute_tokens += tokens
+
+    def snapshot(self, now: float) -> Tuple[int, int, int]:
+        while self.minute and self.minute[0][0] <= now - 60:
+            _, tokens = self.minute.popleft()
+            self.minute_tokens -= tokens
+        rpd = self.day_count if self.day == datetime.fromtimestamp(now).date() else 0
+        return len(self.minute), rpd, self.minute_tokens
+
 class APICallTracker:
-    def __init__(self, log_file: str = None):
+    def __init__(self, log_file: str = None, compact_threshold_bytes: int = COMPACT_THRESHOLD_BYTES):
         if log_file is None:
             log_file = get_api_log_file_path()
         self.log_file = os.path.abspath(log_file)
+        self.lock_file = self.log_file + ".lock"
+        self.compact_threshold_bytes = compact_threshold_bytes
+        self._compact_at = compact_threshold_bytes
         ensure_dir_exists(os.path.dirname(self.log_file))
-        self.call_log: deque[Dict[str, Any]] = deque()
-        self.service_quotas = {
-            "gemini": {
-                "gemini-2.5-pro": {"rpm": 5, "tpm": 125000, "rpd": 100},
-                "gemini-2.5-flash": {"rpm": 10, "tpm": 250000, "rpd": 250},
-                "gemini-2.5-flash-preview": {"rpm": 10, "tpm": 250000, "rpd": 250},
-                "gemini-2.5-flash-lite": {"rpm": 15, "tpm": 250000, "rpd": 1000},
-                "gemini-2.5-flash-lite-preview": {"rpm": 15, "tpm": 250000, "rpd": 1000},
-                "gemini-2.0-flash": {"rpm": 15, "tpm": 1000000, "rpd": 200},
-                "gemini-2.0-flash-lite": {"rpm": 30, "tpm": 1000000, "rpd": 200},
-                "gemini-flash-latest": {"rpm": 15, "tpm": 1000000, "rpd": 200},
-                "gemini-flash-latest-lite": {"rpm": 30, "tpm": 1000000, "rpd": 200}
-            },
-            "reddit": {
-                "subreddit_hot": {"rpm": 60, "tpm": -1, "rpd": 1000},
-                "subreddit_new": {"rpm": 60, "tpm": -1, "rpd": 1000},
-                "subreddit_top": {"rpm": 60, "tpm": -1, "rpd": 1000},
-                "subreddit_rising": {"rpm": 60, "tpm": -1, "rpd": 1000},
-                "subreddit_week": {"rpm": 60, "tpm": -1, "rpd": 1000},
-                "subreddit_day": {"rpm": 60, "tpm": -1, "rpd": 1000},
-                "subreddit_yesterday": {"rpm": 60, "tpm": -1, "rpd": 1000},
-                "subreddit_top_day": {"rpm": 60, "tpm": -1, "rpd": 1000},
-                "post_comments": {"rpm": 60, "tpm": -1, "rpd": 1000},
-            },
-            "google_search": {
-                "search_query": {"rpm": 100, "tpm": -1, "rpd": 10000}
-            }
-        }
-        self._load_log()
+        self.service_quotas = SERVICE_QUOTAS
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, str, Optional[str], Optional[str]], _RollingCounter] = {}
+        self._offset = 0
+        self._inode = None
+        self._migrate_legacy_log()
+        with self._lock:
+            self._sync()
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool = True):
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_file, 'a') as lock_handle:
+            fcntl.flock(lock_handle, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_handle, fcntl.LOCK_UN)
+
+    def _migrate_legacy_log(self):
+        legacy_file = os.path.splitext(self.log_file)[0] + ".json"
+        if legacy_file == self.log_file or os.path.exists(self.log_file) or not os.path.exists(legacy_file):
+            return
+
+        with self._file_lock():
+            if os.path.exists(self.log_file):
+                return
+            try:
+                with open(legacy_file, 'r') as f:
+                    legacy_entries = json.load(f)
+            except (json.JSONDecodeError, OSError):
+                legacy_entries = []
 
-    def _load_log(self):
-        if os.path.exists(self.log_file):
-            with open(self.log_file, 'r') as f:
+            cutoff = datetime.now() - timedelta(days=RETENTION_DAYS)
+            tmp_file = self.log_file + ".tmp"
+            with open(tmp_file, 'w') as f:
+                for entry in legacy_entries:
+                    try:
+                        if datetime.fromisoformat(entry['timestamp']) > cutoff:
+                            entry.pop('timestamp_dt', None)
+                            f.write(json.dumps(entry, default=str) + "\n")
+                    except (KeyError, TypeError, ValueError):
+                        continue
+            os.replace(tmp_file, self.log_file)
+
+    @staticmethod
+    def _counter_keys(service: str, method: str, model: Optional[str], api_key_suffix: Optional[str]):
+        model_key = model if service == "gemini" else None
+        yield (service, method, model_key, None)
+        if api_key_suffix:
+            yield (service, method, model_key, api_key_suffix)
+
+    def _ingest(self, entry: Dict[str, Any]):
+        try:
+            ts = datetime.fromisoformat(entry['timestamp']).timestamp()
+        except (KeyError, TypeError, ValueError):
+            return
+        if ts < time.time() - RETENTION_DAYS * 86400:
+            return
+        tokens = entry.get('token_count') or 0
+        for key in self._counter_keys(entry.get('service'), entry.get('method'), entry.get('model'), entry.get('api_key_suffix')):
+            counter = self._counters.get(key)
+            if counter is None:
+                counter = self._counters[key] = _RollingCounter()
+            counter.add(ts, tokens)
+
+    def _sync(self):
+        try:
+            stat = os.stat(self.log_file)
+        except FileNotFoundError:
+            return
+
+        if self._inode != stat.st_ino or stat.st_size < self._offset:
+            self._inode = stat.st_ino
+            self._offset = 0
+            self._counters = {}
+
+        if stat.st_size == self._offset:
+            return
+
+        with open(self.log_file, 'rb') as f:
+            f.seek(self._offset)
+            chunk = f.read()
+
+        consumed = chunk.rfind(b"\n") + 1
+        for line in chunk[:consumed].splitlines():
+            if not line.strip():
+                continue
+            try:
+                self._ingest(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        self._offset += consumed
+
+    def _compact(self):
+        cutoff = datetime.now() - timedelta(days=RETENTION_DAYS)
+        tmp_file = self.log_file + ".tmp"
+        with open(self.log_file, 'rb') as src, open(tmp_file, 'wb') as dst:
+            for line in src:
                 try:
-                    loaded_log = json.load(f)
-                    for entry in loaded_log:
-                        
-                        entry['timestamp_dt'] = datetime.fromisoformat(entry['timestamp'])
-                        self.call_log.append(entry)
-                except json.JSONDecodeError:
-                    self.call_log = deque()
-
-    def _save_log(self):
-        pruned_log = [entry for entry in self.call_log if entry['timestamp_dt'] > datetime.now() - timedelta(days=2)]
-        with open(self.log_file, 'w') as f:
-            json.dump(list(pruned_log), f, indent=2, default=str)
-
-    def record_call(self, service: str, method: str, model: Optional[str] = None, api_key_suffix: Optional[str] = None, success: bool = True, response: Optional[Any] = None):
-        timestamp = datetime.now()
+                    if datetime.fromisoformat(json.loads(line)['timestamp']) > cutoff:
+                        dst.write(line if line.endswith(b"\n") else line + b"\n")
+                except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                    continue
+        os.replace(tmp_file, self.log_file)
+
+    def record_call(self, service: str, method: str, model: Optional[str] = None, api_key_suffix: Optional[str] = None, success: bool = True, response: Optional[Any] = None, token_count: Optional[int] = None):
         call_details = {
-            "timestamp": timestamp.isoformat(),
-            "timestamp_dt": timestamp,
+            "timestamp": datetime.now().isoformat(),
             "service": service,
             "method": method,
             "model": model,
             "api_key_suffix": api_key_suffix,
             "success": success,
-            "response": str(response) if response else None 
+            "token_count": token_count,
+            "response": str(response)[:200] if response else None
         }
-        self.call_log.append(call_details)
-        self._save_log()
-
-    def _get_current_counts(self, service: str, method: str, model: Optional[str] = None, api_key_suffix: Optional[str] = None) -> Tuple[int, int]:
-        now = datetime.now()
-        minute_ago = now - timedelta(minutes=1)
-        today_start = datetime(now.year, now.month, now.day)
+        line = (json.dumps(call_details, default=str) + "\n").encode('utf-8')
 
-        rpm_count = 0
-        rpd_count = 0
+        with self._lock:
+            with self._file_lock():
+                fd = os.open(self.log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    os.write(fd, line)
+                finally:
+                    os.close(fd)
 
-        while self.call_log and self.call_log[0]['timestamp_dt'] < today_start - timedelta(days=1):
-            self.call_log.popleft()
+                if os.path.getsize(self.log_file) > self._compact_at:
+                    self._compact()
+                    self._compact_at = max(self.compact_threshold_bytes, 2 * os.path.getsize(self.log_file))
+            self._sync()
 
-        for call in self.call_log:
-            if call['service'] == service and call['method'] == method:
-                if service == "gemini" and call.get('model') != model:
-                    continue
-                if api_key_suffix and call.get('api_key_suffix') != api_key_suffix:
-                    continue
-                
-                if call['timestamp_dt'] > minute_ago:
-                    rpm_count += 1
-                if call['timestamp_dt'] > today_start:
-                    rpd_count += 1
+    def _get_current_counts(self, service: str, method: str, model: Optional[str] = None, api_key_suffix: Optional[str] = None) -> Tuple[int, int]:
+        rpm_count, rpd_count, _ = self._get_usage(service, method, model, api_key_suffix)
         return rpm_count, rpd_count
 
-    def can_make_call(self, service: str, method: str, model: Optional[str] = None, api_key_suffix: Optional[str] = None) -> Tuple[bool, str]:
-        rpm_count, rpd_count = self._get_current_counts(service, method, model, api_key_suffix)
+    def _get_usage(self, service: str, method: str, model: Optional[str] = None, api_key_suffix: Optional[str] = None) -> Tuple[int, int, int]:
+        with self._lock:
+            self._sync()
+            key = (service, method, model if service == "gemini" else None, api_key_suffix or None)
+            counter = self._counters.get(key)
+            if counter is None:
+                return 0, 0, 0
+            return counter.snapshot(time.time())
 
+    def _get_quotas(self, service: str, method: str, model: Optional[str] = None) -> Tuple[Optional[Dict[str, Any]], str]:
         if service == "gemini":
             if model not in self.service_quotas["gemini"]:
-                return False, f"Unknown Gemini model: {model}"
-            quotas = self.service_quotas["gemini"][model]
+                return None, f"Unknown Gemini model: {model}"
+            return self.service_quotas["gemini"][model], ""
         elif service == "reddit":
             if method not in self.service_quotas["reddit"]:
-                return False, f"Unknown Reddit method: {method}"
-            quotas = self.service_quotas["reddit"][method]
+                return None, f"Unknown Reddit method: {method}"
+            return self.service_quotas["reddit"][method], ""
         elif service == "google_search":
             if method not in self.service_quotas["google_search"]:
-                return False, f"Unknown Google Search method: {method}"
-            quotas = self.service_quotas["google_search"][method]
-        else:
-            return False, f"Unknown service: {service}"
+                return None, f"Unknown Google Search method: {method}"
+            return self.service_quotas["google_search"][method], ""
+        return None, f"Unknown service: {service}"
+
+    def can_make_call(self, service: str, method: str, model: Optional[str] = None, api_key_suffix: Optional[str] = None) -> Tuple[bool, str]:
+        quotas, reason = self._get_quotas(service, method, model)
+        if quotas is None:
+            return False, reason
 
-        if quotas.get("quota_type") == "rpm" and rpm_count >= quotas.get("limit", 0):
+        rpm_count, rpd_count, tpm_count = self._get_usage(service, method, model, api_key_suffix)
+
+        if quotas.get("rpm", -1) > 0 and rpm_count >= quotas["rpm"]:
             return False, f"Rate limit (RPM) exceeded for {service}/{method} (model: {model})."
-        
-        if quotas.get("quota_type") == "rpd" and rpd_count >= quotas.get("limit", 0):
+
+        if quotas.get("tpm", -1) > 0 and tpm_count >= quotas["tpm"]:
+            return False, f"Rate limit (TPM) exceeded for {service}/{method} (model: {model})."
+
+        if quotas.get("rpd", -1) > 0 and rpd_count >= quotas["rpd"]:
             return False, f"Rate limit (RPD) exceeded for {service}/{method} (model: {model})."
 
         return True, "Call allowed."
 
     def get_quot_info(self, service: str, method_name: str, model: Optional[str] = None, api_key_suffix: str = "") -> Dict[str, Any]:
-        rpm_count, rpd_count = self._get_current_counts(service, method_name, model, api_key_suffix)
-        
-        quotas = None
-        if service == "gemini":
-            quotas = self.service_quotas["gemini"].get(method_name)
-        elif service == "reddit":
-            quotas = self.service_quotas["reddit"].get(method_name)
-        elif service == "google_search":
-            quotas = self.service_quotas["google_search"].get(method_name)
-        else:
+        if service not in self.service_quotas:
             return {"error": "Quota information not found.", "message": "Unknown service.", "service": service, "method": method_name}
 
+        quotas, _ = self._get_quotas(service, method_name, model)
         if not quotas:
             return {"error": "Quota information not found."}
 
-        info = {
+        rpm_count, rpd_count, tpm_count = self._get_usage(service, method_name, model, api_key_suffix)
+
+        return {
             "service": service,
             "method": method_name,
-            "model": None,
-            "rpm_current": None,
-            "rpm_limit": None,
-            "rpd_current": None,
-            "rpd_limit": None,
+            "model": model,
+            "rpm_current": rpm_count,
+            "rpm_limit": quotas.get("rpm"),
+            "tpm_current": tpm_count,
+            "tpm_limit": quotas.get("tpm"),
+            "rpd_current": rpd_count,
+            "rpd_limit": quotas.get("rpd"),
             "message": f"Quota for {service}.{method_name} reached."
         }
-
-        if quotas.get("quota_type") == "rpm":
-            info["rpm_current"] = rpm_count
-            info["rpm_limit"] = quotas.get("limit")
-        elif quotas.get("quota_type") == "rpd":
-            info["rpd_current"] = rpd_count
-            info["rpd_limit"] = quotas.get("limit")
-            
-        return info
@@ -1,37 +1,116 @@
 import os
 import re
 import time
+import asyncio
 import threading
 
-from collections import deque
+from datetime import datetime
 from rich.console import Console
+from typing import Dict, Iterable, Optional, Tuple
+
 from services.support.logger_util import _log as log
+from services.support.api_call_tracker import SERVICE_QUOTAS
 
 console = Console()
 
+class _TokenBucket:
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float):
+        if now > self.updated_at:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_per_second)
+            self.updated_at = now
+
+    def ready_in(self, cost: float, now: float) -> float:
+        self._refill(now)
+        needed = min(cost, self.capacity) - self.tokens
+        if needed <= 0:
+            return 0.0
+        if self.refill_per_second <= 0:
+            return float('inf')
+        return needed / self.refill_per_second
+
+    def consume(self, cost: float, now: float):
+        self._refill(now)
+        self.tokens -= cost
+
+    def refund(self, amount: float, now: float):
+        self._refill(now)
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+class _KeyState:
+    def __init__(self, rpm: int, tpm: int, rpd: int):
+        self.rpm_bucket = _TokenBucket(rpm, rpm / 60.0)
+        self.tpm_bucket = _TokenBucket(tpm, tpm / 60.0) if tpm and tpm > 0 else None
+        self.rpd = rpd if rpd and rpd > 0 else None
+        self.day = datetime.now().date()
+        self.day_count = 0
+        self.cooldown_until = 0.0
+        self.last_used = 0.0
+
+    def _roll_day(self):
+        today = datetime.now().date()
+        if today != self.day:
+            self.day = today
+            self.day_count = 0
+
+    def ready_in(self, tokens: int, now: float) -> float:
+        self._roll_day()
+        if self.rpd is not None and self.day_count >= self.rpd:
+            return float('inf')
+
+        wait = max(0.0, self.cooldown_until - now)
+        wait = max(wait, self.rpm_bucket.ready_in(1, now))
+        if self.tpm_bucket is not None:
+            wait = max(wait, self.tpm_bucket.ready_in(tokens, now))
+        return wait
+
+    def consume(self, tokens: int, now: float):
+        self.rpm_bucket.consume(1, now)
+        if self.tpm_bucket is not None and tokens:
+            self.tpm_bucket.consume(tokens, now)
+        self.day_count += 1
+        self.last_used = now
+
 class APIKeyPool:
-    def __init__(self, api_keys_string: str = None, rpm: int = 60, verbose: bool = False):
+    def __init__(self, api_keys_string: str = None, rpm: int = 60, verbose: bool = False, model_name: Optional[str] = None, service: str = "gemini"):
         self.api_keys = []
-        self.key_usage_times = {}
         self.rpm = rpm
-        self.lock = threading.Lock()
-        self.key_index = 0
+        self.tpm = -1
+        self.rpd = -1
         self.verbose = verbose
-        self._cooldowns = {}
+        self.lock = threading.Lock()
+        self._available = threading.Condition(self.lock)
+        self._states: Dict[str, _KeyState] = {}
+        self._apply_quotas(service, model_name)
         self.load_keys(api_keys_string, verbose)
 
+    def _apply_quotas(self, service: str, model_name: Optional[str]):
+        quotas = SERVICE_QUOTAS.get(service, {}).get(model_name) if model_name else None
+        if not quotas:
+            return
+        if quotas.get("rpm", -1) > 0:
+            self.rpm = min(self.rpm, quotas["rpm"])
+        self.tpm = quotas.get("tpm", -1)
+        self.rpd = quotas.get("rpd", -1)
+
+    def _new_state(self) -> _KeyState:
+        return _KeyState(self.rpm, self.tpm, self.rpd)
+
     def set_explicit_key(self, api_key: str):
         with self.lock:
             self.api_keys = [api_key.strip()]
-            self.key_usage_times = {api_key.strip(): deque()}
-            self.key_index = 0
+            self._states = {api_key.strip(): self._new_state()}
+            self._available.notify_all()
 
     def load_keys(self, api_keys_string: str = None, verbose: bool = False):
         with self.lock:
             self.api_keys = []
-            self.key_usage_times = {}
-            self.key_index = 0
-            self._cooldowns = {}
+            self._states = {}
 
             keys_to_load = []
             if api_keys_string:
@@ -44,39 +123,83 @@ class APIKeyPool:
                 return
 
             self.api_keys.extend(keys_to_load)
-            self.key_usage_times = {key: deque() for key in self.api_keys}
+            self._states = {key: self._new_state() for key in self.api_keys}
+            self._available.notify_all()
 
-    def get_key(self):
+    def _schedule(self, tokens: int, exclude: Optional[Iterable[str]]) -> Tuple[Optional[str], float]:
+        now = time.monotonic()
+        excluded = set(exclude or ())
+        best_key, best_rank = None, None
+        for key in self.api_keys:
+            if key in excluded:
+                continue
+            state = self._states[key]
+            wait = state.ready_in(tokens, now)
+            rank = (wait, -state.rpm_bucket.tokens, state.last_used)
+            if best_rank is None or rank < best_rank:
+                best_key, best_rank = key, rank
+
+        if best_key is None:
+            return None, float('inf')
+        if best_rank[0] == 0:
+            self._states[best_key].consume(tokens, now)
+        return best_key, best_rank[0]
+
+    def try_acquire(self, tokens: int = 0, exclude: Optional[Iterable[str]] = None) -> Tuple[Optional[str], float]:
         with self.lock:
-            if not self.api_keys:
-                return None
+            key, wait = self._schedule(tokens, exclude)
+            return (key, 0.0) if key and wait == 0 else (None, wait)
 
+    def acquire(self, timeout: Optional[float] = None, tokens: int = 0, exclude: Optional[Iterable[str]] = None) -> Optional[str]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.lock:
             while True:
-                current_key = self.api_keys[self.key_index]
-                self.key_index = (self.key_index + 1) % len(self.api_keys)
-
-                current_time = time.time()
-                cooldown_until = self._cooldowns.get(current_key)
-                if cooldown_until and cooldown_until > current_time:
-                    continue
-                
-                while self.key_usage_times[current_key] and \
-                      self.key_usage_times[current_key][0] <= current_time - 60:
-                    self.key_usage_times[current_key].popleft()
-                
-                if len(self.key_usage_times[current_key]) < self.rpm:
-                    self.key_usage_times[current_key].append(current_time)
-                    return current_key
-                else:
-                    time_to_wait = 60 - (current_time - self.key_usage_times[current_key][0])
-                    if time_to_wait > 0:
-                        time.sleep(time_to_wait)
+                key, wait = self._schedule(tokens, exclude)
+                if key and wait == 0:
+                    return key
+                if wait == float('inf'):
+                    log("No API key can serve a request (pool empty or daily quota exhausted).", self.verbose, log_caller_file="api_key_pool.py")
+                    return None
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return None
+                    wait = min(wait, remaining)
+                log(f"All API keys busy, next slot in {wait:.1f}s", self.verbose, log_caller_file="api_key_pool.py")
+                self._available.wait(wait)
+
+    async def acquire_async(self, timeout: Optional[float] = None, tokens: int = 0, exclude: Optional[Iterable[str]] = None) -> Optional[str]:
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            key, wait = self.try_acquire(tokens, exclude)
+            if key:
+                return key
+            if wait == float('inf'):
+                return None
+            if deadline is not None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return None
+                wait = min(wait, remaining)
+            await asyncio.sleep(min(wait, 1.0))
+
+    def get_key(self):
+        return self.acquire()
+
+    def next_available_in(self, tokens: int = 0) -> float:
+        with self.lock:
+            now = time.monotonic()
+            waits = [self._states[key].ready_in(tokens, now) for key in self.api_keys]
+            return min(waits) if waits else float('inf')
 
     def mark_cooldown(self, api_key: str, seconds: float = 65.0):
         with self.lock:
-            if api_key:
-                self._cooldowns[api_key] = time.time() + max(1.0, seconds)
+            state = self._states.get(api_key)
+            if state:
+                state.cooldown_until = time.monotonic() + max(1.0, seconds)
                 log(f"Key ending with {api_key[-4:]} put on cooldown for {int(seconds)}s", self.verbose, log_caller_file="api_key_pool.py")
+                self._available.notify_all()
 
     def report_failure(self, api_key: str, error: Exception | str):
         message = str(error) if error is not None else ""
@@ -89,7 +212,16 @@ class APIKeyPool:
         with self.lock:
             return len(self.api_keys)
 
-    def release_key(self, api_key: str, success: bool):
+    def release_key(self, api_key: str, success: bool, tokens_used: Optional[int] = None, tokens_reserved: int = 0):
         with self.lock:
-            if not success:
-                self.report_failure(api_key, "API call failed, putting key on cooldown.")
\ No newline at end of file
+            state = self._states.get(api_key)
+            if state and state.tpm_bucket is not None and tokens_used is not None:
+                now = time.monotonic()
+                delta = tokens_used - tokens_reserved
+                if delta > 0:
+                    state.tpm_bucket.consume(delta, now)
+                elif delta < 0:
+                    state.tpm_bucket.refund(-delta, now)
+                self._available.notify_all()
+        if not success:
+            self.report_failure(api_key, "API call failed, putting key on cooldown.")
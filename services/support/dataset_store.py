@@ -0,0 +1,209 @@
+import os
+import json
+import gzip
+import time
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from services.support.logger_util import _log as log
+from services.support.path_config import ensure_dir_exists, get_dataset_columns_path, get_latest_artifacts
+
+DATASET_EXTENSION = ".jsonl"
+LEGACY_EXTENSION = ".json"
+HEADER_KEY = "__dataset__"
+
+Predicate = Callable[[Any], bool]
+
+def to_dataset_path(path: str) -> str:
+    root, extension = os.path.splitext(path)
+    return path if extension == DATASET_EXTENSION else f"{root}{DATASET_EXTENSION}"
+
+def resolve_dataset_path(path: str) -> Optional[str]:
+    dataset_path = to_dataset_path(path)
+    for candidate in (dataset_path, f"{os.path.splitext(dataset_path)[0]}{LEGACY_EXTENSION}"):
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+def get_field(record: Dict[str, Any], field: str) -> Any:
+    value: Any = record
+    for part in field.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+def _project(record: Dict[str, Any], fields: Optional[Sequence[str]]) -> Dict[str, Any]:
+    if not fields:
+        return record
+    projected: Dict[str, Any] = {}
+    for field in fields:
+        value = get_field(record, field)
+        if value is None:
+            continue
+        parts = field.split('.')
+        target = projected
+        for part in parts[:-1]:
+            target = target.setdefault(part, {})
+        target[parts[-1]] = value
+    return projected
+
+def _matches(record: Dict[str, Any], where: Optional[Dict[str, Predicate]]) -> bool:
+    return not where or all(predicate(get_field(record, field)) for field, predicate in where.items())
+
+def _as_number(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        try:
+            return float(value.replace(',', ''))
+        except ValueError:
+            return None
+    return None
+
+def write_dataset(path: str, records: Iterable[Dict[str, Any]], metadata: Optional[Dict[str, Any]] = None, numeric_fields: Sequence[str] = (), verbose: bool = False) -> str:
+    path = to_dataset_path(path)
+    ensure_dir_exists(os.path.dirname(path))
+    tmp_path = f"{path}.tmp"
+    offsets: List[int] = []
+    columns: Dict[str, List[Optional[float]]] = {field: [] for field in numeric_fields}
+
+    with open(tmp_path, 'wb') as f:
+        f.write((json.dumps({HEADER_KEY: metadata or {}}, ensure_ascii=False, default=str) + "\n").encode('utf-8'))
+        for record in records:
+            offsets.append(f.tell())
+            f.write((json.dumps(record, ensure_ascii=False, default=str) + "\n").encode('utf-8'))
+            for field in numeric_fields:
+                columns[field].append(_as_number(get_field(record, field)))
+    os.replace(tmp_path, path)
+
+    columns_path = get_dataset_columns_path(path)
+    if numeric_fields:
+        sidecar = {"rows": len(offsets), "size": os.path.getsize(path), "offsets": offsets, "columns": columns}
+        with gzip.open(f"{columns_path}.tmp", 'wt', encoding='utf-8') as f:
+            json.dump(sidecar, f)
+        os.replace(f"{columns_path}.tmp", columns_path)
+    elif os.path.exists(columns_path):
+        os.remove(columns_path)
+
+    log(f"Wrote {len(offsets)} records to {os.path.basename(path)}{f' with columns {list(numeric_fields)}' if numeric_fields else ''}", verbose, log_caller_file="dataset_store.py")
+    return path
+
+def _load_columns(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with gzip.open(get_dataset_columns_path(path), 'rt', encoding='utf-8') as f:
+            sidecar = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if sidecar.get("size") != os.path.getsize(path):
+        return None
+    return sidecar
+
+def _load_legacy(path: str, records_key: Optional[str]) -> Any:
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        if records_key:
+            return data, data.get(records_key, [])
+        return data, next((value for value in data.values() if isinstance(value, list)), [])
+    return {}, data
+
+def read_dataset_metadata(path: str, records_key: Optional[str] = None) -> Dict[str, Any]:
+    if not path.endswith(DATASET_EXTENSION):
+        data, records = _load_legacy(path, records_key)
+        return {key: value for key, value in data.items() if value is not records}
+    with open(path, 'rb') as f:
+        header = json.loads(f.readline() or b'{}')
+    return header.get(HEADER_KEY, {}) if isinstance(header, dict) else {}
+
+def count_dataset_records(path: str, records_key: Optional[str] = None) -> int:
+    if not path.endswith(DATASET_EXTENSION):
+        return len(_load_legacy(path, records_key)[1])
+    sidecar = _load_columns(path)
+    if sidecar is not None:
+        return sidecar["rows"]
+    with open(path, 'rb') as f:
+        return max(0, sum(1 for line in f if line.strip()) - 1)
+
+def read_dataset(path: str, fields: Optional[Sequence[str]] = None, where: Optional[Dict[str, Predicate]] = None, records_key: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    if not path.endswith(DATASET_EXTENSION):
+        for record in _load_legacy(path, records_key)[1]:
+            if _matches(record, where):
+                yield _project(record, fields)
+        return
+
+    sidecar = _load_columns(path) if where else None
+    if sidecar is not None and all(field in sidecar["columns"] for field in where):
+        rows = [
+            row for row in range(sidecar["rows"])
+            if all(predicate(sidecar["columns"][field][row]) for field, predicate in where.items())
+        ]
+        with open(path, 'rb') as f:
+            for row in rows:
+                f.seek(sidecar["offsets"][row])
+                yield _project(json.loads(f.readline()), fields)
+        return
+
+    with open(path, 'rb') as f:
+        f.readline()
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if _matches(record, where):
+                yield _project(record, fields)
+
+def read_dataset_columns(path: str, fields: Sequence[str], records_key: Optional[str] = None) -> Dict[str, List[Optional[float]]]:
+    sidecar = _load_columns(path) if path.endswith(DATASET_EXTENSION) else None
+    if sidecar is not None and all(field in sidecar["columns"] for field in fields):
+        return {field: sidecar["columns"][field] for field in fields}
+
+    columns: Dict[str, List[Optional[float]]] = {field: [] for field in fields}
+    for record in read_dataset(path, fields=fields, records_key=records_key):
+        for field in fields:
+            columns[field].append(_as_number(get_field(record, field)))
+    return columns
+
+def query_dataset_history(profile: str, platform: str, kind: str, fields: Optional[Sequence[str]] = None, where: Optional[Dict[str, Predicate]] = None, days: Optional[float] = None, limit_files: Optional[int] = None, records_key: Optional[str] = None, verbose: bool = False) -> Iterator[Dict[str, Any]]:
+    created_after = time.time() - days * 86400 if days else None
+    paths = get_latest_artifacts(profile, platform, kind, limit=limit_files, created_after=created_after)
+    log(f"Reading {len(paths)} {platform} {kind} datasets for profile '{profile}'", verbose, log_caller_file="dataset_store.py")
+    for path in reversed(paths):
+        try:
+            yield from read_dataset(path, fields=fields, where=where, records_key=records_key)
+        except (OSError, ValueError) as e:
+            log(f"Error reading dataset {path}: {e}", verbose, is_error=True, log_caller_file="dataset_store.py")
+
+# Newest file first, so the freshest copy of a record wins; only keys are kept for deduplication, never the records
+def read_recent_datasets(profile: str, platform: str, kind: str, latest_path: str, key_fn: Callable[[Dict[str, Any]], Any], days: Optional[float] = None, records_key: Optional[str] = None, verbose: bool = False) -> Iterator[Dict[str, Any]]:
+    latest_path = os.path.abspath(latest_path)
+    paths = [latest_path]
+    if days:
+        paths += [path for path in get_latest_artifacts(profile, platform, kind, limit=None, created_after=time.time() - days * 86400) if path != latest_path]
+
+    seen_keys = set()
+    yielded = 0
+    for path in paths:
+        try:
+            for record in read_dataset(path, records_key=records_key):
+                key = key_fn(record)
+                if key:
+                    if key in seen_keys:
+                        continue
+                    seen_keys.add(key)
+                yielded += 1
+                yield record
+        except (OSError, ValueError) as e:
+            if path == latest_path:
+                raise
+            log(f"Error reading dataset {path}: {e}", verbose, is_error=True, log_caller_file="dataset_store.py")
+    if len(paths) > 1:
+        log(f"Merged {yielded} unique records from {len(paths)} {platform} {kind} datasets for profile '{profile}'", verbose, log_caller_file="dataset_store.py")
+
+def count_through(records: Iterable[Dict[str, Any]], counts: Dict[str, int], name: str) -> Iterator[Dict[str, Any]]:
+    counts.setdefault(name, 0)
+    for record in records:
+        counts[name] += 1
+        yield record
@@ -0,0 +1,94 @@
+import os
+import time
+import struct
+import select
+import ctypes
+import ctypes.util
+
+from typing import Optional, Sequence, Set
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+EVENT_HEADER = struct.Struct("iIII")
+FALLBACK_POLL_SECONDS = 0.25
+
+def _load_inotify():
+    if not hasattr(select, "select") or not os.path.exists("/proc/sys/fs/inotify"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+        return libc
+    except (OSError, AttributeError, TypeError):
+        return None
+
+_libc = _load_inotify()
+
+class DirectoryWatcher:
+    def __init__(self, path: str):
+        self.path = path
+        self.fd: Optional[int] = None
+        self.seen: Set[str] = set()
+
+    def __enter__(self):
+        os.makedirs(self.path, exist_ok=True)
+        if _libc is not None:
+            fd = _libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd >= 0 and _libc.inotify_add_watch(fd, os.fsencode(self.path), IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE) >= 0:
+                self.fd = fd
+            elif fd >= 0:
+                os.close(fd)
+        self.seen = set(os.listdir(self.path))
+        return self
+
+    def __exit__(self, *exc):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self.fd is not None
+
+    def _match(self, name: str, suffixes: Sequence[str]) -> bool:
+        return name not in self.seen and name.endswith(tuple(suffixes)) and os.path.exists(os.path.join(self.path, name))
+
+    def _drain_events(self, timeout: float) -> Set[str]:
+        names: Set[str] = set()
+        readable, _, _ = select.select([self.fd], [], [], max(0.0, timeout))
+        if not readable:
+            return names
+        try:
+            buffer = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return names
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(buffer):
+            _, _, _, length = EVENT_HEADER.unpack_from(buffer, offset)
+            offset += EVENT_HEADER.size
+            name = buffer[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+            offset += length
+            if name:
+                names.add(name)
+        return names
+
+    def wait_for_new(self, suffixes: Sequence[str], timeout: float) -> Optional[str]:
+        deadline = time.monotonic() + timeout
+        candidates = set(os.listdir(self.path))
+        while True:
+            for name in sorted(candidates):
+                if self._match(name, suffixes):
+                    self.seen.add(name)
+                    return name
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            if self.fd is not None:
+                candidates = self._drain_events(remaining)
+            else:
+                time.sleep(min(FALLBACK_POLL_SECONDS, remaining))
+                candidates = set(os.listdir(self.path))
@@ -0,0 +1,398 @@
+# socials driver-pool start [--max-browsers 4] [--idle-timeout 900] [--verbose]
+# socials driver-pool status
+# socials driver-pool stop
+
+import os
+import sys
+import json
+import time
+import uuid
+import socket
+import argparse
+import threading
+
+from dotenv import load_dotenv
+from rich.console import Console
+from typing import Any, Dict, Optional, Tuple
+from multiprocessing.connection import Client, Listener
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services.support.logger_util import _log as log
+from services.support.web_driver_handler import setup_driver
+from services.support.path_config import get_driver_pool_socket_path, initialize_directories
+
+console = Console()
+
+DEFAULT_MAX_BROWSERS = 4
+DEFAULT_IDLE_TIMEOUT = 900.0
+HEALTH_CHECK_INTERVAL = 30.0
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+class _PooledSession:
+    def __init__(self, key: Tuple[str, str], signature: str):
+        self.key = key
+        self.signature = signature
+        self.driver = None
+        self.port = None
+        self.starting = True
+        self.lease_id = None
+        self.leased_by = None
+        self.created_at = time.time()
+        self.last_used = time.time()
+        self.leases = 0
+
+    @property
+    def debugger_address(self) -> str:
+        return f"127.0.0.1:{self.port}"
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "user_data_dir": self.key[0],
+            "profile": self.key[1],
+            "debugger_address": self.debugger_address if self.port else None,
+            "state": "starting" if self.starting else ("leased" if self.lease_id else "idle"),
+            "leased_by": self.leased_by,
+            "leases": self.leases,
+            "idle_seconds": int(time.time() - self.last_used) if not self.lease_id else 0,
+            "age_seconds": int(time.time() - self.created_at)
+        }
+
+class DriverPool:
+    def __init__(self, max_browsers: int = DEFAULT_MAX_BROWSERS, idle_timeout: float = DEFAULT_IDLE_TIMEOUT, verbose: bool = False):
+        self.max_browsers = max(1, max_browsers)
+        self.idle_timeout = idle_timeout
+        self.verbose = verbose
+        self.lock = threading.Lock()
+        self._changed = threading.Condition(self.lock)
+        self.sessions: Dict[Tuple[str, str], _PooledSession] = {}
+        self.stopping = threading.Event()
+        self.socket_path = None
+
+    def _signature(self, request: Dict[str, Any]) -> str:
+        return json.dumps([
+            bool(request.get("headless")),
+            bool(request.get("incognito")),
+            request.get("prefs") or {},
+            sorted(request.get("additional_arguments") or [])
+        ], sort_keys=True, default=str)
+
+    def _is_healthy(self, session: _PooledSession) -> bool:
+        try:
+            session.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _close(self, session: _PooledSession, reason: str):
+        log(f"Closing browser for {session.key[0]} ({reason})", self.verbose, log_caller_file="driver_pool.py")
+        try:
+            session.driver.quit()
+        except Exception as e:
+            log(f"Error closing browser for {session.key[0]}: {e}", self.verbose, is_error=True, log_caller_file="driver_pool.py")
+
+    def _reap_dead_leases(self):
+        for session in self.sessions.values():
+            if session.lease_id and not _pid_alive(session.leased_by):
+                log(f"Reclaiming browser for {session.key[0]} from exited process {session.leased_by}", self.verbose, log_caller_file="driver_pool.py")
+                session.lease_id = None
+                session.leased_by = None
+                session.last_used = time.time()
+
+    def _evict_lru_idle(self) -> Optional[_PooledSession]:
+        idle = [session for session in self.sessions.values() if not session.starting and not session.lease_id]
+        if not idle:
+            return None
+        victim = min(idle, key=lambda session: session.last_used)
+        del self.sessions[victim.key]
+        return victim
+
+    def _start(self, session: _PooledSession, request: Dict[str, Any]):
+        session.port = _free_port()
+        additional_arguments = list(request.get("additional_arguments") or [])
+        additional_arguments.append(f"--remote-debugging-port={session.port}")
+        driver, _ = setup_driver(
+            session.key[0],
+            incognito=bool(request.get("incognito")),
+            profile=session.key[1],
+            headless=bool(request.get("headless")),
+            prefs=request.get("prefs"),
+            additional_arguments=additional_arguments,
+            verbose=self.verbose,
+            pooled=False
+        )
+        session.driver = driver
+
+    def lease(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        key = (os.path.abspath(request["user_data_dir"]), request.get("profile") or "Default")
+        signature = self._signature(request)
+        deadline = time.monotonic() + float(request.get("timeout") or 300)
+
+        while True:
+            session, response = self._reserve(key, signature, request, deadline)
+            if response is None:
+                break
+            if not response.get("ok"):
+                return response
+            if self._is_healthy(session):
+                return response
+            with self.lock:
+                if self.sessions.get(key) is session:
+                    del self.sessions[key]
+                self._changed.notify_all()
+            self._close(session, "failed health check")
+
+        try:
+            self._start(session, request)
+        except Exception as e:
+            with self.lock:
+                self.sessions.pop(key, None)
+                self._changed.notify_all()
+            log(f"Failed to launch browser for {key[0]}: {e}", self.verbose, is_error=True, log_caller_file="driver_pool.py")
+            return {"ok": False, "error": str(e)}
+
+        with self.lock:
+            session.starting = False
+            self._changed.notify_all()
+            return self._grant(session, request, reused=False)
+
+    def _reserve(self, key: Tuple[str, str], signature: str, request: Dict[str, Any], deadline: float) -> Tuple[Optional[_PooledSession], Optional[Dict[str, Any]]]:
+        with self.lock:
+            while True:
+                self._reap_dead_leases()
+                to_close = []
+                session = self.sessions.get(key)
+
+                if session and not session.starting and not session.lease_id:
+                    if session.signature == signature:
+                        return session, self._grant(session, request, reused=True)
+                    del self.sessions[key]
+                    to_close.append((session, "launch options changed"))
+                elif session is None:
+                    if len(self.sessions) >= self.max_browsers:
+                        victim = self._evict_lru_idle()
+                        if victim:
+                            to_close.append((victim, "making room for a new profile"))
+                    if not to_close and len(self.sessions) < self.max_browsers:
+                        session = _PooledSession(key, signature)
+                        self.sessions[key] = session
+                        return session, None
+
+                if to_close:
+                    self.lock.release()
+                    try:
+                        for closing, reason in to_close:
+                            self._close(closing, reason)
+                    finally:
+                        self.lock.acquire()
+                    continue
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None, {"ok": False, "error": "timed out waiting for a browser slot"}
+                self._changed.wait(min(remaining, 5.0))
+
+    def _grant(self, session: _PooledSession, request: Dict[str, Any], reused: bool) -> Dict[str, Any]:
+        session.lease_id = uuid.uuid4().hex
+        session.leased_by = request.get("pid")
+        session.leases += 1
+        session.last_used = time.time()
+        log(f"Leased {'warm' if reused else 'new'} browser for {session.key[0]} to pid {session.leased_by}", self.verbose, log_caller_file="driver_pool.py")
+        return {"ok": True, "lease_id": session.lease_id, "debugger_address": session.debugger_address, "reused": reused}
+
+    def release(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        to_close = None
+        with self.lock:
+            for key, session in list(self.sessions.items()):
+                if session.lease_id == request.get("lease_id"):
+                    session.lease_id = None
+                    session.leased_by = None
+                    session.last_used = time.time()
+                    if not request.get("healthy", True):
+                        del self.sessions[key]
+                        to_close = session
+                    self._changed.notify_all()
+                    break
+            else:
+                return {"ok": False, "error": "unknown lease"}
+
+        if to_close:
+            self._close(to_close, "released as unhealthy")
+        return {"ok": True}
+
+    def evict(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        key = (os.path.abspath(request["user_data_dir"]), request.get("profile") or "Default")
+        with self.lock:
+            session = self.sessions.get(key)
+            if not session or session.starting or session.lease_id:
+                return {"ok": False, "error": "no idle browser for profile"}
+            del self.sessions[key]
+            self._changed.notify_all()
+        self._close(session, "evicted on request")
+        return {"ok": True}
+
+    def status(self) -> Dict[str, Any]:
+        with self.lock:
+            self._reap_dead_leases()
+            return {
+                "ok": True,
+                "max_browsers": self.max_browsers,
+                "idle_timeout": self.idle_timeout,
+                "sessions": [session.as_dict() for session in self.sessions.values()]
+            }
+
+    def maintain(self):
+        while not self.stopping.wait(HEALTH_CHECK_INTERVAL):
+            to_close, to_check = [], []
+            with self.lock:
+                self._reap_dead_leases()
+                now = time.time()
+                for key, session in list(self.sessions.items()):
+                    if session.starting or session.lease_id:
+                        continue
+                    if now - session.last_used > self.idle_timeout:
+                        del self.sessions[key]
+                        to_close.append((session, f"idle for {int(now - session.last_used)}s"))
+                    else:
+                        session.lease_id = "health-check"
+                        session.leased_by = os.getpid()
+                        to_check.append(session)
+                if to_close:
+                    self._changed.notify_all()
+
+            for session in to_check:
+                healthy = self._is_healthy(session)
+                with self.lock:
+                    session.lease_id = None
+                    session.leased_by = None
+                    if not healthy and self.sessions.get(session.key) is session:
+                        del self.sessions[session.key]
+                        to_close.append((session, "failed health check"))
+                    self._changed.notify_all()
+
+            for session, reason in to_close:
+                self._close(session, reason)
+
+    def shutdown(self):
+        self.stopping.set()
+        with self.lock:
+            sessions = list(self.sessions.values())
+            self.sessions = {}
+            self._changed.notify_all()
+        for session in sessions:
+            if session.driver is not None:
+                self._close(session, "pool shutting down")
+
+    def handle(self, conn):
+        try:
+            request = conn.recv()
+            op = request.get("op")
+            if op == "lease":
+                response = self.lease(request)
+            elif op == "release":
+                response = self.release(request)
+            elif op == "evict":
+                response = self.evict(request)
+            elif op == "status":
+                response = self.status()
+            elif op == "stop":
+                response = {"ok": True}
+                self.stopping.set()
+                threading.Thread(target=self._wake_listener, daemon=True).start()
+            else:
+                response = {"ok": False, "error": f"unknown op {op}"}
+            conn.send(response)
+        except (EOFError, OSError):
+            pass
+        except Exception as e:
+            log(f"Error handling driver pool request: {e}", self.verbose, is_error=True, log_caller_file="driver_pool.py")
+        finally:
+            conn.close()
+
+    def _wake_listener(self):
+        try:
+            Client(self.socket_path, family='AF_UNIX').close()
+        except OSError:
+            pass
+
+    def serve(self, socket_path: str):
+        self.socket_path = socket_path
+        if os.path.exists(socket_path):
+            try:
+                Client(socket_path, family='AF_UNIX').close()
+                raise RuntimeError(f"Driver pool already running at {socket_path}")
+            except OSError:
+                os.remove(socket_path)
+
+        listener = Listener(socket_path, family='AF_UNIX')
+        os.chmod(socket_path, 0o600)
+        threading.Thread(target=self.maintain, daemon=True).start()
+        log(f"Driver pool listening on {socket_path} (max {self.max_browsers} browsers, idle timeout {int(self.idle_timeout)}s)", True, log_caller_file="driver_pool.py")
+
+        try:
+            while not self.stopping.is_set():
+                conn = listener.accept()
+                threading.Thread(target=self.handle, args=(conn,), daemon=True).start()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            listener.close()
+            self.shutdown()
+            log("Driver pool stopped", True, log_caller_file="driver_pool.py")
+
+def _send(request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    try:
+        conn = Client(get_driver_pool_socket_path(), family='AF_UNIX')
+    except OSError:
+        return None
+    try:
+        conn.send(request)
+        return conn.recv()
+    finally:
+        conn.close()
+
+def main():
+    load_dotenv()
+    initialize_directories()
+    parser = argparse.ArgumentParser(description="Warm browser session pool shared across socials commands")
+    parser.add_argument("command", choices=["start", "status", "stop"], help="'start' runs the pool in the foreground, 'status' lists pooled browsers, 'stop' shuts the pool down")
+    parser.add_argument("--max-browsers", type=int, default=int(os.getenv("DRIVER_POOL_MAX_BROWSERS", DEFAULT_MAX_BROWSERS)), help="Maximum number of concurrent browsers")
+    parser.add_argument("--idle-timeout", type=float, default=float(os.getenv("DRIVER_POOL_IDLE_SECONDS", DEFAULT_IDLE_TIMEOUT)), help="Seconds an unused browser stays warm before it is closed")
+    parser.add_argument("--verbose", action="store_true", help="Enable detailed logging")
+    args = parser.parse_args()
+
+    if args.command == "start":
+        DriverPool(max_browsers=args.max_browsers, idle_timeout=args.idle_timeout, verbose=args.verbose).serve(get_driver_pool_socket_path())
+        return
+
+    response = _send({"op": args.command})
+    if response is None:
+        log("Driver pool is not running.", True, log_caller_file="driver_pool.py")
+        return
+
+    if args.command == "stop":
+        log("Driver pool is stopping.", True, log_caller_file="driver_pool.py")
+        return
+
+    sessions = response.get("sessions", [])
+    log(f"Driver pool: {len(sessions)}/{response.get('max_browsers')} browsers, idle timeout {int(response.get('idle_timeout', 0))}s", True, log_caller_file="driver_pool.py")
+    for session in sessions:
+        log(f"  {session['state']:<8} {session['user_data_dir']} [{session['profile']}] at {session['debugger_address']} leases={session['leases']} idle={session['idle_seconds']}s", True, log_caller_file="driver_pool.py")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import os
+import re
+import math
+import time
+import sqlite3
+import hashlib
+import threading
+
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from services.support.logger_util import _log as log
+from services.support.path_config import get_example_index_path, ensure_dir_exists
+
+EXAMPLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS examples (
+    example_id TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    response TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    added_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    example_id TEXT NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (term, example_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_postings_example ON postings (example_id);
+"""
+BM25_K1 = 1.2
+BM25_B = 0.75
+QUERY_CHUNK_SIZE = 500
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9'_-]*")
+URL_PATTERN = re.compile(r"https?://\S+")
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have i if in is it its of on or our so that the their them they this to was we were what when which who will with you your
+""".split())
+
+Example = Tuple[str, str]
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN_PATTERN.findall(URL_PATTERN.sub(" ", (text or "").lower())) if token not in STOPWORDS and len(token) > 1]
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+def example_id(source: str, response: str) -> str:
+    return hashlib.sha1(f"{source}\0{response}".encode('utf-8')).hexdigest()
+
+class ExampleIndex:
+    def __init__(self, path: str, verbose: bool = False):
+        self.path = path
+        self.verbose = verbose
+        self.lock = threading.Lock()
+        self.synced_ids: Optional[Set[str]] = None
+
+        ensure_dir_exists(os.path.dirname(path))
+        self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(EXAMPLE_SCHEMA)
+
+    # Only examples that are new since the last sync get tokenized; ones that left the approved set are dropped
+    def sync(self, examples: Iterable[Example]) -> Tuple[int, int]:
+        wanted: Dict[str, Example] = {}
+        for source, response in examples:
+            if source and response:
+                wanted.setdefault(example_id(source, response), (source, response))
+
+        with self.lock:
+            if self.synced_ids is not None and self.synced_ids == wanted.keys():
+                return 0, 0
+            existing = {row[0] for row in self.connection.execute("SELECT example_id FROM examples")}
+            added = [key for key in wanted if key not in existing]
+            removed = [key for key in existing if key not in wanted]
+            now = time.time()
+            with self.connection:
+                for key in added:
+                    source, response = wanted[key]
+                    terms = Counter(tokenize(source))
+                    self.connection.execute("INSERT INTO examples (example_id, source, response, length, added_at) VALUES (?, ?, ?, ?, ?)", (key, source, response, sum(terms.values()), now))
+                    self.connection.executemany("INSERT INTO postings (term, example_id, tf) VALUES (?, ?, ?)", [(term, key, tf) for term, tf in terms.items()])
+                for start in range(0, len(removed), QUERY_CHUNK_SIZE):
+                    chunk = removed[start:start + QUERY_CHUNK_SIZE]
+                    placeholders = ', '.join('?' for _ in chunk)
+                    self.connection.execute(f"DELETE FROM postings WHERE example_id IN ({placeholders})", chunk)
+                    self.connection.execute(f"DELETE FROM examples WHERE example_id IN ({placeholders})", chunk)
+            self.synced_ids = set(wanted)
+
+        if added or removed:
+            log(f"Example index {os.path.basename(self.path)}: {len(added)} added, {len(removed)} removed, {len(wanted)} total", self.verbose, log_caller_file="example_index.py")
+        return len(added), len(removed)
+
+    def _score(self, query_terms: Sequence[str]) -> Dict[str, float]:
+        count, total_length = self.connection.execute("SELECT COUNT(*), COALESCE(SUM(length), 0) FROM examples").fetchone()
+        if not count or not query_terms:
+            return {}
+        average_length = max(total_length / count, 1.0)
+        query_counts = Counter(query_terms)
+        terms = list(query_counts)
+
+        postings: Dict[str, List[Tuple[str, int]]] = {}
+        for start in range(0, len(terms), QUERY_CHUNK_SIZE):
+            chunk = terms[start:start + QUERY_CHUNK_SIZE]
+            for term, key, tf in self.connection.execute(f"SELECT term, example_id, tf FROM postings WHERE term IN ({', '.join('?' for _ in chunk)})", chunk):
+                postings.setdefault(term, []).append((key, tf))
+        if not postings:
+            return {}
+
+        candidates = {key for rows in postings.values() for key, _ in rows}
+        lengths = {}
+        candidate_list = list(candidates)
+        for start in range(0, len(candidate_list), QUERY_CHUNK_SIZE):
+            chunk = candidate_list[start:start + QUERY_CHUNK_SIZE]
+            lengths.update(self.connection.execute(f"SELECT example_id, length FROM examples WHERE example_id IN ({', '.join('?' for _ in chunk)})", chunk))
+
+        scores: Dict[str, float] = {}
+        for term, rows in postings.items():
+            idf = math.log(1 + (count - len(rows) + 0.5) / (len(rows) + 0.5))
+            for key, tf in rows:
+                norm = tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * lengths.get(key, average_length) / average_length))
+                scores[key] = scores.get(key, 0.0) + idf * norm * query_counts[term]
+        return scores
+
+    def search(self, query: str, k: int = 8, token_budget: int = 1500) -> List[Example]:
+        with self.lock:
+            scores = self._score(tokenize(query))
+            ranked = sorted(scores, key=scores.__getitem__, reverse=True)[:k]
+            # Unrelated targets still get a few recent examples so the writing style carries over
+            if len(ranked) < k:
+                chosen = set(ranked)
+                recent = self.connection.execute("SELECT example_id FROM examples ORDER BY added_at DESC LIMIT ?", (k + len(ranked),))
+                ranked += [row[0] for row in recent if row[0] not in chosen][:k - len(ranked)]
+            rows = {}
+            for start in range(0, len(ranked), QUERY_CHUNK_SIZE):
+                chunk = ranked[start:start + QUERY_CHUNK_SIZE]
+                rows.update((key, (source, response)) for key, source, response in self.connection.execute(f"SELECT example_id, source, response FROM examples WHERE example_id IN ({', '.join('?' for _ in chunk)})", chunk))
+
+        selected: List[Example] = []
+        used = 0
+        for key in ranked:
+            if key not in rows:
+                continue
+            cost = estimate_tokens(rows[key][0]) + estimate_tokens(rows[key][1])
+            if selected and used + cost > token_budget:
+                continue
+            selected.append(rows[key])
+            used += cost
+        return selected
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+_example_indexes: Dict[Tuple[str, str], ExampleIndex] = {}
+_example_indexes_lock = threading.Lock()
+
+def get_example_index(profile_name: str, platform: str, verbose: bool = False) -> ExampleIndex:
+    with _example_indexes_lock:
+        key = (profile_name, platform)
+        index = _example_indexes.get(key)
+        if index is None:
+            index = _example_indexes[key] = ExampleIndex(get_example_index_path(profile_name, platform), verbose=verbose)
+        return index
+
+def select_examples(profile_name: str, platform: str, query: str, examples: Iterable[Example], verbose: bool = False, status=None) -> List[Example]:
+    k = int(os.getenv("FEW_SHOT_EXAMPLES", "8"))
+    if k <= 0:
+        return [(source, response) for source, response in examples if source and response]
+    index = get_example_index(profile_name, platform, verbose)
+    index.sync(examples)
+    selected = index.search(query, k=k, token_budget=int(os.getenv("FEW_SHOT_TOKEN_BUDGET", "1500")))
+    log(f"Selected {len(selected)} of {len(index.synced_ids or ())} approved {platform} examples for the prompt", verbose, status, log_caller_file="example_index.py")
+    return selected
@@ -0,0 +1,160 @@
+import os
+import re
+import json
+import time
+import base64
+import hashlib
+import threading
+
+from typing import Any, Dict, List, Optional, Union
+from services.support.logger_util import _log as log
+from services.support.media_parts import UploadPart, file_digest
+from services.support.path_config import get_cache_dir, ensure_dir_exists
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+def _normalize_text(text: str) -> str:
+    return re.sub(r'\s+', ' ', text).strip()
+
+class GeminiResponseCache:
+    def __init__(self, cache_dir: Optional[str] = None, ttl_seconds: int = DEFAULT_TTL_SECONDS, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = ensure_dir_exists(cache_dir or os.path.join(get_cache_dir(), "gemini"))
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        self._total_bytes = None
+
+    def make_key(self, model_name: str, prompt_parts: List[Union[str, dict]], media_paths: Optional[List[str]] = None) -> Optional[str]:
+        digest = hashlib.sha256()
+        digest.update(f"model:{model_name}\n".encode('utf-8'))
+
+        for part in prompt_parts:
+            if isinstance(part, str):
+                digest.update(f"text:{_normalize_text(part)}\n".encode('utf-8'))
+            elif isinstance(part, dict) and isinstance(part.get("inline_data"), dict):
+                inline = part["inline_data"]
+                data = inline.get("data", b"")
+                blob = base64.b64decode(data) if isinstance(data, str) else bytes(data)
+                digest.update(f"media:{inline.get('mime_type')}:{hashlib.sha256(blob).hexdigest()}\n".encode('utf-8'))
+            elif isinstance(part, UploadPart):
+                digest.update(f"media:{part.mime_type}:{part.digest}\n".encode('utf-8'))
+            else:
+                return None
+
+        for path in media_paths or []:
+            digest.update(f"file:{file_digest(path)}\n".encode('utf-8'))
+
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key: Optional[str], record_stats: bool = True) -> Optional[str]:
+        if not key:
+            return None
+
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            if record_stats:
+                with self.lock:
+                    self.stats["misses"] += 1
+            return None
+
+        if time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+            self._remove(path)
+            if record_stats:
+                with self.lock:
+                    self.stats["misses"] += 1
+            return None
+
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        if record_stats:
+            with self.lock:
+                self.stats["hits"] += 1
+        return entry.get("text")
+
+    def put(self, key: Optional[str], text: str, model_name: Optional[str] = None):
+        if not key or not text:
+            return
+
+        path = self._entry_path(key)
+        ensure_dir_exists(os.path.dirname(path))
+        payload = json.dumps({"created_at": time.time(), "model": model_name, "text": text}, ensure_ascii=False)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+        with self.lock:
+            self.stats["writes"] += 1
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._scan())
+            else:
+                self._total_bytes += len(payload.encode('utf-8'))
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _scan(self):
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield path, stat.st_size, stat.st_mtime
+
+    def _remove(self, path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def _evict(self):
+        entries = sorted(self._scan(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        now = time.time()
+        target = int(self.max_bytes * 0.9)
+        for path, size, mtime in entries:
+            if total <= target and now - mtime <= self.ttl_seconds:
+                continue
+            if self._remove(path):
+                total -= size
+                self.stats["evictions"] += 1
+        self._total_bytes = total
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+_generation_cache: Optional[GeminiResponseCache] = None
+_generation_cache_lock = threading.Lock()
+
+def get_generation_cache() -> GeminiResponseCache:
+    global _generation_cache
+    with _generation_cache_lock:
+        if _generation_cache is None:
+            _generation_cache = GeminiResponseCache()
+        return _generation_cache
+
+def get_generation_cache_stats() -> Dict[str, Any]:
+    return get_generation_cache().get_stats()
+
+def log_generation_cache_stats(verbose: bool = False, status=None):
+    stats = get_generation_cache_stats()
+    if stats["hits"] or stats["misses"]:
+        log(f"Gemini cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate), {stats['evictions']} evictions", verbose, status, log_caller_file="gemini_cache.py")
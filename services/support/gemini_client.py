@@ -0,0 +1,72 @@
+import threading
+import mimetypes
+import google.generativeai as genai
+
+from typing import Dict, Optional
+
+from google.generativeai import client as genai_client
+from google.generativeai.types import file_types
+
+# The per-key clients below lean on SDK internals (client._ClientManager and GenerativeModel._client) that are only
+# known to exist in the google-generativeai version pinned in requirements.txt. Refuse to import on any other layout
+# rather than silently falling back to the process-wide key.
+def _check_sdk_internals():
+    manager = getattr(genai_client, "_ClientManager", None)
+    missing = [] if manager is not None else ["google.generativeai.client._ClientManager"]
+    missing += [f"_ClientManager.{name}" for name in ("configure", "get_default_client") if manager is not None and not callable(getattr(manager, name, None))]
+    if not hasattr(genai.GenerativeModel("gemini-2.5-flash-lite"), "_client"):
+        missing.append("GenerativeModel._client")
+    if missing:
+        raise ImportError(f"Unsupported google-generativeai {getattr(genai, '__version__', 'unknown')}: missing {', '.join(missing)}. Install the version pinned in requirements.txt.")
+
+_check_sdk_internals()
+
+# genai.configure swaps one process-wide key, so threads generating with different keys race each other.
+# Each key gets its own client manager instead, and its gRPC channels are reused by every model bound to it.
+class GeminiClient:
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+        self.lock = threading.Lock()
+        self.manager = genai_client._ClientManager()
+        self.manager.configure(api_key=api_key)
+        self.generative = self.manager.get_default_client("generative")
+        self._files = None
+        self.models: Dict[str, genai.GenerativeModel] = {}
+
+    @property
+    def files(self):
+        with self.lock:
+            if self._files is None:
+                self._files = self.manager.get_default_client("file")
+            return self._files
+
+    def model(self, model_name: str) -> genai.GenerativeModel:
+        with self.lock:
+            model = self.models.get(model_name)
+            if model is None:
+                model = self.models[model_name] = genai.GenerativeModel(model_name)
+                model._client = self.generative
+            return model
+
+    def upload_file(self, path: str, display_name: Optional[str] = None, mime_type: Optional[str] = None) -> file_types.File:
+        mime_type = mime_type or mimetypes.guess_type(path)[0]
+        return file_types.File(self.files.create_file(path=path, mime_type=mime_type, display_name=display_name))
+
+    def get_file(self, name: str) -> file_types.File:
+        return file_types.File(self.files.get_file(name=name))
+
+    def delete_file(self, name: str):
+        self.files.delete_file(name=name)
+
+_gemini_clients: Dict[str, GeminiClient] = {}
+_gemini_clients_lock = threading.Lock()
+
+def get_gemini_client(api_key: str) -> GeminiClient:
+    with _gemini_clients_lock:
+        client = _gemini_clients.get(api_key)
+        if client is None:
+            client = _gemini_clients[api_key] = GeminiClient(api_key)
+        return client
+
+def get_gemini_model(api_key: str, model_name: str) -> genai.GenerativeModel:
+    return get_gemini_client(api_key).model(model_name)
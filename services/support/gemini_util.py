@@ -1,9 +1,6 @@
 import os
 import re
 import time
-import base64
-import mimetypes
-import google.generativeai as genai
 
 from rich.console import Console
 from typing import Optional, List, Union
@@ -12,35 +9,34 @@ from services.support.api_key_pool import APIKeyPool
 from services.support.rate_limiter import RateLimiter
 from services.support.logger_util import _log as log
 from services.support.api_call_tracker import APICallTracker
+from services.support.gemini_cache import get_generation_cache
+from services.support.gemini_client import get_gemini_client
+from services.support.media_parts import get_media_part_builder
 
 console = Console()
 
 def create_inline_media_data(media_path: str, verbose: bool = False, status=None) -> Optional[dict]:
-    try:
-        mime_type = mimetypes.guess_type(media_path)[0] or "application/octet-stream"
-        if not mime_type.startswith('image/'):
-            log(f"Skipping non-image media: {media_path} (mime_type: {mime_type})", verbose, status, log_caller_file="gemini_util.py")
-            return None
-
-        with open(media_path, 'rb') as f:
-            data_b64 = base64.b64encode(f.read()).decode('utf-8')
-
-        return {
-            "inline_data": {
-                "mime_type": mime_type,
-                "data": data_b64
-            }
-        }
-    except Exception as e:
-        log(f"Could not process media {media_path}: {e}", verbose, is_error=True, status=status, log_caller_file="gemini_util.py")
-        return None
+    return get_media_part_builder().build_part(media_path, allow_video=False, verbose=verbose, status=status)
+
+def get_cached_generation(prompt_parts: List[Union[str, dict]], model_name: str) -> Optional[str]:
+    cache = get_generation_cache()
+    cache_key = cache.make_key(model_name, prompt_parts)
+    return cache.get(cache_key, record_stats=False)
 
-def generate_gemini_with_inline_media(prompt_parts: List[Union[str, dict]], api_key_pool: APIKeyPool, api_call_tracker: APICallTracker, rate_limiter: RateLimiter, model_name: str = 'gemini-2.5-flash-lite', status=None, verbose: bool = False) -> tuple[Optional[str], Optional[int]]:
+def generate_gemini_with_inline_media(prompt_parts: List[Union[str, dict]], api_key_pool: APIKeyPool, api_call_tracker: APICallTracker, rate_limiter: RateLimiter, model_name: str = 'gemini-2.5-flash-lite', status=None, verbose: bool = False, use_cache: bool = True, api_key: Optional[str] = None) -> tuple[Optional[str], Optional[int]]:
     current_api_key = None
+    api_key_suffix = None
     token_count = None
 
+    cache = get_generation_cache() if use_cache else None
+    cache_key = cache.make_key(model_name, prompt_parts) if cache else None
+    cached = cache.get(cache_key) if cache else None
+    if cached is not None:
+        log("[Gemini] Using cached generation for prompt parts", verbose, status, log_caller_file="gemini_util.py")
+        return cached, None
+
     try:
-        current_api_key = api_key_pool.get_key()
+        current_api_key = api_key or api_key_pool.get_key()
         if not current_api_key:
             log("No API key available in the pool.", verbose, status, is_error=True, log_caller_file="gemini_util.py")
             return None, None
@@ -55,17 +51,22 @@ def generate_gemini_with_inline_media(prompt_parts: List[Union[str, dict]], api_
             return None, None
 
         rate_limiter.wait_if_needed(current_api_key)
-        genai.configure(api_key=current_api_key)
-        model = genai.GenerativeModel(model_name)
+        client = get_gemini_client(current_api_key)
+        model = client.model(model_name)
+        request_parts = get_media_part_builder().resolve_uploads(prompt_parts, current_api_key, verbose, status)
 
         message = f"[Gemini] Generating content with inline media using prompt parts"
         log(message, verbose, status, log_caller_file="gemini_util.py")
 
-        response = model.generate_content(prompt_parts)
+        response = model.generate_content(request_parts)
+
+        token_count = getattr(getattr(response, 'usage_metadata', None), 'total_token_count', None)
 
         try:
             result = response.text.strip()
-            api_call_tracker.record_call("gemini", "generate_content", model_name, api_key_suffix, True, result[:100])
+            api_call_tracker.record_call("gemini", "generate_content", model_name, api_key_suffix, True, result[:100], token_count=token_count)
+            if cache:
+                cache.put(cache_key, result, model_name)
             return result, token_count
         except ValueError:
             api_info = api_call_tracker.get_quot_info("gemini", "generate_content", model_name, api_key_suffix)
@@ -97,10 +98,23 @@ def generate_gemini_with_inline_media(prompt_parts: List[Union[str, dict]], api_
         api_key_pool.report_failure(current_api_key, error_message)
         return None, None
 
-def generate_gemini(media_path: Optional[str], api_key_pool: APIKeyPool, api_call_tracker: APICallTracker, rate_limiter: RateLimiter, prompt_text: str, model_name: str = 'gemini-2.5-flash-lite', status=None, verbose: bool = False):
+def generate_gemini(media_path: Optional[str], api_key_pool: APIKeyPool, api_call_tracker: APICallTracker, rate_limiter: RateLimiter, prompt_text: str, model_name: str = 'gemini-2.5-flash-lite', status=None, verbose: bool = False, use_cache: bool = True):
     current_api_key = None
+    api_key_suffix = None
     uploaded_file = None
     token_count = None
+
+    cache = get_generation_cache() if use_cache else None
+    try:
+        cache_key = cache.make_key(model_name, [prompt_text], [media_path] if media_path else None) if cache else None
+    except OSError as e:
+        log(f"Could not read media {media_path} for Gemini generation: {e}", verbose, status, is_error=True, log_caller_file="gemini_util.py")
+        return None, None
+    cached = cache.get(cache_key) if cache else None
+    if cached is not None:
+        log(f"[Gemini] Using cached generation for {os.path.basename(media_path) if media_path else 'text-only'}", verbose, status, log_caller_file="gemini_util.py")
+        return cached, None
+
     try:
         current_api_key = api_key_pool.get_key()
         if not current_api_key:
@@ -117,8 +131,8 @@ def generate_gemini(media_path: Optional[str], api_key_pool: APIKeyPool, api_cal
             return None, None
 
         rate_limiter.wait_if_needed(current_api_key)
-        genai.configure(api_key=current_api_key)
-        model = genai.GenerativeModel(model_name)
+        client = get_gemini_client(current_api_key)
+        model = client.model(model_name)
 
         if media_path:
             base_filename = os.path.basename(media_path)
@@ -126,12 +140,12 @@ def generate_gemini(media_path: Optional[str], api_key_pool: APIKeyPool, api_cal
 
             message = f"[Gemini] Uploading media: {media_path}"
             log(message, verbose, status, log_caller_file="gemini_util.py")
-            uploaded_file = genai.upload_file(path=media_path, display_name=sanitized_display_name)
+            uploaded_file = client.upload_file(media_path, display_name=sanitized_display_name)
             
             timeout_seconds = 600
             start_time = time.time()
             while time.time() - start_time < timeout_seconds:
-                file_status = genai.get_file(uploaded_file.name)
+                file_status = client.get_file(uploaded_file.name)
                 if file_status.state.name == "ACTIVE":
                     message = f"[Gemini] File {uploaded_file.display_name} ({file_status.name}) is now ACTIVE."
                     log(message, verbose, status, log_caller_file="gemini_util.py")
@@ -157,10 +171,11 @@ def generate_gemini(media_path: Optional[str], api_key_pool: APIKeyPool, api_cal
         message = f"[Gemini] Generating content for {uploaded_file.display_name if uploaded_file else 'text-only'}"
         log(message, verbose, status, log_caller_file="gemini_util.py")
         response = model.generate_content(content)
-        
+        token_count = getattr(getattr(response, 'usage_metadata', None), 'total_token_count', None)
+
         try:
             caption = response.text.strip().replace('\n', ' ')
-            api_call_tracker.record_call("gemini", "generate", model_name, api_key_suffix, True, response.text)
+            api_call_tracker.record_call("gemini", "generate", model_name, api_key_suffix, True, response.text, token_count=token_count)
         except ValueError:
             api_info = api_call_tracker.get_quot_info("gemini", "generate", model_name, api_key_suffix)
             log(f"Gemini Response (no text): {response}", verbose, status, is_error=True, api_info=api_info, log_caller_file="gemini_util.py")
@@ -184,6 +199,8 @@ def generate_gemini(media_path: Optional[str], api_key_pool: APIKeyPool, api_cal
 
         message = f"[Gemini] Generated content for {uploaded_file.display_name if uploaded_file else 'text-only'}"
         log(message, verbose, status, log_caller_file="gemini_util.py")
+        if cache:
+            cache.put(cache_key, caption, model_name)
 
         return caption, token_count
     
@@ -198,7 +215,7 @@ def generate_gemini(media_path: Optional[str], api_key_pool: APIKeyPool, api_cal
     finally:
         if uploaded_file:
             try:
-                genai.delete_file(uploaded_file.name)
+                client.delete_file(uploaded_file.name)
                 message = f"[Gemini] Deleted uploaded file: {uploaded_file.display_name}"
                 log(message, verbose, status, log_caller_file="gemini_util.py")
                     
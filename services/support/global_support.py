@@ -255,7 +255,7 @@ def login_profile(profile_name: str, platform: str):
     try:
         log(f"Opening browser for profile '{profile_name}' to login to {platform_name}...", verbose=True, log_caller_file="global_support.py")
 
-        driver, _ = setup_driver(browser_dir, profile=profile_name, headless=False, verbose=True)
+        driver, _ = setup_driver(browser_dir, profile=profile_name, headless=False, verbose=True, pooled=False)
 
         driver.get(login_url)
         log(f"Opened {platform_name} login page. Please login manually in the browser.", verbose=True, log_caller_file="global_support.py")
@@ -1,41 +1,15 @@
 import os
-import requests
 
 from rich.console import Console
-from urllib.parse import urlparse
 
 from services.support.logger_util import _log as log
+from services.support.media_fetch import fetch_media_to_dir
 from services.support.path_config import get_downloads_dir
 
 console = Console()
 
 def download_images(image_urls, profile_name="Default", verbose: bool = False):
     download_dir = os.path.abspath(os.path.join(get_downloads_dir(), 'images', profile_name))
-    os.makedirs(download_dir, exist_ok=True)
-    
-    local_image_paths = []
-    for url in image_urls:
-        try:
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
-            
-            parsed_url = urlparse(url)
-            filename = os.path.basename(parsed_url.path)
-            
-            query_params = parsed_url.query.split('&')
-            format_param = next((p for p in query_params if p.startswith('format=')), None)
-            if format_param:
-                ext = format_param.split('=')[1]
-                if not filename.endswith(f'.{ext}'):
-                    filename = f"{filename.split('.')[0]}.{ext}"
-            
-            file_path = os.path.join(download_dir, filename)
-            
-            with open(file_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            local_image_paths.append(file_path)
-            log(f"Downloaded image: {filename}", verbose, log_caller_file="image_download.py")
-        except Exception as e:
-            log(f"Error downloading image {url}: {str(e)}", verbose, is_error=True, log_caller_file="image_download.py")
-    return local_image_paths 
\ No newline at end of file
+    local_image_paths = fetch_media_to_dir(list(image_urls), download_dir, verbose)
+    log(f"Fetched {len(local_image_paths)} of {len(image_urls)} images into {download_dir}", verbose, log_caller_file="image_download.py")
+    return local_image_paths
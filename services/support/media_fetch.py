@@ -0,0 +1,306 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import mimetypes
+import threading
+import requests
+
+from contextlib import contextmanager
+from urllib.parse import urlparse, parse_qs
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from requests.adapters import HTTPAdapter
+from services.support.logger_util import _log as log
+from services.support.path_config import get_cache_dir, ensure_dir_exists
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+DEFAULT_TIMEOUT = (10, 30)
+CHUNK_SIZE = 64 * 1024
+COMPACT_THRESHOLD_BYTES = 1024 * 1024
+KNOWN_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.mp4', '.webm', '.mov')
+
+def _guess_extension(url: str, content_type: Optional[str]) -> str:
+    parsed = urlparse(url)
+    format_param = parse_qs(parsed.query).get('format', [None])[0]
+    if format_param:
+        return '.jpeg' if format_param.lower() == 'jpg' else f".{format_param.lower()}"
+
+    path_ext = os.path.splitext(parsed.path)[1].lower()
+    if path_ext in KNOWN_EXTENSIONS:
+        return path_ext
+
+    if content_type:
+        guessed = mimetypes.guess_extension(content_type.split(';')[0].strip())
+        if guessed:
+            return '.jpeg' if guessed in ('.jpe', '.jpg') else guessed
+    return '.jpeg'
+
+class MediaFetcher:
+    def __init__(self, cache_dir: Optional[str] = None, max_workers: int = 8, per_host_limit: int = 4, revalidate_seconds: int = 24 * 3600, verbose: bool = False, compact_threshold_bytes: int = COMPACT_THRESHOLD_BYTES):
+        self.cache_dir = ensure_dir_exists(cache_dir or os.path.join(get_cache_dir(), "media"))
+        self.objects_dir = ensure_dir_exists(os.path.join(self.cache_dir, "objects"))
+        self.index_file = os.path.join(self.cache_dir, "index.jsonl")
+        self.lock_file = os.path.join(self.cache_dir, "index.lock")
+        self.max_workers = max(1, max_workers)
+        self.per_host_limit = max(1, per_host_limit)
+        self.revalidate_seconds = revalidate_seconds
+        self.verbose = verbose
+        self.compact_threshold_bytes = compact_threshold_bytes
+        self._compact_at = compact_threshold_bytes
+
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': DEFAULT_USER_AGENT})
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers * 2)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="media-fetch")
+        self.lock = threading.Lock()
+        self.host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self.in_flight: Dict[str, Future] = {}
+        self.index: Dict[str, Dict[str, Any]] = {}
+        self.stats = {"fresh": 0, "revalidated": 0, "downloaded": 0, "deduplicated": 0, "failed": 0, "bytes": 0}
+        self._offset = 0
+        self._inode: Optional[int] = None
+        with self.lock:
+            self._sync()
+
+    @contextmanager
+    def _file_lock(self):
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_file, 'a') as lock_handle:
+            fcntl.flock(lock_handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_handle, fcntl.LOCK_UN)
+
+    def _sync(self):
+        try:
+            stat = os.stat(self.index_file)
+        except FileNotFoundError:
+            self._offset = 0
+            return
+
+        # Compaction (here or in another process) replaces the file; re-read it from the start
+        if self._inode != stat.st_ino or stat.st_size < self._offset:
+            self._inode = stat.st_ino
+            self._offset = 0
+
+        if stat.st_size == self._offset:
+            return
+
+        with open(self.index_file, 'rb') as f:
+            f.seek(self._offset)
+            chunk = f.read()
+
+        consumed = chunk.rfind(b"\n") + 1
+        for line in chunk[:consumed].splitlines():
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if entry.get("url"):
+                self.index[entry["url"]] = entry
+        self._offset += consumed
+
+    # Keeps only the latest entry per url whose object still exists
+    def _compact(self):
+        latest: Dict[str, bytes] = {}
+        with open(self.index_file, 'rb') as src:
+            for line in src:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if entry.get("url") and os.path.exists(entry.get("path", "")):
+                    latest.pop(entry["url"], None)
+                    latest[entry["url"]] = line if line.endswith(b"\n") else line + b"\n"
+
+        tmp_file = self.index_file + ".tmp"
+        with open(tmp_file, 'wb') as dst:
+            dst.writelines(latest.values())
+        os.replace(tmp_file, self.index_file)
+
+    def _record(self, entry: Dict[str, Any]):
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode('utf-8')
+        with self._file_lock():
+            fd = os.open(self.index_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+
+            if os.path.getsize(self.index_file) > self._compact_at:
+                self._compact()
+                self._compact_at = max(self.compact_threshold_bytes, 2 * os.path.getsize(self.index_file))
+        with self.lock:
+            self.index[entry["url"]] = entry
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc
+        with self.lock:
+            slot = self.host_slots.get(host)
+            if slot is None:
+                slot = self.host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return slot
+
+    def _object_path(self, digest: str, extension: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}{extension}")
+
+    def _bump(self, key: str, amount: int = 1):
+        with self.lock:
+            self.stats[key] += amount
+
+    def _cached_entry(self, url: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            entry = self.index.get(url)
+            if entry is None:
+                self._sync()
+                entry = self.index.get(url)
+        if entry and os.path.exists(entry.get("path", "")):
+            return entry
+        return None
+
+    def _fetch(self, url: str) -> Optional[str]:
+        entry = self._cached_entry(url)
+        if entry and time.time() - entry.get("checked_at", 0) < self.revalidate_seconds:
+            self._bump("fresh")
+            return entry["path"]
+
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers['If-None-Match'] = entry["etag"]
+            if entry.get("last_modified"):
+                headers['If-Modified-Since'] = entry["last_modified"]
+
+        try:
+            with self._host_slot(url):
+                with self.session.get(url, headers=headers, stream=True, timeout=DEFAULT_TIMEOUT) as response:
+                    if response.status_code == 304 and entry:
+                        self._record(dict(entry, checked_at=time.time()))
+                        self._bump("revalidated")
+                        return entry["path"]
+                    response.raise_for_status()
+                    path = self._store(url, response)
+        except Exception as e:
+            self._bump("failed")
+            if entry:
+                log(f"Could not revalidate {url}, using cached copy: {e}", self.verbose, is_error=False, log_caller_file="media_fetch.py")
+                return entry["path"]
+            log(f"Error downloading media {url}: {e}", self.verbose, is_error=True, log_caller_file="media_fetch.py")
+            return None
+        return path
+
+    def _store(self, url: str, response) -> str:
+        digest = hashlib.sha256()
+        tmp_path = os.path.join(self.objects_dir, f".{os.getpid()}.{threading.get_ident()}.tmp")
+        size = 0
+        with open(tmp_path, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                if chunk:
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+
+        hex_digest = digest.hexdigest()
+        path = self._object_path(hex_digest, _guess_extension(url, response.headers.get('Content-Type')))
+        if os.path.exists(path):
+            os.remove(tmp_path)
+            self._bump("deduplicated")
+        else:
+            ensure_dir_exists(os.path.dirname(path))
+            os.replace(tmp_path, path)
+            self._bump("downloaded")
+        self._bump("bytes", size)
+
+        self._record({
+            "url": url,
+            "digest": hex_digest,
+            "path": path,
+            "etag": response.headers.get('ETag'),
+            "last_modified": response.headers.get('Last-Modified'),
+            "content_type": response.headers.get('Content-Type'),
+            "checked_at": time.time()
+        })
+        log(f"Downloaded media {url} -> {os.path.basename(path)} ({size} bytes)", self.verbose, log_caller_file="media_fetch.py")
+        return path
+
+    def _done(self, url: str, _future: Future):
+        with self.lock:
+            self.in_flight.pop(url, None)
+
+    def submit(self, url: str) -> Future:
+        with self.lock:
+            future = self.in_flight.get(url)
+            if future is None:
+                future = self.in_flight[url] = self.executor.submit(self._fetch, url)
+                future.add_done_callback(lambda f, u=url: self._done(u, f))
+            return future
+
+    def fetch(self, url: str) -> Optional[str]:
+        return self.submit(url).result()
+
+    def fetch_many(self, urls: List[str]) -> List[Optional[str]]:
+        futures = [self.submit(url) for url in urls]
+        return [future.result() for future in futures]
+
+    def fetch_to_dir(self, urls: List[str], download_dir: str) -> List[str]:
+        ensure_dir_exists(download_dir)
+        local_paths = []
+        for path in self.fetch_many(urls):
+            if not path:
+                continue
+            target = os.path.join(download_dir, os.path.basename(path))
+            if target in local_paths:
+                continue
+            if not os.path.exists(target):
+                try:
+                    os.link(path, target)
+                except OSError:
+                    shutil.copyfile(path, target)
+            local_paths.append(target)
+        return local_paths
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return dict(self.stats)
+
+_media_fetcher: Optional[MediaFetcher] = None
+_media_fetcher_lock = threading.Lock()
+
+def get_media_fetcher() -> MediaFetcher:
+    global _media_fetcher
+    with _media_fetcher_lock:
+        if _media_fetcher is None:
+            _media_fetcher = MediaFetcher(
+                max_workers=int(os.getenv("MEDIA_FETCH_WORKERS", "8")),
+                per_host_limit=int(os.getenv("MEDIA_FETCH_PER_HOST", "4")),
+                revalidate_seconds=int(os.getenv("MEDIA_FETCH_REVALIDATE_SECONDS", str(24 * 3600)))
+            )
+        return _media_fetcher
+
+def fetch_media_to_dir(urls: List[str], download_dir: str, verbose: bool = False) -> List[str]:
+    fetcher = get_media_fetcher()
+    fetcher.verbose = fetcher.verbose or verbose
+    return fetcher.fetch_to_dir(urls, download_dir)
+
+def log_media_fetch_stats(verbose: bool = False, status=None):
+    if _media_fetcher is None:
+        return
+    stats = _media_fetcher.get_stats()
+    if any(stats[key] for key in ("fresh", "revalidated", "downloaded", "deduplicated", "failed")):
+        log(f"Media fetch: {stats['downloaded']} new, {stats['deduplicated']} duplicate content ({stats['bytes'] / 1024 / 1024:.1f} MB transferred), {stats['fresh']} cached, {stats['revalidated']} revalidated, {stats['failed']} failed", verbose, status, log_caller_file="media_fetch.py")
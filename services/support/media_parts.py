@@ -0,0 +1,202 @@
+import io
+import os
+import re
+import time
+import base64
+import hashlib
+import mimetypes
+import threading
+
+from PIL import Image
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from services.support.logger_util import _log as log
+from services.support.gemini_client import get_gemini_client
+
+DEFAULT_MAX_EDGE = 1536
+DEFAULT_JPEG_QUALITY = 85
+DEFAULT_MAX_INLINE_IMAGE_BYTES = 1024 * 1024
+DEFAULT_VIDEO_UPLOAD_THRESHOLD_BYTES = 15 * 1024 * 1024
+DEFAULT_MEMO_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_UPLOADS = 64
+UPLOAD_ACTIVE_TIMEOUT_SECONDS = 600
+# Gemini deletes uploaded files after 48 hours; handles are re-uploaded a little before that
+UPLOAD_REUSE_SECONDS = 46 * 3600
+
+class UploadPart:
+    def __init__(self, path: str, mime_type: str, digest: str):
+        self.path = path
+        self.mime_type = mime_type
+        self.digest = digest
+
+    def __repr__(self) -> str:
+        return f"UploadPart({os.path.basename(self.path)}, {self.mime_type}, {self.digest[:12]})"
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class MediaPartBuilder:
+    def __init__(self, max_edge: int = DEFAULT_MAX_EDGE, jpeg_quality: int = DEFAULT_JPEG_QUALITY, max_inline_image_bytes: int = DEFAULT_MAX_INLINE_IMAGE_BYTES, video_upload_threshold_bytes: int = DEFAULT_VIDEO_UPLOAD_THRESHOLD_BYTES, memo_bytes: int = DEFAULT_MEMO_BYTES, max_uploads: int = DEFAULT_MAX_UPLOADS):
+        self.max_edge = max_edge
+        self.jpeg_quality = jpeg_quality
+        self.max_inline_image_bytes = max_inline_image_bytes
+        self.video_upload_threshold_bytes = video_upload_threshold_bytes
+        self.memo_bytes = memo_bytes
+        self.max_uploads = max_uploads
+        self.lock = threading.Lock()
+        self._parts: OrderedDict[str, Tuple[Union[dict, UploadPart], int]] = OrderedDict()
+        self._parts_bytes = 0
+        self._digests: Dict[Tuple[str, int, float], str] = {}
+        self._uploads: OrderedDict[Tuple[str, str], Tuple[Any, float]] = OrderedDict()
+        self._upload_locks: Dict[Tuple[str, str], threading.Lock] = {}
+
+    def _digest_for(self, path: str) -> str:
+        stat = os.stat(path)
+        stat_key = (os.path.abspath(path), stat.st_size, stat.st_mtime)
+        with self.lock:
+            digest = self._digests.get(stat_key)
+        if digest is None:
+            digest = file_digest(path)
+            with self.lock:
+                self._digests[stat_key] = digest
+        return digest
+
+    def _encode_image(self, path: str, mime_type: str) -> Tuple[bytes, str]:
+        size_bytes = os.path.getsize(path)
+        with Image.open(path) as image:
+            too_large = max(image.size) > self.max_edge
+            if not too_large and size_bytes <= self.max_inline_image_bytes:
+                with open(path, 'rb') as f:
+                    return f.read(), mime_type
+
+            image.thumbnail((self.max_edge, self.max_edge))
+            buffer = io.BytesIO()
+            has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+            if has_alpha:
+                image.save(buffer, format="PNG", optimize=True)
+                return buffer.getvalue(), "image/png"
+            image.convert("RGB").save(buffer, format="JPEG", quality=self.jpeg_quality, optimize=True)
+            return buffer.getvalue(), "image/jpeg"
+
+    def build_part(self, media_path: str, allow_video: bool = False, verbose: bool = False, status=None) -> Optional[Union[dict, UploadPart]]:
+        try:
+            mime_type = mimetypes.guess_type(media_path)[0] or "application/octet-stream"
+            is_video = mime_type.startswith('video/')
+            if not mime_type.startswith('image/') and not (allow_video and is_video):
+                log(f"Skipping unsupported media: {media_path} (mime_type: {mime_type})", verbose, status, log_caller_file="media_parts.py")
+                return None
+
+            digest = self._digest_for(media_path)
+            with self.lock:
+                entry = self._parts.get(digest)
+                if entry is not None:
+                    self._parts.move_to_end(digest)
+                    return entry[0]
+
+            if is_video and os.path.getsize(media_path) > self.video_upload_threshold_bytes:
+                part = UploadPart(media_path, mime_type, digest)
+            else:
+                if is_video:
+                    with open(media_path, 'rb') as f:
+                        data, part_mime = f.read(), mime_type
+                else:
+                    data, part_mime = self._encode_image(media_path, mime_type)
+                part = {"inline_data": {"mime_type": part_mime, "data": base64.b64encode(data).decode('utf-8')}}
+                log(f"Encoded {os.path.basename(media_path)} for inlining ({len(data) // 1024} KB, {part_mime})", verbose, status, log_caller_file="media_parts.py")
+
+            # Inline videos are used once per prompt and can be tens of MB as base64, so only images and upload
+            # handles are memoized, and the memo is bounded by the size of the encoded data it holds
+            if is_video and not isinstance(part, UploadPart):
+                return part
+            size = len(part["inline_data"]["data"]) if isinstance(part, dict) else 0
+            with self.lock:
+                if digest not in self._parts and size <= self.memo_bytes:
+                    self._parts[digest] = (part, size)
+                    self._parts_bytes += size
+                    while self._parts_bytes > self.memo_bytes:
+                        _, (_, evicted_size) = self._parts.popitem(last=False)
+                        self._parts_bytes -= evicted_size
+            return part
+        except Exception as e:
+            log(f"Could not process media {media_path}: {e}", verbose, status, is_error=True, log_caller_file="media_parts.py")
+            return None
+
+    def _upload(self, part: UploadPart, api_key: str, verbose: bool = False, status=None):
+        display_name = re.sub(r'\s*\(.*?\)|\s*\[.*?\]', '', os.path.basename(part.path)).strip()
+        log(f"[Gemini] Uploading media: {part.path}", verbose, status, log_caller_file="media_parts.py")
+        client = get_gemini_client(api_key)
+        uploaded_file = client.upload_file(part.path, display_name=display_name, mime_type=part.mime_type)
+
+        start_time = time.time()
+        while time.time() - start_time < UPLOAD_ACTIVE_TIMEOUT_SECONDS:
+            file_status = client.get_file(uploaded_file.name)
+            if file_status.state.name == "ACTIVE":
+                return file_status
+            if file_status.state.name == "FAILED":
+                raise RuntimeError(f"Gemini file upload failed for {display_name} ({file_status.name}).")
+            log(f"[Gemini] Waiting for file {display_name} ({file_status.state.name}) to become ACTIVE...", verbose, status, log_caller_file="media_parts.py")
+            time.sleep(5)
+        raise TimeoutError(f"Gemini file {display_name} did not become ACTIVE within {UPLOAD_ACTIVE_TIMEOUT_SECONDS} seconds.")
+
+    def resolve_uploads(self, prompt_parts: List[Any], api_key: str, verbose: bool = False, status=None) -> List[Any]:
+        if not any(isinstance(part, UploadPart) for part in prompt_parts):
+            return prompt_parts
+
+        resolved = []
+        for part in prompt_parts:
+            if not isinstance(part, UploadPart):
+                resolved.append(part)
+                continue
+
+            upload_key = (part.digest, api_key)
+            with self.lock:
+                upload_lock = self._upload_locks.setdefault(upload_key, threading.Lock())
+            with upload_lock:
+                with self.lock:
+                    entry = self._uploads.get(upload_key)
+                if entry is not None and time.time() - entry[1] < UPLOAD_REUSE_SECONDS:
+                    uploaded_file = entry[0]
+                    with self.lock:
+                        self._uploads.move_to_end(upload_key)
+                    log(f"[Gemini] Reusing uploaded file for {os.path.basename(part.path)}", verbose, status, log_caller_file="media_parts.py")
+                else:
+                    if entry is not None:
+                        self._delete_upload(upload_key, entry[0], verbose, status)
+                    uploaded_file = self._upload(part, api_key, verbose, status)
+                    with self.lock:
+                        self._uploads[upload_key] = (uploaded_file, time.time())
+                        evicted = []
+                        while len(self._uploads) > self.max_uploads:
+                            evicted.append(self._uploads.popitem(last=False))
+                    for evicted_key, (evicted_file, _) in evicted:
+                        self._delete_upload(evicted_key, evicted_file, verbose, status)
+            resolved.append(uploaded_file)
+        return resolved
+
+    def _delete_upload(self, upload_key: Tuple[str, str], uploaded_file: Any, verbose: bool = False, status=None):
+        with self.lock:
+            if self._uploads.get(upload_key, (None,))[0] is uploaded_file:
+                del self._uploads[upload_key]
+        try:
+            get_gemini_client(upload_key[1]).delete_file(uploaded_file.name)
+            log(f"[Gemini] Deleted uploaded file {uploaded_file.name}", verbose, status, log_caller_file="media_parts.py")
+        except Exception as e:
+            log(f"[Gemini] Could not delete uploaded file {uploaded_file.name}: {e}", verbose, status, log_caller_file="media_parts.py")
+
+_media_part_builder: Optional[MediaPartBuilder] = None
+_media_part_builder_lock = threading.Lock()
+
+def get_media_part_builder() -> MediaPartBuilder:
+    global _media_part_builder
+    with _media_part_builder_lock:
+        if _media_part_builder is None:
+            _media_part_builder = MediaPartBuilder(
+                max_edge=int(os.getenv("GEMINI_MEDIA_MAX_EDGE", str(DEFAULT_MAX_EDGE))),
+                jpeg_quality=int(os.getenv("GEMINI_MEDIA_JPEG_QUALITY", str(DEFAULT_JPEG_QUALITY)))
+            )
+        return _media_part_builder
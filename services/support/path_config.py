@@ -1,5 +1,11 @@
 import os
+import re
+import time
 import shutil
+import sqlite3
+import threading
+
+from typing import List, Optional, Sequence, Union
 
 # Base directory
 BASE_TMP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "tmp")
@@ -60,6 +66,22 @@ def get_pool_dir() -> str:
     """Get pool directory."""
     return os.path.join(BASE_TMP_DIR, "pool")
 
+def get_driver_pool_socket_path() -> str:
+    """Get driver pool daemon socket path: pool/driver_pool.sock"""
+    return os.path.join(get_pool_dir(), "driver_pool.sock")
+
+def get_seen_index_path(profile_name: str) -> str:
+    """Get per-profile seen content index path: cache/seen/{profile}.sqlite3"""
+    return os.path.join(get_cache_dir(), "seen", f"{profile_name}.sqlite3")
+
+def get_example_index_path(profile_name: str, platform: str) -> str:
+    """Get per-profile few-shot example index path: cache/examples/{profile}_{platform}.sqlite3"""
+    return os.path.join(get_cache_dir(), "examples", f"{profile_name}_{platform}.sqlite3")
+
+def get_reddit_cache_path() -> str:
+    """Get shared Reddit listing and comment cache path: cache/reddit/api_cache.sqlite3"""
+    return os.path.join(get_cache_dir(), "reddit", "api_cache.sqlite3")
+
 # =============================================================================
 # PLATFORM HIERARCHY FUNCTIONS
 # =============================================================================
@@ -262,33 +284,43 @@ def get_suggestions_media_dir(profile: str) -> str:
     path = os.path.join(get_suggestions_dir(profile), "media")
     return ensure_dir_exists(path)
 
+def get_suggestions_checkpoint_dir(profile: str) -> str:
+    """Get suggestions checkpoint directory: utils/suggestions/{profile}/checkpoints"""
+    path = os.path.join(get_suggestions_dir(profile), "checkpoints")
+    return ensure_dir_exists(path)
+
+def get_suggestions_checkpoint_path(profile: str, platform: str, source_file: str) -> str:
+    """Get generation checkpoint journal for a filtered source file."""
+    source_name = os.path.splitext(os.path.basename(source_file))[0]
+    return os.path.join(get_suggestions_checkpoint_dir(profile), f"{platform}_{source_name}.jsonl")
+
 # =============================================================================
 # LOG FILE FUNCTIONS
 # =============================================================================
 
 def get_api_log_file_path() -> str:
     """Get API calls log file path."""
-    return os.path.join(get_logs_dir(), "api_calls_log.json")
+    return os.path.join(get_logs_dir(), "api_calls_log.jsonl")
 
 def get_gemini_log_file_path() -> str:
     """Get Gemini API calls log file path."""
-    return os.path.join(get_logs_dir(), "gemini_api_calls_log.json")
+    return os.path.join(get_logs_dir(), "gemini_api_calls_log.jsonl")
 
 def get_reddit_log_file_path(profile_name: str = None) -> str:
     """Get Reddit API calls log file path."""
     if profile_name:
-        return os.path.join(get_logs_dir(), f"reddit_api_calls_log_{profile_name}.json")
-    return os.path.join(get_logs_dir(), "reddit_api_calls_log.json")
+        return os.path.join(get_logs_dir(), f"reddit_api_calls_log_{profile_name}.jsonl")
+    return os.path.join(get_logs_dir(), "reddit_api_calls_log.jsonl")
 
 def get_youtube_log_file_path() -> str:
     """Get YouTube API calls log file path."""
-    return os.path.join(get_logs_dir(), "youtube_api_calls_log.json")
+    return os.path.join(get_logs_dir(), "youtube_api_calls_log.jsonl")
 
 def get_google_log_file_path(profile_name: str = None) -> str:
     """Get Google API calls log file path."""
     if profile_name:
-        return os.path.join(get_logs_dir(), f"google_api_calls_log_{profile_name}.json")
-    return os.path.join(get_logs_dir(), "google_api_calls_log.json")
+        return os.path.join(get_logs_dir(), f"google_api_calls_log_{profile_name}.jsonl")
+    return os.path.join(get_logs_dir(), "google_api_calls_log.jsonl")
 
 # =============================================================================
 # OUTPUT FILE FUNCTIONS
@@ -310,7 +342,7 @@ def get_x_scraper_output_file_path(profile: str, scrape_type: str, target_name:
 
 def get_reddit_scraper_output_file_path(profile: str, timestamp: str) -> str:
     """Get Reddit scraper output file path."""
-    return os.path.join(get_reddit_scraper_dir(profile), f"reddit_scraped_data_{timestamp}.json")
+    return os.path.join(get_reddit_scraper_dir(profile), f"reddit_scraped_data_{timestamp}.jsonl")
 
 def get_reddit_analysis_output_file_path(profile: str, timestamp: str) -> str:
     """Get Reddit analysis output file path."""
@@ -322,11 +354,15 @@ def get_linkedin_scraper_output_file_path(profile: str, target_type: str, timest
 
 def get_product_hunt_output_file_path(profile: str, timestamp: str) -> str:
     """Get Product Hunt output file path."""
-    return os.path.join(get_product_hunt_scraper_dir(profile), f"product_hunt_{timestamp}.json")
+    return os.path.join(get_product_hunt_scraper_dir(profile), f"product_hunt_{timestamp}.jsonl")
 
 def get_ycombinator_output_file_path(profile: str, timestamp: str) -> str:
     """Get Y Combinator output file path."""
-    return os.path.join(get_ycombinator_scraper_dir(profile), f"ycombinator_{timestamp}.json")
+    return os.path.join(get_ycombinator_scraper_dir(profile), f"ycombinator_{timestamp}.jsonl")
+
+def get_dataset_columns_path(dataset_path: str) -> str:
+    """Get the compressed numeric column sidecar path for a JSONL dataset."""
+    return f"{os.path.splitext(dataset_path)[0]}.cols.json.gz"
 
 # =============================================================================
 # SCHEDULE FILE FUNCTIONS
@@ -378,6 +414,181 @@ def get_temp_media_dir(profile: str, mode: str = "action") -> str:
     temp_dir = os.path.join(base_dir, "_temp_media")
     return ensure_dir_exists(temp_dir)
 
+# =============================================================================
+# ARTIFACT CATALOG
+# =============================================================================
+
+_ARTIFACT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    path TEXT NOT NULL UNIQUE,
+    profile TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    row_count INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_artifacts_lookup ON artifacts (profile, platform, kind, created_at DESC);
+"""
+# Filename patterns used to catalog artifacts that predate the catalog: (platform, kind) -> (directory getter, regex)
+ARTIFACT_FILE_PATTERNS = {
+    ("x", "scraped"): (get_suggestions_dir, r"scraped_content_x_.+\.jsonl?"),
+    ("x", "filtered"): (get_suggestions_dir, r"filtered_content_x_.+\.json"),
+    ("x", "generated"): (get_suggestions_dir, r"suggestions_content_x_\d{8}\.json"),
+    ("x", "reviewed"): (get_suggestions_dir, r"suggestions_content_\d{8}_\d{6}_reviewed\.json"),
+    ("x", "new_content"): (get_suggestions_dir, r"new_tweets_content_x_.+\.json"),
+    ("x", "approved"): (get_suggestions_dir, r"approved_content_\d{8}_\d{6}\.json"),
+    ("x", "approved_with_media"): (get_suggestions_dir, r"approved_content_x_.+_with_media\.json"),
+    ("linkedin", "scraped"): (get_suggestions_dir, r"scraped_content_linkedin_.+\.jsonl?"),
+    ("linkedin", "filtered"): (get_suggestions_dir, r"filtered_content_linkedin_.+\.json"),
+    ("linkedin", "generated"): (get_suggestions_dir, r"suggestions_content_linkedin_\d{8}\.json"),
+    ("linkedin", "reviewed"): (get_suggestions_dir, r"suggestions_content_linkedin_.+_reviewed\.json"),
+    ("linkedin", "new_content"): (get_suggestions_dir, r"new_posts_content_linkedin_.+\.json"),
+    ("linkedin", "approved"): (get_suggestions_dir, r"approved_content_linkedin_\d{8}_\d{6}\.json"),
+    ("linkedin", "approved_with_media"): (get_suggestions_dir, r"approved_content_linkedin_.+_with_media\.json"),
+    ("reddit", "scraped"): (get_suggestions_dir, r"scraped_content_reddit_.+\.jsonl?"),
+    ("reddit", "filtered"): (get_suggestions_dir, r"filtered_content_reddit_.+\.json"),
+    ("reddit", "generated"): (get_suggestions_dir, r"suggestions_content_reddit_\d{8}\.json"),
+    ("reddit", "reviewed"): (get_suggestions_dir, r"suggestions_content_reddit_.+_reviewed\.json"),
+    ("reddit", "approved"): (get_suggestions_dir, r"approved_content_reddit_\d{8}_\d{6}\.json"),
+    ("reddit", "approved_with_media"): (get_suggestions_dir, r"approved_content_reddit_.+_with_media\.json"),
+    ("reddit", "raw"): (get_reddit_scraper_dir, r"reddit_scraped_data_.+\.jsonl?"),
+    ("producthunt", "raw"): (get_product_hunt_scraper_dir, r"product_hunt_.+\.jsonl?"),
+    ("ycombinator", "raw"): (get_ycombinator_scraper_dir, r"ycombinator_.+\.jsonl?"),
+}
+_catalog_lock = threading.Lock()
+_catalog_ready = set()
+_catalog_backfilled = set()
+
+def get_artifact_catalog_path() -> str:
+    """Get artifact catalog database path: catalog/artifacts.sqlite3"""
+    return os.path.join(ensure_dir_exists(os.path.join(BASE_TMP_DIR, "catalog")), "artifacts.sqlite3")
+
+def _catalog_connection() -> sqlite3.Connection:
+    """Open the artifact catalog, creating its schema on first use."""
+    path = get_artifact_catalog_path()
+    connection = sqlite3.connect(path, timeout=30)
+    with _catalog_lock:
+        if path not in _catalog_ready:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_ARTIFACT_SCHEMA)
+            _catalog_ready.add(path)
+    return connection
+
+def register_artifact(path: str, profile: str, platform: str, kind: str, row_count: Optional[int] = None, created_at: Optional[float] = None) -> str:
+    """Record a scrape/filter/generate/approve artifact in the catalog and return its path."""
+    path = os.path.abspath(path)
+    connection = _catalog_connection()
+    try:
+        with connection:
+            connection.execute(
+                "INSERT INTO artifacts (path, profile, platform, kind, created_at, row_count) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET profile = excluded.profile, platform = excluded.platform, kind = excluded.kind, created_at = excluded.created_at, row_count = excluded.row_count",
+                (path, profile, platform, kind, created_at if created_at is not None else time.time(), row_count)
+            )
+    finally:
+        connection.close()
+
+    keep_latest = int(os.getenv("ARTIFACT_KEEP_LATEST", "0"))
+    if keep_latest > 0:
+        prune_artifacts(keep_latest=keep_latest, profile=profile, platform=platform, kind=kind, delete_files=True)
+    return path
+
+def _backfill_artifacts(profile: str, platform: str, kind: str) -> None:
+    """Catalog matching files written before the catalog existed, once per process."""
+    spec = ARTIFACT_FILE_PATTERNS.get((platform, kind))
+    key = (profile, platform, kind)
+    with _catalog_lock:
+        if spec is None or key in _catalog_backfilled:
+            return
+        _catalog_backfilled.add(key)
+
+    directory_fn, pattern = spec
+    directory = directory_fn(profile)
+    if not os.path.isdir(directory):
+        return
+
+    connection = _catalog_connection()
+    try:
+        if connection.execute("SELECT 1 FROM artifacts WHERE profile = ? AND platform = ? AND kind = ? LIMIT 1", key).fetchone():
+            return
+        matcher = re.compile(pattern)
+        with connection:
+            for name in os.listdir(directory):
+                path = os.path.abspath(os.path.join(directory, name))
+                if matcher.fullmatch(name) and os.path.isfile(path):
+                    connection.execute(
+                        "INSERT OR IGNORE INTO artifacts (path, profile, platform, kind, created_at, row_count) VALUES (?, ?, ?, ?, ?, NULL)",
+                        (path, profile, platform, kind, os.path.getmtime(path))
+                    )
+    finally:
+        connection.close()
+
+def get_latest_artifacts(profile: str, platform: str, kind: Union[str, Sequence[str]], limit: Optional[int] = 1, created_after: Optional[float] = None) -> List[str]:
+    """Get catalogued artifact paths of one or more kinds, newest first (limit=None for all)."""
+    kinds = (kind,) if isinstance(kind, str) else tuple(kind)
+    for each_kind in kinds:
+        _backfill_artifacts(profile, platform, each_kind)
+
+    connection = _catalog_connection()
+    try:
+        query = f"SELECT path FROM artifacts WHERE profile = ? AND platform = ? AND kind IN ({', '.join('?' for _ in kinds)}) AND created_at >= ? ORDER BY created_at DESC, id DESC"
+        rows = connection.execute(query, (profile, platform, *kinds, created_after if created_after is not None else 0)).fetchall()
+        paths, missing = [], []
+        for (path,) in rows:
+            if not os.path.exists(path):
+                missing.append(path)
+                continue
+            paths.append(path)
+            if limit is not None and len(paths) >= limit:
+                break
+        if missing:
+            with connection:
+                connection.executemany("DELETE FROM artifacts WHERE path = ?", [(path,) for path in missing])
+        return paths
+    finally:
+        connection.close()
+
+def get_latest_artifact(profile: str, platform: str, kind: Union[str, Sequence[str]]) -> str:
+    """Get the newest catalogued artifact path of one or more kinds, or an empty string."""
+    paths = get_latest_artifacts(profile, platform, kind, 1)
+    return paths[0] if paths else ""
+
+def prune_artifacts(keep_latest: Optional[int] = None, max_age_days: Optional[float] = None, profile: Optional[str] = None, platform: Optional[str] = None, kind: Optional[str] = None, delete_files: bool = False) -> int:
+    """Drop artifacts beyond the newest keep_latest per profile/platform/kind or older than max_age_days."""
+    filters, params = [], []
+    for column, value in (("profile", profile), ("platform", platform), ("kind", kind)):
+        if value is not None:
+            filters.append(f"{column} = ?")
+            params.append(value)
+    where = f"WHERE {' AND '.join(filters)}" if filters else ""
+
+    connection = _catalog_connection()
+    try:
+        rows = connection.execute(f"SELECT path, profile, platform, kind, created_at FROM artifacts {where} ORDER BY created_at DESC, id DESC", params).fetchall()
+        cutoff = time.time() - max_age_days * 86400 if max_age_days is not None else None
+        seen = {}
+        stale = []
+        for path, row_profile, row_platform, row_kind, created_at in rows:
+            group = (row_profile, row_platform, row_kind)
+            seen[group] = seen.get(group, 0) + 1
+            if (keep_latest is not None and seen[group] > keep_latest) or (cutoff is not None and created_at < cutoff):
+                stale.append(path)
+
+        with connection:
+            connection.executemany("DELETE FROM artifacts WHERE path = ?", [(path,) for path in stale])
+    finally:
+        connection.close()
+
+    if delete_files:
+        for path in stale:
+            for stale_file in (path, get_dataset_columns_path(path)):
+                try:
+                    os.remove(stale_file)
+                except OSError:
+                    pass
+    return len(stale)
+
 # =============================================================================
 # INITIALIZATION
 # =============================================================================
@@ -1,16 +1,25 @@
 import os
+import atexit
 import psycopg2
+import threading
 
 from psycopg2 import sql
 from dotenv import load_dotenv
-from psycopg2.extras import Json
+from contextlib import contextmanager
 from rich.console import Console
-from typing import List, Dict, Any
+from psycopg2.pool import ThreadedConnectionPool
+from psycopg2.extras import Json, execute_values
+from typing import List, Dict, Any, Iterable, Optional, Iterator
 from services.support.logger_util import _log as log
 
 load_dotenv()
 console = Console()
 
+_pool: Optional[ThreadedConnectionPool] = None
+_pool_pid: Optional[int] = None
+_pool_lock = threading.Lock()
+_verified_tables: set = set()
+
 def get_postgres_connection(verbose: bool = False) -> psycopg2.extensions.connection | None:
     try:
         db_url = os.getenv("POSTGRES_DB")
@@ -26,6 +35,64 @@ def get_postgres_connection(verbose: bool = False) -> psycopg2.extensions.connec
         log(f"[ERROR] Failed to connect to PostgreSQL database: {e}", verbose, is_error=True, log_caller_file="postgres_util.py")
         return None
 
+def get_connection_pool(verbose: bool = False) -> ThreadedConnectionPool | None:
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid() and not _pool.closed:
+            return _pool
+
+        db_url = os.getenv("POSTGRES_DB")
+        if not db_url:
+            log("[ERROR] POSTGRES_DB environment variable not set.", verbose, is_error=True, log_caller_file="postgres_util.py")
+            return None
+
+        try:
+            max_connections = int(os.getenv("POSTGRES_POOL_MAX", "10"))
+            log(f"[HITTING DATABASE] Opening PostgreSQL connection pool (max {max_connections}).", verbose, log_caller_file="postgres_util.py")
+            _pool = ThreadedConnectionPool(1, max_connections, db_url)
+            _pool_pid = os.getpid()
+            return _pool
+        except Exception as e:
+            log(f"[ERROR] Failed to open PostgreSQL connection pool: {e}", verbose, is_error=True, log_caller_file="postgres_util.py")
+            _pool = None
+            return None
+
+def close_connection_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid() and not _pool.closed:
+            _pool.closeall()
+        _pool = None
+
+atexit.register(close_connection_pool)
+
+@contextmanager
+def pooled_connection(verbose: bool = False) -> Iterator[psycopg2.extensions.connection | None]:
+    pool = get_connection_pool(verbose)
+    if pool is None:
+        yield None
+        return
+
+    conn = pool.getconn()
+    broken = False
+    try:
+        yield conn
+    finally:
+        if not conn.closed:
+            try:
+                conn.rollback()
+            except Exception:
+                broken = True
+        pool.putconn(conn, close=broken or bool(conn.closed))
+
+def ensure_table(conn: psycopg2.extensions.connection, table_name: str, schema: Dict[str, str], verbose: bool = False) -> bool:
+    if table_name in _verified_tables:
+        return True
+    if create_table_if_not_exists(conn, table_name, schema, verbose):
+        _verified_tables.add(table_name)
+        return True
+    return False
+
 def create_table_if_not_exists(conn: psycopg2.extensions.connection, table_name: str, schema: Dict[str, str], verbose: bool = False) -> bool:
     try:
         cursor = conn.cursor()
@@ -166,3 +233,100 @@ def update_data(conn: psycopg2.extensions.connection, table_name: str, updates:
     except Exception as e:
         log(f"[ERROR] Failed to update '{table_name}': {e}", verbose, is_error=True, log_caller_file="postgres_util.py")
         return False
+
+def select_column_values(conn: psycopg2.extensions.connection, table_name: str, key_column: str, value_column: str, keys: Iterable[Any], verbose: bool = False) -> Dict[Any, Any]:
+    keys = list(dict.fromkeys(k for k in keys if k))
+    if not keys:
+        return {}
+
+    try:
+        cursor = conn.cursor()
+        query = sql.SQL("SELECT {}, {} FROM {} WHERE {} = ANY(%s)").format(
+            sql.Identifier(key_column),
+            sql.Identifier(value_column),
+            sql.Identifier(table_name),
+            sql.Identifier(key_column)
+        )
+        cursor.execute(query, (keys,))
+        results = dict(cursor.fetchall())
+        log(f"Resolved {len(results)}/{len(keys)} existing keys in '{table_name}'.", verbose, log_caller_file="postgres_util.py")
+        return results
+    except Exception as e:
+        log(f"[ERROR] Failed to resolve keys in '{table_name}': {e}", verbose, is_error=True, log_caller_file="postgres_util.py")
+        raise
+
+def bulk_insert_data(conn: psycopg2.extensions.connection, table_name: str, rows: List[Dict[str, Any]], verbose: bool = False, conflict_column: Optional[str] = None, page_size: int = 500) -> int:
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(tuple(row.keys()), []).append(row)
+
+    inserted = 0
+    cursor = conn.cursor()
+    for columns, group in groups.items():
+        if conflict_column:
+            insert_query = sql.SQL("INSERT INTO {} ({}) VALUES %s ON CONFLICT ({}) DO NOTHING RETURNING 1").format(
+                sql.Identifier(table_name),
+                sql.SQL(', ').join(map(sql.Identifier, columns)),
+                sql.Identifier(conflict_column)
+            )
+        else:
+            insert_query = sql.SQL("INSERT INTO {} ({}) VALUES %s RETURNING 1").format(
+                sql.Identifier(table_name),
+                sql.SQL(', ').join(map(sql.Identifier, columns))
+            )
+
+        values = [
+            tuple(Json(row[col]) if isinstance(row[col], dict) else row[col] for col in columns)
+            for row in group
+        ]
+        inserted += len(execute_values(cursor, insert_query.as_string(conn), values, page_size=page_size, fetch=True))
+
+    log(f"Bulk inserted {inserted}/{len(rows)} records into '{table_name}'.", verbose, log_caller_file="postgres_util.py")
+    return inserted
+
+def count_rows(conn: psycopg2.extensions.connection, table_name: str, where_clause: str = "", params: tuple = (), verbose: bool = False) -> int:
+    try:
+        cursor = conn.cursor()
+        query = sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(table_name))
+        if where_clause:
+            query = sql.SQL("{} WHERE {}").format(query, sql.SQL(where_clause))
+        cursor.execute(query, params)
+        return cursor.fetchone()[0]
+    except Exception as e:
+        log(f"[ERROR] Failed to count rows in '{table_name}': {e}", verbose, is_error=True, log_caller_file="postgres_util.py")
+        raise
+
+STATUS_NOTIFY_FUNCTION = """
+CREATE OR REPLACE FUNCTION socials_notify_status_change() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' OR OLD.status IS DISTINCT FROM NEW.status THEN
+        PERFORM pg_notify(TG_ARGV[0], json_build_object('table', TG_TABLE_NAME, 'batch_id', NEW.batch_id, 'status', NEW.status)::text);
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+def ensure_status_notify_trigger(conn: psycopg2.extensions.connection, table_name: str, channel: str, verbose: bool = False) -> bool:
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT to_regclass(%s)", (sql.Identifier(table_name).as_string(conn),))
+        if cursor.fetchone()[0] is None:
+            conn.rollback()
+            return False
+
+        trigger_name = sql.Identifier(f"{table_name}_status_notify")
+        cursor.execute(STATUS_NOTIFY_FUNCTION)
+        cursor.execute(sql.SQL("DROP TRIGGER IF EXISTS {} ON {}").format(trigger_name, sql.Identifier(table_name)))
+        cursor.execute(sql.SQL("CREATE TRIGGER {} AFTER INSERT OR UPDATE OF status ON {} FOR EACH ROW EXECUTE FUNCTION socials_notify_status_change({})").format(
+            trigger_name,
+            sql.Identifier(table_name),
+            sql.Literal(channel)
+        ))
+        conn.commit()
+        log(f"Status notify trigger installed on '{table_name}'.", verbose, log_caller_file="postgres_util.py")
+        return True
+    except Exception as e:
+        conn.rollback()
+        log(f"[ERROR] Failed to install status notify trigger on '{table_name}': {e}", verbose, is_error=True, log_caller_file="postgres_util.py")
+        return False
@@ -0,0 +1,207 @@
+import os
+import time
+import sqlite3
+import threading
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+
+from services.support.logger_util import _log as log
+from services.support.path_config import get_seen_index_path, ensure_dir_exists
+
+SEEN_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen (
+    platform TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    content_id TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    PRIMARY KEY (platform, stage, content_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_seen_last_seen ON seen (last_seen);
+CREATE TABLE IF NOT EXISTS seen_stats (
+    platform TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    lookups INTEGER NOT NULL DEFAULT 0,
+    hits INTEGER NOT NULL DEFAULT 0,
+    hits_1d INTEGER NOT NULL DEFAULT 0,
+    hits_7d INTEGER NOT NULL DEFAULT 0,
+    hits_30d INTEGER NOT NULL DEFAULT 0,
+    hits_older INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (platform, stage)
+);
+"""
+# Hits are bucketed by how long ago the item was first seen, so SEEN_TTL_DAYS can be tuned from real data
+HIT_AGE_BUCKETS = ((1, "hits_1d"), (7, "hits_7d"), (30, "hits_30d"))
+QUERY_CHUNK_SIZE = 500
+
+StatsKey = Tuple[str, str]
+
+def _hit_bucket(age_seconds: float) -> str:
+    for days, column in HIT_AGE_BUCKETS:
+        if age_seconds < days * 86400:
+            return column
+    return "hits_older"
+
+class SeenIndex:
+    def __init__(self, path: str, ttl_days: float = 30, verbose: bool = False):
+        self.path = path
+        self.ttl_seconds = ttl_days * 86400
+        self.verbose = verbose
+        self.lock = threading.Lock()
+        self.run_stats: Dict[StatsKey, Dict[str, int]] = {}
+
+        ensure_dir_exists(os.path.dirname(path))
+        self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SEEN_SCHEMA)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def _cutoff(self, now: float) -> float:
+        return now - self.ttl_seconds
+
+    def _first_seen_many(self, platform: str, stage: str, content_ids: Sequence[str], now: float) -> Dict[str, float]:
+        found: Dict[str, float] = {}
+        for start in range(0, len(content_ids), QUERY_CHUNK_SIZE):
+            chunk = content_ids[start:start + QUERY_CHUNK_SIZE]
+            rows = self.connection.execute(
+                f"SELECT content_id, first_seen FROM seen WHERE platform = ? AND stage = ? AND last_seen >= ? AND content_id IN ({', '.join('?' for _ in chunk)})",
+                (platform, stage, self._cutoff(now), *chunk)
+            ).fetchall()
+            found.update(rows)
+        return found
+
+    def _record_stats(self, platform: str, stage: str, lookups: int, first_seen: Iterable[float], now: float):
+        buckets = {column: 0 for _, column in HIT_AGE_BUCKETS}
+        buckets["hits_older"] = 0
+        for seen_at in first_seen:
+            buckets[_hit_bucket(now - seen_at)] += 1
+        hits = sum(buckets.values())
+
+        run = self.run_stats.setdefault((platform, stage), {"lookups": 0, "hits": 0})
+        run["lookups"] += lookups
+        run["hits"] += hits
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO seen_stats (platform, stage, lookups, hits, hits_1d, hits_7d, hits_30d, hits_older) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(platform, stage) DO UPDATE SET lookups = lookups + excluded.lookups, hits = hits + excluded.hits, "
+                "hits_1d = hits_1d + excluded.hits_1d, hits_7d = hits_7d + excluded.hits_7d, hits_30d = hits_30d + excluded.hits_30d, hits_older = hits_older + excluded.hits_older",
+                (platform, stage, lookups, hits, buckets["hits_1d"], buckets["hits_7d"], buckets["hits_30d"], buckets["hits_older"])
+            )
+
+    def _mark(self, platform: str, stage: str, content_ids: Sequence[str], now: float):
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO seen (platform, stage, content_id, first_seen, last_seen) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(platform, stage, content_id) DO UPDATE SET last_seen = excluded.last_seen, "
+                "first_seen = CASE WHEN seen.last_seen < ? THEN excluded.first_seen ELSE seen.first_seen END",
+                [(platform, stage, content_id, now, now, self._cutoff(now)) for content_id in content_ids]
+            )
+
+    def contains_many(self, platform: str, stage: str, content_ids: Sequence[str]) -> Set[str]:
+        ids = list(dict.fromkeys(str(content_id) for content_id in content_ids if content_id))
+        if not self.enabled or not ids:
+            return set()
+        now = time.time()
+        with self.lock:
+            found = self._first_seen_many(platform, stage, ids, now)
+            self._record_stats(platform, stage, len(ids), (found[content_id] for content_id in ids if content_id in found), now)
+        return set(found)
+
+    def mark_many(self, platform: str, stage: str, content_ids: Sequence[str]):
+        ids = list(dict.fromkeys(str(content_id) for content_id in content_ids if content_id))
+        if not self.enabled or not ids:
+            return
+        with self.lock:
+            self._mark(platform, stage, ids, time.time())
+
+    def observe(self, platform: str, content_ids: Sequence[str], stage: str = "scraped") -> Set[str]:
+        ids = list(dict.fromkeys(str(content_id) for content_id in content_ids if content_id))
+        if not self.enabled or not ids:
+            return set()
+        now = time.time()
+        with self.lock:
+            found = self._first_seen_many(platform, stage, ids, now)
+            self._record_stats(platform, stage, len(ids), (found[content_id] for content_id in ids if content_id in found), now)
+            self._mark(platform, stage, ids, now)
+        return set(found)
+
+    def filter_unseen(self, platform: str, stage: str, records: Iterable[Dict[str, Any]], key_fn: Callable[[Dict[str, Any]], Any]) -> List[Dict[str, Any]]:
+        records = list(records)
+        seen_ids = self.contains_many(platform, stage, [key_fn(record) for record in records])
+        if not seen_ids:
+            return records
+        return [record for record in records if str(key_fn(record)) not in seen_ids]
+
+    def iter_unseen(self, platform: str, stage: str, records: Iterable[Dict[str, Any]], key_fn: Callable[[Dict[str, Any]], Any], chunk_size: int = 500) -> Iterator[Dict[str, Any]]:
+        chunk: List[Dict[str, Any]] = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                yield from self.filter_unseen(platform, stage, chunk, key_fn)
+                chunk = []
+        if chunk:
+            yield from self.filter_unseen(platform, stage, chunk, key_fn)
+
+    def prune(self) -> int:
+        if not self.enabled:
+            return 0
+        with self.lock:
+            with self.connection:
+                return self.connection.execute("DELETE FROM seen WHERE last_seen < ?", (self._cutoff(time.time()),)).rowcount
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            rows = self.connection.execute("SELECT platform, stage, lookups, hits, hits_1d, hits_7d, hits_30d, hits_older FROM seen_stats ORDER BY platform, stage").fetchall()
+            entries = dict(((platform, stage), count) for platform, stage, count in self.connection.execute("SELECT platform, stage, COUNT(*) FROM seen GROUP BY platform, stage"))
+            run_stats = {key: dict(value) for key, value in self.run_stats.items()}
+
+        stats = []
+        for platform, stage, lookups, hits, hits_1d, hits_7d, hits_30d, hits_older in rows:
+            run = run_stats.get((platform, stage), {"lookups": 0, "hits": 0})
+            stats.append({
+                "platform": platform,
+                "stage": stage,
+                "entries": entries.get((platform, stage), 0),
+                "lookups": lookups,
+                "hits": hits,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "hits_by_age": {"1d": hits_1d, "7d": hits_7d, "30d": hits_30d, "older": hits_older},
+                "run_lookups": run["lookups"],
+                "run_hits": run["hits"],
+                "run_hit_rate": run["hits"] / run["lookups"] if run["lookups"] else 0.0
+            })
+        return stats
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+_seen_indexes: Dict[str, SeenIndex] = {}
+_seen_indexes_lock = threading.Lock()
+
+def get_seen_index(profile_name: str, verbose: bool = False) -> SeenIndex:
+    with _seen_indexes_lock:
+        index = _seen_indexes.get(profile_name)
+        if index is None:
+            index = _seen_indexes[profile_name] = SeenIndex(get_seen_index_path(profile_name), ttl_days=float(os.getenv("SEEN_TTL_DAYS", "30")), verbose=verbose)
+            pruned = index.prune()
+            if pruned:
+                log(f"Pruned {pruned} expired entries from the seen index for profile '{profile_name}'", verbose, log_caller_file="seen_index.py")
+        return index
+
+def log_seen_index_stats(verbose: bool = False, status=None):
+    for profile_name, index in list(_seen_indexes.items()):
+        for stats in index.get_stats():
+            if not stats["run_lookups"]:
+                continue
+            ages = stats["hits_by_age"]
+            log(
+                f"Seen index [{profile_name}] {stats['platform']}/{stats['stage']}: {stats['run_hits']}/{stats['run_lookups']} already seen this run ({stats['run_hit_rate']:.0%}), "
+                f"lifetime {stats['hit_rate']:.0%} of {stats['lookups']} lookups, {stats['entries']} remembered; "
+                f"hits first seen <1d {ages['1d']}, <7d {ages['7d']}, <30d {ages['30d']}, older {ages['older']}",
+                verbose, status, log_caller_file="seen_index.py"
+            )
@@ -2,7 +2,7 @@ from abc import ABC
 from typing import List, Dict, Any, Optional
 
 from services.support.logger_util import _log as log
-from services.support.postgres_util import get_postgres_connection, create_table_if_not_exists, insert_data, select_data
+from services.support.postgres_util import pooled_connection, ensure_table, select_data, select_column_values, bulk_insert_data
 
 class BaseStorage(ABC):
     def __init__(self, profile_name: str):
@@ -14,60 +14,51 @@ class BaseStorage(ABC):
 
     def push_content(self, content: List[Dict[str, Any]], batch_id: str, verbose: bool = False) -> bool:
         try:
-            conn = get_postgres_connection(verbose)
-            if not conn:
-                return False
+            with pooled_connection(verbose) as conn:
+                if not conn:
+                    return False
 
-            table_name = self.table_name
+                table_name = self.table_name
 
-            if not create_table_if_not_exists(conn, table_name, self._get_table_schema(), verbose):
-                log(f"Failed to create table {table_name}", verbose, is_error=True, log_caller_file="base_storage.py")
-                conn.close()
-                return False
+                if not ensure_table(conn, table_name, self._get_table_schema(), verbose):
+                    log(f"Failed to create table {table_name}", verbose, is_error=True, log_caller_file="base_storage.py")
+                    return False
 
-            success_count = 0
-            for item in content:
-                profile_name = item.get('profile_name', self.profile_name)
                 conflict_column = self._get_conflict_column()
-
-                status = 'pending_review'
-
-                if conflict_column != "null":
-                    conflict_value = item.get(conflict_column)
-                    if conflict_value:
-                        existing_records = select_data(
-                            conn, table_name,
-                            f"{conflict_column} = %s",
-                            (conflict_value,),
-                            verbose
-                        )
-                        if existing_records:
-                            existing_status = existing_records[0].get('status')
-                            if existing_status in ['approved', 'posted']:
-                                status = 'posted'
-                            else:
-                                status = 'duplicate_not_posted'
-
-                record = {
-                    'profile_name': profile_name,
-                    'batch_id': batch_id,
-                    'status': status,
-                    **item
-                }
-
-                if insert_data(conn, table_name, record, verbose, conflict_column=self._get_conflict_column()):
-                    success_count += 1
-                else:
-                    log(f"Failed to insert item into {table_name}", verbose, is_error=True, log_caller_file="base_storage.py")
-
-            conn.close()
-
-            if success_count == len(content):
-                log(f"Pushed {len(content)} items to {table_name}", verbose, log_caller_file="base_storage.py")
-                return True
-            else:
-                log(f"Only pushed {success_count}/{len(content)} items to {table_name}", verbose, is_error=True, log_caller_file="base_storage.py")
-                return False
+                if conflict_column == "null":
+                    conflict_column = None
+
+                existing_statuses = {}
+                if conflict_column:
+                    existing_statuses = select_column_values(conn, table_name, conflict_column, 'status', (item.get(conflict_column) for item in content), verbose)
+
+                records = []
+                for item in content:
+                    status = 'pending_review'
+                    conflict_value = item.get(conflict_column) if conflict_column else None
+                    if conflict_value and conflict_value in existing_statuses:
+                        if existing_statuses[conflict_value] in ['approved', 'posted']:
+                            status = 'posted'
+                        else:
+                            status = 'duplicate_not_posted'
+
+                    records.append({
+                        'profile_name': item.get('profile_name', self.profile_name),
+                        'batch_id': batch_id,
+                        'status': status,
+                        **item
+                    })
+
+                try:
+                    inserted = bulk_insert_data(conn, table_name, records, verbose, conflict_column=conflict_column)
+                    conn.commit()
+                except Exception as e:
+                    conn.rollback()
+                    log(f"Failed to insert {len(records)} items into {table_name}: {e}", verbose, is_error=True, log_caller_file="base_storage.py")
+                    return False
+
+            log(f"Pushed {len(content)} items to {table_name} ({inserted} new, {len(content) - inserted} already present)", verbose, log_caller_file="base_storage.py")
+            return True
 
         except Exception as e:
             log(f"Failed to push content to {self.table_name}: {e}", verbose, is_error=True, log_caller_file="base_storage.py")
@@ -75,17 +66,15 @@ class BaseStorage(ABC):
 
     def pull_approved_content(self, batch_id: str, verbose: bool = False) -> List[Dict[str, Any]]:
         try:
-            conn = get_postgres_connection(verbose)
-            if not conn:
-                return []
-
-            table_name = self.table_name
+            with pooled_connection(verbose) as conn:
+                if not conn:
+                    return []
 
-            where_clause = "batch_id = %s AND status = %s"
-            params = (batch_id, 'approved')
-            approved_content = select_data(conn, table_name, where_clause, params, verbose)
+                table_name = self.table_name
 
-            conn.close()
+                where_clause = "batch_id = %s AND status = %s"
+                params = (batch_id, 'approved')
+                approved_content = select_data(conn, table_name, where_clause, params, verbose)
 
             log(f"Pulled {len(approved_content)} approved items from {table_name}", verbose, log_caller_file="base_storage.py")
             return approved_content
@@ -99,15 +88,13 @@ class BaseStorage(ABC):
 
     def get_batch_content(self, batch_id: str, verbose: bool = False) -> List[Dict[str, Any]]:
         try:
-            conn = get_postgres_connection(verbose)
-            if not conn:
-                return []
-
-            table_name = self.table_name
+            with pooled_connection(verbose) as conn:
+                if not conn:
+                    return []
 
-            content = select_data(conn, table_name, "batch_id = %s", (batch_id,), verbose)
+                table_name = self.table_name
 
-            conn.close()
+                content = select_data(conn, table_name, "batch_id = %s", (batch_id,), verbose)
 
             log(f"Retrieved {len(content)} items for batch {batch_id}", verbose, log_caller_file="base_storage.py")
             return content
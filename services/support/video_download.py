@@ -1,125 +1,231 @@
 import os
-import time
+import shutil
+import subprocess
 
 from rich.console import Console
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
 
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import TimeoutException
 
 from services.support.logger_util import _log as log
+from services.support.dir_watcher import DirectoryWatcher
+from services.support.media_fetch import get_media_fetcher
 from services.support.web_driver_handler import setup_driver
-from services.support.path_config import get_browser_data_dir
-
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from services.support.wait_util import click, find_first, log_interaction_summary, navigate, wait_until
+from services.support.path_config import get_browser_data_dir, get_cache_dir, ensure_dir_exists
 
 console = Console()
 
-# path to download files should be configured directly in chromium
-# search in settings downloads and change path
-# also for downloading so that ads dont block use ad-blocker extension
+SAVETWITTER_URL = 'https://savetwitter.net/en'
+VIDEO_NOT_FOUND_XPATH = "//div[contains(@class, 'error')]//p[contains(text(), 'Video not found')]"
+BEST_QUALITY_XPATH = "//a[contains(@class, 'tw-button-dl')][1]"
+VIDEO_SUFFIXES = ('.mp4',)
+
+VideoBackend = Callable[[List[str], str, str, bool, bool], Dict[str, str]]
+
+def get_tweet_id(tweet_url: str) -> str:
+    return tweet_url.split('/status/')[-1].split('?')[0].split('/')[0]
+
+def _video_cache_dir() -> str:
+    return ensure_dir_exists(os.path.join(get_cache_dir(), "videos"))
+
+def _cached_video_path(tweet_id: str) -> str:
+    return os.path.join(_video_cache_dir(), f"{tweet_id}.mp4")
+
+def _link_or_copy(source: str, target: str):
+    if os.path.exists(target):
+        return
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+def _record_mapping(filename: str, tweet_id: str, verbose: bool = False):
+    mapping = f'{filename} -> {tweet_id}\n'
+    with open('tmp/downloaded_videos.txt', 'a') as f:
+        f.write(mapping)
+    log(f"Video downloaded and mapped: {mapping.strip()}", verbose, log_caller_file="video_download.py")
+
+def _submit_savetwitter(driver, url: str, verbose: bool = False):
+    navigate(driver, SAVETWITTER_URL, ready_selectors=['#s_input'], timeout=15, quiet_ms=300, action="savetwitter_open")
+    found = find_first(driver, ['#s_input'], timeout=10, action="savetwitter_input")
+    if not found:
+        raise Exception("savetwitter input field did not load")
+    driver.execute_script("arguments[0].value = arguments[1];", found[0], url)
+    found = find_first(driver, ['.btn-red'], timeout=10, clickable=True, action="savetwitter_submit")
+    if not found:
+        raise Exception("savetwitter download button did not become clickable")
+    click(driver, found[0], action="savetwitter_submit", verbose=verbose)
+
+def _set_download_dir(driver, path: Optional[str], verbose: bool = False) -> bool:
+    params = {"behavior": "allow", "downloadPath": path} if path else {"behavior": "default"}
+    try:
+        driver.execute_cdp_cmd("Browser.setDownloadBehavior", params)
+        return True
+    except Exception as e:
+        log(f"Could not set browser download behavior to {params}: {e}", verbose, is_error=True, log_caller_file="video_download.py")
+        return False
+
+def _collect_from_tab(driver, url: str, tab_dir: str, download_timeout: float, verbose: bool = False) -> Optional[str]:
+    outcome = wait_until(
+        driver,
+        lambda d: d.find_elements(By.XPATH, VIDEO_NOT_FOUND_XPATH) and "missing" or d.find_elements(By.XPATH, BEST_QUALITY_XPATH) and "ready",
+        timeout=20,
+        action="savetwitter_result"
+    )
+    if outcome == "missing":
+        log(f"Video not found for URL: {url}, skipping to next URL", verbose, is_error=False, log_caller_file="video_download.py")
+        return None
+
+    best_quality_link = driver.find_elements(By.XPATH, BEST_QUALITY_XPATH)[0]
+    href = best_quality_link.get_attribute('href') or ''
+    if href.startswith('http'):
+        fetched = get_media_fetcher().fetch(href)
+        if fetched and fetched.endswith(VIDEO_SUFFIXES):
+            return fetched
+
+    # Downloads land in a directory owned by this tab, so a late file from another tab can never be picked up here
+    with DirectoryWatcher(tab_dir) as watcher:
+        if not _set_download_dir(driver, tab_dir, verbose):
+            return None
+        click(driver, best_quality_link, action="savetwitter_download", verbose=verbose)
+        new_file = watcher.wait_for_new(VIDEO_SUFFIXES, download_timeout)
+    if new_file is None:
+        log(f"Download timed out for URL: {url}", verbose, is_error=False, log_caller_file="video_download.py")
+        return None
+    return os.path.join(tab_dir, new_file)
+
+# path to download files is set per tab through CDP (Browser.setDownloadBehavior) right before each download click
+# for downloading so that ads dont block use ad-blocker extension
 # (make the process more efficient and reliable)
-def download_twitter_videos(tweet_urls: list[str], download_dir: str, profile_name="Default", headless=True, verbose: bool = False) -> list[str]:
-    user_data_dir = get_browser_data_dir(profile_name)
-    driver, setup_messages = setup_driver(user_data_dir, profile=profile_name, headless=headless, verbose=verbose)
+def _browser_backend(tweet_urls: List[str], staging_dir: str, profile_name: str, headless: bool, verbose: bool) -> Dict[str, str]:
+    tab_count = max(1, int(os.getenv("X_VIDEO_TABS", "4")))
+    download_timeout = float(os.getenv("X_VIDEO_DOWNLOAD_TIMEOUT", "60"))
+    resolved: Dict[str, str] = {}
+
+    driver, setup_messages = setup_driver(get_browser_data_dir(profile_name), profile=profile_name, headless=headless, verbose=verbose)
     for msg in setup_messages:
         log(msg, verbose, log_caller_file="video_download.py")
-        time.sleep(0.1)
 
-    time.sleep(10)
-    original_window = driver.current_window_handle
-    current_tabs = []
-    
-    os.makedirs(download_dir, exist_ok=True)
+    try:
+        original_window = driver.current_window_handle
+        for start in range(0, len(tweet_urls), tab_count):
+            tabs = {}
+            for url in tweet_urls[start:start + tab_count]:
+                log(f"Downloading video from: {url}", verbose, log_caller_file="video_download.py")
+                try:
+                    driver.switch_to.new_window('tab')
+                    tabs[url] = driver.current_window_handle
+                    _submit_savetwitter(driver, url, verbose)
+                except Exception as e:
+                    log(f"Error submitting URL {url}: {str(e)}", verbose, is_error=True, log_caller_file="video_download.py")
+
+            for url, handle in tabs.items():
+                try:
+                    driver.switch_to.window(handle)
+                    path = _collect_from_tab(driver, url, os.path.join(staging_dir, get_tweet_id(url)), download_timeout, verbose)
+                    if path:
+                        resolved[url] = path
+                except Exception as e:
+                    log(f"Error processing URL {url}: {str(e)}", verbose, is_error=True, log_caller_file="video_download.py")
+                finally:
+                    try:
+                        driver.close()
+                    except Exception:
+                        pass
+            driver.switch_to.window(original_window)
+    finally:
+        # The session may go back to the driver pool; the next lease should not keep saving into our staging dirs
+        _set_download_dir(driver, None, verbose)
+        driver.quit()
+        log_interaction_summary(verbose)
 
-    initial_files = set(os.listdir(download_dir))
-    downloaded_video_paths = []
+    return resolved
 
-    for url in tweet_urls:
-        log(f"Processing Downloads for URL: {url}", verbose, log_caller_file="video_download.py")
-        log(f"Downloading video from: {url}", verbose, log_caller_file="video_download.py")
+def _ytdlp_backend(tweet_urls: List[str], staging_dir: str, profile_name: str, headless: bool, verbose: bool) -> Dict[str, str]:
+    def fetch(url: str) -> Optional[str]:
+        tweet_id = get_tweet_id(url)
+        cmd = [
+            'yt-dlp',
+            '--output', os.path.join(staging_dir, f'{tweet_id}.%(ext)s'),
+            '--format', 'best[ext=mp4]/best',
+            '--restrict-filenames',
+            url
+        ]
         try:
-            driver.execute_script("window.open('');")
-            new_tab = driver.window_handles[-1]
-            current_tabs.append(new_tab)
-            driver.switch_to.window(new_tab)
-            driver.get('https://savetwitter.net/en')
-            time.sleep(2)
-            input_field = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.ID, 's_input'))
-            )
-            driver.execute_script("arguments[0].value = arguments[1];", input_field, url)
-            download_button = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.CLASS_NAME, 'btn-red'))
-            )
-            download_button.click()
-            
-            try:
-                error_div = WebDriverWait(driver, 5).until(
-                    EC.presence_of_element_located((By.XPATH, "//div[contains(@class, 'error')]//p[contains(text(), 'Video not found')]" ))
-                )
-                log(f"Video not found for URL: {url}, skipping to next URL", verbose, is_error=False, log_caller_file="video_download.py")
-                continue
-            except TimeoutException:
-                try:
-                    best_quality_link = WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located((By.XPATH, "//a[contains(@class, 'tw-button-dl')][1]" ))
-                    )
-                    best_quality_link.click()
-                    time.sleep(2)
-                except TimeoutException:
-                    log(f"Download already initiated for {url}, continuing to next URL", verbose, log_caller_file="video_download.py")
-            
-            max_wait_time = 20
-            wait_interval = 2
-            waited_time = 0
-            
-            while waited_time < max_wait_time:
-                current_files = set(os.listdir(download_dir))
-                new_files = current_files - initial_files
-                
-                downloading_files = [f for f in new_files if f.endswith('.crdownload') or f.endswith('.tmp')]
-                
-                if downloading_files:
-                    log(f"Download still in progress: {downloading_files}", verbose, log_caller_file="video_download.py")
-                    time.sleep(wait_interval)
-                    waited_time += wait_interval
-                    continue
-                
-                completed_files = [f for f in new_files if f.endswith('.mp4')]
-                if completed_files:
-                    new_file = completed_files[0]
-                    break
-                
-                time.sleep(wait_interval)
-                waited_time += wait_interval
-            
-            if new_file is None:
-                log(f"Download timed out for URL: {url}", verbose, is_error=False, log_caller_file="video_download.py")
-                continue
-                
-            log(f"New file downloaded: {new_file}", verbose, log_caller_file="video_download.py")
-            
-            initial_files.add(new_file)
-            downloaded_video_paths.append(os.path.join(download_dir, new_file))
-            
-            tweet_id = url.split('/')[-1]
-            mapping = f'{new_file} -> {tweet_id}\n'
-
-            with open('tmp/downloaded_videos.txt', 'a') as f:
-                f.write(mapping)
-            log(f"Video downloaded and mapped: {mapping.strip()}", verbose, log_caller_file="video_download.py")
-
-        except Exception as e:
-            log(f"Error processing URL {url}: {str(e)}", verbose, is_error=True, log_caller_file="video_download.py")
-        finally:
+            subprocess.run(cmd, capture_output=True, text=True, check=True)
+        except FileNotFoundError:
+            log("yt-dlp is not installed; set X_VIDEO_BACKEND=browser or install it with pip install yt-dlp", verbose, is_error=True, log_caller_file="video_download.py")
+            return None
+        except subprocess.CalledProcessError as e:
+            log(f"yt-dlp failed for {url}: {e.stderr.strip()}", verbose, is_error=True, log_caller_file="video_download.py")
+            return None
+        path = os.path.join(staging_dir, f'{tweet_id}.mp4')
+        return path if os.path.exists(path) else None
+
+    with ThreadPoolExecutor(max_workers=max(1, int(os.getenv("X_VIDEO_TABS", "4")))) as executor:
+        paths = list(executor.map(fetch, tweet_urls))
+    return {url: path for url, path in zip(tweet_urls, paths) if path}
+
+VIDEO_BACKENDS: Dict[str, VideoBackend] = {
+    "browser": _browser_backend,
+    "yt-dlp": _ytdlp_backend
+}
+
+def register_video_backend(name: str, backend: VideoBackend):
+    VIDEO_BACKENDS[name] = backend
+
+def acquire_twitter_videos(tweet_urls: List[str], download_dir: Optional[str] = None, profile_name: str = "Default", headless: bool = True, verbose: bool = False, backend: Optional[str] = None) -> Dict[str, str]:
+    unique_urls: Dict[str, str] = {}
+    for url in tweet_urls:
+        if url and '/status/' in url:
+            unique_urls.setdefault(get_tweet_id(url), url)
+
+    pending = [url for tweet_id, url in unique_urls.items() if not os.path.exists(_cached_video_path(tweet_id))]
+    if len(pending) < len(unique_urls):
+        log(f"Reusing {len(unique_urls) - len(pending)} cached tweet videos", verbose, log_caller_file="video_download.py")
+
+    if pending:
+        backend_name = backend or os.getenv("X_VIDEO_BACKEND", "browser")
+        backend_fn = VIDEO_BACKENDS.get(backend_name)
+        if backend_fn is None:
+            log(f"Unknown video backend '{backend_name}', using browser", verbose, is_error=True, log_caller_file="video_download.py")
+            backend_fn = _browser_backend
+
+        staging_dir = ensure_dir_exists(os.path.join(_video_cache_dir(), "_incoming"))
+        log(f"Acquiring {len(pending)} tweet videos with the {backend_name} backend", verbose, log_caller_file="video_download.py")
+        for url, path in backend_fn(pending, staging_dir, profile_name, headless, verbose).items():
+            tweet_id = get_tweet_id(url)
+            target = _cached_video_path(tweet_id)
             try:
-                driver.close()
-                if new_tab in current_tabs:
-                    current_tabs.remove(new_tab)
-            except:
-                pass
-            driver.switch_to.window(original_window)
+                if os.path.commonpath([os.path.abspath(path), os.path.abspath(staging_dir)]) == os.path.abspath(staging_dir):
+                    os.replace(path, target)
+                    if os.path.dirname(os.path.abspath(path)) != os.path.abspath(staging_dir):
+                        shutil.rmtree(os.path.dirname(path), ignore_errors=True)
+                else:
+                    _link_or_copy(path, target)
+                _record_mapping(os.path.basename(path), tweet_id, verbose)
+            except OSError as e:
+                log(f"Could not cache video for {url}: {e}", verbose, is_error=True, log_caller_file="video_download.py")
+
+    results: Dict[str, str] = {}
+    if download_dir:
+        ensure_dir_exists(download_dir)
+    for url in tweet_urls:
+        if not url or '/status/' not in url:
+            continue
+        cached = _cached_video_path(get_tweet_id(url))
+        if not os.path.exists(cached):
+            continue
+        if download_dir:
+            target = os.path.join(download_dir, os.path.basename(cached))
+            _link_or_copy(cached, target)
+            results[url] = target
+        else:
+            results[url] = cached
+    return results
 
-    driver.quit()
-    return downloaded_video_paths
+def download_twitter_videos(tweet_urls: list[str], download_dir: str, profile_name="Default", headless=True, verbose: bool = False) -> list[str]:
+    downloaded = acquire_twitter_videos(tweet_urls, download_dir, profile_name=profile_name, headless=headless, verbose=verbose)
+    return list(dict.fromkeys(downloaded[url] for url in tweet_urls if url in downloaded))
@@ -0,0 +1,268 @@
+import os
+import time
+import random
+import bisect
+import threading
+
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException, WebDriverException
+
+from services.support.logger_util import _log as log
+
+HISTOGRAM_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0]
+DEFAULT_POLL_SECONDS = 0.1
+
+_DOM_SETTLED_SCRIPT = """
+const quietMs = arguments[0];
+const timeoutMs = arguments[1];
+const done = arguments[arguments.length - 1];
+const start = Date.now();
+let last = Date.now();
+const observer = new MutationObserver(() => { last = Date.now(); });
+observer.observe(document, {childList: true, subtree: true, characterData: true});
+(function check() {
+    const now = Date.now();
+    if (document.readyState === 'complete' && now - last >= quietMs) {
+        observer.disconnect();
+        done(true);
+        return;
+    }
+    if (now - start >= timeoutMs) {
+        observer.disconnect();
+        done(false);
+        return;
+    }
+    setTimeout(check, Math.min(100, quietMs));
+})();
+"""
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(HISTOGRAM_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, fraction: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return HISTOGRAM_BUCKETS[index] if index < len(HISTOGRAM_BUCKETS) else self.max
+        return self.max
+
+class InteractionMetrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+
+    def record(self, action: str, kind: str, seconds: float):
+        with self.lock:
+            histogram = self.histograms.get((action, kind))
+            if histogram is None:
+                histogram = self.histograms[(action, kind)] = LatencyHistogram()
+            histogram.observe(seconds)
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {}
+
+    def summary(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            return [{
+                "action": action,
+                "kind": kind,
+                "count": histogram.count,
+                "total_seconds": round(histogram.total, 2),
+                "p50": histogram.percentile(0.5),
+                "p95": histogram.percentile(0.95),
+                "max": round(histogram.max, 2),
+                "buckets": dict(zip([f"<={b}s" for b in HISTOGRAM_BUCKETS] + ["inf"], histogram.counts))
+            } for (action, kind), histogram in sorted(self.histograms.items())]
+
+    def totals(self) -> Dict[str, float]:
+        totals: Dict[str, float] = {}
+        with self.lock:
+            for (_, kind), histogram in self.histograms.items():
+                totals[kind] = totals.get(kind, 0.0) + histogram.total
+        return totals
+
+class JitterBudget:
+    def __init__(self, scale: float = 1.0, budget_seconds: Optional[float] = None):
+        self.scale = max(0.0, scale)
+        self.budget_seconds = budget_seconds if budget_seconds and budget_seconds > 0 else None
+        self.spent = 0.0
+        self.lock = threading.Lock()
+
+    def draw(self, low: float, high: float) -> float:
+        delay = random.uniform(low, high) * self.scale
+        with self.lock:
+            if self.budget_seconds is not None:
+                delay = max(0.0, min(delay, self.budget_seconds - self.spent))
+            self.spent += delay
+        return delay
+
+_metrics = InteractionMetrics()
+_jitter: Optional[JitterBudget] = None
+
+def get_interaction_metrics() -> InteractionMetrics:
+    return _metrics
+
+def get_jitter_budget() -> JitterBudget:
+    global _jitter
+    if _jitter is None:
+        _jitter = JitterBudget(float(os.getenv("BROWSER_JITTER_SCALE", "1.0")), float(os.getenv("BROWSER_JITTER_BUDGET_SECONDS", "0")))
+    return _jitter
+
+def set_jitter_budget(scale: float = 1.0, budget_seconds: Optional[float] = None):
+    global _jitter
+    _jitter = JitterBudget(scale, budget_seconds)
+
+@contextmanager
+def timed(action: str, kind: str = "act"):
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        _metrics.record(action, kind, time.monotonic() - start)
+
+def _driver_of(root):
+    return getattr(root, "parent", root)
+
+@contextmanager
+def implicit_wait_suspended(root):
+    driver = _driver_of(root)
+    try:
+        previous = driver.timeouts.implicit_wait
+    except Exception:
+        previous = None
+    if previous:
+        driver.implicitly_wait(0)
+    try:
+        yield
+    finally:
+        if previous:
+            driver.implicitly_wait(previous)
+
+def human_pause(low: float, high: float, action: str = "pause"):
+    delay = get_jitter_budget().draw(low, high)
+    if delay > 0:
+        time.sleep(delay)
+    _metrics.record(action, "jitter", delay)
+
+# Mandatory pacing between account actions (requests, posts, messages); unlike human_pause it is never scaled or budgeted
+def pace(low: float, high: float, action: str = "pace"):
+    delay = random.uniform(low, high)
+    time.sleep(delay)
+    _metrics.record(action, "pace", delay)
+
+def wait_until(root, condition: Callable[[Any], Any], timeout: float = 10, action: str = "wait", poll: float = DEFAULT_POLL_SECONDS, raise_on_timeout: bool = True):
+    start = time.monotonic()
+    try:
+        with implicit_wait_suspended(root):
+            return WebDriverWait(root, timeout, poll_frequency=poll, ignored_exceptions=(StaleElementReferenceException,)).until(condition)
+    except TimeoutException:
+        if raise_on_timeout:
+            raise
+        return None
+    finally:
+        _metrics.record(action, "wait", time.monotonic() - start)
+
+def _usable(element, clickable: bool, visible: bool) -> bool:
+    if clickable:
+        return element.is_displayed() and element.is_enabled()
+    if visible:
+        return element.is_displayed()
+    return True
+
+def find_first(root, selectors: Sequence[str], timeout: float = 5, by: str = By.CSS_SELECTOR, clickable: bool = False, visible: bool = False, action: str = "find") -> Optional[Tuple[Any, str]]:
+    def any_selector(current_root):
+        for selector in selectors:
+            for element in current_root.find_elements(by, selector):
+                try:
+                    if _usable(element, clickable, visible):
+                        return element, selector
+                except StaleElementReferenceException:
+                    continue
+        return False
+
+    return wait_until(root, any_selector, timeout=timeout, action=action, raise_on_timeout=False)
+
+def find_all(root, selectors: Sequence[str], timeout: float = 5, by: str = By.CSS_SELECTOR, action: str = "find") -> List[Any]:
+    def any_present(current_root):
+        for selector in selectors:
+            elements = current_root.find_elements(by, selector)
+            if elements:
+                return elements
+        return False
+
+    return wait_until(root, any_present, timeout=timeout, action=action, raise_on_timeout=False) or []
+
+def wait_for_dom_settled(driver, quiet_ms: int = 500, timeout: float = 10, action: str = "dom_settled") -> bool:
+    start = time.monotonic()
+    try:
+        previous = driver.timeouts.script
+    except Exception:
+        previous = None
+    try:
+        driver.set_script_timeout(timeout + 5)
+        return bool(driver.execute_async_script(_DOM_SETTLED_SCRIPT, quiet_ms, int(timeout * 1000)))
+    except WebDriverException:
+        return False
+    finally:
+        if previous is not None:
+            try:
+                driver.set_script_timeout(previous)
+            except WebDriverException:
+                pass
+        _metrics.record(action, "wait", time.monotonic() - start)
+
+def navigate(driver, url: str, ready_selectors: Optional[Sequence[str]] = None, timeout: float = 20, quiet_ms: int = 500, action: str = "navigate"):
+    with timed(action, "act"):
+        driver.get(url)
+    if ready_selectors:
+        find_first(driver, ready_selectors, timeout=timeout, action=f"{action}_ready")
+    return wait_for_dom_settled(driver, quiet_ms=quiet_ms, timeout=timeout, action=f"{action}_settled")
+
+def click(driver, element, action: str = "click", verbose: bool = False, status=None):
+    with timed(action, "act"):
+        try:
+            element.click()
+        except WebDriverException as e:
+            log(f"Selenium click failed for {action}, falling back to JavaScript: {e}", verbose, status, log_caller_file="wait_util.py")
+            driver.execute_script("arguments[0].click();", element)
+
+def scroll_into_view(driver, element, action: str = "scroll_into_view"):
+    with timed(action, "act"):
+        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
+
+def wait_for_scroll_growth(driver, previous_height: int, timeout: float = 5, action: str = "scroll_load") -> int:
+    def grown(current_driver):
+        height = current_driver.execute_script("return document.body.scrollHeight")
+        return height if height > previous_height else False
+
+    return wait_until(driver, grown, timeout=timeout, action=action, raise_on_timeout=False) or previous_height
+
+def log_interaction_summary(verbose: bool = False, status=None, reset: bool = True):
+    summary = _metrics.summary()
+    if not summary:
+        return
+    totals = _metrics.totals()
+    log(f"Browser time: waiting {totals.get('wait', 0.0):.1f}s, acting {totals.get('act', 0.0):.1f}s, jitter {totals.get('jitter', 0.0):.1f}s, pacing {totals.get('pace', 0.0):.1f}s", verbose, status, log_caller_file="wait_util.py")
+    for row in summary:
+        log(f"  {row['kind']:<6} {row['action']:<28} n={row['count']:<4} total={row['total_seconds']:>7.2f}s p50<={row['p50']}s p95<={row['p95']}s max={row['max']}s", verbose, status, log_caller_file="wait_util.py")
+    if reset:
+        _metrics.reset()
@@ -4,20 +4,99 @@ import subprocess
 
 from selenium import webdriver
 from rich.console import Console
+from multiprocessing.connection import Client
 
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 
 from services.support.logger_util import _log as log
+from services.support.path_config import get_driver_pool_socket_path
 
 console = Console()
 
-def setup_driver(user_data_dir, incognito=False, profile="Default", headless=False, prefs: dict = None, additional_arguments: list = None, verbose: bool = False, status=None):
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
+
+def _configure_driver(driver):
+    driver.execute_cdp_cmd('Network.setUserAgentOverride', {
+        "userAgent": USER_AGENT
+    })
+
+    driver.set_window_size(1920, 1080)
+    driver.set_page_load_timeout(60)
+    driver.implicitly_wait(float(os.getenv("BROWSER_IMPLICIT_WAIT", "30")))
+
+def _driver_pool_request(request: dict, verbose: bool = False, status=None):
+    if os.getenv("DRIVER_POOL", "1") == "0":
+        return None
+
+    socket_path = get_driver_pool_socket_path()
+    if not os.path.exists(socket_path):
+        return None
+
+    try:
+        conn = Client(socket_path, family='AF_UNIX')
+    except OSError as e:
+        log(f"Driver pool socket present but not accepting connections: {e}", verbose, status=status, api_info=None, log_caller_file="web_driver_handler.py")
+        return None
+
+    try:
+        conn.send(request)
+        return conn.recv()
+    finally:
+        conn.close()
+
+def _lease_pooled_driver(user_data_dir, incognito, profile, headless, prefs, additional_arguments, verbose: bool = False, status=None):
+    response = _driver_pool_request({
+        "op": "lease",
+        "user_data_dir": user_data_dir,
+        "profile": profile,
+        "headless": headless,
+        "incognito": incognito,
+        "prefs": prefs,
+        "additional_arguments": list(additional_arguments or []),
+        "pid": os.getpid(),
+        "timeout": float(os.getenv("DRIVER_POOL_LEASE_TIMEOUT", "300"))
+    }, verbose, status)
+    if response is None:
+        return None
+    if not response.get("ok"):
+        raise Exception(f"Driver pool could not lease a browser for {user_data_dir}: {response.get('error')}")
+
+    lease_id = response["lease_id"]
+    try:
+        options = Options()
+        options.debugger_address = response["debugger_address"]
+        driver = webdriver.Chrome(service=Service(), options=options)
+        _configure_driver(driver)
+    except Exception:
+        _driver_pool_request({"op": "release", "lease_id": lease_id, "healthy": False}, verbose, status)
+        raise
+
+    detach = driver.quit
+
+    def release():
+        try:
+            detach()
+        finally:
+            _driver_pool_request({"op": "release", "lease_id": lease_id, "healthy": True}, verbose, status)
+
+    driver.quit = release
+    log(f"Leased {'warm' if response.get('reused') else 'new'} pooled browser for {user_data_dir} at {response['debugger_address']}", verbose, status=status, api_info=None, log_caller_file="web_driver_handler.py")
+    return driver
+
+def setup_driver(user_data_dir, incognito=False, profile="Default", headless=False, prefs: dict = None, additional_arguments: list = None, verbose: bool = False, status=None, pooled: bool = True):
     options = Options()
     status_messages = []
 
     user_data_dir = os.path.abspath(user_data_dir)
 
+    if pooled:
+        driver = _lease_pooled_driver(user_data_dir, incognito, profile, headless, prefs, additional_arguments, verbose, status)
+        if driver is not None:
+            return driver, status_messages
+    else:
+        _driver_pool_request({"op": "evict", "user_data_dir": user_data_dir, "profile": profile}, verbose, status)
+
     kill_chrome_processes_by_user_data_dir(user_data_dir, verbose, status)
     log(f"Killed Chrome processes for {user_data_dir}", verbose, status=status, api_info=None, log_caller_file="web_driver_handler.py")
 
@@ -94,13 +173,7 @@ def setup_driver(user_data_dir, incognito=False, profile="Default", headless=Fal
     service = Service()
     driver = webdriver.Chrome(service=service, options=options)
 
-    driver.execute_cdp_cmd('Network.setUserAgentOverride', {
-        "userAgent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
-    })
-
-    driver.set_window_size(1920, 1080)
-    driver.set_page_load_timeout(60)
-    driver.implicitly_wait(30)
+    _configure_driver(driver)
 
     log("Chromium WebDriver created successfully", verbose, status=status, api_info=None, log_caller_file="web_driver_handler.py")
     return driver, status_messages
@@ -4,6 +4,7 @@ import os
 import sys
 import argparse
 
+from datetime import datetime
 from dotenv import load_dotenv
 
 from profiles import PROFILES
@@ -14,7 +15,7 @@ from services.support.logger_util import _log as log
 from services.support.path_config import initialize_directories
 from services.support.storage.storage_factory import get_storage, validate_platform
 
-from services.utils.action.support import scrape_and_store, wait_for_approval, post_approved_content
+from services.utils.action.support import ActionOrchestrator, ApprovalStream, scrape_and_store, wait_for_approval, post_approved_content
 
 def main():
     load_dotenv()
@@ -117,14 +118,33 @@ def main():
             platform_profile_str.append(f"{platform}: {', '.join(profiles)}")
         log(f"Starting Multi-Platform Action System: {', '.join(platform_profile_str)}", verbose, log_caller_file="action.py")
 
-        log("Scraping and storing content for specified profile-platform combinations...", verbose, log_caller_file="action.py")
-        batch_id, drivers = scrape_and_store(profile_platform_map, storages, verbose)
+        if os.getenv("ACTION_RUNNER", "process") == "process":
+            batch_id = datetime.now().strftime("%d%m%y%H%M")
+            log(f"Generated unified batch ID: {batch_id}", verbose, log_caller_file="action.py")
 
-        log("Waiting for approval...", verbose, log_caller_file="action.py")
-        wait_for_approval(batch_id, verbose)
+            with ActionOrchestrator(profile_platform_map, storages, batch_id, verbose) as orchestrator:
+                log("Scraping and storing content in one worker process per profile-platform combination...", verbose, log_caller_file="action.py")
+                orchestrator.scrape_and_store()
 
-        log("Posting approved content...", verbose, log_caller_file="action.py")
-        post_approved_content(profile_platform_map, storages, batch_id, drivers, verbose)
+                if os.getenv("ACTION_APPROVAL_MODE", "stream") == "stream":
+                    log("Posting content as it is approved...", verbose, log_caller_file="action.py")
+                    with ApprovalStream(storages, batch_id, verbose) as stream:
+                        orchestrator.post_as_approved(stream)
+                else:
+                    log("Waiting for approval...", verbose, log_caller_file="action.py")
+                    wait_for_approval(batch_id, verbose)
+
+                    log("Posting approved content...", verbose, log_caller_file="action.py")
+                    orchestrator.post_approved()
+        else:
+            log("Scraping and storing content for specified profile-platform combinations...", verbose, log_caller_file="action.py")
+            batch_id, drivers = scrape_and_store(profile_platform_map, storages, verbose)
+
+            log("Waiting for approval...", verbose, log_caller_file="action.py")
+            wait_for_approval(batch_id, verbose)
+
+            log("Posting approved content...", verbose, log_caller_file="action.py")
+            post_approved_content(profile_platform_map, storages, batch_id, drivers, verbose)
 
         log("Multi-profile action system completed successfully!", verbose, log_caller_file="action.py")
 
@@ -1,5 +1,6 @@
 from .scraper import scrape_and_store
-from .approval import wait_for_approval
+from .approval import wait_for_approval, ApprovalStream
 from .poster import post_approved_content
+from .orchestrator import ActionOrchestrator
 
-__all__ = ['scrape_and_store', 'wait_for_approval', 'post_approved_content']
\ No newline at end of file
+__all__ = ['scrape_and_store', 'wait_for_approval', 'ApprovalStream', 'post_approved_content', 'ActionOrchestrator']
\ No newline at end of file
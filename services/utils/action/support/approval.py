@@ -1,4 +1,18 @@
+import os
+import sys
+import json
+import time
+import select
+import threading
+
+from typing import Dict, Optional, Set, Tuple
+
 from services.support.logger_util import _log as log
+from services.support.postgres_util import get_postgres_connection, pooled_connection, count_rows, ensure_status_notify_trigger
+
+APPROVAL_CHANNEL = "socials_action_status"
+
+StorageKey = Tuple[str, str]
 
 def wait_for_approval(batch_id: str, verbose: bool = False):
     log(f"Batch ID: {batch_id}", verbose, log_caller_file="approval.py")
@@ -9,3 +23,121 @@ def wait_for_approval(batch_id: str, verbose: bool = False):
 
     input()
     log("User confirmed to proceed with posting", verbose, log_caller_file="approval.py")
+
+# Tells the poster which (profile, platform) storages changed since the last call. With ACTION_APPROVAL_EVENTS=notify a
+# trigger on each action table NOTIFYs on every status change; poll (or a failed LISTEN setup) re-checks every storage
+# each ACTION_APPROVAL_POLL_SECONDS instead. Notify mode still sweeps everything now and then in case an event was lost.
+class ApprovalStream:
+    def __init__(self, storages: dict, batch_id: str, verbose: bool = False):
+        self.storages = storages
+        self.batch_id = batch_id
+        self.verbose = verbose
+        self.tables: Dict[str, StorageKey] = {storage.table_name: (profile_name, platform) for profile_name, platform_storages in storages.items() for platform, storage in platform_storages.items()}
+        self.connection = None
+        self.poll_seconds = float(os.getenv("ACTION_APPROVAL_POLL_SECONDS", "5"))
+        self.sweep_seconds = self.poll_seconds
+        self.last_sweep = 0.0
+        timeout = float(os.getenv("ACTION_APPROVAL_TIMEOUT_SECONDS", "0"))
+        self.deadline = time.time() + timeout if timeout > 0 else None
+        self.confirmed = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        return self.confirmed.is_set() or (self.deadline is not None and time.time() >= self.deadline)
+
+    def start(self):
+        if os.getenv("ACTION_APPROVAL_EVENTS", "notify") == "notify":
+            self._listen()
+        mode = "LISTEN/NOTIFY" if self.connection else f"polling every {self.poll_seconds:g}s"
+        log(f"Watching {len(self.tables)} action tables for approvals in batch {self.batch_id} ({mode})", self.verbose, log_caller_file="approval.py")
+
+        print(f"\nBatch ID: {self.batch_id}")
+        print("Approved items are posted as soon as they are approved in your external system")
+        if sys.stdin and sys.stdin.isatty():
+            print("Press Enter to post what is approved so far and finish...")
+            threading.Thread(target=self._wait_for_enter, name="approval-confirm", daemon=True).start()
+
+    def _wait_for_enter(self):
+        try:
+            input()
+        except EOFError:
+            return
+        log("User confirmed to finish posting", self.verbose, log_caller_file="approval.py")
+        self.confirmed.set()
+
+    def _listen(self):
+        connection = get_postgres_connection(self.verbose)
+        if not connection:
+            return
+        try:
+            watched = [table for table in self.tables if ensure_status_notify_trigger(connection, table, APPROVAL_CHANNEL, self.verbose)]
+            if not watched:
+                connection.close()
+                return
+            connection.autocommit = True
+            connection.cursor().execute(f"LISTEN {APPROVAL_CHANNEL}")
+            self.connection = connection
+            self.sweep_seconds = float(os.getenv("ACTION_APPROVAL_SWEEP_SECONDS", "60"))
+        except Exception as e:
+            log(f"Falling back to polling for approvals: {e}", self.verbose, is_error=True, log_caller_file="approval.py")
+            connection.close()
+
+    def _drop_listener(self, error: Exception):
+        log(f"Lost the approval listener, falling back to polling: {error}", self.verbose, is_error=True, log_caller_file="approval.py")
+        try:
+            self.connection.close()
+        except Exception:
+            pass
+        self.connection = None
+        self.sweep_seconds = self.poll_seconds
+
+    def wait(self, timeout: float = 1.0) -> Set[StorageKey]:
+        if time.time() - self.last_sweep >= self.sweep_seconds:
+            self.last_sweep = time.time()
+            return set(self.tables.values())
+
+        if self.connection is None:
+            time.sleep(timeout)
+            return set()
+
+        changed: Set[StorageKey] = set()
+        try:
+            if select.select([self.connection], [], [], timeout)[0]:
+                self.connection.poll()
+            while self.connection.notifies:
+                notify = self.connection.notifies.pop(0)
+                try:
+                    payload = json.loads(notify.payload)
+                except ValueError:
+                    continue
+                # Rows this run marks as posted notify too; only decisions made by the reviewer matter here
+                if payload.get("batch_id") == self.batch_id and payload.get("status") != "posted" and payload.get("table") in self.tables:
+                    changed.add(self.tables[payload["table"]])
+        except Exception as e:
+            self._drop_listener(e)
+        return changed
+
+    def pending_review(self, key: StorageKey) -> Optional[int]:
+        profile_name, platform = key
+        try:
+            with pooled_connection(self.verbose) as conn:
+                if not conn:
+                    return None
+                return count_rows(conn, self.storages[profile_name][platform].table_name, "batch_id = %s AND status = %s", (self.batch_id, 'pending_review'), self.verbose)
+        except Exception:
+            return None
+
+    def close(self):
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            except Exception:
+                pass
+            self.connection = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,303 @@
+import os
+import time
+import queue
+import multiprocessing
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.support.logger_util import _log as log
+
+WorkerKey = Tuple[str, str]
+
+def _content_id(item: Dict[str, Any]) -> Optional[str]:
+    return item.get('tweet_id') or item.get('post_id') or item.get('content_id')
+
+# Status updates made while posting are shipped back to the parent, which stays the only storage writer
+class _QueuedStorage:
+    def __init__(self, key: WorkerKey, results):
+        self.key = key
+        self.results = results
+
+    def update_status(self, content_id: str, status: str, additional_updates: Optional[Dict[str, Any]] = None, verbose: bool = False) -> bool:
+        self.results.put(("status", self.key, {"content_id": content_id, "status": status, "additional_updates": additional_updates}))
+        return True
+
+def _worker_main(profile_name: str, platform: str, batch_id: str, verbose: bool, scrape_slots, commands, results):
+    from profiles import PROFILES
+    from services.utils.action.support.scraper import scrape_platform_content
+    from services.utils.action.support.poster import post_platform_content
+
+    key = (profile_name, platform)
+    driver = None
+    try:
+        with scrape_slots:
+            results.put(("progress", key, {"stage": "scraping"}))
+            started = time.time()
+            driver, scraped_content = scrape_platform_content(profile_name, platform, PROFILES[profile_name], batch_id, verbose)
+        results.put(("scraped", key, {"content": scraped_content, "seconds": time.time() - started}))
+
+        min_interval = float(os.getenv("ACTION_POST_MIN_INTERVAL_SECONDS", "30"))
+        last_posted = 0.0
+        pending = None
+        while True:
+            command, payload = pending or commands.get()
+            pending = None
+            if command != "post":
+                break
+            # Per-account pacing: approvals that arrive while this worker waits go out together in the next post
+            time.sleep(max(0.0, last_posted + min_interval - time.time()))
+            merged = 1
+            while pending is None:
+                try:
+                    pending = commands.get_nowait()
+                except queue.Empty:
+                    break
+                if pending[0] == "post":
+                    payload = payload + pending[1]
+                    merged += 1
+                    pending = None
+            results.put(("progress", key, {"stage": "posting"}))
+            started = time.time()
+            posted, failed = post_platform_content(
+                platform,
+                {profile_name: payload},
+                {profile_name: {platform: _QueuedStorage(key, results)}},
+                {profile_name: {platform: driver}} if driver else {},
+                batch_id,
+                verbose
+            )
+            last_posted = time.time()
+            results.put(("posted", key, {"posted": posted, "failed": failed, "seconds": last_posted - started, "commands": merged}))
+    except Exception as e:
+        results.put(("error", key, {"error": str(e)}))
+    finally:
+        if driver:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        results.put(("exited", key, {}))
+
+class ActionWorker:
+    def __init__(self, context, profile_name: str, platform: str, batch_id: str, verbose: bool, scrape_slots, results):
+        self.key = (profile_name, platform)
+        self.commands = context.Queue()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(profile_name, platform, batch_id, verbose, scrape_slots, self.commands, results),
+            name=f"action-{platform}-{profile_name}",
+            daemon=True
+        )
+        self.stage = "starting"
+        self.timings: Dict[str, float] = {}
+        self.started_at = time.time()
+
+    def describe(self) -> str:
+        timings = "".join(f", {stage} {seconds:.1f}s" for stage, seconds in self.timings.items())
+        return f"{self.key[0]}/{self.key[1]}: {self.stage} (pid {self.process.pid}, up {time.time() - self.started_at:.1f}s{timings})"
+
+class ActionOrchestrator:
+    def __init__(self, profile_platform_map: Dict[str, List[str]], storages: dict, batch_id: str, verbose: bool = False):
+        self.storages = storages
+        self.batch_id = batch_id
+        self.verbose = verbose
+        self.context = multiprocessing.get_context(os.getenv("ACTION_START_METHOD", "spawn"))
+        self.results = self.context.Queue()
+        pairs = [(profile_name, platform) for platform, profiles in profile_platform_map.items() for profile_name in profiles]
+        self.scrape_slots = self.context.BoundedSemaphore(int(os.getenv("ACTION_MAX_PARALLEL_SCRAPES", "0")) or max(1, len(pairs)))
+        self.workers: Dict[WorkerKey, ActionWorker] = {}
+        for profile_name, platform in pairs:
+            worker = ActionWorker(self.context, profile_name, platform, batch_id, verbose, self.scrape_slots, self.results)
+            self.workers[worker.key] = worker
+
+    def start(self):
+        log(f"Starting {len(self.workers)} action worker processes", self.verbose, log_caller_file="orchestrator.py")
+        for worker in self.workers.values():
+            worker.process.start()
+
+    def _apply_status(self, key: WorkerKey, update: Dict[str, Any]):
+        profile_name, platform = key
+        try:
+            self.storages[profile_name][platform].update_status(verbose=self.verbose, **update)
+        except Exception as e:
+            log(f"Failed to update status for {platform} item {update.get('content_id')}: {e}", self.verbose, is_error=True, log_caller_file="orchestrator.py")
+
+    def _store(self, key: WorkerKey, scraped_content: List[Dict[str, Any]]):
+        profile_name, platform = key
+        if not scraped_content:
+            log(f"No {platform} content scraped for profile {profile_name}", self.verbose, log_caller_file="orchestrator.py")
+            return
+        if self.verbose:
+            log(f"Sample {platform} data being stored: {str(scraped_content[0])[:500]}...", self.verbose, log_caller_file="orchestrator.py")
+        if not self.storages[profile_name][platform].push_content(scraped_content, self.batch_id, self.verbose):
+            log(f"Failed to store {platform} content for profile {profile_name}", self.verbose, is_error=True, log_caller_file="orchestrator.py")
+            return
+        log(f"Successfully stored {len(scraped_content)} {platform} items for profile {profile_name} with batch ID: {self.batch_id}", self.verbose, log_caller_file="orchestrator.py")
+
+    def _handle(self, message: Tuple[str, WorkerKey, Dict[str, Any]]) -> Tuple[str, WorkerKey, Dict[str, Any]]:
+        kind, key, payload = message
+        worker = self.workers[key]
+        if kind == "progress":
+            worker.stage = payload["stage"]
+            log(f"Action worker {worker.describe()}", self.verbose, log_caller_file="orchestrator.py")
+        elif kind == "scraped":
+            worker.stage = "scraped"
+            worker.timings["scrape"] = payload["seconds"]
+            self._store(key, payload["content"])
+        elif kind == "status":
+            self._apply_status(key, payload)
+        elif kind == "posted":
+            worker.stage = "posted"
+            worker.timings["post"] = payload["seconds"]
+        elif kind == "error":
+            worker.stage = "failed"
+            log(f"Action worker {key[0]}/{key[1]} failed: {payload['error']}", self.verbose, is_error=True, log_caller_file="orchestrator.py")
+        elif kind == "exited" and worker.stage not in ("failed", "posted"):
+            worker.stage = "exited"
+        return message
+
+    def _wait_for(self, kind: str, keys: List[WorkerKey]) -> Dict[WorkerKey, Dict[str, Any]]:
+        pending = set(keys)
+        received: Dict[WorkerKey, Dict[str, Any]] = {}
+        while pending:
+            try:
+                message_kind, key, payload = self._handle(self.results.get(timeout=1))
+            except queue.Empty:
+                for key in list(pending):
+                    if not self.workers[key].process.is_alive():
+                        log(f"Action worker {key[0]}/{key[1]} exited with code {self.workers[key].process.exitcode} before reporting", self.verbose, is_error=True, log_caller_file="orchestrator.py")
+                        self.workers[key].stage = "failed"
+                        pending.discard(key)
+                continue
+            if key in pending and (message_kind == kind or message_kind in ("error", "exited")):
+                received[key] = payload if message_kind == kind else {}
+                pending.discard(key)
+        return received
+
+    def scrape_and_store(self):
+        self._wait_for("scraped", list(self.workers))
+        for worker in self.workers.values():
+            log(f"Action worker {worker.describe()}", self.verbose, log_caller_file="orchestrator.py")
+
+    def post_approved(self) -> Tuple[int, int]:
+        dispatched = []
+        for key, worker in self.workers.items():
+            if worker.stage != "scraped":
+                continue
+            profile_name, platform = key
+            approved = self.storages[profile_name][platform].pull_approved_content(self.batch_id, self.verbose)
+            if not approved:
+                continue
+            log(f"Found {len(approved)} approved {platform} items for profile {profile_name}", self.verbose, log_caller_file="orchestrator.py")
+            worker.commands.put(("post", approved))
+            dispatched.append(key)
+
+        if not dispatched:
+            log("No approved content found for posting across any profile or platform", self.verbose, log_caller_file="orchestrator.py")
+            return 0, 0
+
+        results = self._wait_for("posted", dispatched)
+        total_posted = sum(result.get("posted", 0) for result in results.values())
+        total_failed = sum(result.get("failed", 0) for result in results.values())
+        for key in dispatched:
+            log(f"Action worker {self.workers[key].describe()}", self.verbose, log_caller_file="orchestrator.py")
+        log(f"All platforms posting complete - Total Posted: {total_posted}, Total Failed: {total_failed}", self.verbose, log_caller_file="orchestrator.py")
+        return total_posted, total_failed
+
+    def post_as_approved(self, stream) -> Tuple[int, int]:
+        active = {key for key, worker in self.workers.items() if worker.stage == "scraped"}
+        dispatched: Dict[WorkerKey, set] = {key: set() for key in active}
+        in_flight: Dict[WorkerKey, int] = {key: 0 for key in active}
+        totals = {"posted": 0, "failed": 0}
+
+        def dispatch(key: WorkerKey) -> int:
+            profile_name, platform = key
+            approved = self.storages[profile_name][platform].pull_approved_content(self.batch_id, self.verbose)
+            fresh = [item for item in approved if _content_id(item) not in dispatched[key]]
+            if fresh:
+                dispatched[key].update(_content_id(item) for item in fresh)
+                self.workers[key].commands.put(("post", fresh))
+                in_flight[key] += 1
+                log(f"Dispatched {len(fresh)} newly approved {platform} items to the {profile_name} worker", self.verbose, log_caller_file="orchestrator.py")
+            return len(fresh)
+
+        def account(kind: str, key: WorkerKey, payload: Dict[str, Any]) -> bool:
+            if key not in in_flight:
+                return False
+            if kind == "posted":
+                in_flight[key] = max(0, in_flight[key] - payload.get("commands", 1))
+                totals["posted"] += payload.get("posted", 0)
+                totals["failed"] += payload.get("failed", 0)
+                return in_flight[key] == 0
+            if kind in ("error", "exited"):
+                in_flight[key] = 0
+                active.discard(key)
+            return False
+
+        # A worker that died without reporting would otherwise keep the run waiting on its approvals forever
+        def reap():
+            for key in list(active):
+                if not self.workers[key].process.is_alive():
+                    log(f"Action worker {key[0]}/{key[1]} exited with code {self.workers[key].process.exitcode} while posting", self.verbose, is_error=True, log_caller_file="orchestrator.py")
+                    account("exited", key, {})
+
+        while active and not stream.done:
+            changed = stream.wait(timeout=1.0) & active
+            for key in changed:
+                dispatch(key)
+            while True:
+                try:
+                    kind, key, payload = self._handle(self.results.get_nowait())
+                except queue.Empty:
+                    break
+                if account(kind, key, payload):
+                    changed.add(key)
+            reap()
+            # Pending rows are counted before the final pull, so an approval committed in between is still dispatched
+            for key in changed & active:
+                if in_flight[key] == 0 and stream.pending_review(key) == 0 and not dispatch(key):
+                    active.discard(key)
+                    self.workers[key].commands.put(("quit", None))
+                    log(f"Nothing left to review for {key[0]}/{key[1]}, releasing its browser", self.verbose, log_caller_file="orchestrator.py")
+
+        for key in list(active):
+            dispatch(key)
+        while any(in_flight[key] for key in active):
+            try:
+                account(*self._handle(self.results.get(timeout=1)))
+            except queue.Empty:
+                reap()
+
+        for key in dispatched:
+            log(f"Action worker {self.workers[key].describe()}", self.verbose, log_caller_file="orchestrator.py")
+        log(f"All platforms posting complete - Total Posted: {totals['posted']}, Total Failed: {totals['failed']}", self.verbose, log_caller_file="orchestrator.py")
+        return totals["posted"], totals["failed"]
+
+    def close(self):
+        for worker in self.workers.values():
+            if worker.process.is_alive():
+                worker.commands.put(("quit", None))
+        # Keep draining while workers shut down: a child cannot exit until its queued messages are read
+        deadline = time.time() + float(os.getenv("ACTION_WORKER_SHUTDOWN_SECONDS", "30"))
+        while time.time() < deadline and any(worker.process.is_alive() for worker in self.workers.values()):
+            try:
+                self._handle(self.results.get(timeout=0.2))
+            except queue.Empty:
+                pass
+        for worker in self.workers.values():
+            if worker.process.is_alive():
+                log(f"Terminating action worker {worker.key[0]}/{worker.key[1]}", self.verbose, is_error=True, log_caller_file="orchestrator.py")
+                worker.process.terminate()
+            worker.process.join()
+        while True:
+            try:
+                self._handle(self.results.get_nowait())
+            except queue.Empty:
+                break
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
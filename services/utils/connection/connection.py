@@ -1,12 +1,10 @@
 # socials utils <profile> connection
 
-import os
 import sys
-import json
-import glob
 import argparse
 
 from profiles import PROFILES
+from typing import List, Tuple
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -14,7 +12,8 @@ from rich.status import Status
 from rich.console import Console
 
 from services.support.logger_util import _log as log
-from services.support.path_config import initialize_directories, get_product_hunt_scraper_dir, get_ycombinator_scraper_dir
+from services.support.path_config import initialize_directories
+from services.support.dataset_store import query_dataset_history
 
 from services.support.storage.storage_factory import get_storage
 from services.support.storage.platforms.connections.connection_storage import ConnectionStorage
@@ -26,6 +25,19 @@ from services.utils.connection.support.connection_tracker import load_connection
 
 console = Console()
 
+def collect_founder_links(profile_name: str, platform: str, verbose: bool = False) -> Tuple[List[str], List[str]]:
+    linkedin_urls = []
+    x_urls = []
+    for company in query_dataset_history(profile_name, platform, "raw", fields=["founders"], verbose=verbose):
+        for founder in company.get("founders", []):
+            for link_url in founder.get("links", []):
+                if isinstance(link_url, str):
+                    if "linkedin.com/in/" in link_url:
+                        linkedin_urls.append(link_url)
+                    elif "twitter.com/" in link_url or "x.com/" in link_url:
+                        x_urls.append(link_url)
+    return linkedin_urls, x_urls
+
 def main():
     load_dotenv()
     initialize_directories()
@@ -54,54 +66,8 @@ def main():
 
     log(f"Starting LinkedIn and X connections/follows from Product Hunt and Y Combinator data for profile '{profile_name}'", verbose, log_caller_file="connection.py")
 
-    ph_linkedin_urls = []
-    ph_x_urls = []
-    yc_linkedin_urls = []
-    yc_x_urls = []
-
-    ph_data_dir = get_product_hunt_scraper_dir(profile_name)
-    if os.path.exists(ph_data_dir):
-        ph_files = glob.glob(os.path.join(ph_data_dir, "product_hunt_*.json"))
-        if ph_files:
-            log(f"Found {len(ph_files)} Product Hunt data files", verbose, log_caller_file="connection.py")
-            for file_path in ph_files:
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        companies = json.load(f)
-                    for company in companies:
-                        founders = company.get("founders", [])
-                        for founder in founders:
-                            links = founder.get("links", [])
-                            for link_url in links:
-                                if isinstance(link_url, str):
-                                    if "linkedin.com/in/" in link_url:
-                                        ph_linkedin_urls.append(link_url)
-                                    elif "twitter.com/" in link_url or "x.com/" in link_url:
-                                        ph_x_urls.append(link_url)
-                except Exception as e:
-                    log(f"Error reading PH file {file_path}: {e}", verbose, is_error=True, log_caller_file="connection.py")
-
-    yc_data_dir = get_ycombinator_scraper_dir(profile_name)
-    if os.path.exists(yc_data_dir):
-        yc_files = glob.glob(os.path.join(yc_data_dir, "ycombinator_*.json"))
-        if yc_files:
-            log(f"Found {len(yc_files)} Y Combinator data files", verbose, log_caller_file="connection.py")
-            for file_path in yc_files:
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        companies = json.load(f)
-                    for company in companies:
-                        founders = company.get("founders", [])
-                        for founder in founders:
-                            links = founder.get("links", [])
-                            for link_url in links:
-                                if isinstance(link_url, str):
-                                    if "linkedin.com/in/" in link_url:
-                                        yc_linkedin_urls.append(link_url)
-                                    elif "twitter.com/" in link_url or "x.com/" in link_url:
-                                        yc_x_urls.append(link_url)
-                except Exception as e:
-                    log(f"Error reading YC file {file_path}: {e}", verbose, is_error=True, log_caller_file="connection.py")
+    ph_linkedin_urls, ph_x_urls = collect_founder_links(profile_name, "producthunt", verbose)
+    yc_linkedin_urls, yc_x_urls = collect_founder_links(profile_name, "ycombinator", verbose)
 
     linkedin_urls = ph_linkedin_urls + yc_linkedin_urls
     x_urls = ph_x_urls + yc_x_urls
@@ -102,7 +102,7 @@ def main():
                 log(result["error"], False, is_error=True, log_caller_file="suggestions.py")
                 sys.exit(1)
 
-            console.print(f"[green]Filtered {result['original_count']} to {result['filtered_count']} top posts[/green]")
+            console.print(f"[green]Filtered {result['original_count']} to {result['filtered_count']} top posts ({result['already_generated_count']} already generated)[/green]")
 
         elif args.command == 'web':
             console.print(f"[blue]Content Workflow Web App: http://localhost:5000[/blue]")
@@ -251,7 +251,7 @@ def main():
                 log(result["error"], False, is_error=True, log_caller_file="suggestions.py")
                 sys.exit(1)
 
-            console.print(f"[green]Filtered {result['original_count']} to {result['filtered_count']} top posts[/green]")
+            console.print(f"[green]Filtered {result['original_count']} to {result['filtered_count']} top posts ({result['already_generated_count']} already generated)[/green]")
 
         elif args.command == 'web':
             console.print(f"[blue]Content Workflow Web App: http://localhost:5000[/blue]")
@@ -395,7 +395,7 @@ def main():
                 log(result["error"], False, is_error=True, log_caller_file="suggestions.py")
                 sys.exit(1)
 
-            console.print(f"[green]Filtered {result['original_count']} to {result['filtered_count']} top Reddit posts[/green]")
+            console.print(f"[green]Filtered {result['original_count']} to {result['filtered_count']} top Reddit posts ({result['already_generated_count']} already generated)[/green]")
 
         elif args.command == 'generate':
             if push_to_db:
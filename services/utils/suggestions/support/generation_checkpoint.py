@@ -0,0 +1,81 @@
+import os
+import json
+import threading
+
+from typing import Any, Callable, Dict, List, Tuple
+
+from services.support.logger_util import _log as log
+
+class GenerationCheckpoint:
+    def __init__(self, path: str, batch_id: str, verbose: bool = False):
+        self.path = path
+        self.verbose = verbose
+        self.lock = threading.Lock()
+        self.batch_id = batch_id
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._load()
+        if not os.path.exists(self.path):
+            self._append({"batch_id": self.batch_id})
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+
+        skipped = 0
+        with open(self.path, 'r', encoding='utf-8') as f:
+            line = ""
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    skipped += 1
+                    continue
+                if "content_id" in record and isinstance(record.get("result"), dict):
+                    self._results[str(record["content_id"])] = record["result"]
+                elif record.get("batch_id"):
+                    self.batch_id = record["batch_id"]
+
+        if line and not line.endswith("\n"):
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write("\n")
+
+        if self._results:
+            log(f"Resuming batch {self.batch_id}: {len(self._results)} items already generated in {os.path.basename(self.path)}", self.verbose, log_caller_file="generation_checkpoint.py")
+        if skipped:
+            log(f"Ignored {skipped} torn line(s) in checkpoint {os.path.basename(self.path)}", self.verbose, is_error=True, log_caller_file="generation_checkpoint.py")
+
+    def _append(self, record: Dict[str, Any]):
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with self.lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def is_done(self, content_id: Any) -> bool:
+        return str(content_id) in self._results
+
+    def split(self, posts: List[Dict[str, Any]], content_id_fn: Callable[[Dict[str, Any]], Any]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        pending = [post for post in posts if not self.is_done(content_id_fn(post))]
+        return pending, self.completed_results()
+
+    def completed_results(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            return list(self._results.values())
+
+    def record(self, result: Dict[str, Any]):
+        content_id = result.get("content_id")
+        if content_id in (None, "unknown") or result.get("error") or not result.get("generated_caption"):
+            return
+        self._append({"content_id": content_id, "result": result})
+        with self.lock:
+            self._results[str(content_id)] = result
+
+    def finalize(self):
+        try:
+            os.remove(self.path)
+            log(f"Generation batch {self.batch_id} complete, removed checkpoint {os.path.basename(self.path)}", self.verbose, log_caller_file="generation_checkpoint.py")
+        except OSError:
+            pass
@@ -0,0 +1,180 @@
+import time
+import asyncio
+import threading
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from services.support.logger_util import _log as log
+from services.support.api_key_pool import APIKeyPool
+from services.support.rate_limiter import RateLimiter
+from services.support.api_call_tracker import APICallTracker
+from services.support.gemini_util import generate_gemini_with_inline_media, get_cached_generation
+
+DownloadFn = Callable[[Dict[str, Any]], List[str]]
+BuildPromptFn = Callable[[Dict[str, Any], List[str]], Tuple[List[Any], str]]
+BuildResultFn = Callable[[Dict[str, Any], List[str], str, Optional[Exception]], Dict[str, Any]]
+PersistFn = Callable[[Dict[str, Any]], None]
+
+_DONE = object()
+
+class StageStats:
+    def __init__(self, name: str, concurrency: int):
+        self.name = name
+        self.concurrency = concurrency
+        self.processed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.started_at = None
+        self.finished_at = None
+        self.lock = threading.Lock()
+
+    def record(self, elapsed: float, failed: bool = False):
+        with self.lock:
+            now = time.monotonic()
+            self.started_at = self.started_at or now - elapsed
+            self.finished_at = now
+            self.processed += 1
+            self.busy_seconds += elapsed
+            if failed:
+                self.failed += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        wall = (self.finished_at - self.started_at) if self.started_at and self.finished_at else 0.0
+        return {
+            "stage": self.name,
+            "concurrency": self.concurrency,
+            "processed": self.processed,
+            "failed": self.failed,
+            "busy_seconds": round(self.busy_seconds, 2),
+            "wall_seconds": round(wall, 2),
+            "items_per_second": round(self.processed / wall, 3) if wall > 0 else None,
+            "avg_seconds_per_item": round(self.busy_seconds / self.processed, 3) if self.processed else None
+        }
+
+class GenerationEngine:
+    def __init__(self, api_key_pool: APIKeyPool, api_call_tracker: APICallTracker, rate_limiter: RateLimiter, download_fn: DownloadFn, build_prompt_fn: BuildPromptFn, build_result_fn: BuildResultFn, persist_fn: Optional[PersistFn] = None, download_concurrency: int = 8, prompt_concurrency: int = 4, generate_concurrency: Optional[int] = None, queue_size: Optional[int] = None, key_wait_timeout: Optional[float] = 300.0, verbose: bool = False):
+        self.api_key_pool = api_key_pool
+        self.api_call_tracker = api_call_tracker
+        self.rate_limiter = rate_limiter
+        self.download_fn = download_fn
+        self.build_prompt_fn = build_prompt_fn
+        self.build_result_fn = build_result_fn
+        self.persist_fn = persist_fn
+        self.download_concurrency = max(1, download_concurrency)
+        self.prompt_concurrency = max(1, prompt_concurrency)
+        self.generate_concurrency = max(1, generate_concurrency or api_key_pool.size())
+        self.queue_size = queue_size or 2 * self.generate_concurrency
+        self.key_wait_timeout = key_wait_timeout
+        self.verbose = verbose
+        self.stats = {
+            "download": StageStats("download", self.download_concurrency),
+            "prompt": StageStats("prompt", self.prompt_concurrency),
+            "generate": StageStats("generate", self.generate_concurrency),
+            "persist": StageStats("persist", 1)
+        }
+
+    async def _run_stage(self, name: str, inbox: asyncio.Queue, outbox: asyncio.Queue, workers: int, handler):
+        async def worker():
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    await inbox.put(_DONE)
+                    return
+                start = time.monotonic()
+                failed = False
+                try:
+                    item = await handler(item)
+                except Exception as e:
+                    failed = True
+                    item["error"] = item.get("error") or e
+                    log(f"[{name}] Failed for item {item.get('index')}: {e}", self.verbose, is_error=True, log_caller_file="generation_engine.py")
+                self.stats[name].record(time.monotonic() - start, failed)
+                await outbox.put(item)
+
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        await outbox.put(_DONE)
+
+    async def _download(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        item["media_paths"] = await asyncio.to_thread(self.download_fn, item["post"]) or []
+        return item
+
+    async def _build_prompt(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        if item.get("error"):
+            return item
+        item["prompt_parts"], item["model_name"] = await asyncio.to_thread(self.build_prompt_fn, item["post"], item["media_paths"])
+        return item
+
+    async def _generate(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        if item.get("error"):
+            return item
+
+        cached = await asyncio.to_thread(get_cached_generation, item["prompt_parts"], item["model_name"])
+        if cached is not None:
+            item["caption"] = cached
+            return item
+
+        api_key = await self.api_key_pool.acquire_async(timeout=self.key_wait_timeout)
+        if not api_key:
+            raise RuntimeError("No API key became available for generation")
+
+        result, _ = await asyncio.to_thread(
+            generate_gemini_with_inline_media,
+            prompt_parts=item["prompt_parts"],
+            api_key_pool=self.api_key_pool,
+            api_call_tracker=self.api_call_tracker,
+            rate_limiter=self.rate_limiter,
+            model_name=item["model_name"],
+            verbose=self.verbose,
+            api_key=api_key
+        )
+        item["caption"] = result or ""
+        return item
+
+    async def _persist_stage(self, inbox: asyncio.Queue, results: List[Dict[str, Any]]):
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                return
+            start = time.monotonic()
+            error = item.get("error")
+            result = self.build_result_fn(item["post"], item.get("media_paths") or [], item.get("caption") or "", error if isinstance(error, Exception) else None)
+            failed = False
+            if self.persist_fn:
+                try:
+                    await asyncio.to_thread(self.persist_fn, result)
+                except Exception as e:
+                    failed = True
+                    log(f"[persist] Failed to persist item {item.get('index')}: {e}", self.verbose, is_error=True, log_caller_file="generation_engine.py")
+            self.stats["persist"].record(time.monotonic() - start, failed)
+            results.append(result)
+
+    async def run_async(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        source: asyncio.Queue = asyncio.Queue()
+        downloaded: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        prompted: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        generated: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        for index, post in enumerate(posts):
+            source.put_nowait({"index": index, "post": post})
+        source.put_nowait(_DONE)
+
+        results: List[Dict[str, Any]] = []
+        await asyncio.gather(
+            self._run_stage("download", source, downloaded, self.download_concurrency, self._download),
+            self._run_stage("prompt", downloaded, prompted, self.prompt_concurrency, self._build_prompt),
+            self._run_stage("generate", prompted, generated, self.generate_concurrency, self._generate),
+            self._persist_stage(generated, results)
+        )
+        return results
+
+    def run(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        results = asyncio.run(self.run_async(posts))
+        self.log_stats()
+        return results
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        return [stage.as_dict() for stage in self.stats.values()]
+
+    def log_stats(self):
+        for stage in self.get_stats():
+            log(f"[generation_engine] {stage['stage']}: {stage['processed']} items ({stage['failed']} failed), {stage['items_per_second'] or 0} items/s, avg {stage['avg_seconds_per_item'] or 0}s, concurrency {stage['concurrency']}", self.verbose, log_caller_file="generation_engine.py")
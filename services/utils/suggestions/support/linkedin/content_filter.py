@@ -1,6 +1,7 @@
 import os
 import sys
 import json
+import hashlib
 
 from typing import Dict, Any
 from datetime import datetime
@@ -9,19 +10,39 @@ from profiles import PROFILES
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
 
-from services.support.path_config import get_suggestions_dir
-
-def parse_linkedin_date(post_data):
-    if isinstance(post_data.get('post_date'), str):
-        try:
-            dt = datetime.fromisoformat(post_data['post_date'].replace('Z', '+00:00'))
-            return dt.replace(tzinfo=None)
-        except Exception as e:
-            try:
-                return datetime.strptime(post_data['post_date'], '%Y-%m-%d %H:%M:%S')
-            except:
-                return datetime.now()
-    return datetime.now()
+from services.support.seen_index import get_seen_index
+from services.support.dataset_store import read_recent_datasets, count_through
+from services.support.path_config import get_suggestions_dir, get_latest_artifact, register_artifact
+from services.utils.suggestions.support.ranking_engine import RankingSpec, rank_records
+
+def get_linkedin_username(post_data):
+    profile_url = post_data.get('data', {}).get('profile_url', '')
+    username = post_data.get('data', {}).get('author_name', '')
+
+    if not username and profile_url:
+        username = profile_url.split('/')[-1] or profile_url.split('/')[-2]
+
+    return username or 'unknown'
+
+def get_linkedin_content_id(post_data):
+    # Feed post ids are generated at scrape time, so fall back to the activity urn or the author and text
+    data = post_data.get('data', {})
+    if data.get('post_urn'):
+        return data['post_urn']
+    text = data.get('text') or data.get('post_text', '')
+    if not text:
+        return None
+    return hashlib.sha1(f"{data.get('author_name', '')}|{text[:500]}".encode('utf-8')).hexdigest()[:16]
+
+LINKEDIN_RANKING_SPEC = RankingSpec(
+    group_fn=get_linkedin_username,
+    date_fn=lambda post: post.get('data', {}).get('post_date'),
+    engagement_metrics={
+        'likes': lambda post: post.get('engagement', {}).get('likes', 0),
+        'comments': lambda post: post.get('engagement', {}).get('comments', 0),
+        'reposts': lambda post: post.get('engagement', {}).get('reposts', 0)
+    }
+)
 
 def filter_and_sort_linkedin_content(scraped_file_path: str, profile_name: str) -> Dict[str, Any]:
     profile_props = PROFILES[profile_name].get('properties', {})
@@ -33,85 +54,47 @@ def filter_and_sort_linkedin_content(scraped_file_path: str, profile_name: str)
     max_age_days = content_filter.get('max_age_days', 30)
     max_posts_per_profile = content_filter.get('max_posts_per_profile', 5)
     max_posts = content_filter.get('max_posts', 25)
+    scoring = content_filter.get('scoring', 'engagement')
+    history_days = content_filter.get('history_days', 0)
 
     try:
-        with open(scraped_file_path, 'r', encoding='utf-8') as f:
-            scraped_data = json.load(f)
+        counts: Dict[str, int] = {}
+        scraped_posts = count_through(read_recent_datasets(profile_name, "linkedin", "scraped", scraped_file_path, get_linkedin_content_id, history_days, records_key='scraped_posts'), counts, "scraped")
+        candidate_posts = count_through(get_seen_index(profile_name).iter_unseen("linkedin", "generated", scraped_posts, get_linkedin_content_id), counts, "candidates")
+        batch, ranking = rank_records(candidate_posts, LINKEDIN_RANKING_SPEC, min_age_days, max_age_days, max_posts_per_profile, max_posts, scoring)
     except Exception as e:
         return {"error": f"Failed to load scraped data: {e}"}
 
-    scraped_posts = scraped_data.get('scraped_posts', [])
-    if not scraped_posts:
+    if not counts.get("scraped"):
         return {"error": "No posts found in scraped data"}
 
-    now = datetime.now()
-
-    posts_by_profile = {}
-    for post in scraped_posts:
-        profile_url = post.get('data', {}).get('profile_url', '')
-        username = post.get('data', {}).get('author_name', '')
-
-        if not username and profile_url:
-            try:
-                username = profile_url.split('/')[-1] or profile_url.split('/')[-2]
-            except:
-                username = 'unknown'
-        elif not username:
-            username = 'unknown'
-
-        if username not in posts_by_profile:
-            posts_by_profile[username] = []
-        posts_by_profile[username].append(post)
+    original_count = counts["scraped"]
+    already_generated_count = original_count - counts["candidates"]
+    final_top_posts = ranking.top
 
-    all_top_posts = []
     profile_stats = {}
-
-    for username, profile_posts in posts_by_profile.items():
-        age_filtered_posts = []
-
-        for post in profile_posts:
-            post_date = parse_linkedin_date(post.get('data', {}))
-            age_days = (now - post_date).days
-
-            if not (min_age_days <= age_days <= max_age_days):
-                continue
-
-            likes = post.get('engagement', {}).get('likes', 0)
-            comments = post.get('engagement', {}).get('comments', 0)
-            reposts = post.get('engagement', {}).get('reposts', 0)
-            total_engagement = likes + comments + reposts
-
-            post_copy = post.copy()
-            post_copy['total_engagement'] = total_engagement
-            post_copy['age_days'] = age_days
-            age_filtered_posts.append(post_copy)
-
-        if age_filtered_posts:
-            age_filtered_posts.sort(key=lambda x: x['total_engagement'], reverse=True)
-            top_posts_from_profile = age_filtered_posts[:max_posts_per_profile]
-            all_top_posts.extend(top_posts_from_profile)
-
-            profile_stats[username] = {
-                "total_posts": len(profile_posts),
-                "age_filtered_posts": len(age_filtered_posts),
-                "selected_top": len(top_posts_from_profile),
-                "avg_engagement": sum(p['total_engagement'] for p in top_posts_from_profile) / len(top_posts_from_profile) if top_posts_from_profile else 0
-            }
-
-    all_top_posts.sort(key=lambda x: x['total_engagement'], reverse=True)
-    final_top_posts = all_top_posts[:max_posts]
+    for username, top_posts_from_profile in ranking.group_selected.items():
+        profile_stats[username] = {
+            "total_posts": ranking.group_totals[username],
+            "age_filtered_posts": ranking.group_eligible[username],
+            "selected_top": len(top_posts_from_profile),
+            "avg_engagement": sum(p['total_engagement'] for p in top_posts_from_profile) / len(top_posts_from_profile)
+        }
 
     filtered_data = {
         "timestamp": datetime.now().isoformat(),
         "profile_name": profile_name,
-        "original_scraped_count": len(scraped_posts),
-        "profiles_count": len(posts_by_profile),
+        "original_scraped_count": original_count,
+        "already_generated_count": already_generated_count,
+        "profiles_count": len(ranking.group_totals),
         "filtered_count": len(final_top_posts),
         "filter_criteria": {
             "min_age_days": min_age_days,
             "max_age_days": max_age_days,
             "max_posts_per_profile": max_posts_per_profile,
-            "max_posts": max_posts
+            "max_posts": max_posts,
+            "scoring": scoring,
+            "history_days": history_days
         },
         "profile_stats": profile_stats,
         "filtered_posts": final_top_posts
@@ -126,13 +109,15 @@ def filter_and_sort_linkedin_content(scraped_file_path: str, profile_name: str)
     try:
         with open(filtered_filepath, 'w', encoding='utf-8') as f:
             json.dump(filtered_data, f, indent=2, ensure_ascii=False)
+        register_artifact(filtered_filepath, profile_name, "linkedin", "filtered", len(final_top_posts))
     except Exception as e:
         return {"error": f"Failed to save filtered data: {e}"}
 
     return {
         "success": True,
-        "original_count": len(scraped_posts),
-        "profiles_count": len(posts_by_profile),
+        "original_count": original_count,
+        "already_generated_count": already_generated_count,
+        "profiles_count": len(ranking.group_totals),
         "filtered_count": len(final_top_posts),
         "saved_file": filtered_filepath,
         "profile_stats": profile_stats,
@@ -140,25 +125,7 @@ def filter_and_sort_linkedin_content(scraped_file_path: str, profile_name: str)
     }
 
 def get_latest_scraped_linkedin_file(profile_name: str) -> str:
-    suggestions_dir = get_suggestions_dir(profile_name)
-    if not os.path.exists(suggestions_dir):
-        return ""
-
-    scraped_files = [f for f in os.listdir(suggestions_dir) if f.startswith('scraped_content_linkedin_') and f.endswith('.json')]
-    if not scraped_files:
-        return ""
-
-    scraped_files.sort(reverse=True)
-    return os.path.join(suggestions_dir, scraped_files[0])
+    return get_latest_artifact(profile_name, "linkedin", "scraped")
 
 def get_latest_filtered_linkedin_file(profile_name: str) -> str:
-    suggestions_dir = get_suggestions_dir(profile_name)
-    if not os.path.exists(suggestions_dir):
-        return ""
-
-    filtered_files = [f for f in os.listdir(suggestions_dir) if f.startswith('filtered_content_linkedin_') and f.endswith('.json')]
-    if not filtered_files:
-        return ""
-
-    filtered_files.sort(reverse=True)
-    return os.path.join(suggestions_dir, filtered_files[0])
+    return get_latest_artifact(profile_name, "linkedin", "filtered")
@@ -3,9 +3,8 @@ import json
 import time
 
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from services.support.storage.base_storage import BaseStorage
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from profiles import PROFILES
 
@@ -13,16 +12,22 @@ from services.support.logger_util import _log as log
 from services.support.api_key_pool import APIKeyPool
 from services.support.rate_limiter import RateLimiter
 from services.support.api_call_tracker import APICallTracker
-from services.support.path_config import get_gemini_log_file_path, get_suggestions_dir
+from services.support.seen_index import get_seen_index
+from services.support.path_config import get_gemini_log_file_path, get_suggestions_dir, get_suggestions_checkpoint_path, register_artifact
+from services.support.gemini_cache import log_generation_cache_stats
+from services.support.media_fetch import log_media_fetch_stats
 from services.support.gemini_util import generate_gemini_with_inline_media, create_inline_media_data
 
+from services.utils.suggestions.support.generation_engine import GenerationEngine
+from services.utils.suggestions.support.generation_checkpoint import GenerationCheckpoint
 from services.utils.suggestions.support.linkedin.media_downloader import download_linkedin_post_media
+from services.utils.suggestions.support.linkedin.content_filter import get_linkedin_content_id
 from services.utils.suggestions.support.linkedin.scraping_utils import get_latest_filtered_linkedin_file
 
 api_call_tracker = APICallTracker(log_file=get_gemini_log_file_path())
 rate_limiter = RateLimiter()
 
-def generate_linkedin_caption(post_data: Dict[str, Any], media_paths: List[str], api_key_pool: APIKeyPool, verbose: bool = False) -> str:
+def build_linkedin_caption_prompt(post_data: Dict[str, Any], media_paths: List[str], verbose: bool = False) -> Tuple[List[Any], str]:
     profile_name = post_data.get('profile_name', 'unknown')
     post_id = post_data.get('data', {}).get('post_id', 'unknown')
 
@@ -48,67 +53,29 @@ def generate_linkedin_caption(post_data: Dict[str, Any], media_paths: List[str],
                 prompt_parts.append("\n")
                 log(f"Inlined media {os.path.basename(media_path)} for post {post_id}", verbose, log_caller_file="content_generator.py")
 
-    log(f"[HITTING API] Calling Gemini API for post {post_id}", verbose, log_caller_file="content_generator.py")
-
-    result, _ = generate_gemini_with_inline_media(
-        prompt_parts=prompt_parts,
-        api_key_pool=api_key_pool,
-        api_call_tracker=api_call_tracker,
-        rate_limiter=rate_limiter,
-        model_name=model_name,
-        verbose=verbose
-    )
-
-    if result:
-        log(f"Generated post for {post_id}: {result[:50]}...", verbose, log_caller_file="content_generator.py")
-        return result
-    else:
-        return "Error generating post: Failed to generate content"
-
-def process_linkedin_post(post_data: Dict[str, Any], api_key_pool: APIKeyPool, media_dir: str, verbose: bool = False) -> Dict[str, Any]:
-    post_id = post_data.get('data', {}).get('post_id', 'unknown')
-
-    try:
-        downloaded_media_paths = download_linkedin_post_media(post_data, media_dir, verbose)
-        generated_caption = generate_linkedin_caption(post_data, downloaded_media_paths, api_key_pool, verbose)
-
-        return {
-            "source": "linkedin",
-            "content_id": post_id,
-            "data": post_data.get('data', {}),
-            "engagement": post_data.get('engagement', {}),
-            "total_engagement": post_data.get('total_engagement', 0),
-            "age_days": post_data.get('age_days', 0),
-            "scraped_at": post_data.get('scraped_at'),
-            "post_date": post_data.get('data', {}).get('post_date'),
-            "profile_url": post_data.get('data', {}).get('profile_url'),
-            "original_content": post_data.get('data', {}).get('text') or post_data.get('data', {}).get('post_text', ''),
-            "generated_caption": generated_caption if not generated_caption.startswith("Error") else "",
-            "media_urls": post_data.get('data', {}).get('media_urls', []),
-            "downloaded_media_paths": downloaded_media_paths,
-            "finalized": False,
-            "generation_timestamp": datetime.now().isoformat()
-        }
-
-    except Exception as e:
-        log(f"Error processing post {post_id}: {str(e)}", verbose, is_error=True, log_caller_file="content_generator.py")
-        return {
-            "source": "linkedin",
-            "data": post_data.get('data', {}),
-            "engagement": post_data.get('engagement', {}),
-            "total_engagement": post_data.get('total_engagement', 0),
-            "age_days": post_data.get('age_days', 0),
-            "scraped_at": post_data.get('scraped_at'),
-            "post_date": post_data.get('data', {}).get('post_date'),
-            "profile_url": post_data.get('data', {}).get('profile_url'),
-            "original_content": post_data.get('data', {}).get('text') or post_data.get('data', {}).get('post_text', ''),
-            "error": str(e),
-            "generated_caption": "",
-            "media_urls": post_data.get('data', {}).get('media_urls', []),
-            "downloaded_media_paths": [],
-            "finalized": False,
-            "generation_timestamp": datetime.now().isoformat()
-        }
+    return prompt_parts, model_name
+
+def build_linkedin_generated_post(post_data: Dict[str, Any], downloaded_media_paths: List[str], generated_caption: str, error: Optional[Exception] = None) -> Dict[str, Any]:
+    result = {
+        "source": "linkedin",
+        "content_id": post_data.get('data', {}).get('post_id', 'unknown'),
+        "data": post_data.get('data', {}),
+        "engagement": post_data.get('engagement', {}),
+        "total_engagement": post_data.get('total_engagement', 0),
+        "age_days": post_data.get('age_days', 0),
+        "scraped_at": post_data.get('scraped_at'),
+        "post_date": post_data.get('data', {}).get('post_date'),
+        "profile_url": post_data.get('data', {}).get('profile_url'),
+        "original_content": post_data.get('data', {}).get('text') or post_data.get('data', {}).get('post_text', ''),
+        "generated_caption": generated_caption if generated_caption and not generated_caption.startswith("Error") else "",
+        "media_urls": post_data.get('data', {}).get('media_urls', []),
+        "downloaded_media_paths": downloaded_media_paths if error is None else [],
+        "finalized": False,
+        "generation_timestamp": datetime.now().isoformat()
+    }
+    if error is not None:
+        result["error"] = str(error)
+    return result
 
 def run_linkedin_content_generation(profile_name: str, storage: Optional[BaseStorage] = None, verbose: bool = False) -> Dict[str, Any]:
     filtered_file = get_latest_filtered_linkedin_file(profile_name)
@@ -129,7 +96,7 @@ def run_linkedin_content_generation(profile_name: str, storage: Optional[BaseSto
         profile_props = PROFILES[profile_name].get('properties', {})
         verbose = profile_props.get('verbose', False)
 
-        api_key_pool = APIKeyPool(verbose=verbose)
+        api_key_pool = APIKeyPool(verbose=verbose, model_name=profile_props.get('model_name', 'gemini-2.5-flash-lite'))
         if api_key_pool.size() == 0:
             return {"error": "No API keys available. Set GEMINI_API environment variable."}
 
@@ -137,44 +104,56 @@ def run_linkedin_content_generation(profile_name: str, storage: Optional[BaseSto
         os.makedirs(media_dir, exist_ok=True)
 
         generated_posts = []
-        with ThreadPoolExecutor(max_workers=api_key_pool.size()) as executor:
-            futures = []
-            batch_id = f"linkedin_generation_{datetime.now().strftime('%Y%m%d%H%M%S')}"
-            for post in approved_posts:
-                post['profile_name'] = profile_name
-                post['batch_id'] = batch_id
-                future = executor.submit(process_linkedin_post, post, api_key_pool, media_dir, verbose)
-                futures.append(future)
-
-            for future in as_completed(futures):
-                result = future.result()
-                
-                processed_post = {
-                    "profile_name": result.get('profile_name', profile_name),
-                    "batch_id": batch_id,
-                    "content_id": result.get('data', {}).get('post_id'),
-                    "source": result.get('source'),
-                    "original_content": result.get('original_content'),
-                    "generated_caption": result.get('generated_caption'),
-                    "total_engagement": result.get('total_engagement', 0),
-                    "likes": result.get('engagement', {}).get('likes', 0),
-                    "comments": result.get('engagement', {}).get('comments', 0),
-                    "reposts": result.get('engagement', {}).get('reposts', 0),
-                    "media_urls": result.get('media_urls', []),
-                    "downloaded_media_paths": result.get('downloaded_media_paths', []),
-                    "age_days": result.get('age_days', 0),
-                    "scraped_at": result.get('scraped_at'),
-                    "post_date": result.get('post_date'),
-                    "profile_url": result.get('profile_url'),
-                    "finalized": result.get('finalized', False),
-                    "generation_timestamp": result.get('generation_timestamp'),
-                    "status": 'pending'
-                }
-                generated_posts.append(processed_post)
+        checkpoint = GenerationCheckpoint(get_suggestions_checkpoint_path(profile_name, "linkedin", filtered_file), f"linkedin_generation_{datetime.now().strftime('%Y%m%d%H%M%S')}", verbose)
+        batch_id = checkpoint.batch_id
+        for post in approved_posts:
+            post['profile_name'] = profile_name
+            post['batch_id'] = batch_id
+
+        engine = GenerationEngine(
+            api_key_pool=api_key_pool,
+            api_call_tracker=api_call_tracker,
+            rate_limiter=rate_limiter,
+            download_fn=lambda post: download_linkedin_post_media(post, media_dir, verbose),
+            build_prompt_fn=lambda post, media_paths: build_linkedin_caption_prompt(post, media_paths, verbose),
+            build_result_fn=build_linkedin_generated_post,
+            persist_fn=checkpoint.record,
+            verbose=verbose
+        )
+
+        pending_posts, completed_results = checkpoint.split(approved_posts, lambda post: post.get('data', {}).get('post_id', 'unknown'))
+        results = completed_results + engine.run(pending_posts)
+        get_seen_index(profile_name).mark_many("linkedin", "generated", [get_linkedin_content_id(result) for result in results if result.get('generated_caption')])
+        for result in results:
+            processed_post = {
+                "profile_name": result.get('profile_name', profile_name),
+                "batch_id": batch_id,
+                "content_id": result.get('data', {}).get('post_id'),
+                "source": result.get('source'),
+                "original_content": result.get('original_content'),
+                "generated_caption": result.get('generated_caption'),
+                "total_engagement": result.get('total_engagement', 0),
+                "likes": result.get('engagement', {}).get('likes', 0),
+                "comments": result.get('engagement', {}).get('comments', 0),
+                "reposts": result.get('engagement', {}).get('reposts', 0),
+                "media_urls": result.get('media_urls', []),
+                "downloaded_media_paths": result.get('downloaded_media_paths', []),
+                "age_days": result.get('age_days', 0),
+                "scraped_at": result.get('scraped_at'),
+                "post_date": result.get('post_date'),
+                "profile_url": result.get('profile_url'),
+                "finalized": result.get('finalized', False),
+                "generation_timestamp": result.get('generation_timestamp'),
+                "status": 'pending'
+            }
+            generated_posts.append(processed_post)
+        log_generation_cache_stats(verbose)
+        log_media_fetch_stats(verbose)
 
         if storage:
             if storage.push_content(generated_posts, batch_id, verbose):
                 log(f"Successfully pushed {len(generated_posts)} generated LinkedIn captions to database.", verbose, log_caller_file="content_generator.py")
+                checkpoint.finalize()
                 return {"success": True, "total_generated": len(generated_posts)}
             else:
                 return {"error": "Failed to push generated LinkedIn captions to database."}
@@ -200,6 +179,8 @@ def run_linkedin_content_generation(profile_name: str, storage: Optional[BaseSto
             output_file = os.path.join(get_suggestions_dir(profile_name), f"suggestions_content_linkedin_{datetime.now().strftime('%Y%m%d')}.json")
             with open(output_file, 'w') as f:
                 json.dump(suggestions_content, f, indent=2)
+            register_artifact(output_file, profile_name, "linkedin", "generated", len(generated_posts))
+            checkpoint.finalize()
 
             return {
                 "success": True,
@@ -314,6 +295,7 @@ def generate_new_linkedin_tweets_from_filtered(profile_name: str, storage: Optio
             output_file = os.path.join(get_suggestions_dir(profile_name), f"new_posts_content_linkedin_{datetime.now().strftime('%Y%m%d')}.json")
             with open(output_file, 'w') as f:
                 json.dump(new_posts_content, f, indent=2)
+            register_artifact(output_file, profile_name, "linkedin", "new_content", len(new_posts_data))
 
             return {
                 "success": True,
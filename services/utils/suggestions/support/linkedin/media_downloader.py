@@ -1,6 +1,5 @@
 import os
 import json
-import requests
 
 from datetime import datetime
 from typing import List, Dict, Any
@@ -8,50 +7,19 @@ from typing import List, Dict, Any
 from profiles import PROFILES
 
 from services.support.logger_util import _log as log
-from services.support.path_config import get_suggestions_dir
+from services.support.media_fetch import fetch_media_to_dir
+from services.support.path_config import get_suggestions_dir, register_artifact
 from services.utils.suggestions.support.linkedin.scraping_utils import get_latest_approved_linkedin_file
 
 def is_local_file_and_exists(path: str) -> bool:
     return os.path.exists(path) and (path.startswith('tmp/') or os.path.isabs(path))
 
 def download_linkedin_images_to_dir(image_urls: List[str], download_dir: str, verbose: bool = False) -> List[str]:
-    os.makedirs(download_dir, exist_ok=True)
-
-    local_image_paths = []
-    for url in image_urls:
-        try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-
-            filename = os.path.basename(url.split('?')[0])
-
-            extension = '.jpeg'
-            if 'format=' in url:
-                format_param = url.split('format=')[1].split('&')[0]
-                if format_param.lower() in ['jpg', 'jpeg']:
-                    extension = '.jpeg'
-                elif format_param.lower() == 'png':
-                    extension = '.png'
-                elif format_param.lower() == 'gif':
-                    extension = '.gif'
-
-            if not filename:
-                filename = f"image_{len(local_image_paths)}{extension}"
-            elif not any(filename.lower().endswith(ext) for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp']):
-                filename = f"{filename}{extension}"
-
-            file_path = os.path.join(download_dir, filename)
-
-            with open(file_path, 'wb') as f:
-                f.write(response.content)
-
-            local_image_paths.append(file_path)
-            log(f"Downloaded image: {filename}", verbose, log_caller_file="media_downloader.py")
-        except Exception as e:
-            log(f"Error downloading image {url}: {str(e)}", verbose, is_error=True, log_caller_file="media_downloader.py")
-
+    local_image_paths = fetch_media_to_dir(image_urls, download_dir, verbose)
+    log(f"Fetched {len(local_image_paths)} of {len(image_urls)} images into {download_dir}", verbose, log_caller_file="media_downloader.py")
     return local_image_paths
 
+
 def download_linkedin_post_media(post_data: Dict[str, Any], media_dir: str, verbose: bool = False) -> List[str]:
     media_urls = post_data.get('data', {}).get('media_urls', [])
     post_id = post_data.get('data', {}).get('post_id', 'unknown')
@@ -121,6 +89,7 @@ def run_linkedin_media_download(profile_name: str) -> Dict[str, Any]:
 
         with open(updated_approved_filepath, 'w') as f:
             json.dump(approved_data, f, indent=2)
+        register_artifact(updated_approved_filepath, profile_name, "linkedin", "approved_with_media", len(approved_posts))
 
         return {
             "success": True,
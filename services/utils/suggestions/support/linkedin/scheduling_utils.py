@@ -9,7 +9,7 @@ from profiles import PROFILES
 
 from services.support.logger_util import _log as log
 from services.support.web_driver_handler import setup_driver
-from services.support.path_config import get_schedule_file_path, get_suggestions_dir, get_browser_data_dir
+from services.support.path_config import get_schedule_file_path, get_latest_artifacts, get_browser_data_dir
 
 from services.support.storage.base_storage import BaseStorage
 
@@ -93,14 +93,12 @@ def run_linkedin_content_scheduling(profile_name: str, storage_generated: Option
             return {"error": "No approved content found in the database. Please review and approve content first."}
 
     else:
-        suggestions_dir = get_suggestions_dir(profile_name)
-        approved_files = [f for f in os.listdir(suggestions_dir) if f.startswith('suggestions_content_linkedin_') and f.endswith('.json')]
-        approved_files.sort(reverse=True)
+        approved_files = get_latest_artifacts(profile_name, "linkedin", ("generated", "reviewed"), limit=None)
 
         approved_content_from_files = []
         for file in approved_files:
             try:
-                with open(os.path.join(suggestions_dir, file), 'r') as f:
+                with open(file, 'r') as f:
                     data = json.load(f)
                     if 'generated_posts' in data:
                         for post in data['generated_posts']:
@@ -115,12 +113,11 @@ def run_linkedin_content_scheduling(profile_name: str, storage_generated: Option
             except Exception as e:
                 log(f"Error loading suggestions file {file}: {e}", verbose, log_caller_file="scheduling_utils.py")
 
-        new_posts_files = [f for f in os.listdir(suggestions_dir) if f.startswith('new_posts_content_linkedin_') and f.endswith('.json')]
-        new_posts_files.sort(reverse=True)
+        new_posts_files = get_latest_artifacts(profile_name, "linkedin", "new_content", limit=None)
 
         for file in new_posts_files:
             try:
-                with open(os.path.join(suggestions_dir, file), 'r') as f:
+                with open(file, 'r') as f:
                     data = json.load(f)
                     if 'new_posts' in data:
                         for post in data['new_posts']:
@@ -1,6 +1,5 @@
 import os
 import sys
-import json
 
 from datetime import datetime
 from typing import List, Dict, Any
@@ -12,9 +11,12 @@ from profiles import PROFILES
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
 
 from services.support.logger_util import _log as log
-from services.support.path_config import get_suggestions_dir
+from services.support.dataset_store import write_dataset
+from services.support.seen_index import get_seen_index, log_seen_index_stats
+from services.support.path_config import get_suggestions_dir, get_latest_artifact, register_artifact
 
 from services.platform.linkedin.support.scraper_utils import scrape_linkedin_profiles, scrape_linkedin_feed_posts
+from services.utils.suggestions.support.linkedin.content_filter import get_linkedin_content_id
 
 console = Console()
 
@@ -24,7 +26,6 @@ def save_linkedin_scraped_content(scraped_posts: List[Dict[str, Any]], profile_n
     content_data = {
         "timestamp": datetime.now().isoformat(),
         "profile_name": profile_name,
-        "scraped_posts": scraped_posts,
         "metadata": {
             "total_posts": len(scraped_posts),
             "scrape_date": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -34,12 +35,12 @@ def save_linkedin_scraped_content(scraped_posts: List[Dict[str, Any]], profile_n
     suggestions_dir = get_suggestions_dir(profile_name)
     os.makedirs(suggestions_dir, exist_ok=True)
 
-    filename = f"scraped_content_linkedin_{timestamp}.json"
+    filename = f"scraped_content_linkedin_{timestamp}.jsonl"
     filepath = os.path.join(suggestions_dir, filename)
 
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(content_data, f, indent=2, ensure_ascii=False)
+        filepath = write_dataset(filepath, scraped_posts, metadata=content_data, numeric_fields=("engagement.likes", "engagement.comments", "engagement.reposts"), verbose=verbose)
+        register_artifact(filepath, profile_name, "linkedin", "scraped", len(scraped_posts))
 
         log(f"Saved {len(scraped_posts)} scraped posts to {filepath}", verbose, log_caller_file="scraping_utils.py")
         return filepath
@@ -80,54 +81,25 @@ def run_linkedin_suggestions_workflow(profile_name: str, max_posts_per_profile:
         return {"error": "No posts were scraped from LinkedIn"}
 
     log(f"Total posts scraped: {len(scraped_posts)}", verbose, log_caller_file="scraping_utils.py")
+    already_seen = get_seen_index(profile_name, verbose).observe("linkedin", [get_linkedin_content_id(post) for post in scraped_posts])
+    log_seen_index_stats(verbose)
 
     saved_file = save_linkedin_scraped_content(scraped_posts, profile_name, verbose)
 
     result = {
         "success": True,
         "total_posts_scraped": len(scraped_posts),
+        "already_seen": len(already_seen),
         "saved_file": saved_file
     }
 
     return result
 
 def get_latest_approved_linkedin_file(profile_name: str) -> str:
-    suggestions_dir = get_suggestions_dir(profile_name)
-    if not os.path.exists(suggestions_dir):
-        return ""
-
-    approved_files_with_media = [f for f in os.listdir(suggestions_dir) if f.startswith('approved_content_') and f.endswith('_with_media.json')]
-    if approved_files_with_media:
-        approved_files_with_media.sort(reverse=True)
-        return os.path.join(suggestions_dir, approved_files_with_media[0])
-
-    approved_files = [f for f in os.listdir(suggestions_dir) if f.startswith('approved_content_') and f.endswith('.json')]
-    if not approved_files:
-        return ""
-
-    approved_files.sort(reverse=True)
-    return os.path.join(suggestions_dir, approved_files[0])
+    return get_latest_artifact(profile_name, "linkedin", "approved_with_media") or get_latest_artifact(profile_name, "linkedin", "approved")
 
 def get_latest_linkedin_suggestions_file(profile_name: str) -> str:
-    suggestions_dir = get_suggestions_dir(profile_name)
-    if not os.path.exists(suggestions_dir):
-        return ""
-
-    suggestions_files = [f for f in os.listdir(suggestions_dir) if f.startswith('suggestions_content_') and f.endswith('.json')]
-    if not suggestions_files:
-        return ""
-
-    suggestions_files.sort(reverse=True)
-    return os.path.join(suggestions_dir, suggestions_files[0])
+    return get_latest_artifact(profile_name, "linkedin", ("generated", "reviewed"))
 
 def get_latest_filtered_linkedin_file(profile_name: str) -> str:
-    suggestions_dir = get_suggestions_dir(profile_name)
-    if not os.path.exists(suggestions_dir):
-        return ""
-
-    filtered_files = [f for f in os.listdir(suggestions_dir) if f.startswith('filtered_content_linkedin_') and f.endswith('.json')]
-    if not filtered_files:
-        return ""
-
-    filtered_files.sort(reverse=True)
-    return os.path.join(suggestions_dir, filtered_files[0])
+    return get_latest_artifact(profile_name, "linkedin", "filtered")
@@ -0,0 +1,165 @@
+import os
+import math
+import heapq
+
+from array import array
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+MetricGetter = Callable[[Dict[str, Any]], Any]
+GroupFn = Callable[[Dict[str, Any]], str]
+DateFn = Callable[[Dict[str, Any]], Any]
+ScoreFn = Callable[["RankingBatch"], Sequence[float]]
+
+MIN_VELOCITY_AGE_DAYS = 1 / 24
+
+def parse_datetime(value: Any) -> Optional[datetime]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        try:
+            return datetime.fromtimestamp(value)
+        except (OverflowError, OSError, ValueError):
+            return None
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            parsed = datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            return None
+    return parsed.replace(tzinfo=None) if parsed.tzinfo else parsed
+
+def _as_float(value: Any) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+class RankingSpec:
+    def __init__(self, group_fn: GroupFn, date_fn: DateFn, engagement_metrics: Dict[str, MetricGetter], extra_metrics: Optional[Dict[str, MetricGetter]] = None):
+        self.group_fn = group_fn
+        self.date_fn = date_fn
+        self.engagement_metrics = engagement_metrics
+        self.metrics = dict(engagement_metrics, **(extra_metrics or {}))
+
+    def raw_engagement(self, record: Dict[str, Any]) -> Any:
+        return sum(getter(record) or 0 for getter in self.engagement_metrics.values())
+
+class RankingBatch:
+    def __init__(self, spec: RankingSpec, now: Optional[datetime] = None, age_window: Optional[Tuple[int, int]] = None):
+        self.spec = spec
+        self.now = now or datetime.now()
+        self.age_window = age_window
+        self.records: List[Optional[Dict[str, Any]]] = []
+        self.groups: List[str] = []
+        self.age = array('d')
+        self.age_days = array('l')
+        self.engagement = array('d')
+        self.metrics: Dict[str, array] = {name: array('d') for name in spec.metrics}
+        self._metric_columns = [(self.metrics[name], getter, name in spec.engagement_metrics) for name, getter in spec.metrics.items()]
+
+    def add(self, record: Dict[str, Any]):
+        parsed = parse_datetime(self.spec.date_fn(record))
+        age_seconds = (self.now - parsed).total_seconds() if parsed else 0.0
+        age_days = math.floor(age_seconds / 86400)
+        in_window = self.age_window is None or self.age_window[0] <= age_days <= self.age_window[1]
+        self.records.append(record if in_window else None)
+        self.groups.append(self.spec.group_fn(record))
+        self.age.append(age_seconds / 86400)
+        self.age_days.append(age_days)
+
+        engagement = 0.0
+        for column, getter, counts in self._metric_columns:
+            value = _as_float(getter(record))
+            column.append(value)
+            if counts:
+                engagement += value
+        self.engagement.append(engagement)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]], spec: RankingSpec, now: Optional[datetime] = None, age_window: Optional[Tuple[int, int]] = None) -> "RankingBatch":
+        batch = cls(spec, now, age_window)
+        for record in records:
+            batch.add(record)
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+def _score_engagement(batch: RankingBatch) -> Sequence[float]:
+    return batch.engagement
+
+def _score_time_decay(batch: RankingBatch) -> Sequence[float]:
+    half_life = float(os.getenv("RANKING_HALF_LIFE_DAYS", "3"))
+    return array('d', (engagement * 0.5 ** (max(age, 0.0) / half_life) for engagement, age in zip(batch.engagement, batch.age)))
+
+def _score_velocity(batch: RankingBatch) -> Sequence[float]:
+    return array('d', (engagement / max(age, MIN_VELOCITY_AGE_DAYS) for engagement, age in zip(batch.engagement, batch.age)))
+
+def _score_views_normalised(batch: RankingBatch) -> Sequence[float]:
+    views = batch.metrics.get("views")
+    if views is None:
+        return batch.engagement
+    return array('d', (engagement * 1000 / view_count if view_count > 0 else 0.0 for engagement, view_count in zip(batch.engagement, views)))
+
+SCORING_FUNCTIONS: Dict[str, ScoreFn] = {
+    "engagement": _score_engagement,
+    "time_decay": _score_time_decay,
+    "velocity": _score_velocity,
+    "views_normalised": _score_views_normalised
+}
+
+def register_scoring_function(name: str, score_fn: ScoreFn):
+    SCORING_FUNCTIONS[name] = score_fn
+
+class RankingResult:
+    def __init__(self, top: List[Dict[str, Any]], group_totals: Dict[str, int], group_eligible: Dict[str, int], group_selected: Dict[str, List[Dict[str, Any]]]):
+        self.top = top
+        self.group_totals = group_totals
+        self.group_eligible = group_eligible
+        self.group_selected = group_selected
+
+def rank_batch(batch: RankingBatch, min_age_days: int, max_age_days: int, max_per_group: int, max_total: int, scoring: str = "engagement", min_metrics: Optional[Dict[str, float]] = None) -> RankingResult:
+    score_fn = SCORING_FUNCTIONS.get(scoring, _score_engagement)
+    scores = score_fn(batch)
+    min_metrics = min_metrics or {}
+
+    group_totals: Dict[str, int] = {}
+    eligible: Dict[str, List[int]] = {}
+    for index, group in enumerate(batch.groups):
+        group_totals[group] = group_totals.get(group, 0) + 1
+        rows = eligible.setdefault(group, [])
+        if not (min_age_days <= batch.age_days[index] <= max_age_days):
+            continue
+        if any(batch.metrics[name][index] < minimum for name, minimum in min_metrics.items()):
+            continue
+        rows.append(index)
+
+    selected_rows: List[int] = []
+    group_selected: Dict[str, List[Dict[str, Any]]] = {}
+    for group, rows in eligible.items():
+        if not rows:
+            continue
+        top_rows = heapq.nlargest(max_per_group, rows, key=scores.__getitem__)
+        selected_rows.extend(top_rows)
+        group_selected[group] = [_annotate(batch, row, scores[row]) for row in top_rows]
+
+    top_rows = heapq.nlargest(max_total, selected_rows, key=scores.__getitem__)
+    return RankingResult(
+        top=[batch.records[row] for row in top_rows],
+        group_totals=group_totals,
+        group_eligible={group: len(rows) for group, rows in eligible.items() if rows},
+        group_selected=group_selected
+    )
+
+def _annotate(batch: RankingBatch, row: int, score: float) -> Dict[str, Any]:
+    record = batch.records[row]
+    record['total_engagement'] = batch.spec.raw_engagement(record)
+    record['age_days'] = batch.age_days[row]
+    record['rank_score'] = round(score, 4)
+    return record
+
+def rank_records(records: Iterable[Dict[str, Any]], spec: RankingSpec, min_age_days: int, max_age_days: int, max_per_group: int, max_total: int, scoring: str = "engagement", min_metrics: Optional[Dict[str, float]] = None, now: Optional[datetime] = None) -> Tuple[RankingBatch, RankingResult]:
+    batch = RankingBatch.from_records(records, spec, now, (min_age_days, max_age_days))
+    return batch, rank_batch(batch, min_age_days, max_age_days, max_per_group, max_total, scoring, min_metrics)
@@ -1,6 +1,7 @@
 import os
 import sys
 import json
+import hashlib
 
 from typing import Dict, Any
 from datetime import datetime
@@ -9,15 +10,26 @@ from profiles import PROFILES
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
 
-from services.support.path_config import get_suggestions_dir
-
-def parse_reddit_date(post_data):
-    if isinstance(post_data.get('data', {}).get('created_utc'), (int, float)):
-        try:
-            return datetime.fromtimestamp(post_data['data']['created_utc'])
-        except:
-            return datetime.now()
-    return datetime.now()
+from services.support.seen_index import get_seen_index
+from services.support.dataset_store import read_recent_datasets, count_through
+from services.support.path_config import get_suggestions_dir, get_latest_artifact, register_artifact
+from services.utils.suggestions.support.ranking_engine import RankingSpec, rank_records
+
+def get_reddit_content_id(post_data: Dict[str, Any]) -> str:
+    # Generate a unique content_id from the Reddit URL since posts don't have native IDs
+    reddit_url = post_data.get('data', {}).get('url', '')
+    if reddit_url:
+        return hashlib.md5(reddit_url.encode()).hexdigest()[:16]
+    return f"reddit_{hash(str(post_data))}"
+
+REDDIT_RANKING_SPEC = RankingSpec(
+    group_fn=lambda post: post.get('data', {}).get('subreddit', '') or 'unknown',
+    date_fn=lambda post: post.get('data', {}).get('created_utc'),
+    engagement_metrics={
+        'score': lambda post: post.get('engagement', {}).get('score', 0),
+        'num_comments': lambda post: post.get('engagement', {}).get('num_comments', 0)
+    }
+)
 
 def filter_and_sort_reddit_content(scraped_file_path: str, profile_name: str) -> Dict[str, Any]:
     profile_props = PROFILES[profile_name].get('properties', {})
@@ -30,84 +42,50 @@ def filter_and_sort_reddit_content(scraped_file_path: str, profile_name: str) ->
     min_score = content_filter.get('min_score', 10)
     max_posts_per_subreddit = content_filter.get('max_posts_per_subreddit', 3)
     max_posts = content_filter.get('max_posts', 15)
+    scoring = content_filter.get('scoring', 'engagement')
+    history_days = content_filter.get('history_days', 0)
 
     try:
-        with open(scraped_file_path, 'r', encoding='utf-8') as f:
-            scraped_data = json.load(f)
+        counts: Dict[str, int] = {}
+        scraped_posts = count_through(read_recent_datasets(profile_name, "reddit", "scraped", scraped_file_path, get_reddit_content_id, history_days, records_key='scraped_reddit_posts'), counts, "scraped")
+        candidate_posts = count_through(get_seen_index(profile_name).iter_unseen("reddit", "generated", scraped_posts, get_reddit_content_id), counts, "candidates")
+        batch, ranking = rank_records(candidate_posts, REDDIT_RANKING_SPEC, min_age_days, max_age_days, max_posts_per_subreddit, max_posts, scoring, min_metrics={'score': min_score})
     except Exception as e:
         return {"error": f"Failed to load scraped data: {e}"}
 
-    scraped_posts = scraped_data.get('scraped_reddit_posts', [])
-    if not scraped_posts:
+    if not counts.get("scraped"):
         return {"error": "No Reddit posts found in scraped data"}
 
-    now = datetime.now()
-
-    posts_by_subreddit = {}
-    for post in scraped_posts:
-        subreddit = post.get('data', {}).get('subreddit', '')
-
-        if not subreddit:
-            subreddit = 'unknown'
-
-        if subreddit not in posts_by_subreddit:
-            posts_by_subreddit[subreddit] = []
-        posts_by_subreddit[subreddit].append(post)
+    original_count = counts["scraped"]
+    already_generated_count = original_count - counts["candidates"]
+    final_top_posts = ranking.top
 
-    all_top_posts = []
     subreddit_stats = {}
-
-    for subreddit, subreddit_posts in posts_by_subreddit.items():
-        age_filtered_posts = []
-
-        for post in subreddit_posts:
-            post_date = parse_reddit_date(post)
-            age_days = (now - post_date).days
-
-            if not (min_age_days <= age_days <= max_age_days):
-                continue
-
-            score = post.get('engagement', {}).get('score', 0)
-            if score < min_score:
-                continue
-
-            comments = post.get('engagement', {}).get('num_comments', 0)
-            total_engagement = score + comments
-
-            post_copy = post.copy()
-            post_copy['total_engagement'] = total_engagement
-            post_copy['age_days'] = age_days
-            age_filtered_posts.append(post_copy)
-
-        if age_filtered_posts:
-            age_filtered_posts.sort(key=lambda x: x['total_engagement'], reverse=True)
-            top_posts_from_subreddit = age_filtered_posts[:max_posts_per_subreddit]
-            all_top_posts.extend(top_posts_from_subreddit)
-
-            subreddit_stats[subreddit] = {
-                "total_posts": len(subreddit_posts),
-                "age_filtered_posts": len(age_filtered_posts),
-                "selected_top": len(top_posts_from_subreddit),
-                "avg_score": sum(p.get('engagement', {}).get('score', 0) for p in top_posts_from_subreddit) / len(top_posts_from_subreddit) if top_posts_from_subreddit else 0,
-                "avg_comments": sum(p.get('engagement', {}).get('num_comments', 0) for p in top_posts_from_subreddit) / len(top_posts_from_subreddit) if top_posts_from_subreddit else 0
-            }
-
-    all_top_posts.sort(key=lambda x: x['total_engagement'], reverse=True)
-    final_top_posts = all_top_posts[:max_posts]
+    for subreddit, top_posts_from_subreddit in ranking.group_selected.items():
+        subreddit_stats[subreddit] = {
+            "total_posts": ranking.group_totals[subreddit],
+            "age_filtered_posts": ranking.group_eligible[subreddit],
+            "selected_top": len(top_posts_from_subreddit),
+            "avg_score": sum(p.get('engagement', {}).get('score', 0) for p in top_posts_from_subreddit) / len(top_posts_from_subreddit),
+            "avg_comments": sum(p.get('engagement', {}).get('num_comments', 0) for p in top_posts_from_subreddit) / len(top_posts_from_subreddit)
+        }
 
     filtered_data = {
         "timestamp": datetime.now().isoformat(),
         "profile_name": profile_name,
         "platform": "reddit",
-        "original_scraped_count": len(scraped_posts),
-        "subreddits_count": len(posts_by_subreddit),
+        "original_scraped_count": original_count,
+        "already_generated_count": already_generated_count,
+        "subreddits_count": len(ranking.group_totals),
         "filtered_count": len(final_top_posts),
         "filter_criteria": {
             "min_age_days": min_age_days,
             "max_age_days": max_age_days,
             "min_score": min_score,
             "max_posts_per_subreddit": max_posts_per_subreddit,
-            "max_posts": max_posts
+            "max_posts": max_posts,
+            "scoring": scoring,
+            "history_days": history_days
         },
         "subreddit_stats": subreddit_stats,
         "filtered_reddit_posts": final_top_posts
@@ -122,13 +100,15 @@ def filter_and_sort_reddit_content(scraped_file_path: str, profile_name: str) ->
     try:
         with open(filtered_filepath, 'w', encoding='utf-8') as f:
             json.dump(filtered_data, f, indent=2, ensure_ascii=False)
+        register_artifact(filtered_filepath, profile_name, "reddit", "filtered", len(final_top_posts))
     except Exception as e:
         return {"error": f"Failed to save filtered data: {e}"}
 
     return {
         "success": True,
-        "original_count": len(scraped_posts),
-        "subreddits_count": len(posts_by_subreddit),
+        "original_count": original_count,
+        "already_generated_count": already_generated_count,
+        "subreddits_count": len(ranking.group_totals),
         "filtered_count": len(final_top_posts),
         "saved_file": filtered_filepath,
         "subreddit_stats": subreddit_stats,
@@ -139,28 +119,10 @@ def get_latest_scraped_reddit_file(profile_name: str) -> str:
     """
     Get the latest scraped Reddit content file.
     """
-    suggestions_dir = get_suggestions_dir(profile_name)
-    if not os.path.exists(suggestions_dir):
-        return ""
-
-    reddit_files = [f for f in os.listdir(suggestions_dir) if f.startswith('scraped_content_reddit_') and f.endswith('.json')]
-    if not reddit_files:
-        return ""
-
-    reddit_files.sort(reverse=True)
-    return os.path.join(suggestions_dir, reddit_files[0])
+    return get_latest_artifact(profile_name, "reddit", "scraped")
 
 def get_latest_filtered_reddit_file(profile_name: str) -> str:
     """
     Get the latest filtered Reddit content file.
     """
-    suggestions_dir = get_suggestions_dir(profile_name)
-    if not os.path.exists(suggestions_dir):
-        return ""
-
-    filtered_files = [f for f in os.listdir(suggestions_dir) if f.startswith('filtered_content_reddit_') and f.endswith('.json')]
-    if not filtered_files:
-        return ""
-
-    filtered_files.sort(reverse=True)
-    return os.path.join(suggestions_dir, filtered_files[0])
+    return get_latest_artifact(profile_name, "reddit", "filtered")
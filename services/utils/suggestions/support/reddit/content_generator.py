@@ -1,29 +1,33 @@
 import os
 import json
-import time
 
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 from services.support.storage.base_storage import BaseStorage
 
 from profiles import PROFILES
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from services.support.logger_util import _log as log
 from services.support.api_key_pool import APIKeyPool
 from services.support.rate_limiter import RateLimiter
 from services.support.api_call_tracker import APICallTracker
-from services.support.path_config import get_gemini_log_file_path, get_suggestions_dir
-from services.support.gemini_util import generate_gemini_with_inline_media, create_inline_media_data
-
+from services.support.seen_index import get_seen_index
+from services.support.path_config import get_gemini_log_file_path, get_suggestions_dir, get_suggestions_checkpoint_path, register_artifact
+from services.support.gemini_cache import log_generation_cache_stats
+from services.support.media_fetch import log_media_fetch_stats
+from services.support.gemini_util import create_inline_media_data
+
+from services.utils.suggestions.support.generation_engine import GenerationEngine
+from services.utils.suggestions.support.generation_checkpoint import GenerationCheckpoint
 from services.utils.suggestions.support.reddit.media_downloader import download_reddit_post_media
+from services.utils.suggestions.support.reddit.content_filter import get_reddit_content_id
 from services.utils.suggestions.support.reddit.scraping_utils import get_latest_filtered_reddit_file
 
 api_call_tracker = APICallTracker(log_file=get_gemini_log_file_path())
 rate_limiter = RateLimiter()
 
-def generate_reddit_caption(post_data: Dict[str, Any], media_paths: List[str], api_key_pool: APIKeyPool, verbose: bool = False) -> str:
+def build_reddit_caption_prompt(post_data: Dict[str, Any], media_paths: List[str], verbose: bool = False) -> Tuple[List[Any], str]:
     profile_name = post_data.get('profile_name', 'unknown')
     post_id = post_data.get('data', {}).get('id', 'unknown')
 
@@ -60,76 +64,32 @@ def generate_reddit_caption(post_data: Dict[str, Any], media_paths: List[str], a
 
     prompt_parts.append("\n\nImportant: Generate exactly ONE caption. Do not provide multiple options or explanations. Just write a single, engaging caption.")
 
-    log(f"[HITTING API] Calling Gemini API for Reddit post {post_id}", verbose, log_caller_file="content_generator.py")
-
-    result, _ = generate_gemini_with_inline_media(
-        prompt_parts=prompt_parts,
-        api_key_pool=api_key_pool,
-        api_call_tracker=api_call_tracker,
-        rate_limiter=rate_limiter,
-        model_name=model_name,
-        verbose=verbose
-    )
-
-    if result:
-        log(f"Generated caption for Reddit post {post_id}: {result[:50]}...", verbose, log_caller_file="content_generator.py")
-        return result
-    else:
-        return "Error generating caption: Failed to generate content"
-
-def process_single_reddit_post(post_data: Dict[str, Any], api_key_pool: APIKeyPool, media_dir: str, verbose: bool = False) -> Dict[str, Any]:
-    # Generate a unique content_id from the Reddit URL since posts don't have native IDs
-    reddit_url = post_data.get('data', {}).get('url', '')
-    if reddit_url:
-        # Extract post ID from Reddit URL or use hash of URL
-        import hashlib
-        post_id = hashlib.md5(reddit_url.encode()).hexdigest()[:16]
-    else:
-        post_id = f"reddit_{hash(str(post_data))}"
-
-    try:
-        downloaded_media_paths = download_reddit_post_media(post_data, media_dir, verbose)
-        generated_caption = generate_reddit_caption(post_data, downloaded_media_paths, api_key_pool, verbose)
-
-        return {
-            "reddit_url": post_data.get('data', {}).get('url', ''),
-            "content_id": post_id,
-            "original_title": post_data.get('data', {}).get('title', ''),
-            "original_content": post_data.get('data', {}).get('content', ''),
-            "subreddit": post_data.get('data', {}).get('subreddit', ''),
-            "generated_caption": generated_caption if not generated_caption.startswith("Error") else "",
-            "media_urls": [],
-            "downloaded_media_paths": downloaded_media_paths,
-            "score": post_data.get('engagement', {}).get('score', 0),
-            "comments": post_data.get('engagement', {}).get('num_comments', 0),
-            "upvote_ratio": post_data.get('engagement', {}).get('upvote_ratio', 0.0),
-            "total_engagement": post_data.get('total_engagement', 0),
-            "age_days": post_data.get('age_days', 0),
-            "scraped_date": post_data.get('scraped_at'),
-            "created_utc": post_data.get('data', {}).get('created_utc'),
-            "engagement_score": post_data.get('total_engagement', 0),
-            "finalized": False,
-            "generation_timestamp": datetime.now().isoformat()
-        }
-
-    except Exception as e:
-        log(f"Error processing Reddit post {post_id}: {str(e)}", verbose, is_error=True, log_caller_file="content_generator.py")
-        return {
-            "reddit_url": post_data.get('data', {}).get('url', ''),
-            "content_id": post_id,
-            "original_title": post_data.get('data', {}).get('title', ''),
-            "original_content": post_data.get('data', {}).get('content', ''),
-            "error": str(e),
-            "generated_caption": "",
-            "media_urls": [],
-            "downloaded_media_paths": [],
-            "score": post_data.get('engagement', {}).get('score', 0),
-            "comments": post_data.get('engagement', {}).get('num_comments', 0),
-            "total_engagement": post_data.get('total_engagement', 0),
-            "age_days": post_data.get('age_days', 0),
-            "finalized": False,
-            "generation_timestamp": datetime.now().isoformat()
-        }
+    return prompt_parts, model_name
+
+def build_reddit_generated_post(post_data: Dict[str, Any], downloaded_media_paths: List[str], generated_caption: str, error: Optional[Exception] = None) -> Dict[str, Any]:
+    result = {
+        "reddit_url": post_data.get('data', {}).get('url', ''),
+        "content_id": get_reddit_content_id(post_data),
+        "original_title": post_data.get('data', {}).get('title', ''),
+        "original_content": post_data.get('data', {}).get('content', ''),
+        "subreddit": post_data.get('data', {}).get('subreddit', ''),
+        "generated_caption": generated_caption if generated_caption and not generated_caption.startswith("Error") else "",
+        "media_urls": [],
+        "downloaded_media_paths": downloaded_media_paths if error is None else [],
+        "score": post_data.get('engagement', {}).get('score', 0),
+        "comments": post_data.get('engagement', {}).get('num_comments', 0),
+        "upvote_ratio": post_data.get('engagement', {}).get('upvote_ratio', 0.0),
+        "total_engagement": post_data.get('total_engagement', 0),
+        "age_days": post_data.get('age_days', 0),
+        "scraped_date": post_data.get('scraped_at'),
+        "created_utc": post_data.get('data', {}).get('created_utc'),
+        "engagement_score": post_data.get('total_engagement', 0),
+        "finalized": False,
+        "generation_timestamp": datetime.now().isoformat()
+    }
+    if error is not None:
+        result["error"] = str(error)
+    return result
 
 def run_reddit_content_generation(profile_name: str, storage: Optional[BaseStorage] = None, verbose: bool = False) -> Dict[str, Any]:
     filtered_file = get_latest_filtered_reddit_file(profile_name)
@@ -151,32 +111,41 @@ def run_reddit_content_generation(profile_name: str, storage: Optional[BaseStora
         profile_props = PROFILES[profile_name].get('properties', {})
         verbose = profile_props.get('verbose', False)
 
-        api_key_pool = APIKeyPool(verbose=verbose)
+        api_key_pool = APIKeyPool(verbose=verbose, model_name=profile_props.get('model_name', 'gemini-2.5-flash-lite'))
         if api_key_pool.size() == 0:
             return {"error": "No API keys available. Set GEMINI_API environment variable."}
 
         media_dir = os.path.join(get_suggestions_dir(profile_name), "reddit_media")
         os.makedirs(media_dir, exist_ok=True)
 
-        generated_posts = []
-        with ThreadPoolExecutor(max_workers=min(api_key_pool.size(), 3)) as executor:
-            futures = []
-            batch_id = f"reddit_generation_{datetime.now().strftime('%Y%m%d%H%M%S')}"
-
-            for post in posts_to_process:
-                post['profile_name'] = profile_name
-                post['batch_id'] = batch_id
-                future = executor.submit(process_single_reddit_post, post, api_key_pool, media_dir, verbose)
-                futures.append(future)
-
-            for future in as_completed(futures):
-                result = future.result()
-                generated_posts.append(result)
+        checkpoint = GenerationCheckpoint(get_suggestions_checkpoint_path(profile_name, "reddit", filtered_file), f"reddit_generation_{datetime.now().strftime('%Y%m%d%H%M%S')}", verbose)
+        batch_id = checkpoint.batch_id
+        for post in posts_to_process:
+            post['profile_name'] = profile_name
+            post['batch_id'] = batch_id
+
+        engine = GenerationEngine(
+            api_key_pool=api_key_pool,
+            api_call_tracker=api_call_tracker,
+            rate_limiter=rate_limiter,
+            download_fn=lambda post: download_reddit_post_media(post, media_dir, verbose),
+            build_prompt_fn=lambda post, media_paths: build_reddit_caption_prompt(post, media_paths, verbose),
+            build_result_fn=build_reddit_generated_post,
+            persist_fn=checkpoint.record,
+            generate_concurrency=min(api_key_pool.size(), 3),
+            verbose=verbose
+        )
+        pending_posts, generated_posts = checkpoint.split(posts_to_process, get_reddit_content_id)
+        generated_posts.extend(engine.run(pending_posts))
+        get_seen_index(profile_name).mark_many("reddit", "generated", [post['content_id'] for post in generated_posts if post.get('generated_caption')])
+        log_generation_cache_stats(verbose)
+        log_media_fetch_stats(verbose)
 
         if storage:
             push_result = storage.push_content(generated_posts, batch_id, verbose)
             if push_result:
                 log(f"Successfully pushed {len(generated_posts)} generated Reddit captions to database.", verbose, log_caller_file="content_generator.py")
+                checkpoint.finalize()
                 return {"success": True, "total_generated": len(generated_posts)}
             else:
                 log(f"Failed to push generated Reddit captions to database.", verbose, is_error=True, log_caller_file="content_generator.py")
@@ -204,6 +173,8 @@ def run_reddit_content_generation(profile_name: str, storage: Optional[BaseStora
             output_file = os.path.join(get_suggestions_dir(profile_name), f"suggestions_content_reddit_{datetime.now().strftime('%Y%m%d')}.json")
             with open(output_file, 'w') as f:
                 json.dump(reddit_content, f, indent=2)
+            register_artifact(output_file, profile_name, "reddit", "generated", len(generated_posts))
+            checkpoint.finalize()
 
             return {
                 "success": True,
@@ -1,11 +1,11 @@
 import os
 import json
-import requests
 import re
 
 from typing import List, Dict, Any
 from services.support.logger_util import _log as log
-from services.support.path_config import get_suggestions_dir
+from services.support.media_fetch import fetch_media_to_dir
+from services.support.path_config import get_suggestions_dir, register_artifact
 from services.utils.suggestions.support.reddit.scraping_utils import get_latest_approved_reddit_file
 
 def extract_reddit_media_urls(content: str, post_url: str) -> List[str]:
@@ -38,36 +38,12 @@ def extract_reddit_media_urls(content: str, post_url: str) -> List[str]:
     return unique_urls
 
 def download_reddit_images_to_dir(image_urls: List[str], download_dir: str, verbose: bool = False) -> List[str]:
-    os.makedirs(download_dir, exist_ok=True)
-
-    local_image_paths = []
-    for url in image_urls:
-        try:
-            if not any(url.lower().endswith(ext) for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp']):
-                continue
-
-            response = requests.get(url, timeout=30, headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            })
-            response.raise_for_status()
-
-            filename = os.path.basename(url.split('?')[0])
-            if not filename:
-                filename = f"reddit_image_{len(local_image_paths)}.jpg"
-
-            file_path = os.path.join(download_dir, filename)
-
-            with open(file_path, 'wb') as f:
-                f.write(response.content)
-
-            local_image_paths.append(file_path)
-            log(f"Downloaded Reddit image: {filename}", verbose, log_caller_file="media_downloader.py")
-
-        except Exception as e:
-            log(f"Error downloading Reddit image {url}: {str(e)}", verbose, is_error=True, log_caller_file="media_downloader.py")
-
+    image_urls = [url for url in image_urls if url.lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.webp'))]
+    local_image_paths = fetch_media_to_dir(image_urls, download_dir, verbose)
+    log(f"Fetched {len(local_image_paths)} of {len(image_urls)} Reddit images into {download_dir}", verbose, log_caller_file="media_downloader.py")
     return local_image_paths
 
+
 def download_reddit_post_media(post_data: Dict[str, Any], media_dir: str, verbose: bool = False) -> List[str]:
     content = post_data.get('data', {}).get('content', '')
     post_url = post_data.get('data', {}).get('url', '')
@@ -129,6 +105,7 @@ def run_reddit_media_download(profile_name: str) -> Dict[str, Any]:
 
         with open(updated_approved_filepath, 'w') as f:
             json.dump(approved_data, f, indent=2)
+        register_artifact(updated_approved_filepath, profile_name, "reddit", "approved_with_media", len(approved_posts))
 
         return {
             "success": True,
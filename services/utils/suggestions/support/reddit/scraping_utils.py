@@ -1,6 +1,5 @@
 import os
 import sys
-import json
 
 from datetime import datetime
 from typing import List, Dict, Any
@@ -13,9 +12,12 @@ from profiles import PROFILES
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))))
 
 from services.support.logger_util import _log as log
-from services.support.path_config import get_suggestions_dir
+from services.support.dataset_store import write_dataset
+from services.support.seen_index import get_seen_index, log_seen_index_stats
+from services.support.path_config import get_suggestions_dir, get_latest_artifact, register_artifact
 
 from services.platform.reddit.support.scraper_utils import run_reddit_scraper
+from services.utils.suggestions.support.reddit.content_filter import get_reddit_content_id
 
 console = Console()
 
@@ -35,12 +37,15 @@ def run_reddit_suggestions_workflow(profile_name: str, max_posts: int = 15, verb
         scraped_posts = scraped_posts[:max_posts]
 
     log(f"Total Reddit posts scraped: {len(scraped_posts)}", verbose, log_caller_file="scraping_utils.py")
+    already_seen = get_seen_index(profile_name, verbose).observe("reddit", [get_reddit_content_id(post) for post in scraped_posts])
+    log_seen_index_stats(verbose)
 
     saved_file = save_reddit_scraped_content(scraped_posts, profile_name, verbose)
 
     result = {
         "success": True,
         "total_posts_scraped": len(scraped_posts),
+        "already_seen": len(already_seen),
         "saved_file": saved_file
     }
 
@@ -52,7 +57,6 @@ def save_reddit_scraped_content(scraped_posts: List[Dict[str, Any]], profile_nam
     content_data = {
         "timestamp": datetime.now().isoformat(),
         "profile_name": profile_name,
-        "scraped_reddit_posts": scraped_posts,
         "metadata": {
             "total_posts": len(scraped_posts),
             "scrape_date": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
@@ -63,12 +67,12 @@ def save_reddit_scraped_content(scraped_posts: List[Dict[str, Any]], profile_nam
     suggestions_dir = get_suggestions_dir(profile_name)
     os.makedirs(suggestions_dir, exist_ok=True)
 
-    filename = f"scraped_content_reddit_{timestamp}.json"
+    filename = f"scraped_content_reddit_{timestamp}.jsonl"
     filepath = os.path.join(suggestions_dir, filename)
 
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(content_data, f, indent=2, ensure_ascii=False)
+        filepath = write_dataset(filepath, scraped_posts, metadata=content_data, numeric_fields=("engagement.score", "engagement.num_comments", "data.created_utc"), verbose=verbose)
+        register_artifact(filepath, profile_name, "reddit", "scraped", len(scraped_posts))
 
         log(f"Saved {len(scraped_posts)} scraped Reddit posts to {filepath}", verbose, log_caller_file="scraping_utils.py")
         return filepath
@@ -78,37 +82,10 @@ def save_reddit_scraped_content(scraped_posts: List[Dict[str, Any]], profile_nam
         return ""
 
 def get_latest_scraped_reddit_file(profile_name: str) -> str:
-    suggestions_dir = get_suggestions_dir(profile_name)
-    if not os.path.exists(suggestions_dir):
-        return ""
-
-    reddit_files = [f for f in os.listdir(suggestions_dir) if f.startswith('scraped_content_reddit_') and f.endswith('.json')]
-    if not reddit_files:
-        return ""
-
-    reddit_files.sort(reverse=True)
-    return os.path.join(suggestions_dir, reddit_files[0])
+    return get_latest_artifact(profile_name, "reddit", "scraped")
 
 def get_latest_filtered_reddit_file(profile_name: str) -> str:
-    suggestions_dir = get_suggestions_dir(profile_name)
-    if not os.path.exists(suggestions_dir):
-        return ""
-
-    filtered_files = [f for f in os.listdir(suggestions_dir) if f.startswith('filtered_content_reddit_') and f.endswith('.json')]
-    if not filtered_files:
-        return ""
-
-    filtered_files.sort(reverse=True)
-    return os.path.join(suggestions_dir, filtered_files[0])
+    return get_latest_artifact(profile_name, "reddit", "filtered")
 
 def get_latest_approved_reddit_file(profile_name: str) -> str:
-    suggestions_dir = get_suggestions_dir(profile_name)
-    if not os.path.exists(suggestions_dir):
-        return ""
-
-    approved_files = [f for f in os.listdir(suggestions_dir) if f.startswith('approved_content_reddit_') and f.endswith('.json') and not f.endswith('_with_media.json')]
-    if not approved_files:
-        return ""
-
-    approved_files.sort(reverse=True)
-    return os.path.join(suggestions_dir, approved_files[0])
+    return get_latest_artifact(profile_name, "reddit", "approved")
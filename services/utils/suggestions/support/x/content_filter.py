@@ -9,18 +9,34 @@ from profiles import PROFILES
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
 
-from services.support.path_config import get_suggestions_dir
-
-def parse_tweet_date(tweet_data):
-    if isinstance(tweet_data.get('tweet_date'), str):
-        try:
-            return datetime.fromisoformat(tweet_data['tweet_date'].replace('Z', '+00:00'))
-        except:
-            try:
-                return datetime.strptime(tweet_data['tweet_date'], '%Y-%m-%d %H:%M:%S')
-            except:
-                return datetime.now()
-    return datetime.now()
+from services.support.seen_index import get_seen_index
+from services.support.dataset_store import read_recent_datasets, count_through
+from services.support.path_config import get_suggestions_dir, get_latest_artifact, register_artifact
+from services.utils.suggestions.support.ranking_engine import RankingSpec, rank_records
+
+def get_tweet_username(tweet_data):
+    username = tweet_data.get('username') or tweet_data.get('user', {}).get('screen_name')
+
+    if not username and tweet_data.get('tweet_url'):
+        url_parts = tweet_data['tweet_url'].split('/')
+        if len(url_parts) >= 4 and url_parts[2] == 'x.com':
+            username = url_parts[3]
+
+    return username or 'unknown'
+
+def get_tweet_content_id(tweet_data):
+    return tweet_data.get('tweet_id') or tweet_data.get('tweet_url')
+
+X_RANKING_SPEC = RankingSpec(
+    group_fn=get_tweet_username,
+    date_fn=lambda tweet: tweet.get('tweet_date'),
+    engagement_metrics={
+        'likes': lambda tweet: tweet.get('likes', 0),
+        'retweets': lambda tweet: tweet.get('retweets', 0),
+        'replies': lambda tweet: tweet.get('replies', 0)
+    },
+    extra_metrics={'views': lambda tweet: tweet.get('views', 0)}
+)
 
 def filter_and_sort_content(scraped_file_path: str, profile_name: str) -> Dict[str, Any]:
     profile_props = PROFILES[profile_name].get('properties', {})
@@ -32,87 +48,47 @@ def filter_and_sort_content(scraped_file_path: str, profile_name: str) -> Dict[s
     max_age_days = content_filter.get('max_age_days', 30)
     max_posts_per_profile = content_filter.get('max_posts_per_profile', 5)
     max_posts = content_filter.get('max_posts', 25)
+    scoring = content_filter.get('scoring', 'engagement')
+    history_days = content_filter.get('history_days', 0)
 
     try:
-        with open(scraped_file_path, 'r', encoding='utf-8') as f:
-            scraped_data = json.load(f)
+        counts: Dict[str, int] = {}
+        scraped_tweets = count_through(read_recent_datasets(profile_name, "x", "scraped", scraped_file_path, get_tweet_content_id, history_days, records_key='scraped_tweets'), counts, "scraped")
+        candidate_tweets = count_through(get_seen_index(profile_name).iter_unseen("x", "generated", scraped_tweets, get_tweet_content_id), counts, "candidates")
+        batch, ranking = rank_records(candidate_tweets, X_RANKING_SPEC, min_age_days, max_age_days, max_posts_per_profile, max_posts, scoring)
     except Exception as e:
         return {"error": f"Failed to load scraped data: {e}"}
 
-    scraped_tweets = scraped_data.get('scraped_tweets', [])
-    if not scraped_tweets:
+    if not counts.get("scraped"):
         return {"error": "No tweets found in scraped data"}
 
-    now = datetime.now()
+    original_count = counts["scraped"]
+    already_generated_count = original_count - counts["candidates"]
+    final_top_tweets = ranking.top
 
-    tweets_by_profile = {}
-    for tweet in scraped_tweets:
-        username = tweet.get('username') or tweet.get('user', {}).get('screen_name')
-
-        if not username and tweet.get('tweet_url'):
-            try:
-                url_parts = tweet['tweet_url'].split('/')
-                if len(url_parts) >= 4 and url_parts[2] == 'x.com':
-                    username = url_parts[3]
-            except:
-                pass
-
-        if not username:
-            username = 'unknown'
-
-        if username not in tweets_by_profile:
-            tweets_by_profile[username] = []
-        tweets_by_profile[username].append(tweet)
-
-    all_top_tweets = []
     profile_stats = {}
-
-    for username, profile_tweets in tweets_by_profile.items():
-        age_filtered_tweets = []
-
-        for tweet in profile_tweets:
-            tweet_date = parse_tweet_date(tweet)
-            age_days = (now - tweet_date).days
-
-            if not (min_age_days <= age_days <= max_age_days):
-                continue
-
-            likes = tweet.get('likes', 0)
-            retweets = tweet.get('retweets', 0)
-            replies = tweet.get('replies', 0)
-            total_engagement = likes + retweets + replies
-
-            tweet_copy = tweet.copy()
-            tweet_copy['total_engagement'] = total_engagement
-            tweet_copy['age_days'] = age_days
-            age_filtered_tweets.append(tweet_copy)
-
-        if age_filtered_tweets:
-            age_filtered_tweets.sort(key=lambda x: x['total_engagement'], reverse=True)
-            top_tweets_from_profile = age_filtered_tweets[:max_posts_per_profile]
-            all_top_tweets.extend(top_tweets_from_profile)
-
-            profile_stats[username] = {
-                "total_tweets": len(profile_tweets),
-                "age_filtered_tweets": len(age_filtered_tweets),
-                "selected_top": len(top_tweets_from_profile),
-                "avg_engagement": sum(t['total_engagement'] for t in top_tweets_from_profile) / len(top_tweets_from_profile) if top_tweets_from_profile else 0
-            }
-
-    all_top_tweets.sort(key=lambda x: x['total_engagement'], reverse=True)
-    final_top_tweets = all_top_tweets[:max_posts]
+    for username, top_tweets_from_profile in ranking.group_selected.items():
+        profile_stats[username] = {
+            "total_tweets": ranking.group_totals[username],
+            "age_filtered_tweets": ranking.group_eligible[username],
+            "selected_top": len(top_tweets_from_profile),
+            "avg_engagement": sum(t['total_engagement'] for t in top_tweets_from_profile) / len(top_tweets_from_profile)
+        }
 
     filtered_data = {
         "timestamp": datetime.now().isoformat(),
         "profile_name": profile_name,
-        "original_scraped_count": len(scraped_tweets),
-        "profiles_count": len(tweets_by_profile),
+        "original_scraped_count": original_count,
+        "already_generated_count": already_generated_count,
+        "profiles_count": len(ranking.group_totals),
         "filtered_count": len(final_top_tweets),
         "filter_criteria": {
             "min_age_days": min_age_days,
             "max_age_days": max_age_days,
             "max_posts_per_profile": max_posts_per_profile,
-            "max_posts": max_posts
+            "max_posts": max_posts,
+            "scoring": scoring,
+            "history_days": history_days
         },
         "profile_stats": profile_stats,
         "filtered_tweets": final_top_tweets
@@ -127,13 +103,15 @@ def filter_and_sort_content(scraped_file_path: str, profile_name: str) -> Dict[s
     try:
         with open(filtered_filepath, 'w', encoding='utf-8') as f:
             json.dump(filtered_data, f, indent=2, ensure_ascii=False)
+        register_artifact(filtered_filepath, profile_name, "x", "filtered", len(final_top_tweets))
     except Exception as e:
         return {"error": f"Failed to save filtered data: {e}"}
 
     return {
         "success": True,
-        "original_count": len(scraped_tweets),
-        "profiles_count": len(tweets_by_profile),
+        "original_count": original_count,
+        "already_generated_count": already_generated_count,
+        "profiles_count": len(ranking.group_totals),
         "filtered_count": len(final_top_tweets),
         "saved_file": filtered_filepath,
         "profile_stats": profile_stats,
@@ -141,13 +119,4 @@ def filter_and_sort_content(scraped_file_path: str, profile_name: str) -> Dict[s
     }
 
 def get_latest_scraped_file(profile_name: str) -> str:
-    suggestions_dir = get_suggestions_dir(profile_name)
-    if not os.path.exists(suggestions_dir):
-        return ""
-
-    scraped_files = [f for f in os.listdir(suggestions_dir) if f.startswith('scraped_content_x_') and f.endswith('.json')]
-    if not scraped_files:
-        return ""
-
-    scraped_files.sort(reverse=True)
-    return os.path.join(suggestions_dir, scraped_files[0])
+    return get_latest_artifact(profile_name, "x", "scraped")
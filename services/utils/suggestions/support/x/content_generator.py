@@ -3,27 +3,31 @@ import json
 import time
 
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 from services.support.storage.base_storage import BaseStorage
 
 from profiles import PROFILES
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from services.support.logger_util import _log as log
 from services.support.api_key_pool import APIKeyPool
 from services.support.rate_limiter import RateLimiter
 from services.support.api_call_tracker import APICallTracker
-from services.support.path_config import get_gemini_log_file_path, get_suggestions_dir
+from services.support.seen_index import get_seen_index
+from services.support.path_config import get_gemini_log_file_path, get_suggestions_dir, get_suggestions_checkpoint_path, register_artifact
+from services.support.gemini_cache import log_generation_cache_stats
+from services.support.media_fetch import log_media_fetch_stats
 from services.support.gemini_util import generate_gemini_with_inline_media, create_inline_media_data
 
-from services.utils.suggestions.support.x.media_downloader import download_post_media
+from services.utils.suggestions.support.generation_engine import GenerationEngine
+from services.utils.suggestions.support.generation_checkpoint import GenerationCheckpoint
+from services.utils.suggestions.support.x.media_downloader import download_post_media, prefetch_post_videos
 from services.utils.suggestions.support.x.scraping_utils import get_latest_filtered_file
 
 api_call_tracker = APICallTracker(log_file=get_gemini_log_file_path())
 rate_limiter = RateLimiter()
 
-def generate_caption_with_key(post_data: Dict[str, Any], media_paths: List[str], api_key_pool: APIKeyPool, verbose: bool = False) -> str:
+def build_caption_prompt(post_data: Dict[str, Any], media_paths: List[str], verbose: bool = False) -> Tuple[List[Any], str]:
     profile_name = post_data.get('profile_name', 'unknown')
     tweet_id = post_data.get('tweet_id', 'unknown')
 
@@ -50,78 +54,34 @@ def generate_caption_with_key(post_data: Dict[str, Any], media_paths: List[str],
 
     prompt_parts.append("Important: Generate exactly ONE caption. Do not provide multiple options or explanations. Just write a single, engaging caption.")
 
-    log(f"[HITTING API] Calling Gemini API for tweet {tweet_id}", verbose, log_caller_file="content_generator.py")
-
-    result, _ = generate_gemini_with_inline_media(
-        prompt_parts=prompt_parts,
-        api_key_pool=api_key_pool,
-        api_call_tracker=api_call_tracker,
-        rate_limiter=rate_limiter,
-        model_name=model_name,
-        verbose=verbose
-    )
-
-    if result:
-        log(f"Generated caption for tweet {tweet_id}: {result[:50]}...", verbose, log_caller_file="content_generator.py")
-        return result
-    else:
-        return "Error generating caption: Failed to generate content"
-
-def process_single_post(post_data: Dict[str, Any], api_key_pool: APIKeyPool, media_dir: str, verbose: bool = False) -> Dict[str, Any]:
-    tweet_id = post_data.get('tweet_id', 'unknown')
-
-    try:
-        downloaded_media_paths = download_post_media(post_data, media_dir, verbose)
-        generated_caption = generate_caption_with_key(post_data, downloaded_media_paths, api_key_pool, verbose)
-
-        return {
-            "tweet_url": post_data.get('tweet_url'),
-            "content_id": tweet_id,
-            "original_content": post_data.get('tweet_text') or post_data.get('text', ''),
-            "generated_caption": generated_caption if not generated_caption.startswith("Error") else "",
-            "media_urls": post_data.get('media_urls', []),
-            "downloaded_media_paths": downloaded_media_paths,
-            "date": post_data.get('date'),
-            "likes": post_data.get('likes', 0),
-            "retweets": post_data.get('retweets', 0),
-            "replies": post_data.get('replies', 0),
-            "views": post_data.get('views', 0),
-            "bookmarks": post_data.get('bookmarks', 0),
-            "total_engagement": post_data.get('total_engagement', 0),
-            "age_days": post_data.get('age_days', 0),
-            "scraped_date": post_data.get('scraped_date'),
-            "tweet_date": post_data.get('tweet_date'),
-            "profile_image_url": post_data.get('profile_image_url'),
-            "engagement_score": post_data.get('total_engagement', 0),
-            "finalized": False,
-            "generation_timestamp": datetime.now().isoformat()
-        }
-
-    except Exception as e:
-        log(f"Error processing post {tweet_id}: {str(e)}", verbose, is_error=True, log_caller_file="content_generator.py")
-        return {
-            "tweet_url": post_data.get('tweet_url'),
-            "content_id": tweet_id,
-            "original_content": post_data.get('tweet_text') or post_data.get('text', ''),
-            "error": str(e),
-            "generated_caption": "",
-            "media_urls": post_data.get('media_urls', []),
-            "downloaded_media_paths": [],
-            "date": post_data.get('date'),
-            "likes": post_data.get('likes', 0),
-            "retweets": post_data.get('retweets', 0),
-            "replies": post_data.get('replies', 0),
-            "views": post_data.get('views', 0),
-            "bookmarks": post_data.get('bookmarks', 0),
-            "total_engagement": post_data.get('total_engagement', 0),
-            "age_days": post_data.get('age_days', 0),
-            "scraped_date": post_data.get('scraped_date'),
-            "tweet_date": post_data.get('tweet_date'),
-            "profile_image_url": post_data.get('profile_image_url'),
-            "engagement_score": post_data.get('total_engagement', 0),
-            "finalized": False,
-            "generation_timestamp": datetime.now().isoformat()
-        }
+    return prompt_parts, model_name
+
+def build_generated_post(post_data: Dict[str, Any], downloaded_media_paths: List[str], generated_caption: str, error: Optional[Exception] = None) -> Dict[str, Any]:
+    result = {
+        "tweet_url": post_data.get('tweet_url'),
+        "content_id": post_data.get('tweet_id', 'unknown'),
+        "original_content": post_data.get('tweet_text') or post_data.get('text', ''),
+        "generated_caption": generated_caption if generated_caption and not generated_caption.startswith("Error") else "",
+        "media_urls": post_data.get('media_urls', []),
+        "downloaded_media_paths": downloaded_media_paths if error is None else [],
+        "date": post_data.get('date'),
+        "likes": post_data.get('likes', 0),
+        "retweets": post_data.get('retweets', 0),
+        "replies": post_data.get('replies', 0),
+        "views": post_data.get('views', 0),
+        "bookmarks": post_data.get('bookmarks', 0),
+        "total_engagement": post_data.get('total_engagement', 0),
+        "age_days": post_data.get('age_days', 0),
+        "scraped_date": post_data.get('scraped_date'),
+        "tweet_date": post_data.get('tweet_date'),
+        "profile_image_url": post_data.get('profile_image_url'),
+        "engagement_score": post_data.get('total_engagement', 0),
+        "finalized": False,
+        "generation_timestamp": datetime.now().isoformat()
+    }
+    if error is not None:
+        result["error"] = str(error)
+    return result
 
 def run_content_generation(profile_name: str, storage: Optional[BaseStorage] = None, verbose: bool = False) -> Dict[str, Any]:
     filtered_file = get_latest_filtered_file(profile_name)
@@ -142,30 +102,40 @@ def run_content_generation(profile_name: str, storage: Optional[BaseStorage] = N
         profile_props = PROFILES[profile_name].get('properties', {})
         verbose = profile_props.get('verbose', False)
 
-        api_key_pool = APIKeyPool(verbose=verbose)
+        api_key_pool = APIKeyPool(verbose=verbose, model_name=profile_props.get('model_name', 'gemini-2.5-flash-lite'))
         if api_key_pool.size() == 0:
             return {"error": "No API keys available. Set GEMINI_API environment variable."}
 
         media_dir = os.path.join(get_suggestions_dir(profile_name), "media")
         os.makedirs(media_dir, exist_ok=True)
 
-        generated_posts = []
-        with ThreadPoolExecutor(max_workers=api_key_pool.size()) as executor:
-            futures = []
-            batch_id = f"generation_{datetime.now().strftime('%Y%m%d%H%M%S')}"
-            for post in approved_posts:
-                post['profile_name'] = profile_name
-                post['batch_id'] = batch_id
-                future = executor.submit(process_single_post, post, api_key_pool, media_dir, verbose)
-                futures.append(future)
+        checkpoint = GenerationCheckpoint(get_suggestions_checkpoint_path(profile_name, "x", filtered_file), f"generation_{datetime.now().strftime('%Y%m%d%H%M%S')}", verbose)
+        batch_id = checkpoint.batch_id
+        for post in approved_posts:
+            post['profile_name'] = profile_name
+            post['batch_id'] = batch_id
 
-            for future in as_completed(futures):
-                result = future.result()
-                generated_posts.append(result)
+        engine = GenerationEngine(
+            api_key_pool=api_key_pool,
+            api_call_tracker=api_call_tracker,
+            rate_limiter=rate_limiter,
+            download_fn=lambda post: download_post_media(post, media_dir, verbose),
+            build_prompt_fn=lambda post, media_paths: build_caption_prompt(post, media_paths, verbose),
+            build_result_fn=build_generated_post,
+            persist_fn=checkpoint.record,
+            verbose=verbose
+        )
+        pending_posts, generated_posts = checkpoint.split(approved_posts, lambda post: post.get('tweet_id', 'unknown'))
+        prefetch_post_videos(pending_posts, media_dir, verbose)
+        generated_posts.extend(engine.run(pending_posts))
+        get_seen_index(profile_name).mark_many("x", "generated", [post['content_id'] for post in generated_posts if post.get('generated_caption')])
+        log_generation_cache_stats(verbose)
+        log_media_fetch_stats(verbose)
 
         if storage:
             if storage.push_content(generated_posts, batch_id, verbose):
                 log(f"Successfully pushed {len(generated_posts)} generated captions to database.", verbose, log_caller_file="content_generator.py")
+                checkpoint.finalize()
                 return {"success": True, "total_generated": len(generated_posts)}
             else:
                 return {"error": "Failed to push generated captions to database."}
@@ -191,6 +161,8 @@ def run_content_generation(profile_name: str, storage: Optional[BaseStorage] = N
             output_file = os.path.join(get_suggestions_dir(profile_name), f"suggestions_content_x_{datetime.now().strftime('%Y%m%d')}.json")
             with open(output_file, 'w') as f:
                 json.dump(suggestions_content, f, indent=2)
+            register_artifact(output_file, profile_name, "x", "generated", len(generated_posts))
+            checkpoint.finalize()
 
             return {
                 "success": True,
@@ -303,6 +275,7 @@ def generate_new_tweets_from_filtered(profile_name: str, storage: Optional[BaseS
             output_file = os.path.join(get_suggestions_dir(profile_name), f"new_tweets_content_x_{datetime.now().strftime('%Y%m%d')}.json")
             with open(output_file, 'w') as f:
                 json.dump(new_tweets_content, f, indent=2)
+            register_artifact(output_file, profile_name, "x", "new_content", len(new_tweets_data))
 
             return {
                 "success": True,
@@ -1,56 +1,37 @@
 import os
 import json
-import requests
 import datetime
 
 from profiles import PROFILES
 
 from typing import List, Dict, Any
 from services.support.logger_util import _log as log
-from services.support.path_config import get_suggestions_dir
-from services.support.video_download import download_twitter_videos
+from services.support.media_fetch import fetch_media_to_dir
+from services.support.path_config import get_suggestions_dir, register_artifact
+from services.support.video_download import acquire_twitter_videos, download_twitter_videos
 from services.utils.suggestions.support.x.scraping_utils import get_latest_approved_file
 
 def is_local_file_and_exists(path: str) -> bool:
     return os.path.exists(path) and (path.startswith('tmp/') or os.path.isabs(path))
 
 def download_images_to_dir(image_urls: List[str], download_dir: str, verbose: bool = False) -> List[str]:
-    os.makedirs(download_dir, exist_ok=True)
-
-    local_image_paths = []
-    for url in image_urls:
-        try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-
-            filename = os.path.basename(url.split('?')[0])
-
-            extension = '.jpeg'
-            if 'format=' in url:
-                format_param = url.split('format=')[1].split('&')[0]
-                if format_param.lower() in ['jpg', 'jpeg']:
-                    extension = '.jpeg'
-                elif format_param.lower() == 'png':
-                    extension = '.png'
-                elif format_param.lower() == 'gif':
-                    extension = '.gif'
-
-            if not filename:
-                filename = f"image_{len(local_image_paths)}{extension}"
-            elif not any(filename.lower().endswith(ext) for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp']):
-                filename = f"{filename}{extension}"
-
-            file_path = os.path.join(download_dir, filename)
+    local_image_paths = fetch_media_to_dir(image_urls, download_dir, verbose)
+    log(f"Fetched {len(local_image_paths)} of {len(image_urls)} images into {download_dir}", verbose, log_caller_file="media_downloader.py")
+    return local_image_paths
 
-            with open(file_path, 'wb') as f:
-                f.write(response.content)
 
-            local_image_paths.append(file_path)
-            log(f"Downloaded image: {filename}", verbose, log_caller_file="media_downloader.py")
-        except Exception as e:
-            log(f"Error downloading image {url}: {str(e)}", verbose, is_error=True, log_caller_file="media_downloader.py")
+def _is_video_post(post_data: Dict[str, Any]) -> bool:
+    media_urls = post_data.get('media_urls', [])
+    if isinstance(media_urls, list):
+        return any(url and not is_local_file_and_exists(url) and url.startswith('video') for url in media_urls)
+    return isinstance(media_urls, str) and not is_local_file_and_exists(media_urls) and media_urls.startswith('video')
 
-    return local_image_paths
+def prefetch_post_videos(posts: List[Dict[str, Any]], media_dir: str, verbose: bool = False) -> int:
+    tweet_urls = [post.get('tweet_url') for post in posts if post.get('tweet_url') and _is_video_post(post)]
+    if not tweet_urls:
+        return 0
+    log(f"Prefetching {len(tweet_urls)} tweet videos in one batch", verbose, log_caller_file="media_downloader.py")
+    return len(acquire_twitter_videos(tweet_urls, media_dir, profile_name="Default", headless=True, verbose=verbose))
 
 def download_post_media(post_data: Dict[str, Any], media_dir: str, verbose: bool = False) -> List[str]:
     media_urls = post_data.get('media_urls', [])
@@ -128,6 +109,8 @@ def run_media_download(profile_name: str) -> Dict[str, Any]:
         media_dir = os.path.join(get_suggestions_dir(profile_name), "media")
         os.makedirs(media_dir, exist_ok=True)
 
+        prefetch_post_videos(approved_posts, media_dir, verbose)
+
         downloaded_count = 0
         for post in approved_posts:
             post['profile_name'] = profile_name
@@ -141,6 +124,7 @@ def run_media_download(profile_name: str) -> Dict[str, Any]:
 
         with open(updated_approved_filepath, 'w') as f:
             json.dump(approved_data, f, indent=2)
+        register_artifact(updated_approved_filepath, profile_name, "x", "approved_with_media", len(approved_posts))
 
         return {
             "success": True,
@@ -11,7 +11,7 @@ from services.support.storage.base_storage import BaseStorage
 from services.support.logger_util import _log as log
 
 
-from services.support.path_config import get_schedule_file_path, get_suggestions_dir
+from services.support.path_config import get_schedule_file_path, get_latest_artifacts
 from services.platform.x.support.process_scheduled_tweets import process_scheduled_tweets
 
 def run_content_scheduling(profile_name: str, storage_generated: Optional[BaseStorage] = None, storage_new: Optional[BaseStorage] = None) -> Dict[str, Any]:
@@ -53,14 +53,12 @@ def run_content_scheduling(profile_name: str, storage_generated: Optional[BaseSt
             return {"error": "No approved content found in the database. Please review and approve content first."}
 
     else:
-        suggestions_dir = get_suggestions_dir(profile_name)
-        approved_files = [f for f in os.listdir(suggestions_dir) if f.startswith('suggestions_content_') and f.endswith('.json')]
-        approved_files.sort(reverse=True)
+        approved_files = get_latest_artifacts(profile_name, "x", ("generated", "reviewed"), limit=None)
 
         approved_content_from_files = []
         for file in approved_files:
             try:
-                with open(os.path.join(suggestions_dir, file), 'r') as f:
+                with open(file, 'r') as f:
                     data = json.load(f)
                     if 'generated_posts' in data:
                         for post in data['generated_posts']:
@@ -75,12 +73,11 @@ def run_content_scheduling(profile_name: str, storage_generated: Optional[BaseSt
             except Exception as e:
                 log(f"Error loading suggestions file {file}: {e}", verbose, log_caller_file="scheduling_utils.py")
 
-        new_tweets_files = [f for f in os.listdir(suggestions_dir) if f.startswith('new_tweets_content_x_') and f.endswith('.json')]
-        new_tweets_files.sort(reverse=True)
+        new_tweets_files = get_latest_artifacts(profile_name, "x", "new_content", limit=None)
 
         for file in new_tweets_files:
             try:
-                with open(os.path.join(suggestions_dir, file), 'r') as f:
+                with open(file, 'r') as f:
                     data = json.load(f)
                     if 'new_tweets' in data:
                         for tweet in data['new_tweets']:
@@ -1,11 +1,10 @@
 import os
-import json
 import time
 import sys
 
 from datetime import datetime
 from urllib.parse import quote
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List, Optional
 
 from rich.status import Status
 from rich.console import Console
@@ -16,7 +15,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(
 
 from services.support.logger_util import _log as log
 from services.support.web_driver_handler import setup_driver
-from services.support.path_config import get_browser_data_dir, get_suggestions_dir
+from services.support.dataset_store import write_dataset
+from services.support.seen_index import SeenIndex, get_seen_index, log_seen_index_stats
+from services.support.path_config import get_browser_data_dir, get_suggestions_dir, get_latest_artifact, register_artifact
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
@@ -28,50 +29,199 @@ from services.platform.x.support.capture_containers_scroll import capture_contai
 
 console = Console()
 
-def scrape_current_page(driver, max_tweets: int, verbose: bool = False, status=None) -> List[Dict[str, Any]]:
-    tweets_data = []
-
-    try:
-        log("Starting to capture tweet containers...", verbose, status=status, log_caller_file="scraping_utils.py")
-
-        raw_containers = []
-        processed_tweet_ids = set()
-        no_new_content_count = 0
-        scroll_count = 0
-        max_scrolls = 20
-
-        while len(tweets_data) < max_tweets and scroll_count < max_scrolls and no_new_content_count < 3:
-            no_new_content_count, scroll_count, new_tweets_in_pass = capture_containers_and_scroll(
-                driver, raw_containers, processed_tweet_ids, no_new_content_count, scroll_count, verbose, status
+class PageScrape:
+    def __init__(self, label: str, max_tweets: int, verbose: bool = False, status=None, seen_index: Optional[SeenIndex] = None):
+        self.label = label
+        self.max_tweets = max_tweets
+        self.verbose = verbose
+        self.status = status
+        self.seen_index = seen_index
+        self.stop_after_seen_passes = int(os.getenv("SEEN_STOP_AFTER_PASSES", "2"))
+        self.tweets: List[Dict[str, Any]] = []
+        self.raw_containers: List[Dict[str, Any]] = []
+        self.processed_tweet_ids = set()
+        self.no_new_content_count = 0
+        self.scroll_count = 0
+        self.max_scrolls = 20
+        self.seen_passes = 0
+        self.last_pass_at = 0.0
+        self.handle: Optional[str] = None
+        self.position = 0
+        self.done = False
+
+    def step(self, driver) -> bool:
+        if self.done or len(self.tweets) >= self.max_tweets or self.scroll_count >= self.max_scrolls or self.no_new_content_count >= 3:
+            self.done = True
+            return True
+
+        try:
+            self.no_new_content_count, self.scroll_count, new_tweets_in_pass = capture_containers_and_scroll(
+                driver, self.raw_containers, self.processed_tweet_ids, self.no_new_content_count, self.scroll_count, self.verbose, self.status
             )
+            self.last_pass_at = time.monotonic()
 
             if new_tweets_in_pass > 0:
-                log(f"Pass completed. New tweets found: {new_tweets_in_pass}", verbose, status=status, log_caller_file="scraping_utils.py")
+                log(f"Pass completed for {self.label}. New tweets found: {new_tweets_in_pass}", self.verbose, status=self.status, log_caller_file="scraping_utils.py")
 
-                for container in raw_containers[-new_tweets_in_pass:]:
+                pass_tweet_ids = []
+                for container in self.raw_containers[-new_tweets_in_pass:]:
                     try:
-                        tweet_data = process_container(container, verbose)
+                        tweet_data = process_container(container, self.verbose)
                         if tweet_data and tweet_data.get('tweet_id'):
-                            tweets_data.append(tweet_data)
+                            self.tweets.append(tweet_data)
+                            pass_tweet_ids.append(tweet_data['tweet_id'])
 
-                            if len(tweets_data) >= max_tweets:
+                            if len(self.tweets) >= self.max_tweets:
                                 break
 
                     except Exception as e:
-                        log(f"Error processing container: {e}", verbose, is_error=True, status=status, log_caller_file="scraping_utils.py")
+                        log(f"Error processing container: {e}", self.verbose, is_error=True, status=self.status, log_caller_file="scraping_utils.py")
                         continue
 
-                if len(tweets_data) >= max_tweets:
-                    break
+                if self.seen_index is not None and pass_tweet_ids:
+                    already_seen = self.seen_index.observe("x", pass_tweet_ids)
+                    self.seen_passes = self.seen_passes + 1 if len(already_seen) == len(set(pass_tweet_ids)) else 0
+                    if self.stop_after_seen_passes > 0 and self.seen_passes >= self.stop_after_seen_passes:
+                        log(f"Last {self.seen_passes} passes for {self.label} only contained previously scraped tweets, stopping early", self.verbose, status=self.status, log_caller_file="scraping_utils.py")
+                        self.done = True
 
-            time.sleep(1)
+        except Exception as e:
+            log(f"Error during page scraping for {self.label}: {e}", self.verbose, is_error=True, status=self.status, log_caller_file="scraping_utils.py")
+            self.done = True
+
+        self.done = self.done or len(self.tweets) >= self.max_tweets or self.scroll_count >= self.max_scrolls or self.no_new_content_count >= 3
+        return self.done
+
+    def result(self) -> List[Dict[str, Any]]:
+        return self.tweets[:self.max_tweets]
 
-        log(f"Scraping completed. Total tweets collected: {len(tweets_data)}", verbose, status=status, log_caller_file="scraping_utils.py")
+class ScrapeTarget:
+    def __init__(self, label: str, max_tweets: int, open_fn: Callable[[Any], None]):
+        self.label = label
+        self.max_tweets = max_tweets
+        self.open_fn = open_fn
 
+def scrape_current_page(driver, max_tweets: int, verbose: bool = False, status=None, seen_index: Optional[SeenIndex] = None, label: str = "current page") -> List[Dict[str, Any]]:
+    log("Starting to capture tweet containers...", verbose, status=status, log_caller_file="scraping_utils.py")
+
+    page = PageScrape(label, max_tweets, verbose, status, seen_index)
+    while not page.step(driver):
+        time.sleep(1)
+
+    log(f"Scraping completed. Total tweets collected: {len(page.tweets)}", verbose, status=status, log_caller_file="scraping_utils.py")
+    return page.result()
+
+def _keep_tab_active(driver, verbose: bool = False):
+    # Background tabs get throttled timers and stop loading the timeline, so each tab pretends to have focus
+    try:
+        driver.execute_cdp_cmd("Emulation.setFocusEmulationEnabled", {"enabled": True})
     except Exception as e:
-        log(f"Error during page scraping: {e}", verbose, is_error=True, status=status, log_caller_file="scraping_utils.py")
+        log(f"Could not enable focus emulation for tab: {e}", verbose, log_caller_file="scraping_utils.py")
+
+def _close_tab(driver, original_window: str):
+    try:
+        if driver.current_window_handle != original_window:
+            driver.close()
+        driver.switch_to.window(original_window)
+    except Exception:
+        pass
+
+# Results line up with targets by position, so targets that share a label never overwrite each other
+def scrape_targets_in_tabs(driver, targets: List[ScrapeTarget], tab_count: int, verbose: bool = False, status=None, seen_index: Optional[SeenIndex] = None) -> List[List[Dict[str, Any]]]:
+    pass_interval = float(os.getenv("X_SCRAPE_PASS_INTERVAL", "1"))
+    original_window = driver.current_window_handle
+    pending = list(enumerate(targets))
+    active: List[PageScrape] = []
+    results: List[List[Dict[str, Any]]] = [[] for _ in targets]
 
-    return tweets_data[:max_tweets]
+    try:
+        while pending or active:
+            while pending and len(active) < tab_count:
+                position, target = pending.pop(0)
+                page = PageScrape(target.label, target.max_tweets, verbose, status, seen_index)
+                page.position = position
+                try:
+                    driver.switch_to.new_window('tab')
+                    page.handle = driver.current_window_handle
+                    _keep_tab_active(driver, verbose)
+                    log(f"Opening {target.label} in tab {len(active) + 1}/{tab_count}...", verbose, status=status, log_caller_file="scraping_utils.py")
+                    target.open_fn(driver)
+                    active.append(page)
+                except Exception as e:
+                    log(f"Error opening {target.label}: {e}", verbose, is_error=True, status=status, log_caller_file="scraping_utils.py")
+                    _close_tab(driver, original_window)
+
+            if not active:
+                continue
+
+            page = min(active, key=lambda candidate: candidate.last_pass_at)
+            wait = page.last_pass_at + pass_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+
+            driver.switch_to.window(page.handle)
+            if page.step(driver):
+                results[page.position] = page.result()
+                log(f"Scraped {len(results[page.position])} tweets from {page.label}", verbose, status=status, log_caller_file="scraping_utils.py")
+                active.remove(page)
+                _close_tab(driver, original_window)
+    finally:
+        for page in active:
+            results[page.position] = page.result()
+            try:
+                driver.switch_to.window(page.handle)
+            except Exception:
+                continue
+            _close_tab(driver, original_window)
+
+    return results
+
+def _open_profile_search(driver, username: str, wait_seconds: float = 3):
+    search_query = f"from:{username} -filter:replies"
+    encoded_query = quote(search_query)
+    search_url = f"https://x.com/search?q={encoded_query}&src=typed_query"
+
+    driver.get(search_url)
+    time.sleep(wait_seconds)
+
+def _open_community(driver, community_name: str, verbose: bool = False, status=None):
+    driver.get("https://x.com/home")
+    time.sleep(2)
+
+    if not community_name:
+        return
+
+    try:
+        community_tab = WebDriverWait(driver, 5).until(
+            EC.element_to_be_clickable((By.XPATH, f"//a[@role='tab']//span[contains(text(), '{community_name}')]"))
+        )
+        community_tab.click()
+        log(f"Successfully clicked on '{community_name}' community tab.", verbose, status=status, log_caller_file="scraping_utils.py")
+        time.sleep(5)
+    except Exception as e:
+        log(f"Community tab not found, trying search approach: {e}", verbose, status=status, log_caller_file="scraping_utils.py")
+        try:
+            search_box = WebDriverWait(driver, 10).until(
+                EC.element_to_be_clickable((By.XPATH, "//input[@data-testid='SearchBox_Search_Input']"))
+            )
+            search_box.clear()
+            search_box.send_keys(community_name)
+            time.sleep(1)
+            search_box.send_keys(Keys.RETURN)
+            time.sleep(3)
+            community_links = WebDriverWait(driver, 10).until(
+                EC.presence_of_all_elements_located((By.XPATH, "//a[contains(@href, '/i/communities/') or contains(@href, '/communities/')]"))
+            )
+            if community_links:
+                community_links[0].click()
+                log(f"Successfully navigated to community via search: {community_name}", verbose, status=status, log_caller_file="scraping_utils.py")
+                time.sleep(5)
+            else:
+                raise Exception("No community links found in search results")
+        except Exception as search_e:
+            log(f"Could not navigate to community '{community_name}' via search either: {search_e}. Proceeding with general home feed scraping.", verbose, is_error=False, status=status, log_caller_file="scraping_utils.py")
+            driver.get("https://x.com/home")
+            time.sleep(5)
 
 def scrape_community_and_profiles(profile_name: str, max_tweets_profile: int = 20, max_tweets_community: int = 20, verbose: bool = False, headless: bool = True) -> List[Dict[str, Any]]:
     all_tweets = []
@@ -80,96 +230,55 @@ def scrape_community_and_profiles(profile_name: str, max_tweets_profile: int = 2
     profile_props = profile_config.get('properties', {})
     target_profiles = profile_props.get('target_profiles', [])
     browser_profile = profile_props.get('browser_profile')
+    x_scraper_config = profile_props.get('platform', {}).get('x', {}).get('scraper', {})
+    communities = x_scraper_config.get('communities', [])
+    tab_count = max(1, int(x_scraper_config.get('tabs', os.getenv("X_SCRAPE_TABS", "1"))))
 
     actual_browser_profile = browser_profile if browser_profile else profile_name
     user_data_dir = get_browser_data_dir(actual_browser_profile)
+    seen_index = get_seen_index(profile_name, verbose)
     driver = None
 
+    targets = [
+        ScrapeTarget(f"@{username}", max_tweets_profile, lambda d, username=username: _open_profile_search(d, username))
+        for username in target_profiles
+    ] + [
+        ScrapeTarget(f"community '{community_name}'", max_tweets_community, lambda d, community_name=community_name: _open_community(d, community_name, verbose))
+        for community_name in communities
+    ]
+
     try:
         driver, _ = setup_driver(user_data_dir, profile=actual_browser_profile, headless=headless, verbose=verbose)
         driver.get("https://x.com/home")
         time.sleep(3)
 
-        if target_profiles:
-            with Status(f"[white]Scraping {len(target_profiles)} target profiles...[/white]", spinner="dots", console=console) as status:
-                for target_profile in target_profiles:
+        if tab_count > 1 and len(targets) > 1:
+            with Status(f"[white]Scraping {len(targets)} targets across {min(tab_count, len(targets))} tabs...[/white]", spinner="dots", console=console) as status:
+                results = scrape_targets_in_tabs(driver, targets, tab_count, verbose, status, seen_index)
+                status.stop()
+            for tweets_data in results:
+                all_tweets.extend(tweets_data)
+        else:
+            with Status(f"[white]Scraping {len(targets)} targets...[/white]", spinner="dots", console=console) as status:
+                for target in targets:
                     try:
-                        username = target_profile
-                        log(f"Scraping tweets from @{username}...", verbose, status=status, log_caller_file="scraping_utils.py")
+                        log(f"Scraping tweets from {target.label}...", verbose, status=status, log_caller_file="scraping_utils.py")
+                        target.open_fn(driver)
 
-                        search_query = f"from:{username} -filter:replies"
-                        encoded_query = quote(search_query)
-                        search_url = f"https://x.com/search?q={encoded_query}&src=typed_query"
-
-                        driver.get(search_url)
-                        time.sleep(3)
-
-                        tweets_data = scrape_current_page(driver, max_tweets_profile, verbose, status)
+                        tweets_data = scrape_current_page(driver, target.max_tweets, verbose, status, seen_index, target.label)
                         all_tweets.extend(tweets_data)
 
-                        log(f"Scraped {len(tweets_data)} tweets from @{username}", verbose, status=status, log_caller_file="scraping_utils.py")
+                        log(f"Scraped {len(tweets_data)} tweets from {target.label}", verbose, status=status, log_caller_file="scraping_utils.py")
 
                     except Exception as e:
-                        log(f"Error scraping @{target_profile}: {e}", verbose, is_error=True, status=status, log_caller_file="scraping_utils.py")
+                        log(f"Error scraping {target.label}: {e}", verbose, is_error=True, status=status, log_caller_file="scraping_utils.py")
                         continue
                 status.stop()
 
-        x_scraper_config = profile_props.get('platform', {}).get('x', {}).get('scraper', {})
-        communities = x_scraper_config.get('communities', [])
-        with Status(f"[white]Scraping {len(communities)} communities...[/white]", spinner="dots", console=console) as status:
-            for community_name in communities:
-                try:
-                    log(f"Scraping community '{community_name}'...", verbose, status=status, log_caller_file="scraping_utils.py")
-
-                    driver.get("https://x.com/home")
-                    time.sleep(2)
-
-                    if community_name:
-                        try:
-                            community_tab = WebDriverWait(driver, 5).until(
-                                EC.element_to_be_clickable((By.XPATH, f"//a[@role='tab']//span[contains(text(), '{community_name}')]"))
-                            )
-                            community_tab.click()
-                            log(f"Successfully clicked on '{community_name}' community tab.", verbose, status=status, log_caller_file="scraping_utils.py")
-                            time.sleep(5)
-                        except Exception as e:
-                            log(f"Community tab not found, trying search approach: {e}", verbose, status=status, log_caller_file="scraping_utils.py")
-                            try:
-                                search_box = WebDriverWait(driver, 10).until(
-                                    EC.element_to_be_clickable((By.XPATH, "//input[@data-testid='SearchBox_Search_Input']"))
-                                )
-                                search_box.clear()
-                                search_box.send_keys(community_name)
-                                time.sleep(1)
-                                search_box.send_keys(Keys.RETURN)
-                                time.sleep(3)
-                                community_links = WebDriverWait(driver, 10).until(
-                                    EC.presence_of_all_elements_located((By.XPATH, "//a[contains(@href, '/i/communities/') or contains(@href, '/communities/')]"))
-                                )
-                                if community_links:
-                                    community_links[0].click()
-                                    log(f"Successfully navigated to community via search: {community_name}", verbose, status=status, log_caller_file="scraping_utils.py")
-                                    time.sleep(5)
-                                else:
-                                    raise Exception("No community links found in search results")
-                            except Exception as search_e:
-                                log(f"Could not navigate to community '{community_name}' via search either: {search_e}. Proceeding with general home feed scraping.", verbose, is_error=False, status=status, log_caller_file="scraping_utils.py")
-                                driver.get("https://x.com/home")
-                                time.sleep(5)
-
-                    tweets_data = scrape_current_page(driver, max_tweets_community, verbose, status)
-                    all_tweets.extend(tweets_data)
-
-                    log(f"Scraped {len(tweets_data)} tweets from community '{community_name}'", verbose, status=status, log_caller_file="scraping_utils.py")
-
-                except Exception as e:
-                    log(f"Error scraping community '{community_name}': {e}", verbose, is_error=True, status=status, log_caller_file="scraping_utils.py")
-                    continue
-            status.stop()
-
     finally:
         if driver:
             driver.quit()
+        log_seen_index_stats(verbose)
 
     return all_tweets
 
@@ -179,7 +288,6 @@ def save_scraped_content(scraped_tweets: List[Dict[str, Any]], profile_name: str
     content_data = {
         "timestamp": datetime.now().isoformat(),
         "profile_name": profile_name,
-        "scraped_tweets": scraped_tweets,
         "metadata": {
             "total_tweets": len(scraped_tweets),
             "scrape_date": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -189,12 +297,12 @@ def save_scraped_content(scraped_tweets: List[Dict[str, Any]], profile_name: str
     suggestions_dir = get_suggestions_dir(profile_name)
     os.makedirs(suggestions_dir, exist_ok=True)
 
-    filename = f"scraped_content_x_{timestamp}.json"
+    filename = f"scraped_content_x_{timestamp}.jsonl"
     filepath = os.path.join(suggestions_dir, filename)
 
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(content_data, f, indent=2, ensure_ascii=False)
+        filepath = write_dataset(filepath, scraped_tweets, metadata=content_data, numeric_fields=("likes", "retweets", "replies"), verbose=verbose)
+        register_artifact(filepath, profile_name, "x", "scraped", len(scraped_tweets))
 
         log(f"Saved {len(scraped_tweets)} scraped tweets to {filepath}", verbose, log_caller_file="scraping_utils.py")
         return filepath
@@ -227,42 +335,10 @@ def run_suggestions_workflow(profile_name: str, max_tweets_profile: int = 20, ma
     return result
 
 def get_latest_approved_file(profile_name: str) -> str:
-    suggestions_dir = get_suggestions_dir(profile_name)
-    if not os.path.exists(suggestions_dir):
-        return ""
-
-    approved_files_with_media = [f for f in os.listdir(suggestions_dir) if f.startswith('approved_content_') and f.endswith('_with_media.json')]
-    if approved_files_with_media:
-        approved_files_with_media.sort(reverse=True)
-        return os.path.join(suggestions_dir, approved_files_with_media[0])
-
-    approved_files = [f for f in os.listdir(suggestions_dir) if f.startswith('approved_content_') and f.endswith('.json')]
-    if not approved_files:
-        return ""
-
-    approved_files.sort(reverse=True)
-    return os.path.join(suggestions_dir, approved_files[0])
+    return get_latest_artifact(profile_name, "x", "approved_with_media") or get_latest_artifact(profile_name, "x", "approved")
 
 def get_latest_suggestions_file(profile_name: str) -> str:
-    suggestions_dir = get_suggestions_dir(profile_name)
-    if not os.path.exists(suggestions_dir):
-        return ""
-
-    suggestions_files = [f for f in os.listdir(suggestions_dir) if f.startswith('suggestions_content_') and f.endswith('.json')]
-    if not suggestions_files:
-        return ""
-
-    suggestions_files.sort(reverse=True)
-    return os.path.join(suggestions_dir, suggestions_files[0])
+    return get_latest_artifact(profile_name, "x", ("generated", "reviewed"))
 
 def get_latest_filtered_file(profile_name: str) -> str:
-    suggestions_dir = get_suggestions_dir(profile_name)
-    if not os.path.exists(suggestions_dir):
-        return ""
-
-    filtered_files = [f for f in os.listdir(suggestions_dir) if f.startswith('filtered_content_x_') and f.endswith('.json')]
-    if not filtered_files:
-        return ""
-
-    filtered_files.sort(reverse=True)
-    return os.path.join(suggestions_dir, filtered_files[0])
\ No newline at end of file
+    return get_latest_artifact(profile_name, "x", "filtered")
\ No newline at end of file
@@ -8,6 +8,7 @@ from services.support.logger_util import _log as log
 from services.support.api_key_pool import APIKeyPool
 from services.support.rate_limiter import RateLimiter
 from services.support.api_call_tracker import APICallTracker
+from services.support.dataset_store import read_dataset
 from services.support.path_config import get_gemini_log_file_path
 from services.support.postgres_util import get_postgres_connection
 from services.support.gemini_util import generate_gemini_with_inline_media
@@ -19,24 +20,20 @@ rate_limiter = RateLimiter()
 def aggregate_x_data(profile_name: str, verbose: bool = False) -> Dict[str, Any]:
     scraped_data = []
     try:
-        import glob
-        from services.support.path_config import get_suggestions_dir
+        from services.support.path_config import get_suggestions_dir, get_latest_artifacts
         suggestions_dir = get_suggestions_dir(profile_name)
         if os.path.exists(suggestions_dir):
-            filtered_files = glob.glob(os.path.join(suggestions_dir, "filtered_content_x_*.json"))
-            for file_path in filtered_files[-3:]:
+            filtered_files = get_latest_artifacts(profile_name, "x", "filtered", limit=3)
+            for file_path in reversed(filtered_files):
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        posts = data.get('filtered_tweets', [])
-                        for post in posts:
-                            scraped_data.append({
-                                'content': post.get('text', ''),
-                                'author_name': post.get('author_name', ''),
-                                'likes': int(post.get('likes', 0)),
-                                'retweets': int(post.get('retweets', 0)),
-                                'replies': int(post.get('replies', 0))
-                            })
+                    for post in read_dataset(file_path, fields=['text', 'author_name', 'likes', 'retweets', 'replies'], records_key='filtered_tweets'):
+                        scraped_data.append({
+                            'content': post.get('text', ''),
+                            'author_name': post.get('author_name', ''),
+                            'likes': int(post.get('likes', 0)),
+                            'retweets': int(post.get('retweets', 0)),
+                            'replies': int(post.get('replies', 0))
+                        })
                 except Exception as e:
                     log(f"Error reading filtered file {file_path}: {e}", verbose, log_caller_file="trends_analyzer.py")
         else:
@@ -1,21 +1,72 @@
 import os
 import sys
 import json
+import mimetypes
+import threading
 import urllib.parse
 
 from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from functools import lru_cache
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+from email.utils import formatdate
+from http.server import HTTPServer, ThreadingHTTPServer, BaseHTTPRequestHandler
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))))
 
 from services.support.logger_util import _log as log
-from services.support.path_config import get_suggestions_dir
+from services.support.path_config import get_suggestions_dir, get_latest_artifact, register_artifact
 
-from services.utils.suggestions.support.x.content_filter import get_latest_scraped_file
-from services.utils.suggestions.support.x.scraping_utils import get_latest_approved_file, get_latest_suggestions_file
+from services.utils.suggestions.support.x.scraping_utils import get_latest_approved_file, get_latest_suggestions_file, get_latest_filtered_file
 
 from services.utils.suggestions.support.linkedin.content_filter import get_latest_scraped_linkedin_file
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+SENDFILE_CHUNK_BYTES = 1 << 20
+
+# Parsed artifacts are keyed by path and revalidated against (mtime, size) on every hit, so new or rewritten files show up on
+# the next request. The parsed objects are shared between request threads: handlers copy before modifying them.
+class _ArtifactCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries: OrderedDict[str, Tuple[int, int, Any]] = OrderedDict()
+
+    def load(self, filepath: str) -> Any:
+        path = os.path.abspath(filepath)
+        stat = os.stat(path)
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                self.entries.move_to_end(path)
+                return entry[2]
+
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        with self.lock:
+            self.entries[path] = (stat.st_mtime_ns, stat.st_size, data)
+            self.entries.move_to_end(path)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return data
+
+_artifact_cache: Optional[_ArtifactCache] = None
+_artifact_cache_lock = threading.Lock()
+
+def page_window(query: dict) -> Tuple[int, int]:
+    offset = max(0, int(query.get('offset', ['0'])[0]))
+    limit = min(MAX_PAGE_SIZE, max(1, int(query.get('limit', [os.getenv("WEB_APP_PAGE_SIZE", str(DEFAULT_PAGE_SIZE))])[0])))
+    return offset, limit
+
+def load_json_artifact(filepath: str) -> Any:
+    global _artifact_cache
+    with _artifact_cache_lock:
+        if _artifact_cache is None:
+            _artifact_cache = _ArtifactCache(max(1, int(os.getenv("WEB_APP_CACHE_ENTRIES", "64"))))
+    return _artifact_cache.load(filepath)
+
 def load_filtered_content(profile_name):
     log(f"Loading filtered content for profile: {profile_name}", verbose=False, log_caller_file="web_app.py")
 
@@ -36,8 +87,7 @@ def load_filtered_content(profile_name):
                     reddit_filepath = os.path.join(project_root, reddit_filepath)
 
                 try:
-                    with open(reddit_filepath, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
+                    data = load_json_artifact(reddit_filepath)
                     if 'filtered_reddit_posts' in data:
                         log(f"Found Reddit filtered content with {len(data['filtered_reddit_posts'])} posts", verbose=False, log_caller_file="web_app.py")
                         return data
@@ -56,8 +106,7 @@ def load_filtered_content(profile_name):
                     filepath = os.path.join(project_root, filepath)
 
                 try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
+                    data = load_json_artifact(filepath)
                     if 'filtered_posts' in data:
                         log(f"Found LinkedIn filtered content with {len(data['filtered_posts'])} posts", verbose=False, log_caller_file="web_app.py")
                         return data
@@ -66,11 +115,10 @@ def load_filtered_content(profile_name):
         except ImportError:
             pass
 
-        filepath = get_latest_scraped_file(profile_name)
+        filepath = get_latest_filtered_file(profile_name)
         if filepath:
             try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = load_json_artifact(filepath)
                 if 'filtered_tweets' in data:
                     return data
             except Exception as e:
@@ -83,108 +131,61 @@ def load_filtered_content(profile_name):
         return None
 
 def load_new_generated_content(profile_name):
-    import os
-    suggestions_dir = get_suggestions_dir(profile_name)
-    if not os.path.exists(suggestions_dir):
-        return None
-
-    linkedin_files = [f for f in os.listdir(suggestions_dir) if f.startswith('new_posts_content_linkedin_') and f.endswith('.json')]
-    if linkedin_files:
-        linkedin_files.sort(reverse=True)
-        filepath = os.path.join(suggestions_dir, linkedin_files[0])
+    filepath = get_latest_artifact(profile_name, "linkedin", "new_content")
+    if filepath:
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return load_json_artifact(filepath)
         except Exception as e:
             log(f"Error loading LinkedIn new posts: {e}", verbose=False, is_error=True, log_caller_file="web_app.py")
 
-    x_files = [f for f in os.listdir(suggestions_dir) if f.startswith('new_tweets_content_x_') and f.endswith('.json')]
-    if x_files:
-        x_files.sort(reverse=True)
-        filepath = os.path.join(suggestions_dir, x_files[0])
+    filepath = get_latest_artifact(profile_name, "x", "new_content")
+    if filepath:
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return load_json_artifact(filepath)
         except Exception as e:
             log(f"Error loading X new tweets: {e}", verbose=False, is_error=True, log_caller_file="web_app.py")
 
     return None
 
 def load_approved_content(profile_name):
-    import os
-    suggestions_dir = get_suggestions_dir(profile_name)
-    if not os.path.exists(suggestions_dir):
-        return None
-
-    linkedin_files_with_media = [f for f in os.listdir(suggestions_dir) if f.startswith('approved_content_linkedin_') and f.endswith('_with_media.json')]
-    if linkedin_files_with_media:
-        linkedin_files_with_media.sort(reverse=True)
-        filepath = os.path.join(suggestions_dir, linkedin_files_with_media[0])
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            log(f"Error loading LinkedIn approved content: {e}", verbose=False, is_error=True, log_caller_file="web_app.py")
-
-    linkedin_files = [f for f in os.listdir(suggestions_dir) if f.startswith('approved_content_linkedin_') and f.endswith('.json') and not f.endswith('_with_media.json')]
-    if linkedin_files:
-        linkedin_files.sort(reverse=True)
-        filepath = os.path.join(suggestions_dir, linkedin_files[0])
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            log(f"Error loading LinkedIn approved content: {e}", verbose=False, is_error=True, log_caller_file="web_app.py")
+    for kind in ("approved_with_media", "approved"):
+        filepath = get_latest_artifact(profile_name, "linkedin", kind)
+        if filepath:
+            try:
+                return load_json_artifact(filepath)
+            except Exception as e:
+                log(f"Error loading LinkedIn approved content: {e}", verbose=False, is_error=True, log_caller_file="web_app.py")
 
     filepath = get_latest_approved_file(profile_name)
     if not filepath:
         return None
 
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return load_json_artifact(filepath)
     except Exception as e:
         log(f"Error loading X approved content: {e}", verbose=False, is_error=True, log_caller_file="web_app.py")
         return None
 
 def load_generated_content(profile_name):
-    import os
-    suggestions_dir = get_suggestions_dir(profile_name)
-    if not os.path.exists(suggestions_dir):
-        return None
-
-    linkedin_files = [f for f in os.listdir(suggestions_dir) if f.startswith('suggestions_content_linkedin_') and f.endswith('_reviewed.json')]
-    if linkedin_files:
-        linkedin_files.sort(reverse=True)
-        filepath = os.path.join(suggestions_dir, linkedin_files[0])
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            log(f"Error loading LinkedIn reviewed content: {e}", verbose=False, is_error=True, log_caller_file="web_app.py")
-
-    linkedin_files = [f for f in os.listdir(suggestions_dir) if f.startswith('suggestions_content_linkedin_') and f.endswith('.json') and not f.endswith('_reviewed.json')]
-    if linkedin_files:
-        linkedin_files.sort(reverse=True)
-        filepath = os.path.join(suggestions_dir, linkedin_files[0])
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            log(f"Error loading LinkedIn generated content: {e}", verbose=False, is_error=True, log_caller_file="web_app.py")
+    for kind in ("reviewed", "generated"):
+        filepath = get_latest_artifact(profile_name, "linkedin", kind)
+        if filepath:
+            try:
+                return load_json_artifact(filepath)
+            except Exception as e:
+                log(f"Error loading LinkedIn {kind} content: {e}", verbose=False, is_error=True, log_caller_file="web_app.py")
 
     filepath = get_latest_suggestions_file(profile_name)
     if not filepath:
         return None
 
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return load_json_artifact(filepath)
     except Exception as e:
         log(f"Error loading X generated content: {e}", verbose=False, is_error=True, log_caller_file="web_app.py")
         return None
 
-def save_approved_content(profile_name, approved_posts, platform='x'):
+def save_approved_content(profile_name, approved_posts, platform='x', filtered_timestamp=None, approved_indices=None):
     suggestions_dir = get_suggestions_dir(profile_name)
     os.makedirs(suggestions_dir, exist_ok=True)
 
@@ -198,13 +199,16 @@ def save_approved_content(profile_name, approved_posts, platform='x'):
         "approved_posts": approved_posts,
         "metadata": {
             "total_approved": len(approved_posts),
-            "approval_date": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            "approval_date": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            "filtered_timestamp": filtered_timestamp,
+            "approved_indices": approved_indices
         }
     }
 
     filepath = os.path.join(suggestions_dir, filename)
     with open(filepath, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
+    register_artifact(filepath, profile_name, platform, "approved", len(approved_posts))
 
     return filepath
 
@@ -230,12 +234,14 @@ def save_reviewed_content(profile_name, generated_posts, platform='x'):
     try:
         with open(filepath, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
+        register_artifact(filepath, profile_name, platform, "reviewed", len(generated_posts))
         log(f"Reviewed content saved to {filepath}", verbose=False, log_caller_file="web_app.py")
         return filepath
     except Exception as e:
         log(f"Error saving reviewed content: {e}", verbose=False, is_error=True, log_caller_file="web_app.py")
         return None
 
+@lru_cache(maxsize=1)
 def get_css_styles():
     return """
         body {
@@ -462,21 +468,24 @@ def get_css_styles():
 
 class ContentWebHandler(BaseHTTPRequestHandler):
     def do_GET(self):
-        path_parts = self.path.strip('/').split('/')
+        url = urllib.parse.urlsplit(self.path)
+        path_parts = url.path.strip('/').split('/')
 
-        if len(path_parts) == 1 and path_parts[0] == '':
+        if path_parts[0] == 'api':
+            self.serve_api(path_parts[1:], urllib.parse.parse_qs(url.query))
+        elif len(path_parts) == 1 and path_parts[0] == '':
             self.serve_home()
         elif len(path_parts) == 1 and path_parts[0]:
             profile_name = path_parts[0]
             self.serve_profile_home(profile_name)
         elif len(path_parts) == 2 and path_parts[1] == 'approve':
             profile_name = path_parts[0]
-            self.serve_approval_page(profile_name)
+            self.serve_approval_page(profile_name, urllib.parse.parse_qs(url.query))
         elif len(path_parts) == 2 and path_parts[1] == 'review':
             profile_name = path_parts[0]
-            self.serve_review_page(profile_name)
+            self.serve_review_page(profile_name, urllib.parse.parse_qs(url.query))
         elif path_parts[0] == 'static':
-            self.serve_static_media()
+            self.serve_static_media(path_parts)
         else:
             self.send_error(404)
 
@@ -559,11 +568,25 @@ class ContentWebHandler(BaseHTTPRequestHandler):
         """
         self.wfile.write(html.encode())
 
-    def serve_approval_page(self, profile_name):
+    def page_nav(self, path, offset, limit, total):
+        links = []
+        if offset > 0:
+            links.append(f'<a href="{path}?offset={max(0, offset - limit)}&limit={limit}" class="nav-link">Previous</a>')
+        links.append(f'<span class="stats">{min(offset + 1, total)}-{min(offset + limit, total)} of {total}</span>')
+        if offset + limit < total:
+            links.append(f'<a href="{path}?offset={offset + limit}&limit={limit}" class="nav-link">Next</a>')
+        return f'<div class="nav-links">{"".join(links)}</div>'
+
+    def serve_approval_page(self, profile_name, query=None):
         filtered_data = load_filtered_content(profile_name)
         if not filtered_data:
             self.send_error_page(f"No filtered content found for {profile_name}. Run scraping and filtering first.")
             return
+        try:
+            offset, limit = page_window(query or {})
+        except ValueError:
+            self.send_error_page("offset and limit must be integers")
+            return
 
         is_linkedin = 'filtered_posts' in filtered_data
         posts_field = 'filtered_posts' if is_linkedin else 'filtered_tweets'
@@ -589,14 +612,17 @@ class ContentWebHandler(BaseHTTPRequestHandler):
         html_parts.append('</div>')
         html_parts.append('</div>')
 
-        html_parts.append(f'<form method="POST" action="/{profile_name}/approve">')
-        html_parts.append('<div class="post-grid">')
-
         is_linkedin = 'filtered_posts' in filtered_data
         is_reddit = 'filtered_reddit_posts' in filtered_data
         posts_field = 'filtered_posts' if is_linkedin else ('filtered_reddit_posts' if is_reddit else 'filtered_tweets')
+        posts = filtered_data[posts_field]
 
-        for i, post in enumerate(filtered_data[posts_field]):
+        html_parts.append(self.page_nav(f"/{profile_name}/approve", offset, limit, len(posts)))
+        html_parts.append(f'<form method="POST" action="/{profile_name}/approve">')
+        html_parts.append(f'<input type="hidden" name="offset" value="{offset}"><input type="hidden" name="limit" value="{limit}">')
+        html_parts.append('<div class="post-grid">')
+
+        for i, post in enumerate(posts[offset:offset + limit], start=offset):
             html_parts.append('<div class="post">')
             html_parts.append('<div class="post-header">')
             html_parts.append('<div>')
@@ -688,13 +714,18 @@ class ContentWebHandler(BaseHTTPRequestHandler):
         html = '\n'.join(html_parts)
         self.wfile.write(html.encode())
 
-    def serve_review_page(self, profile_name):
+    def serve_review_page(self, profile_name, query=None):
         approved_data = load_approved_content(profile_name)
         new_content_data = load_new_generated_content(profile_name)
 
         if not approved_data and not new_content_data:
             self.send_error_page(f"No content found for {profile_name}. Run 'generate' and 'generate_new' commands first.")
             return
+        try:
+            offset, limit = page_window(query or {})
+        except ValueError:
+            self.send_error_page("offset and limit must be integers")
+            return
 
         self.send_response(200)
         self.send_header('Content-type', 'text/html')
@@ -730,7 +761,9 @@ class ContentWebHandler(BaseHTTPRequestHandler):
         html_parts.append('</div>')
         html_parts.append('</div>')
 
+        html_parts.append(self.page_nav(f"/{profile_name}/review", offset, limit, total_items))
         html_parts.append(f'<form method="POST" action="/{profile_name}/review">')
+        html_parts.append(f'<input type="hidden" name="offset" value="{offset}"><input type="hidden" name="limit" value="{limit}">')
         html_parts.append('<div class="post-grid">')
 
         item_index = 0
@@ -741,6 +774,9 @@ class ContentWebHandler(BaseHTTPRequestHandler):
             is_reddit_approved = approved_data.get('platform') == 'reddit'
 
             for post in approved_posts:
+                if not offset <= item_index < offset + limit:
+                    item_index += 1
+                    continue
                 html_parts.append('<div class="post">')
                 html_parts.append('<div class="post-header">')
                 html_parts.append('<div>')
@@ -793,6 +829,9 @@ class ContentWebHandler(BaseHTTPRequestHandler):
                 item_type = "New Tweet"
 
             for item in new_items:
+                if not offset <= item_index < offset + limit:
+                    item_index += 1
+                    continue
                 html_parts.append('<div class="post">')
                 html_parts.append('<div class="post-header">')
                 html_parts.append('<div>')
@@ -822,37 +861,150 @@ class ContentWebHandler(BaseHTTPRequestHandler):
         html = ''.join(html_parts)
         self.wfile.write(html.encode())
 
-    def serve_static_media(self):
-        path_parts = self.path.strip('/').split('/')
-        if len(path_parts) >= 3 and path_parts[0] == 'static':
-            profile_name = path_parts[1]
-            media_relative_path = os.path.join(*path_parts[2:])
+    def send_json(self, payload, status_code=200):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status_code)
+        self.send_header('Content-type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def serve_api(self, path_parts, query):
+        if len(path_parts) != 2:
+            self.send_json({"error": "Expected /api/<profile>/<filtered|approved|new|review>"}, 404)
+            return
+        profile_name, kind = path_parts
+        items, platform = [], None
+
+        if kind == 'filtered':
+            filtered_data = load_filtered_content(profile_name)
+            if filtered_data:
+                posts_field = next(field for field in ('filtered_reddit_posts', 'filtered_posts', 'filtered_tweets') if field in filtered_data)
+                platform = {'filtered_reddit_posts': 'reddit', 'filtered_posts': 'linkedin', 'filtered_tweets': 'x'}[posts_field]
+                items = filtered_data[posts_field]
+        elif kind == 'approved':
+            approved_data = load_approved_content(profile_name)
+            if approved_data:
+                platform = approved_data.get('platform', 'x')
+                items = approved_data.get('approved_posts', [])
+        elif kind == 'new':
+            new_content_data = load_new_generated_content(profile_name)
+            if new_content_data:
+                platform = new_content_data.get('platform', 'x')
+                items = new_content_data.get('new_posts' if platform == 'linkedin' else 'new_tweets', [])
+        elif kind == 'review':
+            approved_data = load_approved_content(profile_name)
+            new_content_data = load_new_generated_content(profile_name)
+            if approved_data:
+                items += [{'type': 'approved_post', 'platform': approved_data.get('platform', 'x'), 'content': post} for post in approved_data.get('approved_posts', [])]
+            if new_content_data:
+                new_platform = new_content_data.get('platform', 'x')
+                items += [{'type': 'new_content', 'platform': new_platform, 'content': item} for item in new_content_data.get('new_posts' if new_platform == 'linkedin' else 'new_tweets', [])]
+            platform = items[0]['platform'] if items else None
+        else:
+            self.send_json({"error": f"Unknown content kind: {kind}"}, 404)
+            return
+
+        try:
+            offset, limit = page_window(query)
+        except ValueError:
+            self.send_json({"error": "offset and limit must be integers"}, 400)
+            return
+
+        # index matches the decision-<index> field the HTML forms post back for the same item
+        page = [{"index": offset + i, "item": item} for i, item in enumerate(items[offset:offset + limit])]
+        self.send_json({
+            "profile_name": profile_name,
+            "kind": kind,
+            "platform": platform,
+            "total": len(items),
+            "offset": offset,
+            "limit": limit,
+            "next_offset": offset + limit if offset + limit < len(items) else None,
+            "items": page
+        })
+
+    def _parse_range(self, size: int) -> Optional[Tuple[int, int]]:
+        header = self.headers.get('Range')
+        if not header or not header.startswith('bytes=') or ',' in header:
+            return None
+        first, _, last = header[len('bytes='):].strip().partition('-')
+        if not first:
+            if not last.isdigit() or int(last) == 0 or size == 0:
+                raise ValueError(header)
+            return max(0, size - int(last)), size - 1
+        if not first.isdigit() or (last and not last.isdigit()):
+            raise ValueError(header)
+        # An inverted range is not a valid range-spec at all, so the header is ignored and the full file is served (RFC 9110)
+        if last and int(last) < int(first):
+            return None
+        if int(first) >= size:
+            raise ValueError(header)
+        return int(first), min(int(last), size - 1) if last else size - 1
+
+    def serve_static_media(self, path_parts):
+        if len(path_parts) < 3 or path_parts[0] != 'static':
+            self.send_error(404, "Invalid static media request")
+            return
+
+        profile_name = path_parts[1]
+        media_root_dir = os.path.realpath(get_suggestions_dir(profile_name))
+        full_path = os.path.realpath(os.path.join(media_root_dir, *[urllib.parse.unquote(part) for part in path_parts[2:]]))
+        if os.path.commonpath([media_root_dir, full_path]) != media_root_dir or not os.path.isfile(full_path):
+            log(f"Static media file not found: {full_path}", verbose=False, is_error=True, log_caller_file="web_app.py")
+            self.send_error(404, "File not found")
+            return
 
-            media_root_dir = get_suggestions_dir(profile_name)
-            full_path = os.path.join(media_root_dir, media_relative_path)
+        try:
+            with open(full_path, 'rb') as f:
+                stat = os.fstat(f.fileno())
+                size = stat.st_size
+                etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+                mime_type, _ = mimetypes.guess_type(full_path)
+
+                if etag in [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Cache-Control', f"public, max-age={os.getenv('WEB_APP_MEDIA_MAX_AGE', '3600')}")
+                    self.end_headers()
+                    return
 
-            if os.path.exists(full_path) and os.path.isfile(full_path):
                 try:
-                    with open(full_path, 'rb') as f:
-                        content = f.read()
-                    self.send_response(200)
-                    import mimetypes
-                    mime_type, _ = mimetypes.guess_type(full_path)
-                    if mime_type:
-                        self.send_header('Content-type', mime_type)
-                    else:
-                        self.send_header('Content-type', 'application/octet-stream')
-                    self.send_header('Content-Length', str(len(content)))
+                    byte_range = self._parse_range(size)
+                except ValueError:
+                    self.send_response(416)
+                    self.send_header('Content-Range', f'bytes */{size}')
+                    self.send_header('Content-Length', '0')
                     self.end_headers()
-                    self.wfile.write(content)
-                except Exception as e:
-                    log(f"Error serving static file {full_path}: {e}", verbose=False, is_error=True, log_caller_file="web_app.py")
-                    self.send_error(500, "Error serving file")
-            else:
-                log(f"Static media file not found: {full_path}", verbose=False, is_error=True, log_caller_file="web_app.py")
-                self.send_error(404, "File not found")
-        else:
-            self.send_error(404, "Invalid static media request")
+                    return
+                # A Range tied to an older version of the file gets the whole current file instead
+                if byte_range and self.headers.get('If-Range', etag) != etag:
+                    byte_range = None
+
+                start, end = byte_range or (0, size - 1)
+                self.send_response(206 if byte_range else 200)
+                self.send_header('Content-type', mime_type or 'application/octet-stream')
+                self.send_header('Content-Length', str(end - start + 1 if size else 0))
+                self.send_header('Accept-Ranges', 'bytes')
+                self.send_header('ETag', etag)
+                self.send_header('Last-Modified', formatdate(stat.st_mtime, usegmt=True))
+                self.send_header('Cache-Control', f"public, max-age={os.getenv('WEB_APP_MEDIA_MAX_AGE', '3600')}")
+                if byte_range:
+                    self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+                self.end_headers()
+                # socket.sendfile uses os.sendfile where available and falls back to buffered sends elsewhere
+                offset = start
+                while size and offset <= end:
+                    sent = self.connection.sendfile(f, offset, min(SENDFILE_CHUNK_BYTES, end - offset + 1))
+                    if not sent:
+                        break
+                    offset += sent
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        except Exception as e:
+            log(f"Error serving static file {full_path}: {e}", verbose=False, is_error=True, log_caller_file="web_app.py")
+            self.send_error(500, "Error serving file")
 
     def handle_approval(self, profile_name):
         log(f"Handling approval for profile: {profile_name}", verbose=False, log_caller_file="web_app.py")
@@ -870,14 +1022,26 @@ class ContentWebHandler(BaseHTTPRequestHandler):
         posts_field = 'filtered_posts' if is_linkedin else 'filtered_tweets'
         platform = 'linkedin' if is_linkedin else 'x'
 
-        approved_posts = []
-        for i, post in enumerate(filtered_data[posts_field]):
-            decision_key = f'decision-{i}'
-            if decision_key in parsed_data and parsed_data[decision_key][0] == 'approve':
-                approved_posts.append(post)
-
-        if approved_posts:
-            saved_file = save_approved_content(profile_name, approved_posts, platform)
+        try:
+            offset, limit = page_window(parsed_data)
+        except ValueError:
+            self.send_error(400, "offset and limit must be integers")
+            return
+        posts = filtered_data[posts_field]
+        page = range(offset, min(offset + limit, len(posts)))
+
+        # Only the submitted page is decided here; approvals made on other pages of the same filtered run are kept
+        approved_indices = set()
+        previous = load_approved_content(profile_name)
+        previous_metadata = (previous or {}).get('metadata', {})
+        same_run = previous_metadata.get('filtered_timestamp') == filtered_data.get('timestamp') and previous_metadata.get('approved_indices') is not None
+        if same_run:
+            approved_indices = {i for i in previous_metadata['approved_indices'] if i not in page and i < len(posts)}
+        approved_indices.update(i for i in page if parsed_data.get(f'decision-{i}', ['reject'])[0] == 'approve')
+        approved_posts = [posts[i] for i in sorted(approved_indices)]
+
+        if approved_posts or same_run:
+            saved_file = save_approved_content(profile_name, approved_posts, platform, filtered_data.get('timestamp'), sorted(approved_indices))
             filename = os.path.basename(saved_file)
         else:
             filename = None
@@ -920,6 +1084,13 @@ class ContentWebHandler(BaseHTTPRequestHandler):
             self.send_error(404, "No content found")
             return
 
+        try:
+            offset, limit = page_window(parsed_data)
+        except ValueError:
+            self.send_error(400, "offset and limit must be integers")
+            return
+
+        # Items outside the submitted page were not shown, so they are left undecided rather than skipped
         suggestions_items = []
         item_index = 0
 
@@ -928,9 +1099,13 @@ class ContentWebHandler(BaseHTTPRequestHandler):
             is_linkedin_approved = approved_data.get('platform') == 'linkedin'
 
             for post in approved_posts:
+                if not offset <= item_index < offset + limit:
+                    item_index += 1
+                    continue
                 decision = parsed_data.get(f'decision-{item_index}', ['reject'])[0]
                 if decision == 'approve':
                     edited_caption = parsed_data.get(f'caption_{item_index}', [''])[0]
+                    post = dict(post)
 
                     if is_linkedin_approved:
                         post['generated_caption'] = edited_caption
@@ -952,10 +1127,14 @@ class ContentWebHandler(BaseHTTPRequestHandler):
                 new_items = new_content_data.get('new_tweets', [])
 
             for item in new_items:
+                if not offset <= item_index < offset + limit:
+                    item_index += 1
+                    continue
                 decision = parsed_data.get(f'decision-{item_index}', ['reject'])[0]
                 if decision == 'approve':
                     edited_text = parsed_data.get(f'caption_{item_index}', [''])[0]
 
+                    item = dict(item)
                     item['text'] = edited_text
                     item['approved'] = True
 
@@ -1085,8 +1264,10 @@ class ContentWebHandler(BaseHTTPRequestHandler):
 
 def run_web_app(port=5000):
     server_address = ('', port)
-    httpd = HTTPServer(server_address, ContentWebHandler)
-    log(f"Starting unified content web app on http://localhost:{port}", verbose=False, log_caller_file="web_app.py")
+    threaded = os.getenv("WEB_APP_THREADED", "1") != "0"
+    server_class = ThreadingHTTPServer if threaded else HTTPServer
+    httpd = server_class(server_address, ContentWebHandler)
+    log(f"Starting unified content web app on http://localhost:{port} ({'threaded' if threaded else 'single-threaded'})", verbose=False, log_caller_file="web_app.py")
     log("Press Ctrl+C to stop", verbose=False, log_caller_file="web_app.py")
     try:
         httpd.serve_forever()